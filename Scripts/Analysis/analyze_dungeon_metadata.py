@@ -1,13 +1,25 @@
 #!/usr/bin/env python3
 """
-Analyze all Oracle dungeons using z3ed - uses correct Debug binary.
+Analyze all Oracle dungeons from room headers and object streams.
+
+Rooms are decoded in-process (Generate/dungeon_rooms.py); --z3ed also runs
+z3ed dungeon-describe-room per room (batched and cached by
+Generate/z3ed_driver.py) and flags fields that disagree.
 """
 
-import subprocess
+import argparse
 import json
 import re
+import sys
 from pathlib import Path
 
+GENERATE_DIR = Path(__file__).resolve().parents[1] / "Generate"
+if str(GENERATE_DIR) not in sys.path:
+    sys.path.insert(0, str(GENERATE_DIR))
+
+from dungeon_rooms import DungeonRooms  # noqa: E402
+from z3ed_driver import Z3edDriver, Z3edQuery  # noqa: E402
+
 Z3ED = "/Users/scawful/src/hobby/yaze/build/bin/Debug/z3ed"
 ROM = "/Users/scawful/src/hobby/oracle-of-secrets/Roms/oos168x.sfc"
 
@@ -87,31 +99,40 @@ def parse_z3ed_output(output: str) -> dict:
     return data
 
 
-def query_room(room_id: int) -> dict:
-    """Query z3ed for room metadata."""
-    room_hex = f"0x{room_id:02X}"
-    try:
-        result = subprocess.run(
-            [Z3ED, "dungeon-describe-room", f"--rom={ROM}", f"--room={room_hex}"],
-            capture_output=True, text=True, timeout=5
-        )
+def query_room(room_id: int, rom_path: str = ROM) -> dict:
+    """Room metadata from the in-process ROM decode."""
+    room = DungeonRooms.load(rom_path).room(room_id)
+    return {
+        "room_id": room_id,
+        "room_hex": f"0x{room_id:02X}",
+        "blockset": room.blockset,
+        "spriteset": room.spriteset,
+        "palette": room.palette,
+        "layout": room.layout,
+        "floor1": room.floor1,
+        "floor2": room.floor2,
+        "effect": room.effect,
+        "object_count": room.object_count,
+    }
 
-        data = {"room_id": room_id, "room_hex": room_hex}
 
-        if result.returncode == 0:
-            parsed = parse_z3ed_output(result.stdout)
-            data.update(parsed)
-        else:
-            data["error"] = result.stderr
-
-        return data
-    except subprocess.TimeoutExpired:
-        return {"room_id": room_id, "room_hex": room_hex, "error": "timeout"}
-    except Exception as e:
-        return {"room_id": room_id, "room_hex": room_hex, "error": str(e)}
+def query_room_z3ed(room_id: int, rom_path: str = ROM, z3ed: str = Z3ED) -> dict:
+    """Query z3ed for room metadata (cached by Z3edDriver)."""
+    room_hex = f"0x{room_id:02X}"
+    query = Z3edQuery("dungeon-describe-room", room=room_id)
+    result = Z3edDriver.shared(rom_path, z3ed).run(query)
+
+    data = {"room_id": room_id, "room_hex": room_hex}
+    if result.ok:
+        data.update(parse_z3ed_output(result.stdout))
+    else:
+        data["error"] = result.stderr
+    return data
 
 
-def analyze_dungeon(dungeon_key: str, dungeon_info: dict) -> dict:
+def analyze_dungeon(
+    dungeon_key: str, dungeon_info: dict, rom_path: str = ROM, z3ed: str = None
+) -> dict:
     """Analyze all rooms in a dungeon."""
     sep = "=" * 70
     print(f"\n{sep}")
@@ -127,10 +148,26 @@ def analyze_dungeon(dungeon_key: str, dungeon_info: dict) -> dict:
         "anomalies": [],
     }
 
+    if z3ed:
+        Z3edDriver.shared(rom_path, z3ed).run_many(
+            Z3edQuery("dungeon-describe-room", room=room_id)
+            for room_id in dungeon_info["rooms"]
+        )
+
     for room_id in dungeon_info["rooms"]:
-        room_data = query_room(room_id)
+        room_data = query_room(room_id, rom_path)
         room_hex = f"0x{room_id:02X}"
         results["rooms"][room_hex] = room_data
+        if z3ed:
+            reference = query_room_z3ed(room_id, rom_path, z3ed)
+            mismatched = sorted(
+                key for key, value in reference.items()
+                if key in room_data and key != "room_hex" and room_data[key] != value
+            )
+            if "error" in reference:
+                mismatched.append(f"error={reference['error']!r}")
+            if mismatched:
+                room_data["z3ed_mismatch"] = mismatched
 
         # Check for anomalies
         is_entrance = room_id == dungeon_info["entrance_room"]
@@ -156,15 +193,27 @@ def analyze_dungeon(dungeon_key: str, dungeon_info: dict) -> dict:
         anomaly_marker = f" !! {anomaly}" if anomaly else ""
 
         print(f"  {room_hex}: blockset={blk:>2}, palette={pal:>2}, spriteset={spr:>2}, objects={obj:>3}{marker}{anomaly_marker}")
+        if room_data.get("z3ed_mismatch"):
+            print(f"      z3ed mismatch: {', '.join(room_data['z3ed_mismatch'])}")
 
     return results
 
 
 def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rom", default=ROM, help="Path to ROM file")
+    parser.add_argument(
+        "--z3ed",
+        nargs="?",
+        const=Z3ED,
+        help="Cross-check every room against z3ed (optional binary path)",
+    )
+    args = parser.parse_args()
+
     all_results = {}
 
     for dungeon_key, dungeon_info in DUNGEONS.items():
-        results = analyze_dungeon(dungeon_key, dungeon_info)
+        results = analyze_dungeon(dungeon_key, dungeon_info, args.rom, args.z3ed)
         all_results[dungeon_key] = results
 
     # Summary
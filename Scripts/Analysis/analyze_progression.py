@@ -8,9 +8,14 @@ a progression analysis report showing:
 - Item gates (what items are required to access each dungeon)
 - Room statistics per dungeon
 - Progression flow graph
+- With --rom: rooms reachable from each dungeon entrance, using the cached
+  connectivity index (Generate/connectivity_index.py)
+- With --solve: whether the whole game (story events + dungeon gates) can be
+  completed, and which states are softlock-prone
+  (Generate/progression_solver.py)
 
 Usage:
-    python3 Scripts/analyze_progression.py [--format=text|md|json]
+    python3 Scripts/analyze_progression.py [--format=text|md|json] [--rom ROM] [--solve]
 """
 
 import json
@@ -21,6 +26,10 @@ from typing import Optional
 SCRIPT_DIR = Path(__file__).parent
 PROJECT_ROOT = SCRIPT_DIR.parent
 REGISTRY_PATH = PROJECT_ROOT / "Data" / "location_registry.json"
+STORY_EVENTS_PATH = SCRIPT_DIR.resolve().parents[1] / "Docs" / "Dev" / "Planning" / "story_events.json"
+GENERATE_DIR = SCRIPT_DIR.resolve().parent / "Generate"
+
+ROOM_TRAVERSAL = ("entrance", "door", "stair", "holewarp")
 
 
 def load_registry() -> dict:
@@ -29,8 +38,51 @@ def load_registry() -> dict:
         return json.load(f)
 
 
-def analyze_dungeons(registry: dict) -> list:
-    """Analyze dungeon statistics and return sorted by order."""
+def load_connectivity(rom_path: str):
+    """Load the cached whole-ROM connectivity index for rom_path."""
+    if str(GENERATE_DIR) not in sys.path:
+        sys.path.insert(0, str(GENERATE_DIR))
+    from connectivity_index import ConnectivityIndex
+
+    return ConnectivityIndex.load(Path(rom_path))
+
+
+def solve_progression(registry: dict, index=None):
+    """Run the progression solver over story events + registry dungeon gates."""
+    if str(GENERATE_DIR) not in sys.path:
+        sys.path.insert(0, str(GENERATE_DIR))
+    from progression_solver import ProgressionModel, ProgressionSolver
+
+    with open(STORY_EVENTS_PATH) as f:
+        events = json.load(f)["events"]
+    model = ProgressionModel.compile(events, registry, index)
+    return ProgressionSolver(model, index).solve()
+
+
+def dungeon_reachability(dungeon: dict, index) -> dict:
+    """Registry rooms reachable from the dungeon entrance without leaving the dungeon."""
+    room_ids = sorted(int(r, 16) for r in dungeon.get("rooms", {}))
+    inside = {index.node("room", r) for r in room_ids}
+    if dungeon.get("entrance_id"):
+        start = index.node("entrance", int(dungeon["entrance_id"], 16))
+    else:
+        start = index.node("room", int(dungeon["entrance_room"], 16))
+    inside.add(start)
+    reached = index.reachable([start], kinds=ROOM_TRAVERSAL, within=inside)
+    return {
+        "reachable_rooms": sum(1 for r in room_ids if index.node("room", r) in reached),
+        "unreachable_rooms": [
+            f"0x{r:02X}" for r in room_ids if index.node("room", r) not in reached
+        ],
+    }
+
+
+def analyze_dungeons(registry: dict, index=None) -> list:
+    """Analyze dungeon statistics and return sorted by order.
+
+    When a connectivity index is given, each entry also reports which of
+    its registry rooms are reachable from the entrance.
+    """
     dungeons = []
 
     for key, dungeon in registry.get("dungeons", {}).items():
@@ -69,6 +121,8 @@ def analyze_dungeons(registry: dict) -> list:
             "track_heavy_rooms": track_heavy_rooms,
             "has_connections": any(r.get("connections") for r in rooms.values()),
         })
+        if index is not None:
+            dungeons[-1].update(dungeon_reachability(dungeon, index))
 
     return sorted(dungeons, key=lambda d: d["order"])
 
@@ -98,7 +152,7 @@ def analyze_caves(registry: dict) -> list:
     return caves
 
 
-def generate_text_report(registry: dict) -> str:
+def generate_text_report(registry: dict, index=None) -> str:
     """Generate a text format progression report."""
     lines = []
 
@@ -108,7 +162,7 @@ def generate_text_report(registry: dict) -> str:
     lines.append("")
 
     # Dungeon Progression
-    dungeons = analyze_dungeons(registry)
+    dungeons = analyze_dungeons(registry, index)
 
     lines.append("DUNGEON PROGRESSION ORDER")
     lines.append("-" * 70)
@@ -127,6 +181,10 @@ def generate_text_report(registry: dict) -> str:
         lines.append(f"     Dungeon Item: {d['dungeon_item']}")
         if d['total_tracks'] > 0:
             lines.append(f"     Minecart Tracks: {d['total_tracks']} ({d['track_heavy_rooms']} track-heavy rooms)")
+        if "reachable_rooms" in d:
+            lines.append(f"     Reachable From Entrance: {d['reachable_rooms']}/{d['room_count']} rooms")
+            if d["unreachable_rooms"]:
+                lines.append(f"     Unreachable: {', '.join(d['unreachable_rooms'])}")
         lines.append("")
 
     # Item Gates Summary
@@ -244,6 +302,9 @@ def main():
     parser.add_argument("--format", choices=["text", "md", "json"], default="text",
                         help="Output format (default: text)")
     parser.add_argument("--output", "-o", type=str, help="Output file (default: stdout)")
+    parser.add_argument("--rom", type=str, help="ROM for entrance reachability (text/json)")
+    parser.add_argument("--solve", action="store_true",
+                        help="Check completability with the progression solver (text/json)")
     args = parser.parse_args()
 
     if not REGISTRY_PATH.exists():
@@ -251,18 +312,28 @@ def main():
         sys.exit(1)
 
     registry = load_registry()
+    index = load_connectivity(args.rom) if args.rom else None
+
+    solved = solve_progression(registry, index) if args.solve else None
 
     if args.format == "text":
-        output = generate_text_report(registry)
+        output = generate_text_report(registry, index)
+        if solved is not None:
+            from progression_solver import format_report
+
+            output += "\nPROGRESSION SOLVER\n" + "-" * 70 + "\n" + format_report(solved) + "\n"
     elif args.format == "md":
         output = generate_markdown_report(registry)
     elif args.format == "json":
-        output = json.dumps({
-            "dungeons": analyze_dungeons(registry),
+        report = {
+            "dungeons": analyze_dungeons(registry, index),
             "shrines": analyze_shrines(registry),
             "caves": analyze_caves(registry),
             "progression": registry.get("progression", {}),
-        }, indent=2)
+        }
+        if solved is not None:
+            report["solver"] = solved.to_json()
+        output = json.dumps(report, indent=2)
 
     if args.output:
         with open(args.output, "w") as f:
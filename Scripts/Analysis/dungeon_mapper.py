@@ -3,24 +3,36 @@
 Dungeon Map Generator - Builds accurate room connectivity graphs from ROM data.
 
 Uses:
-  1. Door directions from z3ed dungeon-describe-room
-  2. Staircase destinations from z3ed dungeon-room-header (bytes 10-13)
+  1. Door directions from the room door lists (Generate/dungeon_rooms.py)
+  2. Staircase destinations from the room headers (bytes 10-13)
   3. ALTTP room grid system (16x16) for door target inference
 
+The ROM is decoded in-process once per run; --z3ed re-queries each room
+through z3ed (dungeon-room-header / dungeon-describe-room, batched and
+cached by Generate/z3ed_driver.py) and reports any disagreement with the
+native decode.
+
 Output:
   - Connection graph (JSON)
   - ASCII map visualization
 """
 
-import subprocess
 import json
 import re
+import sys
 import argparse
 from pathlib import Path
 from typing import Optional
 from collections import defaultdict
 from dataclasses import dataclass, field
 
+GENERATE_DIR = Path(__file__).resolve().parents[1] / "Generate"
+if str(GENERATE_DIR) not in sys.path:
+    sys.path.insert(0, str(GENERATE_DIR))
+
+from dungeon_rooms import DungeonRooms  # noqa: E402
+from z3ed_driver import Z3edDriver, Z3edQuery  # noqa: E402
+
 Z3ED = "/Users/scawful/src/hobby/yaze/build/bin/Debug/z3ed"
 ROM = "/Users/scawful/src/hobby/oracle-of-secrets/Roms/oos168x.sfc"
 
@@ -130,46 +142,68 @@ def parse_json_output(output: str) -> dict:
     return {}
 
 
-def query_room_header(room_id: int, rom_path: str = ROM) -> dict:
+def query_room_header(room_id: int, rom_path: str = ROM, z3ed: str = Z3ED) -> dict:
     """Query z3ed for room header (staircase destinations)."""
-    room_hex = f"0x{room_id:02X}"
-    try:
-        result = subprocess.run(
-            [Z3ED, "dungeon-room-header", f"--rom={rom_path}", f"--room={room_hex}"],
-            capture_output=True, text=True, timeout=5
-        )
-        if result.returncode == 0:
-            data = parse_json_output(result.stdout)
-            if "Room Header Debug" in data:
-                return data["Room Header Debug"].get("decoded", {})
-            elif "decoded" in data:
-                return data["decoded"]
-        return {}
-    except Exception as e:
-        print(f"  Warning: Failed to query header for room {room_hex}: {e}")
-        return {}
+    query = Z3edQuery("dungeon-room-header", room=room_id)
+    result = Z3edDriver.shared(rom_path, z3ed).run(query)
+    if result.ok:
+        data = parse_json_output(result.stdout)
+        if "Room Header Debug" in data:
+            return data["Room Header Debug"].get("decoded", {})
+        elif "decoded" in data:
+            return data["decoded"]
+    elif result.returncode < 0:
+        print(f"  Warning: Failed to query header for room 0x{room_id:02X}: {result.stderr}")
+    return {}
 
 
-def query_room_description(room_id: int, rom_path: str = ROM) -> dict:
+def query_room_description(room_id: int, rom_path: str = ROM, z3ed: str = Z3ED) -> dict:
     """Query z3ed for room description (doors, properties)."""
-    room_hex = f"0x{room_id:02X}"
-    try:
-        result = subprocess.run(
-            [Z3ED, "dungeon-describe-room", f"--rom={rom_path}", f"--room={room_hex}"],
-            capture_output=True, text=True, timeout=5
-        )
-        if result.returncode == 0:
-            return parse_json_output(result.stdout)
-        return {}
-    except Exception as e:
-        print(f"  Warning: Failed to query description for room {room_hex}: {e}")
-        return {}
+    query = Z3edQuery("dungeon-describe-room", room=room_id)
+    result = Z3edDriver.shared(rom_path, z3ed).run(query)
+    if result.ok:
+        return parse_json_output(result.stdout)
+    if result.returncode < 0:
+        print(f"  Warning: Failed to query description for room 0x{room_id:02X}: {result.stderr}")
+    return {}
+
+
+def prefetch_z3ed_rooms(room_ids: list[int], rom_path: str = ROM, z3ed: str = Z3ED) -> None:
+    """Run (or load from cache) both z3ed room queries for every room in one batch."""
+    Z3edDriver.shared(rom_path, z3ed).run_many(
+        Z3edQuery(command, room=room_id)
+        for room_id in room_ids
+        for command in ("dungeon-room-header", "dungeon-describe-room")
+    )
 
 
 def collect_room_data(room_id: int, rom_path: str = ROM) -> RoomData:
-    """Collect all data for a room from z3ed."""
-    header = query_room_header(room_id, rom_path)
-    desc = query_room_description(room_id, rom_path)
+    """Collect all data for a room from the in-process ROM decode."""
+    room = DungeonRooms.load(rom_path).room(room_id)
+    return RoomData(
+        room_id=room_id,
+        doors=[
+            Door(
+                position=door.position,
+                direction=door.direction,
+                door_type=door.type_name,
+                tile_x=door.tile_x,
+                tile_y=door.tile_y,
+            )
+            for door in room.doors
+        ],
+        stairs=list(room.stairs),
+        holewarp=room.holewarp,
+        object_count=room.object_count,
+        blockset=room.blockset,
+        palette=room.palette,
+    )
+
+
+def collect_room_data_z3ed(room_id: int, rom_path: str = ROM, z3ed: str = Z3ED) -> RoomData:
+    """Collect all data for a room from z3ed (cached by Z3edDriver)."""
+    header = query_room_header(room_id, rom_path, z3ed)
+    desc = query_room_description(room_id, rom_path, z3ed)
 
     room = RoomData(room_id=room_id)
 
@@ -201,6 +235,27 @@ def collect_room_data(room_id: int, rom_path: str = ROM) -> RoomData:
     return room
 
 
+def cross_check_room(native: RoomData, reference: RoomData) -> list[str]:
+    """Describe where a native decode disagrees with z3ed's answer."""
+    mismatches = []
+    native_doors = sorted((d.direction, d.position) for d in native.doors)
+    reference_doors = sorted((d.direction, d.position) for d in reference.doors)
+    if native_doors != reference_doors:
+        mismatches.append(f"doors {native_doors} != z3ed {reference_doors}")
+    native_stairs = [s for s in native.stairs if s]
+    reference_stairs = [s for s in reference.stairs if s]
+    if native_stairs != reference_stairs:
+        mismatches.append(f"stairs {native_stairs} != z3ed {reference_stairs}")
+    if (native.holewarp or None) != (reference.holewarp or None):
+        mismatches.append(f"holewarp {native.holewarp} != z3ed {reference.holewarp}")
+    for name in ("object_count", "blockset", "palette"):
+        if getattr(native, name) != getattr(reference, name):
+            mismatches.append(
+                f"{name} {getattr(native, name)} != z3ed {getattr(reference, name)}"
+            )
+    return mismatches
+
+
 def get_adjacent_room(room_id: int, direction: str) -> Optional[int]:
     """Calculate adjacent room ID using ALTTP 16x16 grid system.
 
@@ -520,7 +575,9 @@ def format_connections_table(connections: list[Connection]) -> str:
     return "\n".join(lines)
 
 
-def analyze_dungeon(dungeon_key: str, rom_path: str = ROM) -> dict:
+def analyze_dungeon(
+    dungeon_key: str, rom_path: str = ROM, z3ed: Optional[str] = None
+) -> dict:
     """Analyze a dungeon and generate connectivity map."""
     if dungeon_key not in DUNGEONS:
         print(f"Unknown dungeon: {dungeon_key}")
@@ -539,12 +596,18 @@ def analyze_dungeon(dungeon_key: str, rom_path: str = ROM) -> dict:
 
     # Collect room data
     print("\nCollecting room data...")
+    if z3ed:
+        prefetch_z3ed_rooms(room_ids, rom_path, z3ed)
     dungeon_rooms = {}
     for room_id in room_ids:
         room_data = collect_room_data(room_id, rom_path)
         dungeon_rooms[room_id] = room_data
         print(f"  0x{room_id:02X}: {len(room_data.doors)} doors, "
               f"{len([s for s in room_data.stairs if s])} stairs")
+        if z3ed:
+            reference = collect_room_data_z3ed(room_id, rom_path, z3ed)
+            for mismatch in cross_check_room(room_data, reference):
+                print(f"    z3ed mismatch: {mismatch}")
 
     # Build connectivity
     print("\nBuilding connectivity graph...")
@@ -613,6 +676,12 @@ def main():
         default=ROM,
         help="Path to ROM file"
     )
+    parser.add_argument(
+        "--z3ed",
+        nargs="?",
+        const=Z3ED,
+        help="Cross-check every room against z3ed (optional binary path)"
+    )
     parser.add_argument(
         "--all",
         action="store_true",
@@ -634,9 +703,9 @@ def main():
     if args.all:
         results = {}
         for dungeon_key in DUNGEONS:
-            results[dungeon_key] = analyze_dungeon(dungeon_key, args.rom)
+            results[dungeon_key] = analyze_dungeon(dungeon_key, args.rom, args.z3ed)
     else:
-        results = analyze_dungeon(args.dungeon, args.rom)
+        results = analyze_dungeon(args.dungeon, args.rom, args.z3ed)
 
     if args.json:
         output = json.dumps(results, indent=2)
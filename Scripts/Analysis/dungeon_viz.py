@@ -1,16 +1,22 @@
 #!/usr/bin/env python3
 """
 Simple dungeon room ASCII visualizer.
-Cleans up z3ed dungeon-map output into readable room layouts.
+Renders the in-process room map grid (doors, chests, stairs, custom
+collision) into readable room layouts; --z3ed uses z3ed dungeon-map's full
+render instead (batched and cached by Generate/z3ed_driver.py).
 
 Usage:
     python3 Scripts/dungeon_viz.py --rom Roms/oos168x.sfc --room 0x87
     python3 Scripts/dungeon_viz.py --rom Roms/oos168x.sfc --d6
     python3 Scripts/dungeon_viz.py --overview
 """
-import argparse, json, os, subprocess, sys
+import argparse, os, sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Generate'))
+from dungeon_rooms import DungeonRooms
+from z3ed_driver import Z3edDriver, Z3edQuery
 PLAIN = False
 SCALE = 3
+USE_Z3ED = False
 
 D6 = [0x77,0x78,0x79,0x87,0x88,0x89,0x97,0x98,0x99,
       0xA8,0xA9,0xB8,0xB9,0xC8,0xD7,0xD8,0xD9,0xDA]
@@ -28,14 +34,29 @@ def z3ed_path():
     p = os.path.join(d,'..','..','yaze','scripts','z3ed')
     return os.path.abspath(p) if os.path.exists(p) else 'z3ed'
 
+def z3ed_maps(rom, room_ids):
+    """Batch (and cache) z3ed dungeon-map for several rooms."""
+    driver = Z3edDriver.shared(rom, z3ed_path())
+    return driver.run_many(Z3edQuery('dungeon-map', room=r) for r in room_ids)
+
+def get_map_z3ed(rom, room_id):
+    r = z3ed_maps(rom, [room_id])[0]
+    return r.json().get('dungeon_map',{}).get('map',[])
+
 def get_map(rom, room_id):
+    """Map rows for a room, one string per tile row."""
+    if USE_Z3ED:
+        rows = []
+        for line in get_map_z3ed(rom, room_id):
+            parts = line.split(None, 1)
+            if len(parts) < 2: continue
+            try: int(parts[0])
+            except ValueError: continue
+            rows.append(parts[1])
+        return rows[1:]  # drop dungeon-map's column-header row
     try:
-        r = subprocess.run([z3ed_path(),'dungeon-map',
-            f'--room=0x{room_id:02X}',f'--rom={rom}'],
-            capture_output=True, text=True, timeout=10)
-        d = json.loads(r.stdout).get('dungeon_map',{})
-        return d.get('map',[])
-    except:
+        return DungeonRooms.load(rom).map_grid(room_id)
+    except (OSError, ValueError):
         return []
 
 def clean(ch):
@@ -77,16 +98,8 @@ def render(rom, room_id, show_coords=False):
         print(f'  0x{room_id:02X} {name} — no data')
         return
 
-    # Parse and clean into a 2D grid.
-    # grid[0] is the column-header row from dungeon-map (all spaces after clean).
-    # grid[i] for i >= 1 corresponds to actual tile row (i - 1).
-    grid = []
-    for line in lines:
-        parts = line.split(None, 1)
-        if len(parts) < 2: continue
-        try: int(parts[0])
-        except ValueError: continue
-        grid.append([clean(ch) for ch in parts[1]])
+    # Clean into a 2D grid; grid[i] is tile row i.
+    grid = [[clean(ch) for ch in line] for line in lines]
 
     if not grid:
         return
@@ -148,8 +161,7 @@ def render(rom, room_id, show_coords=False):
 
     # Collapse consecutive blank/wall-only rows to at most 1.
     # Also track the original compact row index for each kept row so we can
-    # recover the actual tile row: actual_row = (top + compact_idx * s) - 1
-    # (the -1 corrects for the all-spaces header row that dungeon-map prepends).
+    # recover the actual tile row: actual_row = top + compact_idx * s.
     def row_is_boring(r):
         return all(ch in (' ', '#') for ch in r)
 
@@ -183,7 +195,7 @@ def render(rom, room_id, show_coords=False):
         print(f'{dim}{tens}{rst}')
         print(f'{dim}{units}{rst}')
         for i, row in enumerate(filtered):
-            actual_row = max(0, (top + compact_indices[i] * s) - 1)
+            actual_row = top + compact_indices[i] * s
             lbl = f'{dim}{actual_row:3d} {rst}'
             print('  ' + lbl + ''.join(color(ch) for ch in row))
     else:
@@ -232,10 +244,12 @@ def main():
     ap.add_argument('--plain', action='store_true', help='no ANSI colors')
     ap.add_argument('--scale', type=int, default=3, help='downsample factor (default 3)')
     ap.add_argument('--coords', action='store_true', help='show tile row/col coordinates')
+    ap.add_argument('--z3ed', action='store_true', help='use z3ed dungeon-map (full wall render)')
     a = ap.parse_args()
-    global PLAIN, SCALE
+    global PLAIN, SCALE, USE_Z3ED
     PLAIN = a.plain
     SCALE = a.scale
+    USE_Z3ED = a.z3ed
 
     if a.overview or (not a.rom and not a.room and not a.rooms and not a.d6):
         overview()
@@ -245,12 +259,15 @@ def main():
         ap.error('--rom required')
 
     if a.d6:
+        rooms = D6
         overview()
-        for r in D6: render(a.rom, r, show_coords=a.coords)
     elif a.rooms:
-        for r in a.rooms.split(','): render(a.rom, int(r.strip(),16), show_coords=a.coords)
-    elif a.room:
-        render(a.rom, int(a.room,16), show_coords=a.coords)
+        rooms = [int(r.strip(),16) for r in a.rooms.split(',')]
+    else:
+        rooms = [int(a.room,16)] if a.room else []
+    if USE_Z3ED:
+        z3ed_maps(a.rom, rooms)
+    for r in rooms: render(a.rom, r, show_coords=a.coords)
 
 if __name__ == '__main__':
     main()
@@ -1,8 +1,10 @@
 #!/usr/bin/env python3
 """Extract room connectivity data (stairs, holewarps, doors) from ALTTP ROM.
 
-Reads room headers to extract stair destinations and holewarp targets,
-then cross-references with dungeon room lists to build connectivity graph.
+Reads room headers for palette/blockset metadata and takes stair and
+holewarp edges from the cached whole-ROM connectivity index
+(Generate/connectivity_index.py), then cross-references with dungeon room
+lists to build the per-dungeon connectivity graph.
 
 Usage:
     python3 Scripts/extract_room_connectivity.py --rom Roms/oos168.sfc
@@ -15,6 +17,12 @@ import struct
 import sys
 from pathlib import Path
 
+GENERATE_DIR = Path(__file__).resolve().parents[1] / "Generate"
+if str(GENERATE_DIR) not in sys.path:
+    sys.path.insert(0, str(GENERATE_DIR))
+
+from connectivity_index import ConnectivityIndex  # noqa: E402
+
 
 def snes_to_pc(addr):
     """Convert SNES LoROM address to PC file offset."""
@@ -209,21 +217,24 @@ def compute_door_connections(dungeon_rooms_list):
     return doors
 
 
-def build_stair_connections(rom, dungeon_rooms_list, all_dungeon_rooms):
-    """Build stair connections for rooms in a dungeon by reading ROM headers."""
+def room_edges(index, rid, kind):
+    """Destination rooms of `kind` edges leaving room `rid` in the index."""
+    return [
+        index.describe(target)[1]
+        for target, edge_kind in index.edges(index.node("room", rid))
+        if edge_kind == kind
+    ]
+
+
+def build_stair_connections(index, dungeon_rooms_list, all_dungeon_rooms):
+    """Build stair connections for rooms in a dungeon from the connectivity index."""
     stairs = []
     seen = set()
 
     for room in dungeon_rooms_list:
         rid = int(room["id"], 16)
-        header = extract_room_header(rom, rid)
-        if not header:
-            continue
-
-        for slot, dest in enumerate(header["staircase_rooms"]):
-            if dest == 0 or dest == rid:
-                continue
 
+        for dest in room_edges(index, rid, "stair"):
             # Create a canonical pair to avoid duplicates
             pair = tuple(sorted([rid, dest]))
             if pair in seen:
@@ -249,32 +260,26 @@ def build_stair_connections(rom, dungeon_rooms_list, all_dungeon_rooms):
     return stairs
 
 
-def build_holewarp_connections(rom, dungeon_rooms_list, all_dungeon_rooms):
-    """Build holewarp connections for rooms in a dungeon."""
+def build_holewarp_connections(index, dungeon_rooms_list, all_dungeon_rooms):
+    """Build holewarp connections for rooms in a dungeon from the connectivity index."""
     holewarps = []
 
     for room in dungeon_rooms_list:
         rid = int(room["id"], 16)
-        header = extract_room_header(rom, rid)
-        if not header:
-            continue
 
-        dest = header["holewarp"]
-        if dest == 0 or dest == rid:
-            continue
-
-        dest_hex = f"0x{dest:02X}"
-        from_hex = room["id"]
+        for dest in room_edges(index, rid, "holewarp"):
+            dest_hex = f"0x{dest:02X}"
+            from_hex = room["id"]
 
-        dest_info = all_dungeon_rooms.get(dest)
-        from_info = all_dungeon_rooms.get(rid)
+            dest_info = all_dungeon_rooms.get(dest)
+            from_info = all_dungeon_rooms.get(rid)
 
-        if dest_info and from_info and dest_info["dungeon_id"] == from_info["dungeon_id"]:
-            holewarps.append({
-                "from": from_hex,
-                "to": dest_hex,
-                "label": f"{from_info['name']} → {dest_info['name']}",
-            })
+            if dest_info and from_info and dest_info["dungeon_id"] == from_info["dungeon_id"]:
+                holewarps.append({
+                    "from": from_hex,
+                    "to": dest_hex,
+                    "label": f"{from_info['name']} → {dest_info['name']}",
+                })
 
     return holewarps
 
@@ -328,6 +333,7 @@ def main():
         sys.exit(1)
 
     rom = rom_path.read_bytes()
+    index = ConnectivityIndex.load(rom_path)
     registry = load_dungeon_registry(args.registry)
     all_dungeon_rooms = get_all_dungeon_rooms(registry)
 
@@ -380,8 +386,8 @@ def main():
             rooms_enriched.append(room_entry)
 
         # Build connections
-        stairs = build_stair_connections(rom, dungeon["rooms"], all_dungeon_rooms)
-        holewarps = build_holewarp_connections(rom, dungeon["rooms"], all_dungeon_rooms)
+        stairs = build_stair_connections(index, dungeon["rooms"], all_dungeon_rooms)
+        holewarps = build_holewarp_connections(index, dungeon["rooms"], all_dungeon_rooms)
         doors = compute_door_connections(dungeon["rooms"])
 
         dungeon_entry = {
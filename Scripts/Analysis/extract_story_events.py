@@ -7,8 +7,13 @@ Generates story_events.json with node/edge data for yaze's StoryEventGraphPanel.
 Sources:
   - Docs/Planning/Story_Event_Graph.md  -> event nodes + relationships
 
+With --rom, each dependency edge also records whether the target event's
+ROM locations (rooms, entrances, overworld areas) are reachable from the
+overworld, using the cached connectivity index
+(Generate/connectivity_index.py).
+
 Usage:
-  python3 Scripts/extract_story_events.py [--validate] [--output PATH]
+  python3 Scripts/extract_story_events.py [--validate] [--output PATH] [--rom ROM]
 """
 
 import argparse
@@ -228,8 +233,21 @@ def extract_events(root: Path) -> list:
     return events
 
 
-def infer_dependencies(events: list) -> list:
-    """Infer dependency edges from event ordering and flag relationships."""
+def location_nodes(event: dict, index) -> list:
+    """Connectivity-index nodes for an event's ROM locations."""
+    nodes = []
+    for location in event.get("locations", []):
+        nodes.extend(index.location_nodes(location))
+    return nodes
+
+
+def infer_dependencies(events: list, index=None) -> list:
+    """Infer dependency edges from event ordering and flag relationships.
+
+    With a connectivity index, each edge gets "reachable": whether any of
+    the target event's ROM locations can be reached from the overworld
+    (omitted when the target has no ROM location).
+    """
     edges = []
 
     # Known dependency chains from game design
@@ -253,23 +271,34 @@ def infer_dependencies(events: list) -> list:
         "EV-017": ["EV-014"],       # Tail Pond marker set by Elder after D1
     }
 
+    reachable = {}
+    if index is not None:
+        from_overworld = index.overworld_reachable()
+        for event in events:
+            nodes = location_nodes(event, index)
+            if nodes:
+                reachable[event["id"]] = any(node in from_overworld for node in nodes)
+
     for target_id, source_ids in dependency_map.items():
         for source_id in source_ids:
-            edges.append({
+            edge = {
                 "from": source_id,
                 "to": target_id,
                 "type": "dependency",
-            })
+            }
+            if target_id in reachable:
+                edge["reachable"] = reachable[target_id]
+            edges.append(edge)
 
     return edges
 
 
-def build_story_events(root: Path) -> dict:
+def build_story_events(root: Path, index=None) -> dict:
     """Build the complete story events JSON structure."""
     print("Extracting story events...")
 
     events = extract_events(root)
-    edges = infer_dependencies(events)
+    edges = infer_dependencies(events, index)
 
     # Add dependency/unlock fields to each event based on edges
     deps_by_target = {}
@@ -347,34 +376,41 @@ def validate_story_events(data: dict) -> bool:
                 file=sys.stderr,
             )
 
-    # Check for cycles (simple DFS)
+    for edge in data["edges"]:
+        if edge.get("reachable") is False:
+            print(
+                f"  WARN: {edge['to']} (after {edge['from']}) has no location "
+                f"reachable from the overworld",
+                file=sys.stderr,
+            )
+
+    # Check for cycles (iterative DFS: 1 = on the current path, 2 = done)
     adj = {}
     for edge in data["edges"]:
         adj.setdefault(edge["from"], []).append(edge["to"])
 
-    visited = set()
-    rec_stack = set()
-
-    def has_cycle(node):
-        visited.add(node)
-        rec_stack.add(node)
-        for neighbor in adj.get(node, []):
-            if neighbor not in visited:
-                if has_cycle(neighbor):
-                    return True
-            elif neighbor in rec_stack:
-                print(
-                    f"  ERROR: Cycle detected involving {node} -> {neighbor}",
-                    file=sys.stderr,
-                )
-                return True
-        rec_stack.discard(node)
-        return False
-
-    for eid in event_ids:
-        if eid not in visited:
-            if has_cycle(eid):
-                ok = False
+    state = {}
+    for root in sorted(event_ids):
+        if root in state:
+            continue
+        state[root] = 1
+        stack = [(root, iter(adj.get(root, [])))]
+        while stack:
+            node, neighbors = stack[-1]
+            for neighbor in neighbors:
+                if state.get(neighbor) == 1:
+                    print(
+                        f"  ERROR: Cycle detected involving {node} -> {neighbor}",
+                        file=sys.stderr,
+                    )
+                    ok = False
+                elif neighbor not in state:
+                    state[neighbor] = 1
+                    stack.append((neighbor, iter(adj.get(neighbor, []))))
+                    break
+            else:
+                state[node] = 2
+                stack.pop()
 
     return ok
 
@@ -391,6 +427,11 @@ def main():
         action="store_true",
         help="Validate existing output without regenerating",
     )
+    parser.add_argument(
+        "--rom",
+        default=None,
+        help="ROM used to check event locations against the connectivity index",
+    )
     args = parser.parse_args()
 
     root = find_project_root()
@@ -411,7 +452,16 @@ def main():
             sys.exit(1)
         return
 
-    data = build_story_events(root)
+    index = None
+    if args.rom:
+        generate_dir = Path(__file__).resolve().parents[1] / "Generate"
+        if str(generate_dir) not in sys.path:
+            sys.path.insert(0, str(generate_dir))
+        from connectivity_index import ConnectivityIndex
+
+        index = ConnectivityIndex.load(Path(args.rom))
+
+    data = build_story_events(root, index)
     ok = validate_story_events(data)
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
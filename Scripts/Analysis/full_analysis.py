@@ -11,19 +11,31 @@ Usage:
     python3 full_analysis.py Roms/oos168x.sfc --static-only
     python3 full_analysis.py Roms/oos168x.sfc --dynamic-only --frames 600
     python3 full_analysis.py Roms/oos168x.sfc --call-graph call_graph.dot
+
+Static analysis runs in a worker process while the dynamic stage drives the
+emulator, and each section of the summary prints as soon as its stage
+finishes. Static results are cached under .cache/full_analysis/ keyed by the
+ROM and hooks.json SHA-1s, so re-analyzing an unchanged build only pays for
+the dynamic stage (--no-cache forces a fresh run).
 """
 
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
+import os
 import sys
 import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from pathlib import Path
 from typing import Optional, Dict, Any
 
 # Add paths for imports
 SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parents[1]
+STATIC_CACHE_DIR = REPO_ROOT / ".cache" / "full_analysis"
+STATIC_CACHE_VERSION = 1
 Z3DK_SCRIPTS = Path.home() / "src" / "hobby" / "z3dk" / "scripts"
 
 if str(SCRIPT_DIR) not in sys.path:
@@ -105,6 +117,67 @@ def run_static_analysis(rom_path: Path, hooks_path: Optional[Path],
     return static_results
 
 
+def _file_sha1(path: Optional[Path]) -> str:
+    if path is None:
+        return "none"
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def static_cache_path(rom_path: Path, hooks_path: Optional[Path],
+                      cache_dir: Path = STATIC_CACHE_DIR) -> Path:
+    """Cache file for the static results of this ROM + hooks.json pair."""
+    return cache_dir / f"{_file_sha1(rom_path)}-{_file_sha1(hooks_path)}.json"
+
+
+def load_static_cache(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        record = json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+    if record.get('version') != STATIC_CACHE_VERSION:
+        return None
+    return record.get('static')
+
+
+def store_static_cache(path: Path, static_results: Dict[str, Any]) -> None:
+    if 'error' in static_results:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp = path.with_suffix(f".{os.getpid()}.tmp")
+    temp.write_text(json.dumps({'version': STATIC_CACHE_VERSION,
+                                'static': static_results}), encoding='utf-8')
+    os.replace(temp, path)
+
+
+def run_static_stage(rom_path: Path, hooks_path: Optional[Path],
+                     call_graph_path: Optional[Path],
+                     cache_path: Optional[Path],
+                     verbose: bool = False) -> Dict[str, Any]:
+    """Static stage for the worker process: cached, and never raises.
+
+    A call-graph export needs the live graph, so it always re-runs the
+    analysis (and refreshes the cache).
+    """
+    if cache_path is not None and call_graph_path is None:
+        cached = load_static_cache(cache_path)
+        if cached is not None:
+            print("Static analysis: cached", file=sys.stderr)
+            return cached
+    try:
+        static_results = run_static_analysis(rom_path, hooks_path,
+                                             call_graph_path, verbose)
+    except Exception as e:
+        print(f"Static analysis error: {e}", file=sys.stderr)
+        return {'error': str(e)}
+    if cache_path is not None:
+        store_static_cache(cache_path, static_results)
+    return static_results
+
+
 def run_dynamic_analysis(hooks_path: Optional[Path], frames: int,
                          watch_coords: bool = True,
                          verbose: bool = False) -> Dict[str, Any]:
@@ -179,84 +252,113 @@ def run_dynamic_analysis(hooks_path: Optional[Path], frames: int,
     return dynamic_results
 
 
-def print_summary(results: Dict[str, Any]) -> None:
-    """Print a human-readable summary of results."""
+def run_dynamic_stage(hooks_path: Optional[Path], frames: int,
+                      watch_coords: bool = True,
+                      verbose: bool = False) -> Dict[str, Any]:
+    """Dynamic stage for the worker thread; errors become a result entry."""
+    try:
+        return run_dynamic_analysis(hooks_path, frames,
+                                    watch_coords=watch_coords, verbose=verbose)
+    except Exception as e:
+        print(f"Dynamic analysis error: {e}", file=sys.stderr)
+        return {'error': str(e)}
+
+
+def print_summary_header() -> None:
     print("\n" + "=" * 60)
     print("Oracle of Secrets Full Analysis Report")
     print("=" * 60)
 
-    # Static analysis summary
-    if 'static' in results:
-        static = results['static']
-        print("\nStatic Analysis:")
-        print("-" * 40)
-        print(f"  Hooks analyzed: {static.get('hooks_analyzed', 0)}")
-        print(f"  Cross-references: {static.get('cross_refs_found', 0)}")
-        print(f"  Addresses visited: {static.get('addresses_visited', 0)}")
-
-        errors = static.get('errors', 0)
-        warnings = static.get('warnings', 0)
-        print(f"  Errors: {errors}")
-        print(f"  Warnings: {warnings}")
-
-        # Call graph stats
-        cg = static.get('call_graph', {})
-        if cg:
-            print(f"  Call graph: {cg.get('total_refs', 0)} refs, "
-                  f"{cg.get('entry_points', 0)} entry points")
-
-        cross_bank = static.get('cross_bank_calls', [])
-        if cross_bank:
-            print(f"  Cross-bank calls (bugs?): {len(cross_bank)}")
-
-        cycles = static.get('recursive_cycles', [])
-        if cycles:
-            print(f"  Recursive cycles: {len(cycles)}")
-
-        # Show diagnostics
-        diagnostics = static.get('diagnostics', []) + static.get('stack_issues', [])
-        if diagnostics:
-            print(f"\n  Issues ({len(diagnostics)}):")
-            for d in diagnostics[:10]:
-                severity = d.get('severity', 'info').upper()
-                addr = d.get('address', '?')
-                msg = d.get('message', '')
-                print(f"    [{severity}] {addr}: {msg}")
-            if len(diagnostics) > 10:
-                print(f"    ... and {len(diagnostics) - 10} more")
-
-    # Dynamic analysis summary
-    if 'dynamic' in results:
-        dynamic = results['dynamic']
-        print("\nDynamic Analysis:")
-        print("-" * 40)
-
-        if dynamic.get('error'):
-            print(f"  Error: {dynamic['error']}")
-        else:
-            print(f"  Frames run: {dynamic.get('frames_run', 0)}")
-
-            # P register
-            p_reg = dynamic.get('p_register', {})
-            if p_reg:
-                print(f"  P Register mismatches: {p_reg.get('mismatches', 0)}")
-                if p_reg.get('events'):
-                    for e in p_reg['events'][:5]:
-                        print(f"    {e['pc']} ({e['hook']}): {e['flag']} flag "
-                              f"expected {e['expected']}, got {e['actual']}")
-
-            # Coordinate writes
-            coords = dynamic.get('coordinate_writes', {})
-            if coords:
-                print(f"  Coordinate writes:")
-                for addr, info in coords.items():
-                    writers = info.get('unique_writers', [])
-                    print(f"    {info['name']}: {info['write_count']} writes, "
-                          f"{len(writers)} unique writers")
 
+def print_summary_footer() -> None:
     print("\n" + "=" * 60)
 
 
+def print_static_summary(static: Dict[str, Any]) -> None:
+    print("\nStatic Analysis:")
+    print("-" * 40)
+    if static.get('error'):
+        print(f"  Error: {static['error']}")
+        return
+    print(f"  Hooks analyzed: {static.get('hooks_analyzed', 0)}")
+    print(f"  Cross-references: {static.get('cross_refs_found', 0)}")
+    print(f"  Addresses visited: {static.get('addresses_visited', 0)}")
+
+    errors = static.get('errors', 0)
+    warnings = static.get('warnings', 0)
+    print(f"  Errors: {errors}")
+    print(f"  Warnings: {warnings}")
+
+    # Call graph stats
+    cg = static.get('call_graph', {})
+    if cg:
+        print(f"  Call graph: {cg.get('total_refs', 0)} refs, "
+              f"{cg.get('entry_points', 0)} entry points")
+
+    cross_bank = static.get('cross_bank_calls', [])
+    if cross_bank:
+        print(f"  Cross-bank calls (bugs?): {len(cross_bank)}")
+
+    cycles = static.get('recursive_cycles', [])
+    if cycles:
+        print(f"  Recursive cycles: {len(cycles)}")
+
+    # Show diagnostics
+    diagnostics = static.get('diagnostics', []) + static.get('stack_issues', [])
+    if diagnostics:
+        print(f"\n  Issues ({len(diagnostics)}):")
+        for d in diagnostics[:10]:
+            severity = d.get('severity', 'info').upper()
+            addr = d.get('address', '?')
+            msg = d.get('message', '')
+            print(f"    [{severity}] {addr}: {msg}")
+        if len(diagnostics) > 10:
+            print(f"    ... and {len(diagnostics) - 10} more")
+
+
+def print_dynamic_summary(dynamic: Dict[str, Any]) -> None:
+    print("\nDynamic Analysis:")
+    print("-" * 40)
+
+    if dynamic.get('error'):
+        print(f"  Error: {dynamic['error']}")
+    else:
+        print(f"  Frames run: {dynamic.get('frames_run', 0)}")
+
+        # P register
+        p_reg = dynamic.get('p_register', {})
+        if p_reg:
+            print(f"  P Register mismatches: {p_reg.get('mismatches', 0)}")
+            if p_reg.get('events'):
+                for e in p_reg['events'][:5]:
+                    print(f"    {e['pc']} ({e['hook']}): {e['flag']} flag "
+                          f"expected {e['expected']}, got {e['actual']}")
+
+        # Coordinate writes
+        coords = dynamic.get('coordinate_writes', {})
+        if coords:
+            print(f"  Coordinate writes:")
+            for addr, info in coords.items():
+                writers = info.get('unique_writers', [])
+                print(f"    {info['name']}: {info['write_count']} writes, "
+                      f"{len(writers)} unique writers")
+
+
+SECTION_PRINTERS = {
+    'static': print_static_summary,
+    'dynamic': print_dynamic_summary,
+}
+
+
+def print_summary(results: Dict[str, Any]) -> None:
+    """Print a human-readable summary of results."""
+    print_summary_header()
+    for stage, printer in SECTION_PRINTERS.items():
+        if stage in results:
+            printer(results[stage])
+    print_summary_footer()
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Combined static + dynamic analysis for Oracle of Secrets",
@@ -295,6 +397,8 @@ Examples:
                        help='Skip coordinate memory blame in dynamic analysis')
     parser.add_argument('--json', action='store_true',
                        help='Output as JSON')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Re-run static analysis instead of using cached results')
     parser.add_argument('-v', '--verbose', action='store_true',
                        help='Verbose output')
 
@@ -308,38 +412,51 @@ Examples:
         'rom': str(args.rom),
         'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
     }
-
-    # Run static analysis
-    if not args.dynamic_only:
-        try:
-            results['static'] = run_static_analysis(
-                args.rom,
-                args.hooks if args.hooks.exists() else None,
-                args.call_graph,
-                args.verbose,
-            )
-        except Exception as e:
-            results['static'] = {'error': str(e)}
-            print(f"Static analysis error: {e}", file=sys.stderr)
-
-    # Run dynamic analysis
-    if not args.static_only:
-        try:
-            results['dynamic'] = run_dynamic_analysis(
-                args.hooks if args.hooks.exists() else None,
-                args.frames,
-                watch_coords=not args.no_coords,
-                verbose=args.verbose,
-            )
-        except Exception as e:
-            results['dynamic'] = {'error': str(e)}
-            print(f"Dynamic analysis error: {e}", file=sys.stderr)
+    hooks_path = args.hooks if args.hooks.exists() else None
+    stage_results: Dict[str, Dict[str, Any]] = {}
+
+    if not args.json:
+        print_summary_header()
+
+    # Static analysis in a worker process, dynamic analysis alongside it
+    with ProcessPoolExecutor(max_workers=1) as processes, \
+            ThreadPoolExecutor(max_workers=1) as threads:
+        pending = {}
+        if not args.dynamic_only:
+            cache_path = None
+            if not args.no_cache:
+                cache_path = static_cache_path(args.rom, hooks_path)
+            future = processes.submit(run_static_stage, args.rom, hooks_path,
+                                      args.call_graph, cache_path, args.verbose)
+            pending[future] = 'static'
+        if not args.static_only:
+            future = threads.submit(run_dynamic_stage, hooks_path, args.frames,
+                                    not args.no_coords, args.verbose)
+            pending[future] = 'dynamic'
+
+        # Stream each section as its stage completes
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = pending.pop(future)
+                try:
+                    stage_results[stage] = future.result()
+                except Exception as e:
+                    stage_results[stage] = {'error': str(e)}
+                    print(f"{stage.capitalize()} analysis error: {e}", file=sys.stderr)
+                if not args.json:
+                    SECTION_PRINTERS[stage](stage_results[stage])
+                    sys.stdout.flush()
+
+    for stage in SECTION_PRINTERS:
+        if stage in stage_results:
+            results[stage] = stage_results[stage]
 
     # Output
     if args.json:
         print(json.dumps(results, indent=2))
     else:
-        print_summary(results)
+        print_summary_footer()
 
     # Return code based on errors
     static_success = results.get('static', {}).get('success', True)
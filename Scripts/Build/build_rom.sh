@@ -153,6 +153,7 @@ symbols_rel="Roms/oos${version}x.sym"
 symbols_path="$rom_dir/oos${version}x.sym"
 mlb_rel="Roms/oos${version}x.mlb"
 mlb_path="$rom_dir/oos${version}x.mlb"
+hooks_json="$repo_root/Roms/hooks.json"
 
 if [[ ! -f "$base_rom" ]]; then
   echo "ERROR: Base ROM not found: $base_rom" >&2
@@ -167,17 +168,39 @@ if [[ -f "$legacy_base" && "$base_rom" != "$legacy_base" ]]; then
 fi
 echo "Using base ROM: $base_rom"
 
+# Generators and validators run through the fingerprinted step runner: steps
+# whose inputs and outputs are unchanged since their last success are skipped,
+# and independent steps run in parallel. OOS_FORCE_STEPS=1 reruns everything.
+build_steps="$repo_root/Scripts/Build/build_steps.py"
+step_plan="$(mktemp "${TMPDIR:-/tmp}/oos_build_steps.XXXXXX")"
+trap 'rm -f "$step_plan"; restore_flags' EXIT
+add_step() {
+  # NAME [--in PATH_OR_GLOB] [--out PATH] [--after STEP] [--allow-fail] [--always] -- CMD...
+  printf '%s\0' "$1" --cwd "$PWD" "${@:2}" $'\036' >> "$step_plan"
+}
+run_steps() {
+  local status=0
+  python3 "$build_steps" run --plan "$step_plan" --root "$repo_root" --jobs "${OOS_STEP_JOBS:-0}" || status=$?
+  : > "$step_plan"
+  return $status
+}
+generator_inputs=(--in "$repo_root/Scripts/Generate/*.py")
+
 # Custom collision is editor-authored but source-owned. Fail before generating
 # build inputs when the selected base ROM does not reproduce the tracked JSON.
-echo "[*] Validating custom collision source contract..."
-python3 "$repo_root/Scripts/Generate/validate_custom_collision_source.py" \
+add_step collision_contract "${generator_inputs[@]}" \
+  --in "$repo_root/Data/dungeons/custom_collision.json" --in "$base_rom" -- \
+  python3 "$repo_root/Scripts/Generate/validate_custom_collision_source.py" \
   --root "$repo_root" \
   --rom "$base_rom"
 
 # Expanded messages are source-owned. Fail before generating any build inputs
 # when the canonical bundle and tracked Asar include have drifted.
-echo "[*] Validating expanded message source contract..."
-python3 "$repo_root/Scripts/Generate/validate_expanded_message_source.py" \
+add_step message_contract "${generator_inputs[@]}" \
+  --in "$repo_root/Data/dialogue/expanded_messages.json" \
+  --in "$repo_root/Core/Generated/expanded_messages.asm" \
+  --in "$repo_root/Core/message.asm" --in "$repo_root/Core/progression.asm" -- \
+  python3 "$repo_root/Scripts/Generate/validate_expanded_message_source.py" \
   --root "$repo_root"
 
 # Keep water-gate runtime tables synced with the validated editor-authored base
@@ -199,25 +222,35 @@ if [[ "${OOS_SKIP_WATER_TABLE_GEN:-0}" != "1" || "${OOS_SKIP_WATER_FILL_TABLE_GE
   fi
 fi
 
+feature_flags_step=(feature_flags)
 if [[ "${OOS_SKIP_WATER_TABLE_GEN:-0}" != "1" ]]; then
-  echo "[*] Generating water-gate runtime tables from: $water_table_rom_arg"
-  python3 "$repo_root/Scripts/Generate/generate_water_gate_runtime_tables.py" --rom "$water_table_rom_arg"
+  echo "[*] Water-gate runtime tables source: $water_table_rom_arg"
+  add_step water_gate_tables "${generator_inputs[@]}" --in "$water_table_rom" \
+    --out "$repo_root/Dungeons/generated/water_gate_runtime_tables.asm" \
+    --after collision_contract --after message_contract -- \
+    python3 "$repo_root/Scripts/Generate/generate_water_gate_runtime_tables.py" --rom "$water_table_rom_arg"
+  feature_flags_step+=(--after water_gate_tables)
 fi
 
 if [[ "${OOS_SKIP_WATER_FILL_TABLE_GEN:-0}" != "1" ]]; then
-  echo "[*] Generating water-fill table from custom collision markers: $water_table_rom_arg"
-  python3 "$repo_root/Scripts/Generate/generate_water_fill_table.py" --rom "$water_table_rom_arg"
+  echo "[*] Water-fill table source (custom collision markers): $water_table_rom_arg"
+  add_step water_fill_table "${generator_inputs[@]}" --in "$water_table_rom" \
+    --out "$repo_root/Dungeons/generated/water_fill_table.asm" \
+    --after collision_contract --after message_contract -- \
+    python3 "$repo_root/Scripts/Generate/generate_water_fill_table.py" --rom "$water_table_rom_arg"
+  feature_flags_step+=(--after water_fill_table)
 fi
 
-# Feature-flag guardrails (non-fatal by default).
-if ! python3 "$repo_root/Scripts/Build/verify_feature_flags.py" --root "$repo_root"; then
-  echo "[-] Feature flag verification failed!" >&2
-  # Default is non-fatal (developer workflow). Set OOS_FLAGS_FATAL=1 to
-  # fail the build when feature flags are inconsistent.
-  if [[ "${OOS_FLAGS_FATAL:-0}" == "1" ]]; then
-    exit 1
-  fi
+# Feature-flag guardrails (non-fatal by default). Set OOS_FLAGS_FATAL=1 to
+# fail the build when feature flags are inconsistent.
+if [[ "${OOS_FLAGS_FATAL:-0}" != "1" ]]; then
+  feature_flags_step+=(--allow-fail)
 fi
+add_step "${feature_flags_step[@]}" \
+  --in "$repo_root/**/*.asm" -- \
+  python3 "$repo_root/Scripts/Build/verify_feature_flags.py" --root "$repo_root"
+
+run_steps
 
 # Validate Oracle menu registry (bins + component tables) before patching.
 if [[ "${OOS_SKIP_MENU_VALIDATE:-0}" != "1" ]]; then
@@ -326,94 +359,146 @@ if ! command -v "$asar_bin" >/dev/null 2>&1; then
   exit 1
 fi
 
+# Content-addressed ROM cache: a tree + flag profile + base ROM + assembler
+# combination that was assembled before (bisects, isolation sweeps) is
+# restored instead of re-assembled. OOS_ROM_CACHE=0 disables it;
+# OOS_ROM_CACHE_MB bounds its disk use (LRU).
+rom_cache="$repo_root/Scripts/Build/rom_cache.py"
+rom_cache_key=""
+rom_cache_hit=0
+rom_cache_hooks=0
+rom_artifacts=(rom="$patched_rom")
 if [[ $emit_symbols -eq 1 ]]; then
-  # Use z3asm features if available
+  rom_artifacts+=(symbols="$symbols_path")
   if [[ "$asar_bin" == *"z3asm"* ]]; then
-    "$asar_bin" --symbols=wla --symbols-path="$symbols_path" --emit=sourcemap.json Oracle_main.asm "$patched_rom"
+    rom_artifacts+=(sourcemap="$PWD/sourcemap.json")
+  fi
+fi
+if [[ "${OOS_ROM_CACHE:-1}" != "0" ]]; then
+  rom_key_args=(--root "$repo_root" key --base-rom "$base_rom" --asm "$asar_bin")
+  if [[ $emit_symbols -eq 0 ]]; then
+    rom_key_args+=(--no-symbols)
+  fi
+  rom_cache_key="$(python3 "$rom_cache" "${rom_key_args[@]}")" || rom_cache_key=""
+fi
+if [[ -n "$rom_cache_key" ]]; then
+  if restored="$(python3 "$rom_cache" --root "$repo_root" fetch --key "$rom_cache_key" \
+      "${rom_artifacts[@]}" --optional hooks="$hooks_json")"; then
+    rom_cache_hit=1
+    if [[ " $restored " == *" hooks "* ]]; then
+      rom_cache_hooks=1
+    fi
+    echo "[=] Restored patched ROM from cache (${rom_cache_key:0:16})"
+  fi
+fi
+
+if [[ $rom_cache_hit -eq 0 ]]; then
+  if [[ $emit_symbols -eq 1 ]]; then
+    # Use z3asm features if available
+    if [[ "$asar_bin" == *"z3asm"* ]]; then
+      "$asar_bin" --symbols=wla --symbols-path="$symbols_path" --emit=sourcemap.json Oracle_main.asm "$patched_rom"
+    else
+      "$asar_bin" --symbols=wla --symbols-path="$symbols_path" Oracle_main.asm "$patched_rom"
+    fi
   else
-    "$asar_bin" --symbols=wla --symbols-path="$symbols_path" Oracle_main.asm "$patched_rom"
+    "$asar_bin" Oracle_main.asm "$patched_rom"
+  fi
+  if [[ -n "$rom_cache_key" ]]; then
+    python3 "$rom_cache" --root "$repo_root" store --key "$rom_cache_key" "${rom_artifacts[@]}" \
+      || echo "[-] Warning: could not store patched ROM in the build cache." >&2
   fi
-else
-  "$asar_bin" Oracle_main.asm "$patched_rom"
 fi
 
 echo "Built patched ROM: $patched_rom"
 
+asm_inputs=(--in "$repo_root/**/*.asm")
+
 # Refresh the ignored Yaze integration manifest from the exact source and ROM
 # that produced this build. Fail closed so source-sync never opens against a
 # missing or stale allocation contract.
-echo "[*] Generating Yaze hack manifest..."
-python3 "$repo_root/Scripts/Generate/generate_hack_manifest.py" \
+add_step hack_manifest "${generator_inputs[@]}" "${asm_inputs[@]}" \
+  --in "$repo_root/Data/**/*.json" --in "$repo_root/Oracle-of-Secrets.yaze" \
+  --in "$base_rom" --in "$patched_rom" \
+  --out "$repo_root/Roms/hack_manifest.json" -- \
+  python3 "$repo_root/Scripts/Generate/generate_hack_manifest.py" \
   --root "$repo_root" \
   --output "$repo_root/Roms/hack_manifest.json" \
   --dev-rom "$base_rom" \
-  --rom "$patched_rom"
+  --rom "$patched_rom" \
+  --jobs "${OOS_SCAN_JOBS:-0}"
 
 # Export symbols for yaze + Mesen2.
 if [[ $emit_symbols -eq 1 && -f "$symbols_path" ]]; then
+  symbols_step=(export_symbols "${generator_inputs[@]}" --in "$symbols_path" --out "$mlb_path")
   export_args=("$symbols_rel" "-o" "$mlb_rel" "--rom-name" "oos${version}x" "--filter" "oracle")
   if [[ $mesen_sync -eq 1 ]]; then
+    # Syncing copies into the Mesen2 profile, which the runner cannot fingerprint.
+    symbols_step+=(--always)
     export_args+=("--sync")
   fi
-  python3 "$repo_root/Scripts/Generate/export_symbols.py" "${export_args[@]}"
+  add_step "${symbols_step[@]}" -- \
+    python3 "$repo_root/Scripts/Generate/export_symbols.py" "${export_args[@]}"
 fi
 
 # Run ZScream overlap check
-python3 "$repo_root/Scripts/Build/check_zscream_overlap.py"
+add_step zscream_overlap \
+  --in "$repo_root/Core/ZS ROM MAP.txt" --in "$rom_dir/oos168x.symbols" -- \
+  python3 "$repo_root/Scripts/Build/check_zscream_overlap.py"
 
 # Generate annotations.json if requested (ASM @watch/@assert tags)
 if [[ "${OOS_GENERATE_ANNOTATIONS:-0}" == "1" ]]; then
   annotations_out="$repo_root/.cache/annotations.json"
-  python3 "$repo_root/Scripts/Generate/generate_annotations.py" --root "$repo_root" --out "$annotations_out" || true
+  add_step annotations --allow-fail "${generator_inputs[@]}" "${asm_inputs[@]}" \
+    --out "$annotations_out" -- \
+    python3 "$repo_root/Scripts/Generate/generate_annotations.py" --root "$repo_root" --out "$annotations_out" --jobs "${OOS_SCAN_JOBS:-0}"
 fi
 
-# Run static analysis if hooks.json exists
-hooks_json="$repo_root/Roms/hooks.json"
-if [[ -f "$patched_rom" ]]; then
-  regen_hooks=0
-  if [[ ! -f "$hooks_json" || "${OOS_GENERATE_HOOKS:-0}" == "1" ]]; then
-    regen_hooks=1
-  elif [[ -f "$repo_root/Config/module_flags.asm" && "$repo_root/Config/module_flags.asm" -nt "$hooks_json" ]]; then
-    regen_hooks=1
-  elif [[ -f "$repo_root/Config/feature_flags.asm" && "$repo_root/Config/feature_flags.asm" -nt "$hooks_json" ]]; then
-    regen_hooks=1
-  fi
-
-  if [[ "$regen_hooks" == "1" ]]; then
-    echo "[*] Generating hooks.json..."
-    python3 "$repo_root/Scripts/Generate/generate_hooks_json.py" --root "$repo_root" --output "$hooks_json" --rom "$patched_rom" || true
+# Refresh hooks.json whenever its ASM sources, flags or the patched ROM change
+# (OOS_GENERATE_HOOKS=1 forces a rebuild). A ROM cache hit restores the
+# hooks.json generated for that build alongside the ROM.
+hooks_after=()
+if [[ $rom_cache_hooks -eq 1 && "${OOS_GENERATE_HOOKS:-0}" != "1" ]]; then
+  echo "[=] hooks_json: restored from ROM cache"
+else
+  hooks_step=(hooks_json --allow-fail "${generator_inputs[@]}" "${asm_inputs[@]}" --in "$patched_rom" --out "$hooks_json")
+  if [[ "${OOS_GENERATE_HOOKS:-0}" == "1" ]]; then
+    hooks_step+=(--always)
   fi
+  add_step "${hooks_step[@]}" -- \
+    python3 "$repo_root/Scripts/Generate/generate_hooks_json.py" --root "$repo_root" --output "$hooks_json" --rom "$patched_rom" --jobs "${OOS_SCAN_JOBS:-0}"
+  hooks_after=(--after hooks_json)
 fi
 
 # Optional validation: ensure hooks.json matches generator output
 # Set OOS_VALIDATE_ON_BUILD=1 to run hook + sprite checks non-fatally on every build.
 validate_on_build="${OOS_VALIDATE_ON_BUILD:-0}"
 if [[ "${OOS_VALIDATE_HOOKS:-0}" == "1" || "$validate_on_build" == "1" ]]; then
-  if [[ -f "$hooks_json" && -f "$patched_rom" ]]; then
-    if [[ "$validate_on_build" == "1" && "${OOS_VALIDATE_HOOKS:-0}" != "1" ]]; then
-      echo "[*] Validating hooks.json (non-fatal)..."
-    else
-      echo "[*] Validating hooks.json..."
-    fi
+  add_step verify_hooks --allow-fail ${hooks_after[@]+"${hooks_after[@]}"} \
+    "${generator_inputs[@]}" "${asm_inputs[@]}" --in "$patched_rom" --in "$hooks_json" -- \
     python3 "$repo_root/Scripts/Validate/verify_hooks_json.py" \
-      --root "$repo_root" --rom "$patched_rom" --hooks "$hooks_json" || true
-  else
-    echo "[-] Warning: hooks.json or patched ROM missing; skipping hook validation."
-  fi
+    --root "$repo_root" --rom "$patched_rom" --hooks "$hooks_json"
 fi
 
 # Optional validation: sprite registry
 if [[ "${OOS_VALIDATE_SPRITES:-0}" == "1" || "$validate_on_build" == "1" ]]; then
-  if [[ "$validate_on_build" == "1" && "${OOS_VALIDATE_SPRITES:-0}" != "1" ]]; then
-    echo "[*] Validating sprite registry (non-fatal)..."
-  else
-    echo "[*] Validating sprite registry..."
-  fi
   sprite_validate_args=("$repo_root/Scripts/Validate/validate_sprite_registry.py")
   if [[ "${OOS_VALIDATE_SPRITES_STRICT:-0}" == "1" ]]; then
     sprite_validate_args+=("--strict")
   fi
-  python3 "${sprite_validate_args[@]}" || true
+  add_step sprite_registry --allow-fail "${generator_inputs[@]}" \
+    --in "$repo_root/Scripts/Generate/generate_sprite_registry.py" \
+    --in "$repo_root/Scripts/Validate/validate_sprite_registry.py" \
+    --in "$repo_root/Sprites/registry.csv" --in "$repo_root/Sprites/sprite_registry_ids.asm" -- \
+    python3 "${sprite_validate_args[@]}"
+fi
+
+run_steps
+
+# Add the freshly generated hooks.json to this build's cache entry, but only
+# when the hooks_json step's last success produced the file as it is now.
+if [[ -n "$rom_cache_key" && $rom_cache_hooks -eq 0 && -f "$hooks_json" ]]; then
+  python3 "$rom_cache" --root "$repo_root" store --key "$rom_cache_key" \
+    --optional hooks="$hooks_json" --optional-step hooks_json || true
 fi
 
 if [[ -f "$hooks_json" && -f "$patched_rom" ]]; then
@@ -0,0 +1,482 @@
+#!/usr/bin/env python3
+"""Fingerprinted, parallel runner for build_rom.sh generator/validator steps.
+
+build_rom.sh declares each step into a plan file, then runs the plan:
+
+    add_step water_gate_tables --in "$base_rom" \\
+      --out "$repo_root/Dungeons/generated/water_gate_runtime_tables.asm" \\
+      --after collision_contract -- python3 .../generate_water_gate_runtime_tables.py ...
+    run_steps   # build_steps.py run --plan "$step_plan" --root "$repo_root"
+
+`add_step` appends the declaration straight to the plan (see read_plan) so
+declaring steps costs no interpreter start-up; `build_steps.py add --plan`
+writes the same record for callers outside the shell.
+
+Each step records a fingerprint of its command, working directory, selected
+environment variables and the content of every input (globs allowed; any
+`.py` file named on the command line is an implicit input). A step is skipped
+when that fingerprint and the content of its outputs match the last
+successful run. File digests are cached by (size, mtime) so a no-op rebuild
+only stats files.
+
+Steps run concurrently once the steps named by --after have succeeded; a
+failed step skips its dependents. Output is buffered per step and printed
+when it finishes.
+
+Fingerprints live in .cache/build_steps.json under the repository root.
+
+Exit code:
+- 0 if every step succeeded, was skipped as unchanged, or was --allow-fail
+- 1 if any other step failed or was blocked by a failed dependency
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional
+
+
+STORE_VERSION = 1
+DEFAULT_STORE = Path(".cache/build_steps.json")
+GLOB_CHARS = re.compile(r"[*?\[]")
+PRUNE_DIRS = {"__pycache__", "node_modules", "build"}
+PLAN_RECORD_END = "\x1e"
+
+
+@dataclass
+class Step:
+    name: str
+    argv: list[str]
+    cwd: str
+    inputs: list[str] = field(default_factory=list)
+    outputs: list[str] = field(default_factory=list)
+    after: list[str] = field(default_factory=list)
+    env: list[str] = field(default_factory=list)
+    allow_fail: bool = False
+    always: bool = False
+
+
+@dataclass
+class StepResult:
+    name: str
+    status: str  # ran | skipped | failed | blocked
+    seconds: float = 0.0
+    returncode: int = 0
+    output: str = ""
+
+
+# ---------------------------------------------------------------------------
+# Fingerprints
+# ---------------------------------------------------------------------------
+
+def _glob_regex(pattern: str) -> re.Pattern[str]:
+    out = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile("".join(out) + r"\Z")
+
+
+class FileIndex:
+    """Expands input patterns and hashes files, caching digests by stat."""
+
+    def __init__(self, root: Path, digests: Optional[dict] = None) -> None:
+        self.root = root
+        self.digests: dict[str, list] = digests or {}
+        self._walks: dict[Path, list[str]] = {}
+        self._lock = threading.Lock()
+
+    def _walk(self, base: Path) -> list[str]:
+        with self._lock:
+            files = self._walks.get(base)
+            if files is None:
+                files = []
+                for dirpath, dirnames, filenames in os.walk(base):
+                    dirnames[:] = sorted(
+                        d for d in dirnames if not d.startswith(".") and d not in PRUNE_DIRS
+                    )
+                    for filename in filenames:
+                        files.append(os.path.join(dirpath, filename))
+                files.sort()
+                self._walks[base] = files
+            return files
+
+    def expand(self, pattern: str, cwd: Path) -> list[Path]:
+        path = Path(pattern)
+        if not path.is_absolute():
+            path = cwd / path
+        if not GLOB_CHARS.search(pattern):
+            return [path]
+        parts = path.parts
+        literal = next(i for i, part in enumerate(parts) if GLOB_CHARS.search(part))
+        base = Path(*parts[:literal])
+        regex = _glob_regex("/".join(parts[literal:]))
+        prefix = len(str(base)) + 1
+        return [Path(p) for p in self._walk(base) if regex.match(p[prefix:].replace(os.sep, "/"))]
+
+    def invalidate(self) -> None:
+        """Forget directory listings after a step may have created files."""
+        with self._lock:
+            self._walks.clear()
+
+    def digest(self, path: Path) -> Optional[str]:
+        """Content digest of `path`, or None if it does not exist."""
+        key = str(path)
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        cached = self.digests.get(key)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+        hasher = hashlib.sha256()
+        with path.open("rb") as handle:
+            for chunk in iter(lambda: handle.read(1 << 20), b""):
+                hasher.update(chunk)
+        value = hasher.hexdigest()
+        with self._lock:
+            self.digests[key] = [stat.st_size, stat.st_mtime_ns, value]
+        return value
+
+    def step_inputs(self, step: Step) -> list[Path]:
+        cwd = Path(step.cwd)
+        paths: set[Path] = set()
+        for pattern in step.inputs:
+            paths.update(self.expand(pattern, cwd))
+        for arg in step.argv:
+            if arg.endswith(".py"):
+                script = Path(arg) if Path(arg).is_absolute() else cwd / arg
+                if script.is_file():
+                    paths.add(script)
+        # A step's own outputs may match its input globs (e.g. **/*.asm).
+        for pattern in step.outputs:
+            paths.difference_update(self.expand(pattern, cwd))
+        return sorted(paths)
+
+    def fingerprint(self, step: Step) -> str:
+        document = {
+            "argv": step.argv,
+            "cwd": step.cwd,
+            "env": {name: os.environ.get(name) for name in sorted(step.env)},
+            "inputs": [[str(path), self.digest(path)] for path in self.step_inputs(step)],
+        }
+        return hashlib.sha256(json.dumps(document, sort_keys=True).encode()).hexdigest()
+
+    def output_digests(self, step: Step) -> dict[str, Optional[str]]:
+        cwd = Path(step.cwd)
+        return {
+            str(path): self.digest(path)
+            for pattern in step.outputs
+            for path in self.expand(pattern, cwd)
+        }
+
+
+class FingerprintStore:
+    """Last successful fingerprint per step plus the stat-keyed digest cache."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.steps: dict[str, dict] = {}
+        self.files: dict[str, list] = {}
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if data.get("version") == STORE_VERSION:
+            self.steps = data.get("steps", {})
+            self.files = data.get("files", {})
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(
+            json.dumps(
+                {"version": STORE_VERSION, "steps": self.steps, "files": self.files},
+                indent=1,
+                sort_keys=True,
+            ),
+            encoding="utf-8",
+        )
+        os.replace(tmp, self.path)
+
+
+# ---------------------------------------------------------------------------
+# Plans
+# ---------------------------------------------------------------------------
+
+def _step_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="add", add_help=False)
+    parser.add_argument("name")
+    parser.add_argument("--cwd", default=None)
+    parser.add_argument("--in", dest="inputs", action="append", default=[], metavar="PATH_OR_GLOB")
+    parser.add_argument("--out", dest="outputs", action="append", default=[], metavar="PATH_OR_GLOB")
+    parser.add_argument("--after", action="append", default=[], metavar="STEP")
+    parser.add_argument("--env", action="append", default=[], metavar="VAR",
+                        help="Environment variable that affects the step's result")
+    parser.add_argument("--allow-fail", action="store_true", help="Failure is reported but non-fatal")
+    parser.add_argument("--always", action="store_true", help="Never skip this step")
+    return parser
+
+
+def parse_step(args: list[str]) -> Step:
+    """Parse `NAME [options] -- CMD...` into a Step."""
+    if "--" not in args:
+        raise ValueError(f"step {' '.join(args[:1])}: missing command after --")
+    split = args.index("--")
+    command = args[split + 1:]
+    if not command:
+        raise ValueError(f"step {' '.join(args[:1])}: missing command after --")
+    try:
+        options = _step_parser().parse_args(args[:split])
+    except SystemExit:
+        raise ValueError(f"invalid step declaration: {' '.join(args)}") from None
+    return Step(
+        name=options.name,
+        argv=command,
+        cwd=options.cwd or os.getcwd(),
+        inputs=options.inputs,
+        outputs=options.outputs,
+        after=options.after,
+        env=options.env,
+        allow_fail=options.allow_fail,
+        always=options.always,
+    )
+
+
+def read_plan(path: Path) -> list[Step]:
+    """Steps from a plan of NUL-separated declarations, each ended by RS (0x1E).
+
+    build_rom.sh writes these directly (printf '%s\\0' ... $'\\036'), so
+    declaring a step costs no interpreter start-up.
+    """
+    steps: list[Step] = []
+    names: set[str] = set()
+    fields: list[str] = []
+    for field_value in path.read_bytes().decode("utf-8").split("\0"):
+        if field_value != PLAN_RECORD_END:
+            fields.append(field_value)
+            continue
+        step = parse_step(fields)
+        fields = []
+        if step.name in names:
+            raise ValueError(f"duplicate step name: {step.name}")
+        unknown = [name for name in step.after if name not in names]
+        if unknown:
+            raise ValueError(
+                f"step {step.name} depends on undeclared steps: {', '.join(unknown)}"
+            )
+        names.add(step.name)
+        steps.append(step)
+    if any(fields):
+        raise ValueError(f"plan {path} ends with an unterminated step declaration")
+    return steps
+
+
+def append_plan(path: Path, args: list[str]) -> None:
+    with path.open("ab") as handle:
+        for value in args + [PLAN_RECORD_END]:
+            handle.write(value.encode("utf-8") + b"\0")
+
+
+# ---------------------------------------------------------------------------
+# Execution
+# ---------------------------------------------------------------------------
+
+def _execute(step: Step) -> tuple[int, str]:
+    try:
+        proc = subprocess.run(
+            step.argv,
+            cwd=step.cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            errors="replace",
+        )
+    except OSError as exc:
+        return 127, f"{exc}\n"
+    return proc.returncode, proc.stdout
+
+
+def run_steps(
+    steps: list[Step],
+    index: FileIndex,
+    store: FingerprintStore,
+    jobs: int = 0,
+    force: bool = False,
+    report: Callable[[StepResult], None] = lambda result: None,
+    execute: Callable[[Step], tuple[int, str]] = _execute,
+) -> list[StepResult]:
+    """Run `steps` in dependency order, skipping unchanged ones."""
+    by_name = {step.name: step for step in steps}
+    pending = {step.name for step in steps}
+    done: dict[str, StepResult] = {}
+    running = {}
+    workers = jobs if jobs > 0 else max(1, os.cpu_count() or 1)
+
+    def attempt(step: Step) -> StepResult:
+        started = time.perf_counter()
+        fingerprint = index.fingerprint(step)
+        previous = store.steps.get(step.name)
+        if (
+            not force
+            and not step.always
+            and previous is not None
+            and previous.get("fingerprint") == fingerprint
+            and previous.get("outputs") == index.output_digests(step)
+        ):
+            return StepResult(step.name, "skipped", time.perf_counter() - started)
+        returncode, output = execute(step)
+        index.invalidate()
+        seconds = time.perf_counter() - started
+        if returncode != 0:
+            store.steps.pop(step.name, None)
+            return StepResult(step.name, "failed", seconds, returncode, output)
+        store.steps[step.name] = {
+            "fingerprint": fingerprint,
+            "outputs": index.output_digests(step),
+        }
+        return StepResult(step.name, "ran", seconds, 0, output)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while pending or running:
+            for name in sorted(pending):
+                step = by_name[name]
+                blockers = [
+                    dep for dep in step.after
+                    if dep in done and done[dep].status in ("failed", "blocked")
+                ]
+                if blockers:
+                    pending.discard(name)
+                    done[name] = StepResult(
+                        name, "blocked", output=f"blocked by {', '.join(blockers)}\n"
+                    )
+                    report(done[name])
+                elif all(dep in done or dep not in by_name for dep in step.after):
+                    pending.discard(name)
+                    running[pool.submit(attempt, step)] = name
+            if not running:
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                result = future.result()
+                del running[future]
+                done[result.name] = result
+                report(result)
+
+    return [done[step.name] for step in steps]
+
+
+def _print_result(steps: dict[str, Step]) -> Callable[[StepResult], None]:
+    def report(result: StepResult) -> None:
+        step = steps[result.name]
+        if result.status == "skipped":
+            print(f"[=] {result.name}: unchanged, skipped")
+        elif result.status == "ran":
+            print(f"[*] {result.name} ({result.seconds:.2f}s)")
+        elif result.status == "blocked":
+            print(f"[-] {result.name}: {result.output.strip()}", file=sys.stderr)
+        else:
+            label = "failed (non-fatal)" if step.allow_fail else "failed"
+            print(
+                f"[-] {result.name} {label}: exit {result.returncode} "
+                f"({result.seconds:.2f}s)",
+                file=sys.stderr,
+            )
+        if result.output and result.status != "blocked":
+            sys.stdout.write(result.output if result.output.endswith("\n") else result.output + "\n")
+        sys.stdout.flush()
+
+    return report
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    raw = list(sys.argv[1:] if argv is None else argv)
+    if raw[:1] == ["add"]:
+        # add --plan PLAN NAME [options] -- CMD...
+        if len(raw) < 3 or raw[1] != "--plan":
+            print("usage: build_steps.py add --plan PLAN NAME [options] -- CMD...", file=sys.stderr)
+            return 2
+        step_args = ["--cwd", os.getcwd()] + raw[3:]
+        try:
+            parse_step(step_args)
+        except ValueError as exc:
+            print(f"ERROR: {exc}", file=sys.stderr)
+            return 1
+        append_plan(Path(raw[2]), step_args)
+        return 0
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=["run"])
+    parser.add_argument("--plan", type=Path, required=True)
+    parser.add_argument("--root", type=Path, default=Path("."))
+    parser.add_argument("--store", type=Path, default=None,
+                        help=f"Fingerprint store (default: <root>/{DEFAULT_STORE})")
+    parser.add_argument("--jobs", type=int, default=0, help="Parallel steps (0 = CPU count)")
+    parser.add_argument("--force", action="store_true", help="Ignore fingerprints and run every step")
+    args = parser.parse_args(raw)
+
+    root = args.root.resolve()
+    try:
+        steps = read_plan(args.plan)
+    except ValueError as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 1
+    store = FingerprintStore(args.store or root / DEFAULT_STORE)
+    index = FileIndex(root, store.files)
+    force = args.force or os.environ.get("OOS_FORCE_STEPS", "0") == "1"
+    started = time.perf_counter()
+    results = run_steps(
+        steps,
+        index,
+        store,
+        jobs=args.jobs,
+        force=force,
+        report=_print_result({step.name: step for step in steps}),
+    )
+    store.files = index.digests
+    store.save()
+
+    allowed = {step.name for step in steps if step.allow_fail}
+    fatal = [
+        result.name
+        for result in results
+        if result.status in ("failed", "blocked") and result.name not in allowed
+    ]
+    counts = {status: sum(r.status == status for r in results) for status in ("ran", "skipped")}
+    print(
+        f"[*] build steps: {counts['ran']} ran, {counts['skipped']} unchanged "
+        f"({time.perf_counter() - started:.2f}s)"
+    )
+    if fatal:
+        print(f"[-] build steps failed: {', '.join(fatal)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
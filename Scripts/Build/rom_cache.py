@@ -0,0 +1,423 @@
+#!/usr/bin/env python3
+"""Content-addressed cache of assembled ROMs for build_rom.sh.
+
+Bisects (bisect_blackout_flags.py, bisect_softlock.py) and module-isolation
+sweeps (build_isolation_roms.sh, run_module_isolation_auto.py) rebuild the
+same source tree and flag profile over and over. build_rom.sh asks this
+cache before running the assembler:
+
+    key="$(rom_cache.py key --root "$repo_root" --base-rom "$base_rom" --asm "$asar_bin")"
+    rom_cache.py fetch --key "$key" rom="$patched_rom" symbols="$symbols_path" \\
+      --optional hooks="$hooks_json"          # exit 0 on a hit
+    ...assemble...
+    rom_cache.py store --key "$key" rom="$patched_rom" symbols="$symbols_path"
+
+The key hashes every source reachable from Oracle_main.asm through literal
+`incsrc`/`incbin` (which covers Config/feature_flags.asm and
+Config/module_flags.asm), the feature/module flag profile, the base ROM,
+the assembler binary, whether symbols were requested and the generator
+scripts (Scripts/Generate/*.py, the same inputs build_rom.sh gives the
+hooks_json step, whose output a hit restores). An include that
+cannot be resolved to a file makes the build uncacheable rather than
+risking a stale hit.
+
+Entries live in <main checkout>/.cache/rom_builds/<key>/ so git worktrees
+(bisect slots, sandboxes) share one cache. Each entry holds the named
+artifacts plus meta.json; a hit refreshes the entry's mtime, and `store`
+prunes least-recently-used entries beyond OOS_ROM_CACHE_MB (default 2048).
+OOS_ROM_CACHE_DIR overrides the location.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Iterable, Optional
+
+from build_steps import DEFAULT_STORE, FileIndex, FingerprintStore
+
+
+CACHE_VERSION = 1
+GENERATOR_GLOB = "Scripts/Generate/*.py"
+ENTRY_POINT = Path("Oracle_main.asm")
+FLAG_FILES = (Path("Config/feature_flags.asm"), Path("Config/module_flags.asm"))
+DEFAULT_BUDGET_MB = 2048
+DIGESTS_NAME = "digests.json"
+META_NAME = "meta.json"
+
+# Literal Asar include, optionally after a label (`menu_frame: incbin ...`).
+# Comments are stripped before matching; `incbin file:start-end` ranges and
+# `-> target` suffixes are not part of the path.
+INCLUDE_RE = re.compile(
+    r"^\s*(?:[A-Za-z_.][\w.]*:\s*)?(incsrc|incbin)\s+"
+    r"(?:\"([^\"]+)\"|'([^']+)'|([^\s;]+))",
+    re.IGNORECASE,
+)
+FLAG_RE = re.compile(r"^\s*!((?:ENABLE|DISABLE)_\w+)\s*=\s*(\S+)")
+
+
+class UncacheableBuild(RuntimeError):
+    """Raised when the source graph cannot be hashed safely."""
+
+
+def _parse_include(line: str) -> Optional[tuple[str, str]]:
+    match = INCLUDE_RE.match(line.split(";", 1)[0])
+    if not match:
+        return None
+    kind = match.group(1).lower()
+    text = next(value for value in match.groups()[1:] if value is not None)
+    if kind == "incbin" and match.group(4) is not None:
+        text = text.split(":", 1)[0]
+    return kind, text
+
+
+def reachable_sources(root: Path, entry: Path = ENTRY_POINT) -> list[Path]:
+    """Every file reachable from `entry` through literal incsrc/incbin.
+
+    Conditional blocks are not evaluated: both arms are followed, so the set
+    is a superset of what the assembler reads. Paths resolve against the
+    including file's directory first, then the repository root.
+    """
+    root = root.resolve()
+    pending = [(root / entry).resolve()]
+    if not pending[0].is_file():
+        raise UncacheableBuild(f"entry point not found: {pending[0]}")
+    seen: set[Path] = set()
+    while pending:
+        path = pending.pop()
+        if path in seen:
+            continue
+        seen.add(path)
+        if path.suffix.lower() != ".asm":
+            continue
+        try:
+            lines = path.read_text(encoding="utf-8", errors="replace").splitlines()
+        except OSError as exc:
+            raise UncacheableBuild(f"unable to read {path}: {exc}") from exc
+        for line_number, line in enumerate(lines, 1):
+            include = _parse_include(line)
+            if include is None:
+                continue
+            kind, text = include
+            candidates = (path.parent / text, root / text)
+            found = next((c.resolve() for c in candidates if c.is_file()), None)
+            rel = path.relative_to(root)
+            if found is None:
+                raise UncacheableBuild(f"{rel}:{line_number}: unresolved {kind} {text!r}")
+            if not found.is_relative_to(root):
+                raise UncacheableBuild(f"{rel}:{line_number}: {kind} escapes repo root: {text!r}")
+            pending.append(found)
+    return sorted(seen)
+
+
+def flag_profile(root: Path) -> dict[str, str]:
+    """`!ENABLE_*` / `!DISABLE_*` assignments from the canonical flag files."""
+    profile: dict[str, str] = {}
+    for rel in FLAG_FILES:
+        try:
+            text = (root / rel).read_text(encoding="utf-8")
+        except OSError:
+            continue
+        for line in text.splitlines():
+            match = FLAG_RE.match(line.split(";", 1)[0])
+            if match:
+                profile[match.group(1)] = match.group(2)
+    return profile
+
+
+def assembler_identity(asm: str) -> list:
+    resolved = shutil.which(asm) or asm
+    try:
+        stat = Path(resolved).stat()
+    except OSError:
+        return [asm]
+    return [os.path.basename(asm), str(Path(resolved).resolve()), stat.st_size, stat.st_mtime_ns]
+
+
+def default_cache_dir(root: Path) -> Path:
+    """.cache/rom_builds in the main checkout, shared by its worktrees."""
+    override = os.environ.get("OOS_ROM_CACHE_DIR")
+    if override:
+        return Path(override)
+    try:
+        common = subprocess.run(
+            ["git", "-C", str(root), "rev-parse", "--path-format=absolute", "--git-common-dir"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        common = ""
+    base = Path(common).parent if common else root
+    return base / ".cache" / "rom_builds"
+
+
+class RomCache:
+    """Build key computation and the on-disk entry store."""
+
+    def __init__(self, cache_dir: Path, budget_mb: int = DEFAULT_BUDGET_MB) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.budget = budget_mb * 1024 * 1024
+
+    # -- keys ---------------------------------------------------------------
+
+    def _file_index(self, root: Path) -> FileIndex:
+        try:
+            digests = json.loads((self.cache_dir / DIGESTS_NAME).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            digests = {}
+        return FileIndex(root, digests)
+
+    def _save_digests(self, index: FileIndex) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.cache_dir / DIGESTS_NAME
+        temp = path.with_suffix(f".{os.getpid()}.tmp")
+        temp.write_text(json.dumps(index.digests, sort_keys=True), encoding="utf-8")
+        os.replace(temp, path)
+
+    def key_document(self, root: Path, base_rom: Path, asm: str, symbols: bool = True) -> dict:
+        root = root.resolve()
+        index = self._file_index(root)
+        document = {
+            "version": CACHE_VERSION,
+            "assembler": assembler_identity(asm),
+            "symbols": symbols,
+            "base_rom": index.digest(Path(base_rom).resolve()),
+            "flags": flag_profile(root),
+            "sources": [
+                [path.relative_to(root).as_posix(), index.digest(path)]
+                for path in reachable_sources(root)
+            ],
+            "generators": [
+                [path.relative_to(root).as_posix(), index.digest(path)]
+                for path in sorted(root.glob(GENERATOR_GLOB))
+            ],
+        }
+        if document["base_rom"] is None:
+            raise UncacheableBuild(f"base ROM not found: {base_rom}")
+        self._save_digests(index)
+        return document
+
+    def key(self, root: Path, base_rom: Path, asm: str, symbols: bool = True) -> str:
+        document = self.key_document(root, base_rom, asm, symbols)
+        return hashlib.sha256(json.dumps(document, sort_keys=True).encode()).hexdigest()
+
+    # -- entries ------------------------------------------------------------
+
+    def entry(self, key: str) -> Path:
+        return self.cache_dir / key
+
+    def fetch(
+        self,
+        key: str,
+        artifacts: dict[str, Path],
+        optional: Optional[dict[str, Path]] = None,
+    ) -> Optional[list[str]]:
+        """Copy a hit's artifacts into place; None (nothing copied) on a miss."""
+        entry = self.entry(key)
+        optional = optional or {}
+        if not all((entry / name).is_file() for name in artifacts):
+            return None
+        restored = []
+        try:
+            for name, dest in {**artifacts, **optional}.items():
+                source = entry / name
+                if not source.is_file():
+                    continue
+                temp = dest.with_name(f".{dest.name}.{os.getpid()}.tmp")
+                shutil.copyfile(source, temp)
+                os.replace(temp, dest)
+                restored.append(name)
+            os.utime(entry)
+        except OSError:
+            # Pruned underneath us by a concurrent build: treat as a miss.
+            return None
+        return restored
+
+    def store(self, key: str, artifacts: dict[str, Path], meta: Optional[dict] = None) -> Path:
+        """Add (or extend) the entry for `key`, then prune to the budget."""
+        entry = self.entry(key)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        if not entry.is_dir():
+            staging = self.cache_dir / f".{key}.{os.getpid()}.tmp"
+            staging.mkdir(parents=True, exist_ok=True)
+            try:
+                os.replace(staging, entry)
+            except OSError:
+                # Another build stored the same key first; extend theirs.
+                shutil.rmtree(staging, ignore_errors=True)
+        for name, source in artifacts.items():
+            temp = entry / f".{name}.{os.getpid()}.tmp"
+            shutil.copyfile(source, temp)
+            os.replace(temp, entry / name)
+        record = self.meta(key)
+        record.update(meta or {})
+        record["artifacts"] = sorted(
+            p.name for p in entry.iterdir() if p.name != META_NAME and not p.name.startswith(".")
+        )
+        record.setdefault("created", time.time())
+        temp = entry / f".{META_NAME}.{os.getpid()}.tmp"
+        temp.write_text(json.dumps(record, indent=1, sort_keys=True), encoding="utf-8")
+        os.replace(temp, entry / META_NAME)
+        os.utime(entry)
+        self.prune(keep=key)
+        return entry
+
+    def meta(self, key: str) -> dict:
+        try:
+            return json.loads((self.entry(key) / META_NAME).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def entries(self) -> list[tuple[float, int, Path]]:
+        """(last use, bytes, path) per entry, least recently used first."""
+        found = []
+        try:
+            children = list(self.cache_dir.iterdir())
+        except OSError:
+            return []
+        for path in children:
+            if not path.is_dir() or path.name.startswith("."):
+                continue
+            try:
+                size = sum(f.stat().st_size for f in path.iterdir() if f.is_file())
+                found.append((path.stat().st_mtime, size, path))
+            except OSError:
+                continue
+        return sorted(found)
+
+    def prune(self, budget: Optional[int] = None, keep: Optional[str] = None) -> list[Path]:
+        budget = self.budget if budget is None else budget
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = []
+        for _, size, path in entries:
+            if total <= budget:
+                break
+            if path.name == keep:
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            removed.append(path)
+        return removed
+
+
+def step_vouches(root: Path, step: str, path: Path) -> bool:
+    """Whether build_steps' record says `step` last produced `path` as it is now."""
+    record = FingerprintStore(root / DEFAULT_STORE).steps.get(step)
+    if not record:
+        return False
+    outputs = record.get("outputs", {})
+    recorded = outputs.get(str(path), outputs.get(str(path.resolve())))
+    return recorded is not None and recorded == FileIndex(root).digest(path)
+
+
+def _artifact_args(values: Iterable[str]) -> dict[str, Path]:
+    artifacts = {}
+    for value in values:
+        name, sep, path = value.partition("=")
+        if not sep or not name or not path or "/" in name:
+            raise argparse.ArgumentTypeError(f"expected NAME=PATH, got {value!r}")
+        artifacts[name] = Path(path)
+    return artifacts
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cache-dir", type=Path, default=None,
+                        help="Cache location (default: OOS_ROM_CACHE_DIR or <main checkout>/.cache/rom_builds)")
+    parser.add_argument("--root", type=Path, default=Path("."))
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    key_parser = sub.add_parser("key", help="Print the cache key for the current tree")
+    key_parser.add_argument("--base-rom", type=Path, required=True)
+    key_parser.add_argument("--asm", default="asar", help="Assembler binary")
+    key_parser.add_argument("--no-symbols", action="store_true")
+    key_parser.add_argument("--explain", action="store_true", help="Print the key document as JSON")
+
+    for name, help_text in (("fetch", "Restore artifacts on a hit (exit 1 on a miss)"),
+                            ("store", "Store artifacts under a key")):
+        command = sub.add_parser(name, help=help_text)
+        command.add_argument("--key", required=True)
+        command.add_argument("artifacts", nargs="*", metavar="NAME=PATH")
+        command.add_argument("--optional", action="append", default=[], metavar="NAME=PATH")
+    sub.choices["store"].add_argument(
+        "--optional-step", default=None, metavar="STEP",
+        help="Store optional artifacts only if this build step's last success produced them",
+    )
+
+    sub.add_parser("list", help="List entries, most recently used first")
+    prune_parser = sub.add_parser("prune", help="Evict least-recently-used entries")
+    prune_parser.add_argument("--max-mb", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    root = args.root.resolve()
+    budget = int(os.environ.get("OOS_ROM_CACHE_MB", DEFAULT_BUDGET_MB))
+    cache = RomCache(args.cache_dir or default_cache_dir(root), budget)
+
+    if args.command == "key":
+        try:
+            document = cache.key_document(root, args.base_rom, args.asm, not args.no_symbols)
+        except UncacheableBuild as exc:
+            print(f"[-] ROM cache disabled for this build: {exc}", file=sys.stderr)
+            return 1
+        if args.explain:
+            print(json.dumps(document, indent=1, sort_keys=True))
+        else:
+            print(hashlib.sha256(json.dumps(document, sort_keys=True).encode()).hexdigest())
+        return 0
+
+    if args.command in ("fetch", "store"):
+        try:
+            artifacts = _artifact_args(args.artifacts)
+            optional = _artifact_args(args.optional)
+        except argparse.ArgumentTypeError as exc:
+            parser.error(str(exc))
+        if args.command == "fetch":
+            restored = cache.fetch(args.key, artifacts, optional)
+            if restored is None:
+                return 1
+            print(" ".join(restored))
+            return 0
+        for name, path in optional.items():
+            if not path.is_file():
+                continue
+            if args.optional_step and not step_vouches(root, args.optional_step, path):
+                continue
+            artifacts[name] = path
+        missing = [str(path) for path in artifacts.values() if not path.is_file()]
+        if missing:
+            print(f"ERROR: missing artifacts: {', '.join(missing)}", file=sys.stderr)
+            return 1
+        if not artifacts:
+            return 0
+        cache.store(args.key, artifacts, {"flags": flag_profile(root)})
+        return 0
+
+    if args.command == "prune":
+        budget_bytes = None if args.max_mb is None else args.max_mb * 1024 * 1024
+        for path in cache.prune(budget_bytes):
+            print(f"[*] evicted {path.name}")
+        return 0
+
+    for mtime, size, path in reversed(cache.entries()):
+        meta = cache.meta(path.name)
+        flags = ",".join(
+            f"{name}={value}" for name, value in sorted(meta.get("flags", {}).items())
+            if value not in ("0",)
+        )
+        stamp = time.strftime("%Y-%m-%d %H:%M", time.localtime(mtime))
+        print(f"{path.name[:16]}  {stamp}  {size / 1048576:6.1f} MB  {flags}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
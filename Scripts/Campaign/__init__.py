@@ -8,9 +8,13 @@ and debugging.
 Modules:
 - emulator_abstraction: Unified interface for Mesen2
 - game_state: State parsing and awareness
+- state_buffer: Columnar ring buffer of snapshots for windowed queries
 - pathfinder: Collision-aware navigation
 - action_planner: Goal-oriented action planning
 - input_recorder: Record and playback input sequences
+- input_movie: Compact binary input movies (RLE joypad masks)
+- movie_checkpoints: Savestate checkpoints for fast-seeking movies
+- parallel_runner: Run campaign jobs across registry Mesen2 instances
 - visual_verifier: Screenshot comparison and verification
 
 Usage:
@@ -71,6 +75,12 @@ from .input_recorder import (
     create_menu_open_sequence,
     create_attack_sequence,
 )
+from .state_buffer import SnapshotBuffer
+from .input_movie import (
+    InputMovie,
+    MovieFormatError,
+)
+from .movie_checkpoints import CheckpointStore
 from .action_planner import (
     GoalType,
     PlanStatus,
@@ -91,6 +101,14 @@ from .campaign_orchestrator import (
     create_campaign,
     quick_status,
 )
+from .parallel_runner import (
+    RunnerJob,
+    InstanceInfo,
+    JobOutcome,
+    RunReport,
+    ParallelCampaignRunner,
+    discover_instances,
+)
 from .verification import (
     VerificationLevel,
     MemoryCheck,
@@ -146,6 +164,7 @@ __all__ = [
     "ParsedGameState",
     "get_parser",
     "parse_state",
+    "SnapshotBuffer",
     # Location data
     "DUNGEONS",
     "ENTRANCE_NAMES",
@@ -174,6 +193,9 @@ __all__ = [
     "create_walk_sequence",
     "create_menu_open_sequence",
     "create_attack_sequence",
+    "InputMovie",
+    "MovieFormatError",
+    "CheckpointStore",
     # Action planning
     "GoalType",
     "PlanStatus",
@@ -192,6 +214,13 @@ __all__ = [
     "CampaignOrchestrator",
     "create_campaign",
     "quick_status",
+    # Parallel runs
+    "RunnerJob",
+    "InstanceInfo",
+    "JobOutcome",
+    "RunReport",
+    "ParallelCampaignRunner",
+    "discover_instances",
     # Visual verification
     "VerificationResult",
     "Screenshot",
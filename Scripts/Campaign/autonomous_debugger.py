@@ -30,7 +30,6 @@ import signal
 import sys
 import tempfile
 import time
-from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
@@ -52,6 +51,7 @@ if __name__ == "__main__" and __package__ is None:
 
 from .emulator_abstraction import GameStateSnapshot, Mesen2Emulator
 from .game_state import GameStateParser
+from .state_buffer import SnapshotBuffer
 
 logger = logging.getLogger(__name__)
 
@@ -98,8 +98,11 @@ class SoftLockDetector:
         stagnation_threshold: int = 120,
         black_screen_threshold: int = 30,
         mode_stuck_threshold: int = 300,
+        history_size: int = 600,
     ):
-        self.history: deque[GameStateSnapshot] = deque(maxlen=600)
+        self.history = SnapshotBuffer(
+            max(history_size, stagnation_threshold, black_screen_threshold, mode_stuck_threshold)
+        )
         self.stagnation_threshold = stagnation_threshold
         self.black_screen_threshold = black_screen_threshold
         self.mode_stuck_threshold = mode_stuck_threshold
@@ -121,90 +124,91 @@ class SoftLockDetector:
 
     def _check_position_stagnation(self) -> Optional[Anomaly]:
         """Link's (X,Y) unchanged for N samples while Link is in a movement state."""
-        if len(self.history) < self.stagnation_threshold:
+        n = self.stagnation_threshold
+        if not self.history.is_full_window(n):
             return None
 
-        recent = list(self.history)[-self.stagnation_threshold:]
-
         # Only flag if game is in playable state the entire window
-        if not all(s.is_playing for s in recent):
+        if not self.history.all_in("mode", (0x07, 0x09), last=n):
             return None
 
         # Reduce false positives during normal idle (standing still).
         # Require Link to be in a movement-like state for the full window.
-        moving_states = {0x01, 0x02, 0x03}  # walking/swimming/diving
-        if not all(s.link_state in moving_states for s in recent):
+        moving_states = (0x01, 0x02, 0x03)  # walking/swimming/diving
+        if not self.history.all_in("link_state", moving_states, last=n):
             return None
 
-        ref_pos = recent[0].position
-        if all(s.position == ref_pos for s in recent):
+        if self.history.is_constant("x", last=n) and self.history.is_constant("y", last=n):
+            latest = self.history.latest()
+            ref_pos = (latest["x"], latest["y"])
             return Anomaly(
                 type="stagnation",
                 severity="warning",
                 description=(
                     f"Link position unchanged at ({ref_pos[0]}, {ref_pos[1]}) "
-                    f"for {self.stagnation_threshold} samples while moving "
-                    f"(link_state=0x{recent[-1].link_state:02X})"
+                    f"for {n} samples while moving "
+                    f"(link_state=0x{latest['link_state']:02X})"
                 ),
-                frame_count=self.stagnation_threshold,
+                frame_count=n,
                 timestamp=time.time(),
                 context={
                     "position": ref_pos,
-                    "mode": recent[-1].mode,
-                    "link_state": recent[-1].link_state,
+                    "mode": latest["mode"],
+                    "link_state": latest["link_state"],
                 },
             )
         return None
 
     def _check_black_screen(self) -> Optional[Anomaly]:
         """INIDISP == 0x80 and mode in (0x06, 0x07) for N consecutive samples."""
-        if len(self.history) < self.black_screen_threshold:
+        n = self.black_screen_threshold
+        if not self.history.is_full_window(n):
             return None
 
-        recent = list(self.history)[-self.black_screen_threshold:]
-
-        if all(s.is_black_screen for s in recent):
+        if 0 not in self.history.black_screen_mask(last=n):
+            latest = self.history.latest()
             return Anomaly(
                 type="black_screen",
                 severity="critical",
                 description=(
-                    f"Black screen (INIDISP=0x80, mode=0x{recent[-1].mode:02X}) "
-                    f"persisted for {self.black_screen_threshold} samples"
+                    f"Black screen (INIDISP=0x80, mode=0x{latest['mode']:02X}) "
+                    f"persisted for {n} samples"
                 ),
-                frame_count=self.black_screen_threshold,
+                frame_count=n,
                 timestamp=time.time(),
                 context={
-                    "inidisp": recent[-1].inidisp,
-                    "mode": recent[-1].mode,
-                    "submode": recent[-1].submode,
+                    "inidisp": latest["inidisp"],
+                    "mode": latest["mode"],
+                    "submode": latest["submode"],
                 },
             )
         return None
 
     def _check_mode_stuck(self) -> Optional[Anomaly]:
         """GameMode byte unchanged for N samples (catches hung transitions)."""
-        if len(self.history) < self.mode_stuck_threshold:
+        n = self.mode_stuck_threshold
+        if not self.history.is_full_window(n):
             return None
 
-        recent = list(self.history)[-self.mode_stuck_threshold:]
-        ref_mode = recent[0].mode
+        latest = self.history.latest()
+        ref_mode = latest["mode"]
 
         # Mode 0x07 (dungeon) and 0x09 (overworld) are normal to be stuck in
         # during regular gameplay — only flag non-playable modes
         if ref_mode in (0x07, 0x09):
             return None
 
-        if all(s.mode == ref_mode for s in recent):
+        if self.history.is_constant("mode", last=n):
             return Anomaly(
                 type="mode_stuck",
                 severity="error",
                 description=(
                     f"GameMode stuck at 0x{ref_mode:02X} "
-                    f"for {self.mode_stuck_threshold} samples"
+                    f"for {n} samples"
                 ),
-                frame_count=self.mode_stuck_threshold,
+                frame_count=n,
                 timestamp=time.time(),
-                context={"mode": ref_mode, "submode": recent[-1].submode},
+                context={"mode": ref_mode, "submode": latest["submode"]},
             )
         return None
 
@@ -37,6 +37,7 @@ from .locations import (
     get_entrance_name,
     get_room_name,
 )
+from .stream_navigator import StreamNavigator
 
 
 class BuildingType(Enum):
@@ -258,7 +259,8 @@ class BuildingNavigator:
         target_x: int,
         target_y: int,
         tolerance: int = 32,
-        max_frames: int = 300
+        max_frames: int = 300,
+        streamed: bool = False
     ) -> bool:
         """Walk Link toward a target position.
 
@@ -267,10 +269,20 @@ class BuildingNavigator:
             target_y: Target Y coordinate
             tolerance: Distance considered "arrived"
             max_frames: Maximum frames to attempt
+            streamed: Use closed-loop streamed input (StreamNavigator)
+                instead of 15-frame chunks
 
         Returns:
             True if reached target, False if timeout/stuck
         """
+        if streamed:
+            streamer = StreamNavigator(
+                self.bridge,
+                timeout_frames=max_frames,
+                arrival_threshold=tolerance,
+            )
+            return streamer.navigate_to(target_x, target_y).success
+
         frames_elapsed = 0
         last_position = (0, 0)
         stuck_count = 0
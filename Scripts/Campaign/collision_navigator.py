@@ -53,6 +53,8 @@ import time
 import math
 import os
 
+from .stream_navigator import StreamNavigator
+
 
 class TileType(IntEnum):
     """Collision tile types from ALTTP/Oracle."""
@@ -869,14 +871,55 @@ class CollisionNavigator:
             self.bridge.run_frames(frames)
         time.sleep(frames / 60.0 * 0.3)  # Brief pause
 
+    def execute_path(self, path: List[Tuple[int, int]], state: NavState) -> Tuple[NavState, int]:
+        """Stream a whole tile path as frame-accurate holds.
+
+        Unlike execute_move(), the path is sent as one schedule and Link's
+        position is probed between holds; the streamer re-plans only when
+        Link leaves the expected track.
+
+        Args:
+            path: Screen-relative tile coordinates (as returned by find_path)
+            state: State the path was planned from
+
+        Returns:
+            (state after execution, frames consumed)
+        """
+        base_x = state.link_x - (state.link_x % 512)
+        base_y = state.link_y - (state.link_y % 512)
+        waypoints = [
+            (base_x + tx * 8 + 4, base_y + ty * 8 + 4)
+            for tx, ty in self._path_corners(path)
+        ]
+        streamer = StreamNavigator(self.bridge, timeout_frames=self.timeout_frames)
+        result = streamer.follow_path(waypoints)
+        return self.capture_state(state.frame + result.frames_elapsed), result.frames_elapsed
+
+    @staticmethod
+    def _path_corners(path: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """Reduce a tile path to the tiles where direction changes."""
+        if len(path) < 2:
+            return list(path)
+        corners = []
+        for i in range(1, len(path) - 1):
+            d_in = (path[i][0] - path[i - 1][0], path[i][1] - path[i - 1][1])
+            d_out = (path[i + 1][0] - path[i][0], path[i + 1][1] - path[i][1])
+            if d_in != d_out:
+                corners.append(path[i])
+        corners.append(path[-1])
+        return corners
+
     def navigate_to(self, target_x: int, target_y: int,
-                    use_pathfinding: bool = True) -> NavAttempt:
+                    use_pathfinding: bool = True,
+                    streamed: bool = False) -> NavAttempt:
         """Navigate to target coordinates with obstacle avoidance.
 
         Args:
             target_x: Target X pixel coordinate
             target_y: Target Y pixel coordinate
             use_pathfinding: If True, use A* when stuck; otherwise greedy only
+            streamed: Execute A* paths in full via execute_path() instead of
+                the first three direction chunks
 
         Returns:
             NavAttempt with result and path information
@@ -953,6 +996,11 @@ class CollisionNavigator:
                     goal_tile = ((target_x % 512) // 8, (target_y % 512) // 8)
 
                     path = self.find_path(start_tile, goal_tile, cmap)
+                    if path and len(path) > 1 and streamed:
+                        _, used = self.execute_path(path, state)
+                        frames_elapsed += max(1, used)
+                        stuck_count = 0
+                        continue
                     if path and len(path) > 1:
                         # Execute first few moves of the path
                         directions = self.path_to_directions(path[:10])
@@ -20,10 +20,13 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from enum import IntEnum, auto
-from typing import Any, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 from .emulator_abstraction import GameStateSnapshot
 
+if TYPE_CHECKING:
+    from .state_buffer import SnapshotBuffer
+
 
 class GamePhase(IntEnum):
     """High-level game phase."""
@@ -359,6 +362,56 @@ class GameStateParser:
 
         return changes
 
+    def classify_phases(
+        self,
+        buffer: 'SnapshotBuffer',
+        last: Optional[int] = None,
+        seconds: Optional[float] = None,
+    ) -> List[GamePhase]:
+        """Phase of every sample in a SnapshotBuffer window (oldest first)."""
+        return [GamePhase(code) for code in buffer.phases(last, seconds)]
+
+    def detect_changes(
+        self,
+        buffer: 'SnapshotBuffer',
+        last: Optional[int] = None,
+        seconds: Optional[float] = None,
+    ) -> List[Tuple[float, str]]:
+        """Window form of detect_change over a SnapshotBuffer.
+
+        Compares each sample with the previous one using whole-column
+        operations and reports the same change descriptions.
+
+        Args:
+            buffer: Columnar snapshot history
+            last: Most recent N samples
+            seconds: Samples within this many seconds of the newest
+
+        Returns:
+            (timestamp, description) pairs in chronological order
+        """
+        ts = buffer.timestamps(last, seconds)
+        found: List[Tuple[int, int, str]] = []
+
+        for order, (values, fmt) in enumerate((
+            (buffer.phases(last, seconds), lambda a, b: f"Phase: {GamePhase(a).name} -> {GamePhase(b).name}"),
+            (buffer.column("area", last, seconds), lambda a, b: f"Area: 0x{a:02X} -> 0x{b:02X}"),
+            (buffer.column("room", last, seconds), lambda a, b: f"Room: 0x{a:02X} -> 0x{b:02X}"),
+            (buffer.actions(last, seconds), lambda a, b: f"Action: {LinkAction(a).name} -> {LinkAction(b).name}"),
+            (buffer.black_screen_mask(last, seconds),
+             lambda a, b: "BLACK SCREEN DETECTED" if b else "Black screen cleared"),
+        )):
+            for i, old, new in buffer.index_transitions(values):
+                found.append((i, order, fmt(old, new)))
+
+        xs = buffer.column("x", last, seconds)
+        ys = buffer.column("y", last, seconds)
+        for i in buffer.position_jumps(16, last, seconds):
+            found.append((i, 5, f"Position: ({xs[i - 1]},{ys[i - 1]}) -> ({xs[i]},{ys[i]})"))
+
+        found.sort()
+        return [(ts[i], text) for i, _, text in found]
+
 
 # Singleton parser for convenience
 _default_parser: Optional[GameStateParser] = None
@@ -0,0 +1,241 @@
+"""Compact binary input movies for Oracle of Secrets.
+
+``InputSequence`` stores every input as a JSON dict, which is fine for
+hand-written sequences but wasteful for long recorded routes. An
+``InputMovie`` stores one 16-bit SNES joypad mask per frame, run-length
+encoded, behind a small header that pins the movie to a ROM (SHA1) and a
+start savestate - the same shape as established emulator movie formats.
+
+File layout (little-endian):
+
+    header  "<4sHHI20sHHI"
+            magic b"OOSM", version, flags, frame_count,
+            rom_sha1 (20 raw bytes, zero if unknown),
+            len(start_state), len(name), len(metadata json)
+    strings start_state, name, metadata (UTF-8)
+    runs    u32 run_count, then run_count x "<HI" (mask, length)
+
+Campaign Goals Supported:
+- D.4: Input sequence recorder and playback
+
+Usage:
+    from scripts.campaign.input_movie import InputMovie
+
+    movie = InputMovie.from_sequence(seq, rom_sha1=sha1, start_state="baseline_1")
+    movie.save("route.oosm")
+
+    movie = InputMovie.load("route.oosm")
+    InputPlayer(emulator).stream(movie)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import struct
+from array import array
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+from .input_recorder import Button, InputFrame, InputSequence
+
+
+MOVIE_MAGIC = b"OOSM"
+MOVIE_VERSION = 1
+MOVIE_SUFFIX = ".oosm"
+
+_HEADER = struct.Struct("<4sHHI20sHHI")
+_RUN = struct.Struct("<HI")
+_COUNT = struct.Struct("<I")
+
+
+class MovieFormatError(ValueError):
+    """Raised when a movie file is malformed or unsupported."""
+
+
+def _rle(masks: array) -> List[Tuple[int, int]]:
+    runs: List[Tuple[int, int]] = []
+    for mask in masks:
+        if runs and runs[-1][0] == mask:
+            runs[-1] = (mask, runs[-1][1] + 1)
+        else:
+            runs.append((mask, 1))
+    return runs
+
+
+@dataclass
+class InputMovie:
+    """Run-length encoded per-frame joypad masks plus a pinning header."""
+    name: str
+    runs: List[Tuple[int, int]] = field(default_factory=list)  # (mask, length)
+    rom_sha1: str = ""
+    start_state: str = ""
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def frame_count(self) -> int:
+        """Total frames covered by the movie."""
+        return sum(length for _, length in self.runs)
+
+    @property
+    def duration_seconds(self) -> float:
+        """Approximate duration at 60fps."""
+        return self.frame_count / 60.0
+
+    @property
+    def movie_hash(self) -> str:
+        """Content hash of the input runs and pinning header fields."""
+        digest = hashlib.sha1()
+        digest.update(self.rom_sha1.encode())
+        digest.update(b"\0")
+        digest.update(self.start_state.encode())
+        digest.update(b"\0")
+        for mask, length in self.runs:
+            digest.update(_RUN.pack(mask, length))
+        return digest.hexdigest()
+
+    # ------------------------------------------------------------------
+    # Conversion
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_masks(cls, name: str, masks: array | List[int], **kwargs: Any) -> 'InputMovie':
+        """Build a movie from one mask per frame."""
+        if not isinstance(masks, array):
+            masks = array("H", masks)
+        return cls(name=name, runs=_rle(masks), **kwargs)
+
+    @classmethod
+    def from_sequence(
+        cls,
+        sequence: InputSequence,
+        rom_sha1: str = "",
+        start_state: str = "",
+    ) -> 'InputMovie':
+        """Flatten an InputSequence to per-frame masks.
+
+        Overlapping holds are OR-ed together; gaps become empty masks.
+        """
+        masks = array("H", bytes(2 * sequence.total_frames))
+        for frame in sequence.frames:
+            mask = int(frame.buttons) & 0xFFFF
+            for i in range(frame.frame_number, frame.frame_number + frame.hold_frames):
+                masks[i] |= mask
+        return cls.from_masks(
+            sequence.name,
+            masks,
+            rom_sha1=rom_sha1,
+            start_state=start_state,
+            metadata={"description": sequence.description, **sequence.metadata},
+        )
+
+    def to_sequence(self) -> InputSequence:
+        """Expand back to an InputSequence (one InputFrame per non-empty run)."""
+        metadata = dict(self.metadata)
+        description = metadata.pop("description", "")
+        frames: List[InputFrame] = []
+        for frame, mask, length in self.iter_spans():
+            if mask:
+                frames.append(InputFrame(frame, Button(mask), length))
+        # Keep trailing idle frames so total_frames round-trips.
+        tail = frames[-1].frame_number + frames[-1].hold_frames if frames else 0
+        if tail < self.frame_count:
+            frames.append(InputFrame(tail, Button.NONE, self.frame_count - tail))
+        return InputSequence(self.name, description, frames, metadata)
+
+    def masks(self) -> array:
+        """Expand runs into one uint16 mask per frame."""
+        out = array("H")
+        for mask, length in self.runs:
+            out.extend(array("H", [mask]) * length)
+        return out
+
+    def iter_spans(self, start_frame: int = 0) -> Iterator[Tuple[int, int, int]]:
+        """Yield (frame, mask, length) spans, clipped to start at start_frame."""
+        frame = 0
+        for mask, length in self.runs:
+            end = frame + length
+            if end > start_frame:
+                begin = max(frame, start_frame)
+                yield begin, mask, end - begin
+            frame = end
+
+    # ------------------------------------------------------------------
+    # Serialization
+    # ------------------------------------------------------------------
+
+    def to_bytes(self) -> bytes:
+        """Encode the movie to its binary representation."""
+        try:
+            sha = bytes.fromhex(self.rom_sha1) if self.rom_sha1 else b""
+        except ValueError as exc:
+            raise MovieFormatError(f"rom_sha1 is not hex: {self.rom_sha1!r}") from exc
+        if sha and len(sha) != 20:
+            raise MovieFormatError(f"rom_sha1 must be 20 bytes, got {len(sha)}")
+        start = self.start_state.encode("utf-8")
+        name = self.name.encode("utf-8")
+        meta = json.dumps(self.metadata, sort_keys=True).encode("utf-8")
+
+        parts = [
+            _HEADER.pack(
+                MOVIE_MAGIC, MOVIE_VERSION, 0, self.frame_count,
+                sha.ljust(20, b"\0"), len(start), len(name), len(meta),
+            ),
+            start,
+            name,
+            meta,
+            _COUNT.pack(len(self.runs)),
+        ]
+        parts.extend(_RUN.pack(mask & 0xFFFF, length) for mask, length in self.runs)
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'InputMovie':
+        """Decode a movie from its binary representation."""
+        view = memoryview(data)
+        if len(view) < _HEADER.size:
+            raise MovieFormatError("Truncated movie header")
+        magic, version, _flags, frame_count, sha, n_start, n_name, n_meta = _HEADER.unpack_from(view, 0)
+        if magic != MOVIE_MAGIC:
+            raise MovieFormatError(f"Bad movie magic: {magic!r}")
+        if version != MOVIE_VERSION:
+            raise MovieFormatError(f"Unsupported movie version: {version}")
+
+        offset = _HEADER.size
+        end = offset + n_start + n_name + n_meta + _COUNT.size
+        if len(view) < end:
+            raise MovieFormatError("Truncated movie strings")
+        start = bytes(view[offset:offset + n_start]).decode("utf-8")
+        offset += n_start
+        name = bytes(view[offset:offset + n_name]).decode("utf-8")
+        offset += n_name
+        meta = json.loads(bytes(view[offset:offset + n_meta]).decode("utf-8") or "{}")
+        offset += n_meta
+        (run_count,) = _COUNT.unpack_from(view, offset)
+        offset += _COUNT.size
+        if len(view) < offset + run_count * _RUN.size:
+            raise MovieFormatError("Truncated movie runs")
+        runs = [tuple(r) for r in _RUN.iter_unpack(view[offset:offset + run_count * _RUN.size])]
+
+        movie = cls(
+            name=name,
+            runs=runs,
+            rom_sha1=sha.hex() if any(sha) else "",
+            start_state=start,
+            metadata=meta,
+        )
+        if movie.frame_count != frame_count:
+            raise MovieFormatError(
+                f"Frame count mismatch: header {frame_count}, runs {movie.frame_count}"
+            )
+        return movie
+
+    def save(self, path: str | Path) -> None:
+        """Save movie to a binary file."""
+        Path(path).write_bytes(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str | Path) -> 'InputMovie':
+        """Load movie from a binary file."""
+        return cls.from_bytes(Path(path).read_bytes())
@@ -204,15 +204,24 @@ class InputSequence:
         )
 
     def save(self, path: str | Path) -> None:
-        """Save sequence to JSON file."""
+        """Save sequence to JSON file (or a binary movie for .oosm paths)."""
         path = Path(path)
+        if path.suffix == ".oosm":
+            from .input_movie import InputMovie
+            InputMovie.from_sequence(self).save(path)
+            return
         with open(path, 'w') as f:
             json.dump(self.to_dict(), f, indent=2)
 
     @classmethod
     def load(cls, path: str | Path) -> 'InputSequence':
-        """Load sequence from JSON file."""
+        """Load sequence from JSON file or binary movie."""
         path = Path(path)
+        with open(path, 'rb') as f:
+            head = f.read(4)
+        if head == b"OOSM":
+            from .input_movie import InputMovie
+            return InputMovie.load(path).to_sequence()
         with open(path, 'r') as f:
             return cls.from_dict(json.load(f))
 
@@ -289,15 +298,25 @@ class InputRecorder:
 class InputPlayer:
     """Play back input sequences on an emulator."""
 
-    def __init__(self, emulator: EmulatorInterface):
+    def __init__(
+        self,
+        emulator: EmulatorInterface,
+        checkpoints: Optional[Any] = None,
+        checkpoint_interval: int = 600,
+    ):
         """Initialize player.
 
         Args:
             emulator: Emulator to send inputs to
+            checkpoints: Optional CheckpointStore; stream() records
+                savestates into it and seek() loads from it
+            checkpoint_interval: Frames between checkpoints
         """
         self._emu = emulator
         self._current_frame = 0
         self._playing = False
+        self._checkpoints = checkpoints
+        self._checkpoint_interval = max(1, checkpoint_interval)
 
     @property
     def is_playing(self) -> bool:
@@ -381,6 +400,148 @@ class InputPlayer:
 
         return True
 
+    def stream(
+        self,
+        movie: Any,
+        callback: Optional[callable] = None,
+        sample_every: int = 60,
+        start_frame: int = 0,
+        end_frame: Optional[int] = None,
+    ) -> bool:
+        """Play back a movie span by span at emulator speed.
+
+        Unlike play(), each run of identical input is uploaded with one
+        inject_input() and advanced with one step_frame() per sample window,
+        so socket traffic scales with the number of input changes rather
+        than the number of frames. When the player has a checkpoint store,
+        a savestate is captured every `checkpoint_interval` frames.
+
+        The emulator must already be at `start_frame` (see seek()).
+
+        Args:
+            movie: InputMovie or InputSequence to play
+            callback: Optional callback(frame, state); the state is sampled
+                once per window (at most every `sample_every` frames) and
+                streamed to the callback for every frame in that window
+            sample_every: Frames per snapshot when a callback is given
+            start_frame: Movie frame the emulator is currently at
+            end_frame: Stop after this frame (default: end of movie)
+
+        Returns:
+            True if playback completed successfully
+        """
+        movie = self._as_movie(movie)
+        end = movie.frame_count if end_frame is None else min(end_frame, movie.frame_count)
+        movie_hash = movie.movie_hash if self._checkpoints is not None else ""
+
+        self._playing = True
+        self._current_frame = start_frame
+        window = max(1, sample_every)
+        try:
+            for frame, mask, length in movie.iter_spans(start_frame):
+                if frame >= end:
+                    break
+                if not self._playing:
+                    return False
+                length = min(length, end - frame)
+                self._current_frame = frame
+                buttons = Button(mask).to_strings()
+                if buttons and not self._emu.inject_input(buttons, frames=length, release=True):
+                    return False
+
+                remaining = length
+                while remaining > 0:
+                    if not self._playing:
+                        return False
+                    step = min(remaining, window) if callback else remaining
+                    if movie_hash:
+                        to_boundary = self._checkpoint_interval - (
+                            self._current_frame % self._checkpoint_interval
+                        )
+                        step = min(step, to_boundary)
+                    if not self._emu.step_frame(step):
+                        return False
+                    remaining -= step
+                    first = self._current_frame + 1
+                    self._current_frame += step
+                    if callback:
+                        state = self._emu.read_state()
+                        for n in range(first, self._current_frame + 1):
+                            callback(n, state)
+                    if movie_hash and self._current_frame % self._checkpoint_interval == 0:
+                        self._save_checkpoint(movie_hash, self._current_frame)
+        finally:
+            self._playing = False
+
+        return True
+
+    def seek(
+        self,
+        movie: Any,
+        frame: int,
+        callback: Optional[callable] = None,
+        sample_every: int = 60,
+    ) -> bool:
+        """Bring the emulator to `frame` of a movie as cheaply as possible.
+
+        Loads the nearest checkpoint at or before `frame` (falling back to
+        the movie's start state) and streams only the remaining frames.
+
+        Args:
+            movie: InputMovie or InputSequence
+            frame: Target movie frame
+            callback: Optional callback for the replayed remainder
+            sample_every: Frames per snapshot when a callback is given
+
+        Returns:
+            True if the emulator is now at `frame`
+        """
+        movie = self._as_movie(movie)
+        frame = max(0, min(frame, movie.frame_count))
+
+        start = 0
+        hit = None
+        if self._checkpoints is not None:
+            hit = self._checkpoints.nearest(movie.movie_hash, frame)
+        if hit is not None and self._emu.load_state(str(hit[1])):
+            start = hit[0]
+        elif not self._load_start_state(movie):
+            return False
+
+        return self.stream(
+            movie,
+            callback=callback,
+            sample_every=sample_every,
+            start_frame=start,
+            end_frame=frame,
+        )
+
+    def _as_movie(self, movie: Any) -> Any:
+        from .input_movie import InputMovie
+
+        if isinstance(movie, InputSequence):
+            return InputMovie.from_sequence(movie)
+        return movie
+
+    def _load_start_state(self, movie: Any) -> bool:
+        """Load the movie's start state; an empty id means 'already there'."""
+        state = movie.start_state
+        if not state:
+            return True
+        if state.endswith(".mss") or "/" in state or "\\" in state:
+            return self._emu.load_state(state)
+        if hasattr(self._emu, "load_state_by_id"):
+            return self._emu.load_state_by_id(state)
+        return False
+
+    def _save_checkpoint(self, movie_hash: str, frame: int) -> None:
+        store = self._checkpoints
+        if store.has(movie_hash, frame):
+            return
+        path = store.prepare(movie_hash, frame)
+        if self._emu.save_state(str(path)):
+            store.commit(movie_hash, frame)
+
     def stop(self) -> None:
         """Stop playback."""
         self._playing = False
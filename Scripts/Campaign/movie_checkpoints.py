@@ -0,0 +1,183 @@
+"""Savestate checkpoints for fast-seeking long input movies.
+
+Reaching frame N of a recorded route normally means replaying N frames
+from the movie's start state. ``CheckpointStore`` keeps emulator
+savestates captured every K frames during playback, keyed by
+(movie hash, frame), so later seeks load the nearest checkpoint at or
+before N and replay only the remainder.
+
+Layout on disk:
+
+    <root>/<movie_hash>/<frame:08d>.mss
+
+Eviction is least-recently-used (file mtime, refreshed on every hit) and
+bounded by a byte budget across all movies.
+
+Campaign Goals Supported:
+- D.4: Input sequence recorder and playback
+
+Usage:
+    from scripts.campaign.movie_checkpoints import CheckpointStore
+
+    store = CheckpointStore(budget_bytes=512 * 1024 * 1024)
+    player = InputPlayer(emu, checkpoints=store, checkpoint_interval=600)
+    player.stream(movie)          # first play records checkpoints
+    player.seek(movie, 54000)     # later: load nearest, replay remainder
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+
+DEFAULT_CHECKPOINT_INTERVAL = 600  # 10 seconds at 60fps
+DEFAULT_BUDGET_BYTES = 1024 * 1024 * 1024
+STATE_SUFFIX = ".mss"
+
+
+def default_checkpoint_root() -> Path:
+    """Default checkpoint directory (next to the campaign's temp states)."""
+    override = os.getenv("OOS_CHECKPOINT_DIR")
+    if override:
+        return Path(override).expanduser()
+    return Path(tempfile.gettempdir()) / "oos_campaign" / "checkpoints"
+
+
+class CheckpointStore:
+    """Disk-budgeted savestate store keyed by (movie hash, frame)."""
+
+    def __init__(
+        self,
+        root: Optional[str | Path] = None,
+        budget_bytes: int = DEFAULT_BUDGET_BYTES,
+    ):
+        """Initialize store.
+
+        Args:
+            root: Directory for checkpoint files (default: temp dir)
+            budget_bytes: Maximum total size of all checkpoints
+        """
+        self.root = Path(root) if root is not None else default_checkpoint_root()
+        self.budget_bytes = budget_bytes
+
+    def path_for(self, movie_hash: str, frame: int) -> Path:
+        """Path where the checkpoint for (movie_hash, frame) lives."""
+        return self.root / movie_hash / f"{frame:08d}{STATE_SUFFIX}"
+
+    def frames(self, movie_hash: str) -> List[int]:
+        """Sorted frames that have a checkpoint for this movie."""
+        movie_dir = self.root / movie_hash
+        if not movie_dir.is_dir():
+            return []
+        result = []
+        for path in movie_dir.glob(f"*{STATE_SUFFIX}"):
+            try:
+                result.append(int(path.stem))
+            except ValueError:
+                continue
+        return sorted(result)
+
+    def has(self, movie_hash: str, frame: int) -> bool:
+        """Check whether a checkpoint exists."""
+        return self.path_for(movie_hash, frame).exists()
+
+    def nearest(self, movie_hash: str, frame: int) -> Optional[Tuple[int, Path]]:
+        """Latest checkpoint at or before `frame`, marked as recently used."""
+        best = None
+        for candidate in self.frames(movie_hash):
+            if candidate > frame:
+                break
+            best = candidate
+        if best is None:
+            return None
+        path = self.path_for(movie_hash, best)
+        self._touch(path)
+        return best, path
+
+    def prepare(self, movie_hash: str, frame: int) -> Path:
+        """Create the movie directory and return the path to save into."""
+        path = self.path_for(movie_hash, frame)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def commit(self, movie_hash: str, frame: int) -> bool:
+        """Register a freshly written checkpoint and enforce the budget.
+
+        Returns:
+            True if the checkpoint file exists after eviction
+        """
+        path = self.path_for(movie_hash, frame)
+        if not path.exists():
+            return False
+        self._touch(path)
+        self.evict(keep={path})
+        return path.exists()
+
+    def total_bytes(self) -> int:
+        """Total size of all checkpoint files."""
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self, keep: Optional[set] = None) -> List[Path]:
+        """Delete least-recently-used checkpoints until within budget.
+
+        Args:
+            keep: Paths that must not be evicted (e.g. the one just written)
+
+        Returns:
+            Paths that were removed
+        """
+        keep = keep or set()
+        entries = sorted(self._entries(), key=lambda e: e[2])
+        total = sum(size for _, size, _ in entries)
+        removed: List[Path] = []
+        for path, size, _ in entries:
+            if total <= self.budget_bytes:
+                break
+            if path in keep:
+                continue
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed.append(path)
+            try:
+                path.parent.rmdir()
+            except OSError:
+                pass
+        return removed
+
+    def clear(self, movie_hash: Optional[str] = None) -> int:
+        """Remove checkpoints for one movie (or all). Returns count removed."""
+        count = 0
+        for path, _, _ in self._entries():
+            if movie_hash is not None and path.parent.name != movie_hash:
+                continue
+            try:
+                path.unlink()
+                count += 1
+            except OSError:
+                pass
+        return count
+
+    def _entries(self) -> List[Tuple[Path, int, float]]:
+        if not self.root.is_dir():
+            return []
+        entries = []
+        for path in self.root.glob(f"*/*{STATE_SUFFIX}"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((path, st.st_size, st.st_mtime))
+        return entries
+
+    @staticmethod
+    def _touch(path: Path) -> None:
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
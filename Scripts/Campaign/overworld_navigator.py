@@ -50,6 +50,7 @@ from .pathfinder import (
     TileType,
     WALKABLE_TILES,
 )
+from .stream_navigator import StreamNavigator, StreamStatus
 
 
 class NavigationMode(Enum):
@@ -58,6 +59,7 @@ class NavigationMode(Enum):
     PATHFINDING = auto()     # Use A* pathfinding
     AREA_CROSSING = auto()   # Cross between overworld areas
     FOLLOW_WAYPOINTS = auto() # Follow predefined waypoint path
+    STREAMED = auto()        # Frame-accurate holds with probe-based correction
 
 
 class NavigationStatus(Enum):
@@ -360,6 +362,7 @@ class OverworldNavigator:
         self._states_history: List[OverworldState] = []
         self._stuck_threshold = 60  # Frames without movement = stuck
         self._arrival_threshold = 16  # Pixels within target = arrived
+        self._streamer: Optional[StreamNavigator] = None
 
     def capture_state(self) -> OverworldState:
         """Capture current overworld state from emulator.
@@ -561,11 +564,14 @@ class OverworldNavigator:
         Args:
             target_x: Target X coordinate
             target_y: Target Y coordinate
-            mode: Navigation mode (DIRECT or PATHFINDING)
+            mode: Navigation mode (DIRECT, PATHFINDING or STREAMED)
 
         Returns:
             NavigationResult with success/failure status
         """
+        if mode == NavigationMode.STREAMED:
+            return self.navigate_streamed([(target_x, target_y)])
+
         self._states_history.clear()
         start_state = self.capture_state()
 
@@ -643,6 +649,44 @@ class OverworldNavigator:
             error_message=f"Timeout after {frames_elapsed} frames",
         )
 
+    def navigate_streamed(self, waypoints: List[Tuple[int, int]]) -> NavigationResult:
+        """Navigate through waypoints with closed-loop streamed input.
+
+        Sends each leg as one frame-accurate hold and monitors position with
+        a single-read probe, re-planning only when Link deviates.
+
+        Args:
+            waypoints: Pixel (x, y) waypoints; the last one is the target
+
+        Returns:
+            NavigationResult with success/failure status
+        """
+        self._states_history.clear()
+        if self._streamer is None:
+            self._streamer = StreamNavigator(
+                self.bridge,
+                timeout_frames=self.timeout_frames,
+                arrival_threshold=self._arrival_threshold,
+            )
+
+        result = self._streamer.follow_path(waypoints)
+        status_map = {
+            StreamStatus.SUCCESS: NavigationStatus.SUCCESS,
+            StreamStatus.FAILED_WRONG_MODE: NavigationStatus.FAILED_WRONG_MODE,
+            StreamStatus.FAILED_STUCK: NavigationStatus.FAILED_STUCK,
+            StreamStatus.FAILED_TIMEOUT: NavigationStatus.FAILED_TIMEOUT,
+            StreamStatus.FAILED_NO_INPUT: NavigationStatus.FAILED_NO_PATH,
+        }
+        return NavigationResult(
+            status=status_map[result.status],
+            start_position=result.start_position,
+            end_position=result.end_position,
+            target_position=result.target_position,
+            frames_elapsed=result.frames_elapsed,
+            path_length=result.segments_sent,
+            error_message=result.error_message,
+        )
+
     def navigate_to_poi(self, poi_name: str) -> NavigationResult:
         """Navigate to a named point of interest.
 
@@ -0,0 +1,617 @@
+"""Parallel campaign runner over the Mesen2 instance registry.
+
+``CampaignOrchestrator`` drives a single emulator. This module farms a
+queue of jobs (campaign runs, transition tests, regression scenarios) out
+to N claimed Mesen2 instances, one worker process per instance:
+
+- Instances come from the registry (``mesen2_registry.py``) and are
+  claimed/released through its CLI, like ``mesen2_client.py close`` does.
+- Each instance is health-checked before it receives work and again after
+  a job crashes; unhealthy instances are retired for the rest of the run.
+- A job that crashes (socket error, timeout, worker death) is retried on a
+  different instance, up to ``max_attempts``.
+- Outcomes are merged into one ``RunReport`` and streamed to an optional
+  progress callback as they complete.
+
+Campaign Goals Supported:
+- A.1-A.5: Autonomous Gameplay (many runs at once)
+- B.5: Regression test all transition types
+
+Usage:
+    python3 -m scripts.campaign.parallel_runner --all-instances \\
+        --scenario Tests/regression/*.json --campaign 4
+
+    from scripts.campaign.parallel_runner import ParallelCampaignRunner, RunnerJob
+    runner = ParallelCampaignRunner(discover_instances())
+    report = runner.run([RunnerJob("c1", "campaign", {"max_iterations": 5})])
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+REGISTRY_SCRIPT = REPO_ROOT / "Scripts" / "Mesen2" / "mesen2_registry.py"
+TEST_RUNNER_SCRIPT = REPO_ROOT / "Scripts" / "Validate" / "test_runner.py"
+
+# Allow running as `python3 Scripts/Campaign/parallel_runner.py ...`
+if __name__ == "__main__" and __package__ is None:
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.insert(0, str(REPO_ROOT))
+    __package__ = "scripts.campaign"
+
+JOB_KINDS = ("campaign", "transition", "scenario")
+
+STATUS_PASSED = "passed"
+STATUS_FAILED = "failed"
+STATUS_CRASHED = "crashed"
+STATUS_UNSCHEDULED = "unscheduled"
+
+
+# ---------------------------------------------------------------------------
+# Data classes
+# ---------------------------------------------------------------------------
+
+@dataclass
+class RunnerJob:
+    """One unit of work for an emulator instance."""
+    job_id: str
+    kind: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    max_attempts: int = 2
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "kind": self.kind,
+            "params": self.params,
+            "max_attempts": self.max_attempts,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'RunnerJob':
+        return cls(
+            job_id=data["job_id"],
+            kind=data["kind"],
+            params=data.get("params", {}),
+            max_attempts=data.get("max_attempts", 2),
+        )
+
+
+@dataclass
+class InstanceInfo:
+    """A registry-managed Mesen2 instance."""
+    name: str
+    socket: str
+    rom_filename: Optional[str] = None
+
+
+@dataclass
+class JobOutcome:
+    """Result of running one job (final attempt)."""
+    job_id: str
+    kind: str
+    status: str
+    instance: Optional[str] = None
+    attempt: int = 1
+    duration_s: float = 0.0
+    result: Dict[str, Any] = field(default_factory=dict)
+    error: str = ""
+    tried_instances: List[str] = field(default_factory=list)
+
+    @property
+    def passed(self) -> bool:
+        return self.status == STATUS_PASSED
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "kind": self.kind,
+            "status": self.status,
+            "instance": self.instance,
+            "attempt": self.attempt,
+            "duration_s": round(self.duration_s, 3),
+            "result": self.result,
+            "error": self.error,
+            "tried_instances": self.tried_instances,
+        }
+
+
+@dataclass
+class RunReport:
+    """Merged progress report for a parallel run."""
+    outcomes: List[JobOutcome] = field(default_factory=list)
+    instances: List[str] = field(default_factory=list)
+    retired_instances: List[str] = field(default_factory=list)
+    retries: int = 0
+    start_time: Optional[datetime] = None
+    end_time: Optional[datetime] = None
+
+    def counts(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for outcome in self.outcomes:
+            counts[outcome.status] = counts.get(outcome.status, 0) + 1
+        return counts
+
+    def per_instance(self) -> Dict[str, Dict[str, int]]:
+        table: Dict[str, Dict[str, int]] = {}
+        for outcome in self.outcomes:
+            if outcome.instance is None:
+                continue
+            row = table.setdefault(outcome.instance, {})
+            row[outcome.status] = row.get(outcome.status, 0) + 1
+        return table
+
+    def merged_milestones(self) -> Dict[str, int]:
+        """Milestone id -> number of campaign runs that completed it."""
+        merged: Dict[str, int] = {}
+        for outcome in self.outcomes:
+            milestones = outcome.result.get("milestones", {})
+            for mid, data in milestones.items():
+                if data.get("status") == "COMPLETED":
+                    merged[mid] = merged.get(mid, 0) + 1
+        return merged
+
+    @property
+    def all_passed(self) -> bool:
+        return bool(self.outcomes) and all(o.passed for o in self.outcomes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        elapsed = None
+        if self.start_time and self.end_time:
+            elapsed = (self.end_time - self.start_time).total_seconds()
+        return {
+            "start_time": self.start_time.isoformat() if self.start_time else None,
+            "end_time": self.end_time.isoformat() if self.end_time else None,
+            "elapsed_s": elapsed,
+            "instances": self.instances,
+            "retired_instances": self.retired_instances,
+            "retries": self.retries,
+            "counts": self.counts(),
+            "per_instance": self.per_instance(),
+            "merged_milestones": self.merged_milestones(),
+            "outcomes": [o.to_dict() for o in sorted(self.outcomes, key=lambda o: o.job_id)],
+        }
+
+    def summary(self) -> str:
+        lines = [
+            "=" * 60,
+            "PARALLEL CAMPAIGN RUN",
+            "=" * 60,
+            f"Instances: {len(self.instances)} (retired: {len(self.retired_instances)})",
+            f"Jobs: {len(self.outcomes)}  Retries: {self.retries}",
+        ]
+        for status, count in sorted(self.counts().items()):
+            lines.append(f"  {status}: {count}")
+        for name, row in sorted(self.per_instance().items()):
+            parts = ", ".join(f"{k}={v}" for k, v in sorted(row.items()))
+            lines.append(f"  [{name}] {parts}")
+        failed = [o for o in self.outcomes if not o.passed]
+        if failed:
+            lines.append("")
+            lines.append("NOT PASSED:")
+            for outcome in sorted(failed, key=lambda o: o.job_id):
+                lines.append(f"  {outcome.job_id} ({outcome.status}) {outcome.error}")
+        lines.append("=" * 60)
+        return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# Registry helpers
+# ---------------------------------------------------------------------------
+
+def registry_dir() -> Path:
+    """Registry directory (same resolution as mesen2_registry.py)."""
+    override = os.getenv("MESEN2_REGISTRY_DIR")
+    if override:
+        return Path(override).expanduser().resolve()
+    return (REPO_ROOT / ".context" / "scratchpad" / "mesen2" / "instances").resolve()
+
+
+def discover_instances(
+    names: Optional[List[str]] = None,
+    include_dead: bool = False,
+) -> List[InstanceInfo]:
+    """Read instance records from the registry.
+
+    Args:
+        names: Restrict to these instance names (default: all)
+        include_dead: Include records last seen as not alive
+    """
+    directory = registry_dir()
+    if not directory.is_dir():
+        return []
+    instances = []
+    for path in sorted(directory.glob("*.json")):
+        try:
+            record = json.loads(path.read_text())
+        except (OSError, json.JSONDecodeError):
+            continue
+        name = record.get("instance") or path.stem
+        socket = record.get("socket")
+        if not socket:
+            continue
+        if names and name not in names:
+            continue
+        if not include_dead and record.get("alive") is False:
+            continue
+        instances.append(InstanceInfo(name, socket, record.get("rom_filename")))
+    return instances
+
+
+def _registry_cli(*args: str) -> bool:
+    if not REGISTRY_SCRIPT.exists():
+        return False
+    result = subprocess.run(
+        [sys.executable, str(REGISTRY_SCRIPT), *args],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    return result.returncode == 0
+
+
+def claim_instance(instance: InstanceInfo, owner: str) -> bool:
+    """Claim an instance in the registry for `owner`."""
+    return _registry_cli(
+        "claim", "--instance", instance.name, "--owner", owner,
+        "--socket", instance.socket, "--source", "parallel_runner",
+    )
+
+
+def release_instance(instance: InstanceInfo, owner: str) -> bool:
+    """Release a previously claimed instance."""
+    return _registry_cli("release", "--instance", instance.name, "--owner", owner)
+
+
+def check_instance_health(instance: InstanceInfo) -> bool:
+    """True if the instance's socket answers."""
+    from .emulator_abstraction import Mesen2Emulator
+
+    try:
+        return Mesen2Emulator(instance.socket).is_connected()
+    except Exception:
+        return False
+
+
+# ---------------------------------------------------------------------------
+# Job execution (runs inside worker processes)
+# ---------------------------------------------------------------------------
+
+class InstanceCrash(RuntimeError):
+    """The emulator instance stopped responding during a job."""
+
+
+def _make_bridge(socket_path: str):
+    from scripts.mesen2_client_lib.bridge import MesenBridge
+    return MesenBridge(socket_path)
+
+
+def _run_campaign_job(params: Dict[str, Any], instance: InstanceInfo) -> Tuple[bool, Dict[str, Any]]:
+    from .campaign_orchestrator import CampaignOrchestrator, CampaignPhase
+    from .emulator_abstraction import Mesen2Emulator
+
+    emu = Mesen2Emulator(instance.socket)
+    if not emu.connect(timeout=params.get("connect_timeout", 5.0)):
+        raise InstanceCrash(f"Cannot connect to {instance.socket}")
+    log_dir = params.get("log_dir")
+    orchestrator = CampaignOrchestrator(
+        emulator=emu,
+        log_dir=Path(log_dir) / instance.name if log_dir else None,
+    )
+    if params.get("state_path"):
+        if not emu.load_state(params["state_path"]):
+            raise InstanceCrash(f"Failed to load state {params['state_path']}")
+    progress = orchestrator.run_campaign(max_iterations=params.get("max_iterations", 10))
+    return progress.current_phase != CampaignPhase.FAILED, progress.to_dict()
+
+
+def _run_transition_job(params: Dict[str, Any], instance: InstanceInfo) -> Tuple[bool, Dict[str, Any]]:
+    from .transition_tester import TransitionTester, TransitionType
+
+    tester = TransitionTester(_make_bridge(instance.socket))
+    result = tester.test_transition(
+        TransitionType[params.get("transition_type", "OVERWORLD_SCREEN")],
+        direction=params.get("direction", "UP"),
+        hold_frames=params.get("hold_frames", 60),
+        setup_state_path=params.get("state_path"),
+    )
+    return result.success, result.to_dict()
+
+
+def _run_scenario_job(params: Dict[str, Any], instance: InstanceInfo) -> Tuple[bool, Dict[str, Any]]:
+    env = dict(os.environ)
+    env["MESEN2_SOCKET_PATH"] = instance.socket
+    env["MESEN2_INSTANCE"] = instance.name
+    # A dead bridge must fail the scenario rather than skip it.
+    env["OOS_TEST_REQUIRE_EMULATOR"] = "1"
+    cmd = [sys.executable, str(TEST_RUNNER_SCRIPT), str(params["path"]), "--quiet"]
+    cmd.extend(params.get("extra_args", []))
+    proc = subprocess.run(
+        cmd,
+        cwd=str(REPO_ROOT),
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=params.get("timeout", 600),
+        check=False,
+    )
+    output = (proc.stdout or "") + (proc.stderr or "")
+    if "Bridge not connected" in output or "Socket error" in output:
+        raise InstanceCrash(output.strip().splitlines()[-1] if output.strip() else "socket error")
+    return proc.returncode == 0, {
+        "returncode": proc.returncode,
+        "output_tail": output.strip().splitlines()[-20:],
+    }
+
+
+JOB_HANDLERS: Dict[str, Callable[[Dict[str, Any], InstanceInfo], Tuple[bool, Dict[str, Any]]]] = {
+    "campaign": _run_campaign_job,
+    "transition": _run_transition_job,
+    "scenario": _run_scenario_job,
+}
+
+
+def execute_job(job: RunnerJob, instance: InstanceInfo) -> JobOutcome:
+    """Run one job against one instance (worker-process entry point)."""
+    start = time.time()
+    handler = JOB_HANDLERS.get(job.kind)
+    if handler is None:
+        return JobOutcome(job.job_id, job.kind, STATUS_FAILED, instance.name,
+                          error=f"Unknown job kind: {job.kind}")
+    try:
+        passed, result = handler(job.params, instance)
+        status = STATUS_PASSED if passed else STATUS_FAILED
+        error = ""
+    except (InstanceCrash, ConnectionError, TimeoutError, OSError) as exc:
+        status, result, error = STATUS_CRASHED, {}, str(exc)
+    except subprocess.TimeoutExpired as exc:
+        status, result, error = STATUS_CRASHED, {}, f"Timed out after {exc.timeout}s"
+    except Exception as exc:
+        status, result, error = STATUS_FAILED, {}, f"{type(exc).__name__}: {exc}"
+    return JobOutcome(
+        job_id=job.job_id,
+        kind=job.kind,
+        status=status,
+        instance=instance.name,
+        duration_s=time.time() - start,
+        result=result,
+        error=error,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Scheduler
+# ---------------------------------------------------------------------------
+
+class ParallelCampaignRunner:
+    """Schedules jobs across claimed Mesen2 instances in worker processes."""
+
+    def __init__(
+        self,
+        instances: List[InstanceInfo],
+        owner: str = "parallel-runner",
+        claim: bool = True,
+        health_check: Callable[[InstanceInfo], bool] = check_instance_health,
+        job_fn: Callable[[RunnerJob, InstanceInfo], JobOutcome] = execute_job,
+        executor_factory: Optional[Callable[[int], Executor]] = None,
+        progress_callback: Optional[Callable[[JobOutcome, RunReport], None]] = None,
+    ):
+        """Initialize runner.
+
+        Args:
+            instances: Instances to use (see discover_instances())
+            owner: Registry owner name used for claim/release
+            claim: Claim instances in the registry for the run's duration
+            health_check: Callable deciding whether an instance is usable
+            job_fn: Picklable job entry point executed in the workers
+            executor_factory: Builds the executor for N workers
+                (default: ProcessPoolExecutor)
+            progress_callback: Called with each final outcome as it lands
+        """
+        self.instances = list(instances)
+        self.owner = owner
+        self.claim = claim
+        self.health_check = health_check
+        self.job_fn = job_fn
+        self.executor_factory = executor_factory or (lambda n: ProcessPoolExecutor(max_workers=n))
+        self.progress_callback = progress_callback
+
+    def _acquire(self) -> List[InstanceInfo]:
+        acquired = []
+        for instance in self.instances:
+            if self.claim and not claim_instance(instance, self.owner):
+                continue
+            if not self.health_check(instance):
+                if self.claim:
+                    release_instance(instance, self.owner)
+                continue
+            acquired.append(instance)
+        return acquired
+
+    def _finish(self, report: RunReport, outcome: JobOutcome) -> None:
+        report.outcomes.append(outcome)
+        if self.progress_callback:
+            self.progress_callback(outcome, report)
+
+    def run(self, jobs: List[RunnerJob]) -> RunReport:
+        """Run all jobs and return the merged report."""
+        report = RunReport(start_time=datetime.now())
+        acquired = self._acquire()
+        report.instances = [i.name for i in acquired]
+
+        # (job, attempt, instances already tried)
+        pending: Deque[Tuple[RunnerJob, int, List[str]]] = deque((job, 1, []) for job in jobs)
+        free: List[InstanceInfo] = list(acquired)
+        running: Dict[Future, Tuple[RunnerJob, int, List[str], InstanceInfo]] = {}
+
+        executor = self.executor_factory(max(1, len(acquired))) if acquired else None
+        try:
+            while pending or running:
+                self._dispatch(executor, pending, free, running)
+                if not running:
+                    # Nothing could be scheduled: no healthy instances remain.
+                    while pending:
+                        job, attempt, tried = pending.popleft()
+                        self._finish(report, JobOutcome(
+                            job.job_id, job.kind, STATUS_UNSCHEDULED, None, attempt,
+                            error="No healthy instance available", tried_instances=tried,
+                        ))
+                    break
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                broken = False
+                for future in done:
+                    job, attempt, tried, instance = running.pop(future)
+                    try:
+                        outcome = future.result()
+                    except BrokenProcessPool as exc:
+                        broken = True
+                        outcome = JobOutcome(job.job_id, job.kind, STATUS_CRASHED,
+                                             instance.name, error=f"Worker died: {exc}")
+                    except Exception as exc:
+                        outcome = JobOutcome(job.job_id, job.kind, STATUS_CRASHED,
+                                             instance.name, error=f"{type(exc).__name__}: {exc}")
+                    outcome.attempt = attempt
+                    outcome.tried_instances = tried + [instance.name]
+
+                    if outcome.status == STATUS_CRASHED:
+                        if self.health_check(instance):
+                            free.append(instance)
+                        else:
+                            report.retired_instances.append(instance.name)
+                        if attempt < job.max_attempts:
+                            report.retries += 1
+                            pending.appendleft((job, attempt + 1, outcome.tried_instances))
+                            continue
+                    else:
+                        free.append(instance)
+                    self._finish(report, outcome)
+
+                if broken and executor is not None:
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    executor = self.executor_factory(max(1, len(acquired)))
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+            if self.claim:
+                for instance in acquired:
+                    release_instance(instance, self.owner)
+            report.end_time = datetime.now()
+
+        return report
+
+    def _dispatch(
+        self,
+        executor: Optional[Executor],
+        pending: Deque[Tuple[RunnerJob, int, List[str]]],
+        free: List[InstanceInfo],
+        running: Dict[Future, Tuple[RunnerJob, int, List[str], InstanceInfo]],
+    ) -> None:
+        """Hand pending jobs to free instances, preferring untried ones.
+
+        A retry waits for an untried instance while one is still busy; it
+        only goes back to an instance it already crashed on once no untried
+        healthy instance is left in the pool.
+        """
+        if executor is None:
+            return
+        busy = {entry[3].name for entry in running.values()}
+        waiting: Deque[Tuple[RunnerJob, int, List[str]]] = deque()
+        while pending and free:
+            job, attempt, tried = pending.popleft()
+            choice = next((i for i in free if i.name not in tried), None)
+            if choice is None:
+                if any(name not in tried for name in busy):
+                    waiting.append((job, attempt, tried))
+                    continue
+                choice = free[0]
+            free.remove(choice)
+            busy.add(choice.name)
+            future = executor.submit(self.job_fn, job, choice)
+            running[future] = (job, attempt, tried, choice)
+        pending.extendleft(reversed(waiting))
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def load_jobs(path: Path) -> List[RunnerJob]:
+    """Load a JSON job list ([{job_id, kind, params, max_attempts}, ...])."""
+    data = json.loads(path.read_text())
+    if isinstance(data, dict):
+        data = data.get("jobs", [])
+    return [RunnerJob.from_dict(item) for item in data]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run campaign jobs across Mesen2 instances")
+    parser.add_argument("--instances", help="Comma-separated registry instance names")
+    parser.add_argument("--all-instances", action="store_true", help="Use every live registry instance")
+    parser.add_argument("--jobs", type=Path, help="JSON job list")
+    parser.add_argument("--scenario", nargs="*", default=[], help="Regression scenario JSON files")
+    parser.add_argument("--campaign", type=int, default=0, help="Number of campaign runs to queue")
+    parser.add_argument("--max-iterations", type=int, default=10)
+    parser.add_argument("--max-attempts", type=int, default=2)
+    parser.add_argument("--owner", default=f"parallel-runner-{os.getpid()}")
+    parser.add_argument("--no-claim", action="store_true", help="Do not claim instances in the registry")
+    parser.add_argument("--output", type=Path, help="Write merged JSON report here")
+    parser.add_argument("--json", action="store_true", help="Print JSON report instead of summary")
+    args = parser.parse_args(argv)
+
+    names = [n.strip() for n in args.instances.split(",")] if args.instances else None
+    if not names and not args.all_instances:
+        parser.error("pass --instances or --all-instances")
+    instances = discover_instances(names)
+    if not instances:
+        print("No live registry instances found.", file=sys.stderr)
+        return 2
+
+    jobs: List[RunnerJob] = load_jobs(args.jobs) if args.jobs else []
+    for path in args.scenario:
+        jobs.append(RunnerJob(f"scenario:{Path(path).stem}", "scenario",
+                              {"path": path}, args.max_attempts))
+    for n in range(args.campaign):
+        jobs.append(RunnerJob(f"campaign:{n + 1}", "campaign",
+                              {"max_iterations": args.max_iterations}, args.max_attempts))
+    if not jobs:
+        parser.error("no jobs: pass --jobs, --scenario or --campaign")
+
+    def on_progress(outcome: JobOutcome, report: RunReport) -> None:
+        if not args.json:
+            print(f"[{len(report.outcomes)}/{len(jobs)}] {outcome.job_id} "
+                  f"{outcome.status} on {outcome.instance} ({outcome.duration_s:.1f}s)")
+
+    runner = ParallelCampaignRunner(
+        instances,
+        owner=args.owner,
+        claim=not args.no_claim,
+        progress_callback=on_progress,
+    )
+    report = runner.run(jobs)
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report.to_dict(), indent=2) + "\n")
+    if args.json:
+        print(json.dumps(report.to_dict(), indent=2))
+    else:
+        print(report.summary())
+    return 0 if report.all_passed else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,301 @@
+"""Columnar ring buffer of game state snapshots.
+
+``GameStateParser.parse``/``detect_change`` interpret one
+``GameStateSnapshot`` at a time, and detectors keep a deque of snapshot
+objects. ``SnapshotBuffer`` keeps the same samples as fixed-capacity typed
+columns (``array``) in a ring, so a session can sample at 60 Hz for hours
+with constant memory, and window questions are answered with whole-column
+operations (slicing, ``bytes.translate``/``find``, ``map`` over
+``operator`` functions) instead of per-sample Python objects:
+
+    # When did INIDISP go dark in the last 10 seconds?
+    buf.first_time("inidisp", 0x80, seconds=10)
+
+Byte-wide columns (mode, submode, area, inidisp, ...) are ``array("B")``
+so they convert to ``bytes`` for C-speed lookup tables and searches.
+
+Campaign Goals Supported:
+- D.1: Game state parser (mode, area, inventory)
+- E.1: Autonomous soft-lock / black-screen detection
+
+Usage:
+    from scripts.campaign.state_buffer import SnapshotBuffer
+
+    buf = SnapshotBuffer(capacity=60 * 60 * 5)   # 5 minutes at 60 Hz
+    buf.append(emu.read_state())
+    phases = buf.phases(seconds=2)                # bytes of GamePhase codes
+    changes = parser.detect_changes(buf, seconds=10)
+"""
+
+from __future__ import annotations
+
+import operator
+from array import array
+from bisect import bisect_left
+from itertools import compress
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .emulator_abstraction import GameStateSnapshot
+from .game_state import GamePhase, LinkAction, LINK_STATE_TO_ACTION, MODE_TO_PHASE
+
+# Column name -> (array typecode, value mask)
+COLUMNS: Dict[str, Tuple[str, int]] = {
+    "mode": ("B", 0xFF),
+    "submode": ("B", 0xFF),
+    "area": ("B", 0xFF),
+    "room": ("H", 0xFFFF),
+    "x": ("H", 0xFFFF),
+    "y": ("H", 0xFFFF),
+    "z": ("H", 0xFFFF),
+    "direction": ("B", 0xFF),
+    "link_state": ("B", 0xFF),
+    "indoors": ("B", 0x01),
+    "inidisp": ("B", 0xFF),
+    "health": ("H", 0xFFFF),
+    "max_health": ("H", 0xFFFF),
+}
+
+# 256-entry lookup tables for bytes.translate()
+PHASE_TABLE = bytes(int(MODE_TO_PHASE.get(m, GamePhase.UNKNOWN)) for m in range(256))
+ACTION_TABLE = bytes(int(LINK_STATE_TO_ACTION.get(s, LinkAction.UNKNOWN)) for s in range(256))
+_DARK_TABLE = bytes(1 if v == 0x80 else 0 for v in range(256))
+_BLACK_MODE_TABLE = bytes(1 if m in (0x06, 0x07) else 0 for m in range(256))
+_DUNGEON_MODE_TABLE = bytes(1 if m == 0x07 else 0 for m in range(256))
+
+
+def _positions(mask: bytes) -> Iterator[int]:
+    """Indices of non-zero bytes in a 0/1 mask."""
+    i = mask.find(1)
+    while i != -1:
+        yield i
+        i = mask.find(1, i + 1)
+
+
+class SnapshotBuffer:
+    """Fixed-capacity columnar ring of GameStateSnapshot samples."""
+
+    def __init__(self, capacity: int = 600):
+        """Initialize buffer.
+
+        Args:
+            capacity: Maximum samples retained (older samples are overwritten)
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.capacity = capacity
+        self._head = 0  # next write index
+        self._count = 0
+        self._timestamps = array("d", bytes(8 * capacity))
+        self._columns: Dict[str, array] = {
+            name: array(code, bytes(array(code).itemsize * capacity))
+            for name, (code, _) in COLUMNS.items()
+        }
+
+    def __len__(self) -> int:
+        return self._count
+
+    def clear(self) -> None:
+        """Drop all samples (storage is kept)."""
+        self._head = 0
+        self._count = 0
+
+    # ------------------------------------------------------------------
+    # Ingest
+    # ------------------------------------------------------------------
+
+    def append(self, snapshot: GameStateSnapshot) -> None:
+        """Add one sample, overwriting the oldest when full."""
+        raw = snapshot.raw_data if isinstance(snapshot.raw_data, dict) else {}
+        values = {
+            "mode": snapshot.mode,
+            "submode": snapshot.submode,
+            "area": snapshot.area,
+            "room": raw.get("room_id", snapshot.room),
+            "x": snapshot.link_x,
+            "y": snapshot.link_y,
+            "z": snapshot.link_z,
+            "direction": snapshot.link_direction,
+            "link_state": snapshot.link_state,
+            "indoors": 1 if snapshot.indoors else 0,
+            "inidisp": snapshot.inidisp,
+            "health": snapshot.health,
+            "max_health": snapshot.max_health,
+        }
+        i = self._head
+        self._timestamps[i] = snapshot.timestamp
+        for name, (_, mask) in COLUMNS.items():
+            self._columns[name][i] = int(values[name]) & mask
+        self._head = (i + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def extend(self, snapshots: Iterable[GameStateSnapshot]) -> None:
+        """Add several samples in order."""
+        for snapshot in snapshots:
+            self.append(snapshot)
+
+    # ------------------------------------------------------------------
+    # Windows
+    # ------------------------------------------------------------------
+
+    def _ordered(self, data: array, n: int) -> array:
+        """Last n entries of a ring column in chronological order."""
+        if n <= 0:
+            return data[:0]
+        end = self._head
+        start = end - n
+        if start >= 0:
+            return data[start:end]
+        return data[start + self.capacity:self.capacity] + data[:end]
+
+    def window_size(self, last: Optional[int] = None, seconds: Optional[float] = None) -> int:
+        """Number of samples in the requested window.
+
+        Args:
+            last: Most recent N samples
+            seconds: Samples within this many seconds of the newest sample
+        """
+        n = self._count if last is None else max(0, min(last, self._count))
+        if seconds is not None and n:
+            ts = self._ordered(self._timestamps, n)
+            n -= bisect_left(ts, ts[-1] - seconds)
+        return n
+
+    def timestamps(self, last: Optional[int] = None, seconds: Optional[float] = None) -> array:
+        """Timestamps for the window."""
+        return self._ordered(self._timestamps, self.window_size(last, seconds))
+
+    def column(self, name: str, last: Optional[int] = None, seconds: Optional[float] = None) -> array:
+        """Values of one column for the window, oldest first."""
+        if name not in self._columns:
+            raise KeyError(f"Unknown column: {name}")
+        return self._ordered(self._columns[name], self.window_size(last, seconds))
+
+    def latest(self) -> Optional[Dict[str, Any]]:
+        """Newest sample as a dict of column values (plus timestamp)."""
+        if not self._count:
+            return None
+        i = (self._head - 1) % self.capacity
+        row: Dict[str, Any] = {name: col[i] for name, col in self._columns.items()}
+        row["timestamp"] = self._timestamps[i]
+        return row
+
+    # ------------------------------------------------------------------
+    # Whole-window predicates
+    # ------------------------------------------------------------------
+
+    def is_full_window(self, last: int) -> bool:
+        """True if at least `last` samples are buffered."""
+        return self._count >= last
+
+    def is_constant(self, name: str, last: Optional[int] = None, seconds: Optional[float] = None) -> bool:
+        """True if the column holds a single value across the window."""
+        values = self.column(name, last, seconds)
+        return bool(values) and values.count(values[0]) == len(values)
+
+    def all_in(
+        self,
+        name: str,
+        allowed: Iterable[int],
+        last: Optional[int] = None,
+        seconds: Optional[float] = None,
+    ) -> bool:
+        """True if every value in the window is one of `allowed`."""
+        values = self.column(name, last, seconds)
+        if not values:
+            return False
+        allowed = set(allowed)
+        if values.typecode == "B":
+            return not values.tobytes().translate(None, bytes(v for v in allowed if 0 <= v < 256))
+        return all(map(allowed.__contains__, values))
+
+    def first_index(
+        self,
+        name: str,
+        value: int,
+        last: Optional[int] = None,
+        seconds: Optional[float] = None,
+    ) -> Optional[int]:
+        """Window index of the first sample where column == value."""
+        values = self.column(name, last, seconds)
+        if values.typecode == "B":
+            idx = values.tobytes().find(bytes([value & 0xFF])) if 0 <= value < 256 else -1
+            return None if idx < 0 else idx
+        try:
+            return values.index(value)
+        except ValueError:
+            return None
+
+    def first_time(
+        self,
+        name: str,
+        value: int,
+        last: Optional[int] = None,
+        seconds: Optional[float] = None,
+    ) -> Optional[float]:
+        """Timestamp of the first sample in the window where column == value."""
+        idx = self.first_index(name, value, last, seconds)
+        if idx is None:
+            return None
+        return self.timestamps(last, seconds)[idx]
+
+    def transitions(
+        self,
+        name: str,
+        last: Optional[int] = None,
+        seconds: Optional[float] = None,
+    ) -> List[Tuple[float, int, int]]:
+        """(timestamp, old, new) for each sample where the column changed."""
+        ts = self.timestamps(last, seconds)
+        return [(ts[i], old, new) for i, old, new in self.index_transitions(self.column(name, last, seconds))]
+
+    @staticmethod
+    def index_transitions(values) -> List[Tuple[int, int, int]]:
+        """(index, old, new) wherever a window sequence differs from its predecessor."""
+        changed = compress(range(1, len(values)), map(operator.ne, values[1:], values[:-1]))
+        return [(i, values[i - 1], values[i]) for i in changed]
+
+    # ------------------------------------------------------------------
+    # Derived columns
+    # ------------------------------------------------------------------
+
+    def black_screen_mask(self, last: Optional[int] = None, seconds: Optional[float] = None) -> bytes:
+        """1 where INIDISP == 0x80 and mode is 0x06/0x07 (GameStateSnapshot.is_black_screen)."""
+        n = self.window_size(last, seconds)
+        dark = self._ordered(self._columns["inidisp"], n).tobytes().translate(_DARK_TABLE)
+        modes = self._ordered(self._columns["mode"], n).tobytes().translate(_BLACK_MODE_TABLE)
+        return bytes(map(operator.and_, dark, modes))
+
+    def phases(self, last: Optional[int] = None, seconds: Optional[float] = None) -> bytes:
+        """GamePhase code per sample, matching GameStateParser._determine_phase."""
+        n = self.window_size(last, seconds)
+        modes = self._ordered(self._columns["mode"], n).tobytes()
+        phases = bytearray(modes.translate(PHASE_TABLE))
+
+        # Mode 0x07 outdoors is classified as overworld.
+        indoors = self._ordered(self._columns["indoors"], n)
+        for i in _positions(modes.translate(_DUNGEON_MODE_TABLE)):
+            if not indoors[i]:
+                phases[i] = GamePhase.OVERWORLD
+        for i in _positions(self.black_screen_mask(n)):
+            phases[i] = GamePhase.BLACK_SCREEN
+        return bytes(phases)
+
+    def actions(self, last: Optional[int] = None, seconds: Optional[float] = None) -> bytes:
+        """LinkAction code per sample."""
+        return self.column("link_state", last, seconds).tobytes().translate(ACTION_TABLE)
+
+    def position_jumps(
+        self,
+        threshold: int = 16,
+        last: Optional[int] = None,
+        seconds: Optional[float] = None,
+    ) -> List[int]:
+        """Window indices where X or Y moved more than `threshold` since the previous sample."""
+        n = self.window_size(last, seconds)
+        xs = self._ordered(self._columns["x"], n)
+        ys = self._ordered(self._columns["y"], n)
+        dx = map(abs, map(operator.sub, xs[1:], xs[:-1]))
+        dy = map(abs, map(operator.sub, ys[1:], ys[:-1]))
+        jumped = map(operator.or_, map(threshold.__lt__, dx), map(threshold.__lt__, dy))
+        return list(compress(range(1, n), jumped))
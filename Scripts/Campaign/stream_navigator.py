@@ -0,0 +1,502 @@
+# -*- coding: utf-8 -*-
+"""Closed-loop streamed navigation for Oracle of Secrets.
+
+The older navigators walk in fixed 15-30 frame chunks and re-read the full
+state between chunks, which overshoots targets and spends most of the wall
+clock on socket round-trips. This module instead:
+
+1. Plans a path as a frame-accurate input schedule (axis-aligned segments,
+   exportable as an ``InputSequence``).
+2. Streams each segment to the emulator as a single INPUT hold.
+3. Monitors Link with a cheap single-read position probe while the hold
+   plays out, and only re-plans when Link deviates from the expected track
+   (blocked, sliding around a corner, knocked back).
+
+Campaign Goals Supported:
+- A.2: Navigate overworld to specific locations
+- A.3: Enter buildings (approach walks)
+- D.2: Collision-aware pathfinding (path execution)
+
+Usage:
+    from scripts.campaign.stream_navigator import StreamNavigator
+
+    nav = StreamNavigator(bridge)
+    result = nav.navigate_to(3400, 3700)
+    result = nav.follow_path([(3400, 3700), (3400, 3800)])
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass, field
+from enum import Enum, auto
+from typing import Any, Dict, List, Optional, Tuple
+
+from .input_recorder import Button, InputSequence
+
+
+# Link's walking speed. Matches the 10 frames/tile assumption used by
+# create_walk_sequence(); real speed alternates 1-2 px/frame.
+WALK_PIXELS_PER_FRAME = 1.6
+
+DIRECTION_VECTORS: Dict[str, Tuple[int, int]] = {
+    "UP": (0, -1),
+    "DOWN": (0, 1),
+    "LEFT": (-1, 0),
+    "RIGHT": (1, 0),
+}
+
+# Modes in which Link can be steered (dungeon, overworld).
+STEERABLE_MODES = (0x07, 0x09)
+
+
+@dataclass
+class PositionSample:
+    """Result of one position probe."""
+    game_mode: int
+    submodule: int
+    inidisp: int
+    link_x: int
+    link_y: int
+    frame: int = 0
+
+    @property
+    def position(self) -> Tuple[int, int]:
+        return (self.link_x, self.link_y)
+
+    @property
+    def is_steerable(self) -> bool:
+        """True while Link accepts directional input (no transition running)."""
+        return self.game_mode in STEERABLE_MODES and self.submodule == 0
+
+
+class PositionProbe:
+    """Single-read probe for mode, INIDISP queue and Link's position.
+
+    $7E0010-$7E0023 holds GameMode, Submodule, INIDISPQ, Link Y and Link X,
+    so one READBLOCK of 0x14 bytes replaces the five-plus separate reads a
+    full ``capture_state()`` performs. Bridges without ``read_block`` (or
+    returning short data) fall back to individual reads.
+    """
+
+    BLOCK_BASE = 0x7E0010
+    BLOCK_LEN = 0x14
+    OFF_MODE = 0x00
+    OFF_SUBMODULE = 0x01
+    OFF_INIDISP = 0x03
+    OFF_LINK_Y = 0x10
+    OFF_LINK_X = 0x12
+
+    def __init__(self, bridge: Any):
+        self.bridge = bridge
+        self.reads = 0
+
+    def read(self, frame: int = 0) -> PositionSample:
+        """Probe current position (one socket round-trip when supported)."""
+        self.reads += 1
+        block = None
+        if hasattr(self.bridge, "read_block"):
+            try:
+                block = self.bridge.read_block(self.BLOCK_BASE, self.BLOCK_LEN)
+            except Exception:
+                block = None
+        if isinstance(block, (bytes, bytearray)) and len(block) >= self.BLOCK_LEN:
+            return PositionSample(
+                game_mode=block[self.OFF_MODE],
+                submodule=block[self.OFF_SUBMODULE],
+                inidisp=block[self.OFF_INIDISP],
+                link_x=block[self.OFF_LINK_X] | (block[self.OFF_LINK_X + 1] << 8),
+                link_y=block[self.OFF_LINK_Y] | (block[self.OFF_LINK_Y + 1] << 8),
+                frame=frame,
+            )
+        return PositionSample(
+            game_mode=self.bridge.read_memory(self.BLOCK_BASE + self.OFF_MODE),
+            submodule=self.bridge.read_memory(self.BLOCK_BASE + self.OFF_SUBMODULE),
+            inidisp=self.bridge.read_memory(self.BLOCK_BASE + self.OFF_INIDISP),
+            link_x=self._read_word(self.BLOCK_BASE + self.OFF_LINK_X),
+            link_y=self._read_word(self.BLOCK_BASE + self.OFF_LINK_Y),
+            frame=frame,
+        )
+
+    def _read_word(self, address: int) -> int:
+        if hasattr(self.bridge, "read_memory16"):
+            return self.bridge.read_memory16(address)
+        lo = self.bridge.read_memory(address)
+        hi = self.bridge.read_memory(address + 1)
+        return lo | (hi << 8)
+
+
+@dataclass
+class InputSegment:
+    """One held direction in a streamed schedule."""
+    direction: str
+    frames: int
+    start: Tuple[int, int]
+    end: Tuple[int, int]
+
+    @property
+    def distance(self) -> int:
+        return abs(self.end[0] - self.start[0]) + abs(self.end[1] - self.start[1])
+
+
+class StreamStatus(Enum):
+    """Outcome of a streamed navigation."""
+    SUCCESS = auto()
+    FAILED_WRONG_MODE = auto()
+    FAILED_STUCK = auto()
+    FAILED_TIMEOUT = auto()
+    FAILED_NO_INPUT = auto()
+
+
+@dataclass
+class StreamResult:
+    """Result of a streamed navigation attempt."""
+    status: StreamStatus
+    start_position: Tuple[int, int]
+    end_position: Tuple[int, int]
+    target_position: Tuple[int, int]
+    frames_elapsed: int
+    segments_sent: int
+    corrections: int
+    probes: int
+    samples: List[PositionSample] = field(default_factory=list)
+    error_message: str = ""
+
+    @property
+    def success(self) -> bool:
+        return self.status == StreamStatus.SUCCESS
+
+    @property
+    def distance_to_target(self) -> float:
+        return math.hypot(
+            self.end_position[0] - self.target_position[0],
+            self.end_position[1] - self.target_position[1],
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "status": self.status.name,
+            "start_position": self.start_position,
+            "end_position": self.end_position,
+            "target_position": self.target_position,
+            "frames_elapsed": self.frames_elapsed,
+            "segments_sent": self.segments_sent,
+            "corrections": self.corrections,
+            "probes": self.probes,
+            "distance_to_target": self.distance_to_target,
+            "error_message": self.error_message,
+        }
+
+
+def plan_segments(
+    start: Tuple[int, int],
+    target: Tuple[int, int],
+    speed: float = WALK_PIXELS_PER_FRAME,
+    major_axis_first: bool = True,
+) -> List[InputSegment]:
+    """Split a straight-line leg into axis-aligned frame-accurate holds.
+
+    Args:
+        start: Starting (x, y) pixel position
+        target: Target (x, y) pixel position
+        speed: Walking speed in pixels per frame
+        major_axis_first: Walk the longer axis first (matches the greedy
+            direction choice the other navigators make)
+
+    Returns:
+        Up to two InputSegments (one per axis with non-zero delta)
+    """
+    sx, sy = start
+    tx, ty = target
+    dx = tx - sx
+    dy = ty - sy
+
+    x_leg = ("RIGHT" if dx > 0 else "LEFT", abs(dx), (tx, sy))
+    y_leg = ("DOWN" if dy > 0 else "UP", abs(dy), None)
+
+    if major_axis_first and abs(dy) > abs(dx):
+        order = [("y", y_leg), ("x", x_leg)]
+    else:
+        order = [("x", x_leg), ("y", y_leg)]
+
+    segments: List[InputSegment] = []
+    cursor = (sx, sy)
+    for axis, (direction, distance, _) in order:
+        if distance == 0:
+            continue
+        end = (tx, cursor[1]) if axis == "x" else (cursor[0], ty)
+        frames = max(1, int(round(distance / speed)))
+        segments.append(InputSegment(direction, frames, cursor, end))
+        cursor = end
+    return segments
+
+
+def plan_path_segments(
+    start: Tuple[int, int],
+    waypoints: List[Tuple[int, int]],
+    speed: float = WALK_PIXELS_PER_FRAME,
+) -> List[InputSegment]:
+    """Plan segments through a list of waypoints, merging collinear holds."""
+    segments: List[InputSegment] = []
+    cursor = start
+    for waypoint in waypoints:
+        for seg in plan_segments(cursor, waypoint, speed):
+            if segments and segments[-1].direction == seg.direction:
+                prev = segments[-1]
+                merged_distance = prev.distance + seg.distance
+                segments[-1] = InputSegment(
+                    prev.direction,
+                    max(1, int(round(merged_distance / speed))),
+                    prev.start,
+                    seg.end,
+                )
+            else:
+                segments.append(seg)
+        cursor = waypoint
+    return segments
+
+
+def segments_to_sequence(
+    segments: List[InputSegment],
+    name: str = "streamed_path",
+    run: bool = False,
+) -> InputSequence:
+    """Convert planned segments into a frame-accurate InputSequence."""
+    seq = InputSequence(
+        name=name,
+        description=f"Streamed path ({len(segments)} segments)",
+        metadata={"type": "navigation", "streamed": True},
+    )
+    frame = 0
+    for seg in segments:
+        buttons = Button.from_string(seg.direction)
+        if run:
+            buttons |= Button.Y
+        seq.add_input(frame, buttons, hold=seg.frames)
+        frame += seg.frames
+    return seq
+
+
+class StreamNavigator:
+    """Closed-loop navigator streaming frame-accurate holds.
+
+    Each planned segment is sent as one INPUT command. While it plays out,
+    the navigator probes position every ``probe_interval`` frames and
+    compares it to the expected track. It re-plans from the observed
+    position only when Link drifts off-axis, falls behind the expected
+    progress (blocked), or ends a leg outside the arrival threshold.
+    A new INPUT supersedes whatever is left of the previous hold.
+    """
+
+    def __init__(
+        self,
+        bridge: Any,
+        timeout_frames: int = 3600,
+        speed: float = WALK_PIXELS_PER_FRAME,
+        probe_interval: int = 8,
+        arrival_threshold: int = 8,
+        deviation_threshold: int = 6,
+        stall_probes: int = 3,
+        max_corrections: int = 12,
+    ):
+        """Initialize streamed navigator.
+
+        Args:
+            bridge: MesenBridge instance (or compatible) for emulator control
+            timeout_frames: Maximum scheduled frames before giving up
+            speed: Expected walking speed in pixels per frame
+            probe_interval: Frames between position probes during a hold
+            arrival_threshold: Pixels within target = arrived
+            deviation_threshold: Off-axis drift (pixels) that triggers a re-plan
+            stall_probes: Consecutive probes without movement = stuck
+            max_corrections: Re-plans allowed per navigation
+        """
+        self.bridge = bridge
+        self.probe = PositionProbe(bridge)
+        self.timeout_frames = timeout_frames
+        self.speed = speed
+        self.probe_interval = max(1, probe_interval)
+        self.arrival_threshold = arrival_threshold
+        self.deviation_threshold = deviation_threshold
+        self.stall_probes = max(1, stall_probes)
+        self.max_corrections = max_corrections
+
+    # ------------------------------------------------------------------
+    # Emulator plumbing
+    # ------------------------------------------------------------------
+
+    def _send_hold(self, direction: str, frames: int) -> bool:
+        if hasattr(self.bridge, "press_button"):
+            result = self.bridge.press_button(direction, frames)
+            return result is not False
+        if hasattr(self.bridge, "input_inject"):
+            self.bridge.input_inject(buttons=[direction], frames=frames)
+            return True
+        return False
+
+    def _release(self) -> None:
+        """Cancel the rest of the current hold with a neutral one-frame INPUT."""
+        if hasattr(self.bridge, "press_button"):
+            self.bridge.press_button("", 1)
+        elif hasattr(self.bridge, "input_inject"):
+            self.bridge.input_inject(buttons=[], frames=1)
+
+    def _wait_frames(self, frames: int) -> None:
+        if hasattr(self.bridge, "run_frames"):
+            self.bridge.run_frames(frames)
+        else:
+            time.sleep(frames / 60.0)
+
+    # ------------------------------------------------------------------
+    # Segment execution
+    # ------------------------------------------------------------------
+
+    def _stream_segment(
+        self,
+        seg: InputSegment,
+        origin: PositionSample,
+        frame_base: int,
+        samples: List[PositionSample],
+    ) -> Tuple[PositionSample, int, Optional[str]]:
+        """Play one segment, probing for deviation.
+
+        Returns:
+            (last sample, frames consumed, outcome) where outcome is None when
+            the segment played out on track, "deviated", "stalled" or "mode".
+        """
+        if not self._send_hold(seg.direction, seg.frames):
+            return origin, 0, "no_input"
+
+        ux, uy = DIRECTION_VECTORS[seg.direction]
+        elapsed = 0
+        stalled = 0
+        last = origin
+        while elapsed < seg.frames:
+            step = min(self.probe_interval, seg.frames - elapsed)
+            self._wait_frames(step)
+            elapsed += step
+            sample = self.probe.read(frame_base + elapsed)
+            samples.append(sample)
+
+            if sample.game_mode not in STEERABLE_MODES:
+                return sample, elapsed, "mode"
+
+            if sample.position == last.position:
+                stalled += 1
+                if stalled >= self.stall_probes:
+                    return sample, elapsed, "stalled"
+            else:
+                stalled = 0
+            last = sample
+
+            along = (sample.link_x - origin.link_x) * ux + (sample.link_y - origin.link_y) * uy
+            cross = (sample.link_x - origin.link_x) * uy - (sample.link_y - origin.link_y) * ux
+            if abs(cross) > self.deviation_threshold:
+                return sample, elapsed, "deviated"
+            # Well behind schedule means Link is pushing into something.
+            expected = self.speed * elapsed
+            if elapsed >= 2 * self.probe_interval and along < expected * 0.5:
+                return sample, elapsed, "deviated"
+            # Past the segment end: cut the hold short instead of letting it
+            # carry Link further.
+            if along >= seg.distance:
+                if elapsed < seg.frames:
+                    self._release()
+                return sample, elapsed, None
+
+        return last, elapsed, None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def plan(self, target_x: int, target_y: int) -> List[InputSegment]:
+        """Plan segments from Link's current position to a target."""
+        sample = self.probe.read()
+        return plan_segments(sample.position, (target_x, target_y), self.speed)
+
+    def navigate_to(self, target_x: int, target_y: int) -> StreamResult:
+        """Navigate to a single target position."""
+        return self.follow_path([(target_x, target_y)])
+
+    def follow_path(self, waypoints: List[Tuple[int, int]]) -> StreamResult:
+        """Stream a path through waypoints, correcting only on deviation.
+
+        Args:
+            waypoints: Pixel (x, y) waypoints; the last one is the target
+
+        Returns:
+            StreamResult describing the outcome
+        """
+        start = self.probe.read(0)
+        samples: List[PositionSample] = [start]
+        target = waypoints[-1] if waypoints else start.position
+        frames = 0
+        segments_sent = 0
+        corrections = 0
+        current = start
+
+        def finish(status: StreamStatus, message: str = "") -> StreamResult:
+            return StreamResult(
+                status=status,
+                start_position=start.position,
+                end_position=current.position,
+                target_position=target,
+                frames_elapsed=frames,
+                segments_sent=segments_sent,
+                corrections=corrections,
+                probes=len(samples),
+                samples=samples,
+                error_message=message,
+            )
+
+        if start.game_mode not in STEERABLE_MODES:
+            return finish(StreamStatus.FAILED_WRONG_MODE,
+                          f"Not steerable (mode={start.game_mode:#x})")
+
+        pending = list(waypoints)
+        while pending:
+            threshold = self.arrival_threshold
+            if len(pending) > 1:
+                threshold = max(self.arrival_threshold, self.deviation_threshold)
+            if self._within(current, pending[0], threshold):
+                pending.pop(0)
+                continue
+            if frames >= self.timeout_frames:
+                return finish(StreamStatus.FAILED_TIMEOUT, f"Timeout after {frames} frames")
+
+            replan = False
+            for seg in plan_path_segments(current.position, pending, self.speed):
+                current, used, outcome = self._stream_segment(seg, current, frames, samples)
+                frames += used
+                segments_sent += 1
+                if outcome == "no_input":
+                    return finish(StreamStatus.FAILED_NO_INPUT, "Bridge has no input method")
+                if outcome == "mode":
+                    return finish(StreamStatus.FAILED_WRONG_MODE,
+                                  f"Left steerable mode (mode={current.game_mode:#x})")
+                if outcome is not None:
+                    replan = True
+                    break
+                if frames >= self.timeout_frames:
+                    break
+
+            if not replan:
+                # The whole schedule played on track; intermediate waypoints
+                # are behind us.
+                pending = pending[-1:]
+            if replan or not self._within(current, pending[0], self.arrival_threshold):
+                corrections += 1
+                if corrections > self.max_corrections:
+                    return finish(StreamStatus.FAILED_STUCK,
+                                  f"No convergence after {self.max_corrections} corrections")
+                # Settle the tail of any superseded hold before re-planning.
+                current = self.probe.read(frames)
+                samples.append(current)
+
+        return finish(StreamStatus.SUCCESS)
+
+    @staticmethod
+    def _within(sample: PositionSample, point: Tuple[int, int], threshold: int) -> bool:
+        return math.hypot(sample.link_x - point[0], sample.link_y - point[1]) <= threshold
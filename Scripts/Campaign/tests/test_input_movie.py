@@ -0,0 +1,145 @@
+"""Tests for input_movie module.
+
+Focus: Goal D.4 - compact binary input movies and span-streamed playback.
+"""
+
+import pytest
+from unittest.mock import MagicMock
+
+from scripts.campaign.input_movie import (
+    MOVIE_MAGIC,
+    InputMovie,
+    MovieFormatError,
+)
+from scripts.campaign.input_recorder import (
+    Button,
+    InputPlayer,
+    InputSequence,
+)
+
+SHA = "ab" * 20
+
+
+@pytest.fixture
+def sequence():
+    seq = InputSequence("route", description="test route", metadata={"goal": "A.2"})
+    seq.add_input(0, Button.RIGHT, hold=100)
+    seq.add_input(100, Button.RIGHT | Button.Y, hold=50)
+    seq.add_input(200, Button.A, hold=2)
+    return seq
+
+
+@pytest.fixture
+def mock_emu():
+    emu = MagicMock()
+    emu.inject_input.return_value = True
+    emu.step_frame.return_value = True
+    return emu
+
+
+class TestMovieEncoding:
+    """Tests for RLE encoding and the binary layout."""
+
+    def test_from_sequence_runs(self, sequence):
+        movie = InputMovie.from_sequence(sequence)
+        assert movie.runs == [
+            (int(Button.RIGHT), 100),
+            (int(Button.RIGHT | Button.Y), 50),
+            (0, 50),
+            (int(Button.A), 2),
+        ]
+        assert movie.frame_count == sequence.total_frames
+
+    def test_overlapping_holds_are_ored(self):
+        seq = InputSequence("overlap")
+        seq.add_input(0, Button.UP, hold=4)
+        seq.add_input(2, Button.B, hold=2)
+        movie = InputMovie.from_sequence(seq)
+        assert list(movie.masks()) == [16, 16, 17, 17]
+
+    def test_roundtrip_bytes(self, sequence):
+        movie = InputMovie.from_sequence(sequence, rom_sha1=SHA, start_state="baseline_1")
+        data = movie.to_bytes()
+        assert data[:4] == MOVIE_MAGIC
+        loaded = InputMovie.from_bytes(data)
+        assert loaded.runs == movie.runs
+        assert loaded.rom_sha1 == SHA
+        assert loaded.start_state == "baseline_1"
+        assert loaded.metadata["goal"] == "A.2"
+
+    def test_long_hold_is_compact(self):
+        seq = InputSequence("long")
+        seq.add_input(0, Button.LEFT, hold=36000)
+        data = InputMovie.from_sequence(seq).to_bytes()
+        assert len(data) < 128
+
+    def test_to_sequence_roundtrip(self, sequence):
+        back = InputMovie.from_sequence(sequence).to_sequence()
+        assert back.total_frames == sequence.total_frames
+        assert back.description == "test route"
+        assert InputMovie.from_sequence(back).runs == InputMovie.from_sequence(sequence).runs
+
+    def test_bad_magic(self):
+        with pytest.raises(MovieFormatError):
+            InputMovie.from_bytes(b"XXXX" + bytes(64))
+
+    def test_truncated(self, sequence):
+        data = InputMovie.from_sequence(sequence).to_bytes()
+        with pytest.raises(MovieFormatError):
+            InputMovie.from_bytes(data[:-3])
+
+    def test_bad_sha(self):
+        with pytest.raises(MovieFormatError):
+            InputMovie("x", rom_sha1="1234").to_bytes()
+
+    def test_movie_hash_tracks_content(self, sequence):
+        a = InputMovie.from_sequence(sequence)
+        b = InputMovie.from_sequence(sequence)
+        assert a.movie_hash == b.movie_hash
+        b.runs[0] = (b.runs[0][0], 99)
+        assert a.movie_hash != b.movie_hash
+
+    def test_iter_spans_clipped(self, sequence):
+        spans = list(InputMovie.from_sequence(sequence).iter_spans(120))
+        assert spans[0] == (120, int(Button.RIGHT | Button.Y), 30)
+
+    def test_sequence_save_load_oosm(self, sequence, tmp_path):
+        path = tmp_path / "route.oosm"
+        sequence.save(path)
+        assert path.read_bytes()[:4] == MOVIE_MAGIC
+        loaded = InputSequence.load(path)
+        assert loaded.total_frames == sequence.total_frames
+
+
+class TestStreamPlayback:
+    """Tests for InputPlayer.stream."""
+
+    def test_one_command_per_span(self, mock_emu, sequence):
+        player = InputPlayer(mock_emu)
+        assert player.stream(InputMovie.from_sequence(sequence)) is True
+        # Three non-empty spans, four spans total.
+        assert mock_emu.inject_input.call_count == 3
+        assert mock_emu.step_frame.call_count == 4
+        mock_emu.inject_input.assert_any_call(["RIGHT"], frames=100, release=True)
+        assert player.current_frame == sequence.total_frames
+
+    def test_accepts_sequence(self, mock_emu, sequence):
+        assert InputPlayer(mock_emu).stream(sequence) is True
+
+    def test_callback_sampled(self, mock_emu):
+        seq = InputSequence("cb")
+        seq.add_input(0, Button.A, hold=10)
+        frames = []
+        InputPlayer(mock_emu).stream(seq, callback=lambda f, s: frames.append(f), sample_every=4)
+        assert frames == list(range(1, 11))
+        assert mock_emu.read_state.call_count == 3
+
+    def test_inject_failure(self, mock_emu, sequence):
+        mock_emu.inject_input.return_value = False
+        assert InputPlayer(mock_emu).stream(sequence) is False
+
+    def test_step_failure(self, mock_emu, sequence):
+        mock_emu.step_frame.return_value = False
+        player = InputPlayer(mock_emu)
+        assert player.stream(sequence) is False
+        assert not player.is_playing
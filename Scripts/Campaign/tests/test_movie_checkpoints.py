@@ -0,0 +1,142 @@
+"""Tests for movie_checkpoints module.
+
+Focus: Goal D.4 - savestate checkpointing and fast-seek for long movies.
+"""
+
+import os
+import pytest
+
+from scripts.campaign.input_movie import InputMovie
+from scripts.campaign.input_recorder import Button, InputPlayer, InputSequence
+from scripts.campaign.movie_checkpoints import CheckpointStore
+
+
+class FrameEmu:
+    """Fake emulator whose whole state is a frame counter."""
+
+    def __init__(self, state_size=100):
+        self.frame = 0
+        self.stepped = 0
+        self.state_size = state_size
+        self.loaded = []
+
+    def inject_input(self, buttons, frames=1, release=True):
+        return True
+
+    def step_frame(self, count=1):
+        self.frame += count
+        self.stepped += count
+        return True
+
+    def read_state(self):
+        return self.frame
+
+    def save_state(self, name):
+        with open(name, "wb") as f:
+            f.write(str(self.frame).encode().ljust(self.state_size, b"\0"))
+        return name
+
+    def load_state(self, path):
+        self.loaded.append(path)
+        with open(path, "rb") as f:
+            self.frame = int(f.read().rstrip(b"\0"))
+        return True
+
+    def load_state_by_id(self, state_id):
+        self.loaded.append(state_id)
+        self.frame = 0
+        return True
+
+
+@pytest.fixture
+def movie():
+    seq = InputSequence("long_route")
+    seq.add_input(0, Button.RIGHT, hold=1000)
+    seq.add_input(1000, Button.UP, hold=1000)
+    return InputMovie.from_sequence(seq, start_state="baseline_1")
+
+
+class TestCheckpointStore:
+    """Tests for the on-disk store."""
+
+    def _write(self, store, movie_hash, frame, size=100):
+        path = store.prepare(movie_hash, frame)
+        path.write_bytes(b"x" * size)
+        return store.commit(movie_hash, frame)
+
+    def test_nearest(self, tmp_path):
+        store = CheckpointStore(tmp_path)
+        for frame in (100, 200, 300):
+            self._write(store, "abc", frame)
+        assert store.frames("abc") == [100, 200, 300]
+        assert store.nearest("abc", 250)[0] == 200
+        assert store.nearest("abc", 300)[0] == 300
+        assert store.nearest("abc", 99) is None
+        assert store.nearest("other", 500) is None
+
+    def test_budget_evicts_lru(self, tmp_path):
+        store = CheckpointStore(tmp_path, budget_bytes=250)
+        self._write(store, "abc", 100)
+        self._write(store, "abc", 200)
+        old = store.path_for("abc", 100)
+        os.utime(old, (1, 1))
+        self._write(store, "abc", 300)
+        assert store.total_bytes() <= 250
+        assert store.frames("abc") == [200, 300]
+
+    def test_newest_checkpoint_kept_over_budget(self, tmp_path):
+        store = CheckpointStore(tmp_path, budget_bytes=10)
+        assert self._write(store, "abc", 100) is True
+        assert store.frames("abc") == [100]
+
+    def test_clear(self, tmp_path):
+        store = CheckpointStore(tmp_path)
+        self._write(store, "a", 1)
+        self._write(store, "b", 1)
+        assert store.clear("a") == 1
+        assert store.frames("b") == [1]
+
+
+class TestSeek:
+    """Tests for InputPlayer checkpointing and seek."""
+
+    def test_stream_records_checkpoints(self, tmp_path, movie):
+        emu = FrameEmu()
+        store = CheckpointStore(tmp_path)
+        player = InputPlayer(emu, checkpoints=store, checkpoint_interval=500)
+        assert player.stream(movie) is True
+        assert emu.frame == 2000
+        assert store.frames(movie.movie_hash) == [500, 1000, 1500, 2000]
+
+    def test_seek_replays_only_remainder(self, tmp_path, movie):
+        emu = FrameEmu()
+        store = CheckpointStore(tmp_path)
+        player = InputPlayer(emu, checkpoints=store, checkpoint_interval=500)
+        player.stream(movie)
+
+        emu.stepped = 0
+        assert player.seek(movie, 1730) is True
+        assert emu.frame == 1730
+        assert emu.stepped == 230
+        assert player.current_frame == 1730
+
+    def test_seek_without_checkpoint_uses_start_state(self, tmp_path, movie):
+        emu = FrameEmu()
+        player = InputPlayer(emu, checkpoints=CheckpointStore(tmp_path), checkpoint_interval=500)
+        assert player.seek(movie, 700) is True
+        assert emu.loaded == ["baseline_1"]
+        assert emu.frame == 700
+        # The first seek fills in checkpoints on the way.
+        assert player._checkpoints.frames(movie.movie_hash) == [500]
+
+    def test_seek_without_store(self, movie):
+        emu = FrameEmu()
+        assert InputPlayer(emu).seek(movie, 42) is True
+        assert emu.frame == 42
+
+    def test_different_movies_do_not_share(self, tmp_path, movie):
+        emu = FrameEmu()
+        store = CheckpointStore(tmp_path)
+        InputPlayer(emu, checkpoints=store, checkpoint_interval=500).stream(movie)
+        other = InputMovie(movie.name, list(movie.runs), start_state="other")
+        assert store.nearest(other.movie_hash, 1500) is None
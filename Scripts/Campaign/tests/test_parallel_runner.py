@@ -0,0 +1,240 @@
+"""Tests for parallel_runner module.
+
+Focus: Goal A.1-A.5 - running campaign jobs across several Mesen2 instances.
+"""
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from scripts.campaign import parallel_runner
+from scripts.campaign.parallel_runner import (
+    STATUS_CRASHED,
+    STATUS_FAILED,
+    STATUS_PASSED,
+    STATUS_UNSCHEDULED,
+    InstanceInfo,
+    JobOutcome,
+    ParallelCampaignRunner,
+    RunnerJob,
+    discover_instances,
+    execute_job,
+)
+
+
+def threads(n):
+    return ThreadPoolExecutor(max_workers=n)
+
+
+def make_instances(*names):
+    return [InstanceInfo(name, f"/tmp/{name}.sock") for name in names]
+
+
+class FakeFleet:
+    """Job function + health check over a set of fake instances."""
+
+    def __init__(self, crash_on=(), dead=(), fail_jobs=()):
+        self.crash_on = set(crash_on)
+        self.dead = set(dead)
+        self.fail_jobs = set(fail_jobs)
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def job_fn(self, job, instance):
+        with self.lock:
+            self.calls.append((job.job_id, instance.name))
+        if instance.name in self.crash_on:
+            self.dead.add(instance.name)
+            return JobOutcome(job.job_id, job.kind, STATUS_CRASHED, instance.name, error="socket closed")
+        status = STATUS_FAILED if job.job_id in self.fail_jobs else STATUS_PASSED
+        return JobOutcome(job.job_id, job.kind, status, instance.name)
+
+    def health(self, instance):
+        return instance.name not in self.dead
+
+
+def runner_for(fleet, instances, **kwargs):
+    return ParallelCampaignRunner(
+        instances,
+        claim=False,
+        health_check=fleet.health,
+        job_fn=fleet.job_fn,
+        executor_factory=threads,
+        **kwargs,
+    )
+
+
+class TestScheduling:
+    """Tests for ParallelCampaignRunner.run."""
+
+    def test_all_jobs_run(self):
+        fleet = FakeFleet()
+        jobs = [RunnerJob(f"j{i}", "scenario") for i in range(6)]
+        report = runner_for(fleet, make_instances("a", "b", "c")).run(jobs)
+        assert report.counts() == {STATUS_PASSED: 6}
+        assert report.all_passed
+        assert {name for _, name in fleet.calls} <= {"a", "b", "c"}
+
+    def test_crash_retries_on_other_instance(self):
+        fleet = FakeFleet(crash_on={"a"})
+        jobs = [RunnerJob(f"j{i}", "scenario") for i in range(4)]
+        report = runner_for(fleet, make_instances("a", "b")).run(jobs)
+        assert report.counts() == {STATUS_PASSED: 4}
+        assert report.retired_instances == ["a"]
+        assert report.retries == 1
+        retried = [o for o in report.outcomes if o.attempt == 2]
+        assert len(retried) == 1
+        assert retried[0].tried_instances == ["a", "b"]
+
+    def test_retry_waits_for_untried_instance(self):
+        # "a" crashes once but stays healthy and is free again first; the
+        # retry must wait for "b" rather than rerun on "a".
+        calls = []
+        b_may_finish = threading.Event()
+
+        def job_fn(job, instance):
+            calls.append((job.job_id, instance.name))
+            if instance.name == "b" and job.job_id == "slow":
+                b_may_finish.wait(5)
+            if (job.job_id, instance.name) == ("flaky", "a"):
+                return JobOutcome(job.job_id, job.kind, STATUS_CRASHED, instance.name)
+            return JobOutcome(job.job_id, job.kind, STATUS_PASSED, instance.name)
+
+        def health(instance):
+            b_may_finish.set()
+            return True
+
+        runner = ParallelCampaignRunner(
+            make_instances("a", "b"), claim=False, health_check=health,
+            job_fn=job_fn, executor_factory=threads,
+        )
+        report = runner.run([RunnerJob("flaky", "scenario"), RunnerJob("slow", "scenario")])
+        assert report.counts() == {STATUS_PASSED: 2}
+        assert [name for job_id, name in calls if job_id == "flaky"] == ["a", "b"]
+
+    def test_retry_falls_back_to_tried_instance(self):
+        calls = []
+
+        def job_fn(job, instance):
+            calls.append(instance.name)
+            status = STATUS_CRASHED if len(calls) == 1 else STATUS_PASSED
+            return JobOutcome(job.job_id, job.kind, status, instance.name)
+
+        runner = ParallelCampaignRunner(
+            make_instances("a"), claim=False, health_check=lambda i: True,
+            job_fn=job_fn, executor_factory=threads,
+        )
+        report = runner.run([RunnerJob("j", "scenario")])
+        assert report.outcomes[0].passed
+        assert calls == ["a", "a"]
+
+    def test_unhealthy_instances_skipped(self):
+        fleet = FakeFleet(dead={"a"})
+        report = runner_for(fleet, make_instances("a", "b")).run([RunnerJob("j", "scenario")])
+        assert report.instances == ["b"]
+        assert fleet.calls == [("j", "b")]
+
+    def test_no_instances_left(self):
+        fleet = FakeFleet(crash_on={"a"})
+        jobs = [RunnerJob("j1", "scenario", max_attempts=3), RunnerJob("j2", "scenario")]
+        report = runner_for(fleet, make_instances("a")).run(jobs)
+        statuses = {o.job_id: o.status for o in report.outcomes}
+        assert statuses["j1"] == STATUS_UNSCHEDULED
+        assert statuses["j2"] == STATUS_UNSCHEDULED
+        assert not report.all_passed
+
+    def test_plain_failure_not_retried(self):
+        fleet = FakeFleet(fail_jobs={"bad"})
+        report = runner_for(fleet, make_instances("a", "b")).run([RunnerJob("bad", "scenario")])
+        assert report.retries == 0
+        assert report.outcomes[0].status == STATUS_FAILED
+        assert len(fleet.calls) == 1
+
+    def test_crash_exhausts_attempts(self):
+        fleet = FakeFleet(crash_on={"a", "b"})
+        report = runner_for(fleet, make_instances("a", "b", "c")).run(
+            [RunnerJob("j", "scenario", max_attempts=2)]
+        )
+        # Two attempts on a and b, both crash; c is never needed.
+        assert report.outcomes[0].status == STATUS_CRASHED
+        assert report.outcomes[0].tried_instances == ["a", "b"]
+
+    def test_progress_callback(self):
+        fleet = FakeFleet()
+        seen = []
+        runner = runner_for(fleet, make_instances("a"), progress_callback=lambda o, r: seen.append(o.job_id))
+        runner.run([RunnerJob("x", "scenario"), RunnerJob("y", "scenario")])
+        assert sorted(seen) == ["x", "y"]
+
+    def test_worker_exception_counts_as_crash(self):
+        calls = []
+
+        def job_fn(job, instance):
+            calls.append(instance.name)
+            if len(calls) == 1:
+                raise ConnectionError("boom")
+            return JobOutcome(job.job_id, job.kind, STATUS_PASSED, instance.name)
+
+        runner = ParallelCampaignRunner(
+            make_instances("a", "b"), claim=False, health_check=lambda i: True,
+            job_fn=job_fn, executor_factory=threads,
+        )
+        report = runner.run([RunnerJob("j", "scenario")])
+        assert report.outcomes[0].passed
+        assert calls == ["a", "b"]
+
+
+class TestReport:
+    """Tests for RunReport merging."""
+
+    def test_merged_milestones(self):
+        fleet = FakeFleet()
+        runner = runner_for(fleet, make_instances("a"))
+        report = runner.run([])
+        report.outcomes = [
+            JobOutcome("c1", "campaign", STATUS_PASSED, "a",
+                       result={"milestones": {"m1": {"status": "COMPLETED"}, "m2": {"status": "NOT_STARTED"}}}),
+            JobOutcome("c2", "campaign", STATUS_PASSED, "a",
+                       result={"milestones": {"m1": {"status": "COMPLETED"}}}),
+        ]
+        assert report.merged_milestones() == {"m1": 2}
+        data = report.to_dict()
+        assert data["per_instance"] == {"a": {STATUS_PASSED: 2}}
+        json.dumps(data)
+        assert "PARALLEL CAMPAIGN RUN" in report.summary()
+
+
+class TestExecuteJob:
+    """Tests for the worker entry point."""
+
+    def test_unknown_kind(self):
+        outcome = execute_job(RunnerJob("j", "bogus"), make_instances("a")[0])
+        assert outcome.status == STATUS_FAILED
+
+    def test_handler_errors_classified(self, monkeypatch):
+        def crash(params, instance):
+            raise ConnectionError("gone")
+
+        def bug(params, instance):
+            raise KeyError("path")
+
+        monkeypatch.setitem(parallel_runner.JOB_HANDLERS, "scenario", crash)
+        assert execute_job(RunnerJob("j", "scenario"), make_instances("a")[0]).status == STATUS_CRASHED
+        monkeypatch.setitem(parallel_runner.JOB_HANDLERS, "scenario", bug)
+        assert execute_job(RunnerJob("j", "scenario"), make_instances("a")[0]).status == STATUS_FAILED
+
+
+class TestDiscovery:
+    """Tests for registry discovery."""
+
+    def test_reads_registry_records(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("MESEN2_REGISTRY_DIR", str(tmp_path))
+        (tmp_path / "a.json").write_text(json.dumps({"instance": "a", "socket": "/tmp/a.sock", "alive": True}))
+        (tmp_path / "b.json").write_text(json.dumps({"instance": "b", "socket": "/tmp/b.sock", "alive": False}))
+        (tmp_path / "c.json").write_text(json.dumps({"instance": "c"}))
+        (tmp_path / "broken.json").write_text("{")
+        assert [i.name for i in discover_instances()] == ["a"]
+        assert [i.name for i in discover_instances(include_dead=True)] == ["a", "b"]
+        assert discover_instances(["b"]) == []
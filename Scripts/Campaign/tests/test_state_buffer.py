@@ -0,0 +1,141 @@
+"""Tests for state_buffer module.
+
+Focus: Goal D.1 - columnar snapshot history and windowed change detection.
+"""
+
+from dataclasses import replace
+
+import pytest
+
+from scripts.campaign.game_state import GamePhase, GameStateParser
+from scripts.campaign.state_buffer import SnapshotBuffer
+
+
+def stream(base, count, start=0.0, step=1 / 60, **overrides):
+    return [replace(base, timestamp=start + i * step, **overrides) for i in range(count)]
+
+
+class TestRing:
+    """Tests for ring storage and windows."""
+
+    def test_wraps_at_capacity(self, sample_overworld_state):
+        buf = SnapshotBuffer(capacity=8)
+        for i in range(20):
+            buf.append(replace(sample_overworld_state, timestamp=float(i), link_x=i))
+        assert len(buf) == 8
+        assert list(buf.column("x")) == list(range(12, 20))
+        assert list(buf.column("x", last=3)) == [17, 18, 19]
+        assert buf.latest()["x"] == 19
+
+    def test_seconds_window(self, sample_overworld_state):
+        buf = SnapshotBuffer(capacity=1000)
+        buf.extend(stream(sample_overworld_state, 600, step=1 / 60))
+        assert buf.window_size(seconds=1.0) == 61
+        assert len(buf.timestamps(seconds=0.5)) == 31
+
+    def test_clear(self, sample_overworld_state):
+        buf = SnapshotBuffer(capacity=4)
+        buf.extend(stream(sample_overworld_state, 3))
+        buf.clear()
+        assert len(buf) == 0
+        assert buf.latest() is None
+
+    def test_unknown_column(self):
+        with pytest.raises(KeyError):
+            SnapshotBuffer(4).column("nope")
+
+    def test_room_id_from_raw_data(self, sample_overworld_state):
+        buf = SnapshotBuffer(4)
+        buf.append(replace(sample_overworld_state, room=0x12, raw_data={"room_id": 0x112}))
+        assert buf.latest()["room"] == 0x112
+
+
+class TestQueries:
+    """Tests for window predicates."""
+
+    def test_first_time_dark(self, sample_overworld_state, sample_black_screen_state):
+        buf = SnapshotBuffer(capacity=60 * 60)
+        buf.extend(stream(sample_overworld_state, 300))
+        buf.extend(stream(sample_black_screen_state, 30, start=5.0))
+        assert buf.first_time("inidisp", 0x80, seconds=10) == pytest.approx(5.0)
+        assert buf.first_time("inidisp", 0x80, last=100) == pytest.approx(5.0)
+        assert buf.first_time("inidisp", 0x80, last=10) == pytest.approx(5.0 + 20 / 60)
+        assert buf.first_time("inidisp", 0x42) is None
+
+    def test_all_in_and_constant(self, sample_overworld_state):
+        buf = SnapshotBuffer(16)
+        buf.extend(stream(sample_overworld_state, 5, link_state=0x01))
+        buf.append(replace(sample_overworld_state, link_state=0x11, link_x=0x1FF))
+        assert buf.all_in("link_state", (0x01,), last=5) is False
+        assert buf.all_in("link_state", (0x01, 0x11)) is True
+        assert buf.all_in("x", (384, 0x1FF)) is True
+        assert buf.is_constant("y") is True
+        assert buf.is_constant("x") is False
+
+    def test_transitions(self, sample_overworld_state):
+        buf = SnapshotBuffer(16)
+        buf.extend(stream(sample_overworld_state, 3, area=0x29))
+        buf.extend(stream(sample_overworld_state, 3, start=1.0, area=0x2A))
+        assert buf.transitions("area") == [(1.0, 0x29, 0x2A)]
+
+    def test_position_jumps(self, sample_overworld_state):
+        buf = SnapshotBuffer(16)
+        for i, x in enumerate((100, 110, 140, 141)):
+            buf.append(replace(sample_overworld_state, timestamp=float(i), link_x=x))
+        assert buf.position_jumps(16) == [2]
+
+
+class TestParserWindow:
+    """Tests for GameStateParser window helpers."""
+
+    def test_phases_match_scalar_parser(self, sample_overworld_state, sample_black_screen_state):
+        samples = [
+            sample_overworld_state,
+            replace(sample_overworld_state, mode=0x07, indoors=True),
+            replace(sample_overworld_state, mode=0x07, indoors=False),
+            replace(sample_overworld_state, mode=0x0E),
+            replace(sample_overworld_state, mode=0x42),
+            sample_black_screen_state,
+            replace(sample_black_screen_state, mode=0x06),
+        ]
+        buf = SnapshotBuffer(16)
+        buf.extend(samples)
+        parser = GameStateParser()
+        assert parser.classify_phases(buf) == [parser.parse(s).phase for s in samples]
+
+    def test_detect_changes_matches_pairwise(self, sample_overworld_state, sample_black_screen_state):
+        samples = [
+            sample_overworld_state,
+            replace(sample_overworld_state, timestamp=1001.0, link_x=500),
+            replace(sample_overworld_state, timestamp=1001.5, link_state=0x01),
+            replace(sample_black_screen_state, timestamp=1002.0),
+            replace(sample_overworld_state, timestamp=1003.0, area=0x2A),
+        ]
+        buf = SnapshotBuffer(16)
+        buf.extend(samples)
+
+        scalar = GameStateParser()
+        expected = []
+        previous = None
+        for snap in samples:
+            parsed = scalar.parse(snap)
+            if previous is not None:
+                scalar._last_state = previous
+                expected.extend((snap.timestamp, c) for c in scalar.detect_change(parsed))
+            previous = parsed
+
+        assert GameStateParser().detect_changes(buf) == expected
+        assert (1002.0, "BLACK SCREEN DETECTED") in expected
+
+    def test_window_limits_changes(self, sample_overworld_state):
+        buf = SnapshotBuffer(64)
+        buf.extend(stream(sample_overworld_state, 30, area=0x28))
+        buf.extend(stream(sample_overworld_state, 30, start=10.0, area=0x29))
+        assert GameStateParser().detect_changes(buf, seconds=5) == []
+        changes = GameStateParser().detect_changes(buf)
+        assert changes == [(10.0, "Area: 0x28 -> 0x29")]
+
+    def test_phase_codes(self, sample_overworld_state):
+        buf = SnapshotBuffer(4)
+        buf.append(sample_overworld_state)
+        assert buf.phases() == bytes([GamePhase.OVERWORLD])
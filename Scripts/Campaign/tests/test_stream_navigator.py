@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""Tests for stream_navigator module.
+
+Focus: Goal A.2 - closed-loop streamed navigation (frame-accurate holds,
+single-read position probe, correction only on deviation).
+"""
+
+import pytest
+from unittest.mock import MagicMock
+
+from scripts.campaign.input_recorder import Button
+from scripts.campaign.overworld_navigator import (
+    NavigationMode,
+    NavigationStatus,
+    OverworldNavigator,
+)
+from scripts.campaign.stream_navigator import (
+    InputSegment,
+    PositionProbe,
+    StreamNavigator,
+    StreamStatus,
+    plan_path_segments,
+    plan_segments,
+    segments_to_sequence,
+)
+
+
+class SimBridge:
+    """Tiny emulator model: holds move Link at a fixed speed per frame."""
+
+    def __init__(self, x=100, y=100, mode=0x09, speed=2, walls=None):
+        self.x = x
+        self.y = y
+        self.mode = mode
+        self.speed = speed
+        self.walls = walls or []  # callables (x, y) -> blocked
+        self.hold = None
+        self.hold_left = 0
+        self.inputs = []
+        self.block_reads = 0
+
+    def press_button(self, buttons, frames=5, player=0):
+        self.inputs.append((buttons, frames))
+        self.hold = buttons
+        self.hold_left = frames
+        return True
+
+    def run_frames(self, count=1):
+        vec = {"UP": (0, -1), "DOWN": (0, 1), "LEFT": (-1, 0), "RIGHT": (1, 0)}
+        for _ in range(count):
+            if self.hold_left <= 0 or not self.hold:
+                return True
+            dx, dy = vec[self.hold]
+            nx, ny = self.x + dx * self.speed, self.y + dy * self.speed
+            if not any(w(nx, ny) for w in self.walls):
+                self.x, self.y = nx, ny
+            self.hold_left -= 1
+        return True
+
+    def read_block(self, address, length):
+        self.block_reads += 1
+        data = bytearray(length)
+        data[0x00] = self.mode
+        data[0x10] = self.y & 0xFF
+        data[0x11] = (self.y >> 8) & 0xFF
+        data[0x12] = self.x & 0xFF
+        data[0x13] = (self.x >> 8) & 0xFF
+        return bytes(data)
+
+
+class TestPlanning:
+    """Tests for segment planning."""
+
+    def test_plan_segments_major_axis_first(self):
+        segs = plan_segments((0, 0), (16, 64), speed=1.6)
+        assert [s.direction for s in segs] == ["DOWN", "RIGHT"]
+        assert segs[0].frames == 40
+        assert segs[1].frames == 10
+
+    def test_plan_segments_zero_delta(self):
+        assert plan_segments((5, 5), (5, 5)) == []
+
+    def test_plan_path_merges_collinear_holds(self):
+        segs = plan_path_segments((0, 0), [(32, 0), (64, 0)], speed=2.0)
+        assert len(segs) == 1
+        assert segs[0].direction == "RIGHT"
+        assert segs[0].frames == 32
+        assert segs[0].end == (64, 0)
+
+    def test_segments_to_sequence_is_frame_accurate(self):
+        segs = [
+            InputSegment("RIGHT", 20, (0, 0), (32, 0)),
+            InputSegment("DOWN", 10, (32, 0), (32, 16)),
+        ]
+        seq = segments_to_sequence(segs)
+        assert seq.total_frames == 30
+        assert seq.frames[1].frame_number == 20
+        assert seq.frames[1].buttons == Button.DOWN
+
+
+class TestPositionProbe:
+    """Tests for the single-read position probe."""
+
+    def test_probe_uses_single_block_read(self):
+        bridge = SimBridge(x=3320, y=3688)
+        sample = PositionProbe(bridge).read()
+        assert sample.position == (3320, 3688)
+        assert sample.game_mode == 0x09
+        assert bridge.block_reads == 1
+
+    def test_probe_falls_back_to_word_reads(self):
+        bridge = MagicMock(spec=["read_memory", "read_memory16"])
+        bridge.read_memory.return_value = 0x09
+        bridge.read_memory16.side_effect = lambda addr: 500 if addr == 0x7E0022 else 600
+        sample = PositionProbe(bridge).read()
+        assert sample.position == (500, 600)
+
+    def test_probe_ignores_short_block(self):
+        bridge = MagicMock()
+        bridge.read_block.return_value = b"\x09"
+        bridge.read_memory.return_value = 0x07
+        bridge.read_memory16.return_value = 42
+        sample = PositionProbe(bridge).read()
+        assert sample.game_mode == 0x07
+        assert sample.position == (42, 42)
+
+
+class TestStreamNavigator:
+    """Tests for closed-loop streamed navigation."""
+
+    def test_open_path_needs_no_corrections(self):
+        bridge = SimBridge(speed=2)
+        nav = StreamNavigator(bridge, speed=2.0)
+        result = nav.navigate_to(164, 100)
+        assert result.success
+        assert result.corrections == 0
+        assert result.segments_sent == 1
+        assert bridge.inputs == [("RIGHT", 32)]
+
+    def test_frames_approach_walking_time(self):
+        bridge = SimBridge(speed=2)
+        nav = StreamNavigator(bridge, speed=2.0)
+        result = nav.navigate_to(300, 260)
+        assert result.success
+        # 200 + 160 px at 2 px/frame = 180 frames of walking.
+        assert result.frames_elapsed <= 190
+
+    def test_speed_mismatch_corrected(self):
+        bridge = SimBridge(speed=1)
+        nav = StreamNavigator(bridge, speed=2.0, arrival_threshold=4)
+        result = nav.navigate_to(164, 100)
+        assert result.success
+        assert result.corrections >= 1
+        assert abs(bridge.x - 164) <= 4
+
+    def test_early_arrival_releases_rest_of_hold(self):
+        bridge = SimBridge(speed=3)
+        nav = StreamNavigator(bridge, speed=1.6)
+        result = nav.navigate_to(164, 100)
+        assert result.success
+        assert bridge.inputs == [("RIGHT", 40), ("", 1)]
+        bridge.run_frames(40)
+        assert bridge.x - 164 <= nav.probe_interval * 3
+
+    def test_blocked_reports_stuck(self):
+        bridge = SimBridge(speed=2, walls=[lambda x, y: x > 130])
+        nav = StreamNavigator(bridge, speed=2.0, max_corrections=3)
+        result = nav.navigate_to(200, 100)
+        assert result.status == StreamStatus.FAILED_STUCK
+        assert not result.success
+
+    def test_wrong_mode(self):
+        bridge = SimBridge(mode=0x0E)
+        result = StreamNavigator(bridge).navigate_to(200, 100)
+        assert result.status == StreamStatus.FAILED_WRONG_MODE
+        assert bridge.inputs == []
+
+    def test_follow_path_through_waypoints(self):
+        bridge = SimBridge(speed=2)
+        nav = StreamNavigator(bridge, speed=2.0)
+        result = nav.follow_path([(140, 100), (140, 140), (180, 140)])
+        assert result.success
+        assert [b for b, _ in bridge.inputs] == ["RIGHT", "DOWN", "RIGHT"]
+
+    def test_result_to_dict(self):
+        bridge = SimBridge(speed=2)
+        data = StreamNavigator(bridge, speed=2.0).navigate_to(120, 100).to_dict()
+        assert data["status"] == "SUCCESS"
+        assert data["target_position"] == (120, 100)
+
+
+class TestNavigatorIntegration:
+    """Tests for the STREAMED mode on existing navigators."""
+
+    def test_overworld_streamed_mode(self):
+        bridge = SimBridge(x=3320, y=3688, speed=2)
+        nav = OverworldNavigator(bridge)
+        result = nav.navigate_to_coordinates(3400, 3688, mode=NavigationMode.STREAMED)
+        assert result.status == NavigationStatus.SUCCESS
+        assert result.end_position[0] >= 3400 - 16
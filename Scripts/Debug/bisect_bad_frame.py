@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""Find the first frame at which a condition turns bad, by savestate bisection.
+
+Loads a start state, runs forward saving states at exponentially spaced
+frames (1, 2, 4, ...) until the predicate reports bad, then binary-searches
+between the last good and first bad checkpoint, replaying only the span it
+needs (see mesen2_client_lib/frame_bisect.py). 10,000 frames are localized in
+about 30 predicate reads instead of a per-frame scan.
+
+The emulator is left paused on the first bad frame, and the report names the
+state one frame earlier, ready for instruction stepping (e.g.
+repro_stack_corruption.py --step-after-save).
+
+Predicates (pick one):
+    --sp                    SP left the $01xx page
+    --expr "mem($7E0010) >= $1A"
+                            expr.py expression is non-zero (symbols resolve
+                            through the Oracle symbol table)
+    --mode 0x1B,0x1C        game mode ($7E0010) is one of the values
+    --black-screen          INIDISPQ == $80 in game mode $06/$07 (the
+                            transition-blackout signature)
+                            (use --confirm to ignore normal transition blanks)
+
+Usage:
+    python3 bisect_bad_frame.py --slot 1 --sp --frames 10000
+    python3 bisect_bad_frame.py --state hang.mss --black-screen --confirm 30 -o report.json
+
+Exit code: 0 when a bad frame was found, 2 when the window stayed good,
+1 on setup errors.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+MESEN2_DIR = Path(__file__).resolve().parents[1] / "Mesen2"
+if str(MESEN2_DIR) not in sys.path:
+    sys.path.insert(0, str(MESEN2_DIR))
+
+from mesen2_client_lib.bridge import MesenBridge  # noqa: E402
+from mesen2_client_lib.expr import ExprError  # noqa: E402
+from mesen2_client_lib.frame_bisect import (  # noqa: E402
+    BridgeFrames,
+    FrameBisectError,
+    FrameBisector,
+    black_screen,
+    expr_true,
+    mode_in,
+    sp_corrupt,
+)
+
+
+def _symbol_resolver(bridge: MesenBridge):
+    from mesen2_client_lib.state_symbols import load_oos_symbols
+
+    table = load_oos_symbols()
+
+    def resolve(name: str) -> int:
+        symbol = table.lookup_by_label(name)
+        if not symbol:
+            raise ExprError(f"Unknown symbol: {name}")
+        if symbol.size >= 2:
+            return bridge.read_memory16(symbol.address)
+        return bridge.read_memory(symbol.address)
+
+    return resolve
+
+
+def _build_predicate(args: argparse.Namespace, bridge: MesenBridge):
+    if args.sp:
+        return sp_corrupt(bridge), "sp"
+    if args.expr:
+        return expr_true(bridge, args.expr, _symbol_resolver(bridge)), f"expr:{args.expr}"
+    if args.mode:
+        modes = [int(value, 0) for value in args.mode.split(",") if value.strip()]
+        return mode_in(bridge, modes), f"mode:{args.mode}"
+    return black_screen(bridge), "black_screen"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Savestate bisection for the first bad frame",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    start = parser.add_mutually_exclusive_group(required=True)
+    start.add_argument("--slot", type=int, help="Save state slot to start from")
+    start.add_argument("--state", type=Path, help="Save state file to start from")
+    start.add_argument("--current", action="store_true", help="Start from the emulator's current state")
+    predicate = parser.add_mutually_exclusive_group(required=True)
+    predicate.add_argument("--sp", action="store_true", help="Bad when SP leaves $0100-$01FF")
+    predicate.add_argument("--expr", help="Bad when this expr.py expression is non-zero")
+    predicate.add_argument("--mode", help="Bad when $7E0010 is one of these (comma-separated)")
+    predicate.add_argument("--black-screen", action="store_true", help="Bad when INIDISPQ is $80 in game mode $06/$07")
+    parser.add_argument("--frames", type=int, default=10000, help="Frames to search (default: 10000)")
+    parser.add_argument("--confirm", type=int, default=1,
+                        help="Frames the predicate must hold to count as bad (default: 1)")
+    parser.add_argument("--first-interval", type=int, default=1,
+                        help="First checkpoint offset in frames (default: 1)")
+    parser.add_argument("--state-dir", type=Path, default=None,
+                        help="Where checkpoints are written (default: a temp directory)")
+    parser.add_argument("--keep-checkpoints", action="store_true",
+                        help="Keep intermediate checkpoints, not just the last-good/first-bad pair")
+    parser.add_argument("--socket", default=None, help="Mesen2 socket path override")
+    parser.add_argument("--output", "-o", type=Path, default=None, help="JSON report path (default: stdout)")
+    args = parser.parse_args()
+
+    bridge = MesenBridge(socket_path=args.socket)
+    if bridge.socket_path is None or not bridge.send_command("PING").get("success"):
+        print("Error: No Mesen2 instance found", file=sys.stderr)
+        return 1
+
+    try:
+        check, label = _build_predicate(args, bridge)
+    except (ExprError, ValueError) as exc:
+        print(f"Error: invalid predicate: {exc}", file=sys.stderr)
+        return 1
+
+    frames = BridgeFrames(bridge)
+    if args.slot is not None and not bridge.load_state(slot=args.slot):
+        print(f"Error: failed to load state slot {args.slot}", file=sys.stderr)
+        return 1
+    if args.state is not None and not bridge.load_state(path=str(args.state)):
+        print(f"Error: failed to load state {args.state}", file=sys.stderr)
+        return 1
+
+    state_dir = args.state_dir or Path(tempfile.mkdtemp(prefix="oos_frame_bisect_"))
+    start_frame = frames.frame_counter()
+    bisector = FrameBisector(frames, check, state_dir, confirm=args.confirm)
+    try:
+        result = bisector.run(args.frames, first_interval=args.first_interval)
+    except FrameBisectError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    if not args.keep_checkpoints:
+        bisector.discard_checkpoints(result)
+
+    report = {"predicate": label, "confirm": args.confirm, "start_frame_counter": start_frame}
+    report.update(result.to_json())
+    if result.found:
+        report["cpu"] = bridge.get_cpu_state()
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n")
+        print(f"Report written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+    if not result.found:
+        print(f"\nPredicate stayed good for {args.frames} frames", file=sys.stderr)
+        return 2
+    print(
+        f"\nFirst bad frame: +{result.first_bad_frame} "
+        f"({len(result.probes)} probes, {result.loads} loads, {result.frames_run} frames run)",
+        file=sys.stderr,
+    )
+    if result.last_good is not None:
+        print(f"Last good state: {result.last_good.path}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,21 +10,49 @@ It assumes:
   - disabling all candidate flags fixes it (exit code 0)
 
 If either assumption doesn't hold, it prints guidance and exits non-zero.
+
+With --jobs N, candidate subsets of each ddmin round are evaluated
+concurrently. Each worker slot owns a sandbox worktree
+(Build/sandbox_runner.sh, named <instance>-<k>) checked out at the current
+sources, and builds its flag profile there. The repro then runs on that
+slot's own Mesen2 instance through its explicit socket
+(/tmp/mesen2-<instance>-<k>.sock), hot-loading the slot's ROM.
+ddmin still picks the first passing subset in chunk order, so the result
+matches a serial run.
+
+Predicate results are cached across sessions under .cache/bisect_flags/.
+The cache key covers the source tree hash, the flag set, the seed and the
+repro parameters. The source hash is the tree of `git stash create` (or
+HEAD), so untracked files are not part of it; use --no-cache after
+changing them. Built ROMs are cached next to the results, keyed the same
+way minus the repro parameters; with --no-cache they stay in the slot's
+worktree.
 """
 
 from __future__ import annotations
 
 import argparse
+import dataclasses
+import hashlib
 import json
 import os
+import queue
+import shutil
 import subprocess
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Callable, Optional
 
 
 REPO_ROOT = Path(__file__).resolve().parent.parent
+GIT_ROOT = Path(__file__).resolve().parents[2]
+SANDBOX_RUNNER = REPO_ROOT / "Build" / "sandbox_runner.sh"
+CACHE_DIR = GIT_ROOT / ".cache" / "bisect_flags"
+CACHE_VERSION = 1
+BUILD_TIMEOUT_S = 240
 
 
 def _csv(items: list[str]) -> str:
@@ -56,13 +84,14 @@ class TestConfig:
     max_frames: int
     poll_every: int
     no_capture: bool
+    rom: str | None = None  # prebuilt ROM (parallel slots); None = build in-tree
 
 
 def run_repro(cfg: TestConfig) -> int:
     cmd = [
         sys.executable,
         "Scripts/repro_blackout_transition.py",
-        "--build",
+        *(["--rom", str(cfg.rom)] if cfg.rom else ["--build"]),
         "--version",
         str(cfg.version),
         "--instance",
@@ -129,6 +158,7 @@ def is_fixed(
                 "disable": cfg.disable,
                 "enable": cfg.enable,
                 "profile": cfg.profile,
+                "instance": cfg.instance,
                 "rc": rc,
                 "seconds": round(dt, 2),
             }
@@ -145,8 +175,24 @@ def is_fixed(
     return True
 
 
-def ddmin(disable_set: list[str], test_fixed) -> list[str]:
-    """Classic ddmin on a set where predicate is 'fixed when these are disabled'."""
+def first_fixed(
+    subsets: list[list[str]],
+    test_fixed: Callable[[list[str]], bool],
+    test_many: Optional[Callable[[list[list[str]]], list[bool]]],
+) -> Optional[list[str]]:
+    """First subset (in order) that is fixed; batch-evaluated when test_many is given."""
+    if test_many is None:
+        return next((c for c in subsets if test_fixed(c)), None)
+    results = test_many(subsets)
+    return next((c for c, fixed in zip(subsets, results) if fixed), None)
+
+
+def ddmin(disable_set: list[str], test_fixed, test_many=None) -> list[str]:
+    """Classic ddmin on a set where predicate is 'fixed when these are disabled'.
+
+    With `test_many`, each round's chunks (then complements) are evaluated as
+    one batch; the first fixed one in order wins, as in the serial loop.
+    """
     n = 2
     current = list(disable_set)
     while len(current) >= 2:
@@ -155,27 +201,19 @@ def ddmin(disable_set: list[str], test_fixed) -> list[str]:
         for i in range(0, len(current), chunk_size):
             chunks.append(current[i : i + chunk_size])
 
-        reduced = False
-
         # 1) Try disabling only a chunk
-        for c in chunks:
-            if test_fixed(c):
-                current = c
-                n = 2
-                reduced = True
-                break
-        if reduced:
+        found = first_fixed(chunks, test_fixed, test_many)
+        if found is not None:
+            current = found
+            n = 2
             continue
 
         # 2) Try disabling everything except a chunk (i.e. remove c from current)
-        for c in chunks:
-            complement = [x for x in current if x not in c]
-            if test_fixed(complement):
-                current = complement
-                n = max(2, n - 1)
-                reduced = True
-                break
-        if reduced:
+        complements = [[x for x in current if x not in c] for c in chunks]
+        found = first_fixed(complements, test_fixed, test_many)
+        if found is not None:
+            current = found
+            n = max(2, n - 1)
             continue
 
         if n >= len(current):
@@ -185,6 +223,211 @@ def ddmin(disable_set: list[str], test_fixed) -> list[str]:
     return current
 
 
+def _git(*args: str) -> str:
+    r = subprocess.run(["git", "-C", str(GIT_ROOT), *args], capture_output=True, text=True)
+    if r.returncode != 0:
+        raise RuntimeError(f"git {' '.join(args)} failed: {r.stderr.strip()}")
+    return r.stdout.strip()
+
+
+def source_revision() -> tuple[str, str]:
+    """(commit, tree hash) for the working tree's tracked sources."""
+    rev = _git("stash", "create") or _git("rev-parse", "HEAD")
+    return rev, _git("rev-parse", f"{rev}^{{tree}}")
+
+
+def _digest(payload: object) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+@dataclass
+class Slot:
+    instance: str
+    worktree: Path | None = None  # None = build in-tree via repro --build
+
+
+class FlagBisector:
+    """Cached, optionally concurrent evaluation of the 'fixed' predicate."""
+
+    def __init__(
+        self,
+        base_cfg: TestConfig,
+        *,
+        runs: int,
+        sleep_s: float,
+        log: list[dict],
+        jobs: int = 1,
+        source: tuple[str, str] | None = None,
+        cache_dir: Path | None = CACHE_DIR,
+    ) -> None:
+        self.base_cfg = base_cfg
+        self.runs = runs
+        self.sleep_s = sleep_s
+        self.log = log
+        self.jobs = max(1, jobs)
+        self.source_rev, self.source_tree = source or ("", "")
+        self.cache_dir = cache_dir if self.source_tree else None
+        self.cache_hits = 0
+        self._slots: "queue.Queue[Slot]" = queue.Queue()
+        if self.jobs == 1:
+            self._slots.put(Slot(base_cfg.instance))
+        else:
+            for k in range(1, self.jobs + 1):
+                self._slots.put(Slot(f"{base_cfg.instance}-{k}"))
+
+    # -- cache ----------------------------------------------------------------
+
+    def build_key(self, disable: list[str]) -> str:
+        cfg = self.base_cfg
+        return _digest([CACHE_VERSION, self.source_tree, cfg.version, cfg.profile,
+                        sorted(cfg.enable), sorted(disable)])
+
+    def predicate_key(self, disable: list[str]) -> str:
+        cfg = self.base_cfg
+        return _digest([self.build_key(disable), self.runs, cfg.seed_slot, cfg.seed_state,
+                        cfg.seed_lib, cfg.press, cfg.press_frames, cfg.settle_frames,
+                        cfg.max_frames, cfg.poll_every])
+
+    def _cached(self, disable: list[str]) -> bool | None:
+        if self.cache_dir is None:
+            return None
+        path = self.cache_dir / f"{self.predicate_key(disable)}.json"
+        try:
+            return bool(json.loads(path.read_text(encoding="utf-8"))["fixed"])
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _store(self, disable: list[str], fixed: bool) -> None:
+        if self.cache_dir is None:
+            return
+        path = self.cache_dir / f"{self.predicate_key(disable)}.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        record = {"fixed": fixed, "disable": sorted(disable), "source_tree": self.source_tree,
+                  "ts": time.strftime("%Y-%m-%dT%H:%M:%S")}
+        temp = path.with_suffix(f".{os.getpid()}.tmp")
+        temp.write_text(json.dumps(record, indent=2) + "\n", encoding="utf-8")
+        os.replace(temp, path)
+
+    # -- slots ----------------------------------------------------------------
+
+    def _prepare(self, slot: Slot) -> None:
+        """Create (or reuse) the slot's sandbox worktree at the source revision."""
+        if self.jobs == 1 or slot.worktree is not None:
+            return
+        if not self.source_rev:
+            raise RuntimeError("--jobs > 1 needs a git checkout (sandbox worktrees).")
+        path = GIT_ROOT.parent / f"oracle-of-secrets-{slot.instance}"
+        if not path.exists():
+            subprocess.run([str(SANDBOX_RUNNER), "--name", slot.instance, "create"],
+                           cwd=GIT_ROOT, check=True, capture_output=True)
+        subprocess.run(["git", "-C", str(path), "checkout", "--quiet", "--force", "--detach",
+                        self.source_rev], check=True)
+        (path / "Roms").mkdir(exist_ok=True)
+        slot.worktree = path
+
+    def _base_rom(self) -> str:
+        if os.environ.get("OOS_BASE_ROM"):
+            return os.environ["OOS_BASE_ROM"]
+        version = self.base_cfg.version
+        default = GIT_ROOT / "Roms" / f"oos{version}.sfc"
+        legacy = GIT_ROOT / "Roms" / f"oos{version}_test2.sfc"
+        return str(default if default.exists() or not legacy.exists() else legacy)
+
+    def _build(self, slot: Slot, disable: list[str]) -> str:
+        """Build this flag profile in the slot's worktree; returns the ROM path.
+
+        With caching on, the ROM is copied into the cache; with --no-cache it
+        is used in place (the slot is held until its repro finishes).
+        """
+        cfg = self.base_cfg
+        assert slot.worktree is not None
+        built = slot.worktree / "Roms" / f"oos{cfg.version}x.sfc"
+        rom = self.cache_dir / "roms" / f"{self.build_key(disable)}.sfc" if self.cache_dir else None
+        if rom is not None and rom.exists():
+            return str(rom)
+        cmd = [str(slot.worktree / "Scripts" / "Build" / "build_rom.sh"), str(cfg.version)]
+        if cfg.profile and cfg.profile != "defaults":
+            cmd += ["--profile", cfg.profile]
+        if cfg.enable:
+            cmd += ["--enable", _csv(cfg.enable)]
+        if disable:
+            cmd += ["--disable", _csv(disable)]
+        env = {**os.environ, "OOS_BASE_ROM": self._base_rom()}
+        try:
+            result = subprocess.run(cmd, cwd=slot.worktree, env=env, timeout=BUILD_TIMEOUT_S)
+        except subprocess.TimeoutExpired as exc:
+            raise RuntimeError(f"Build timed out after {BUILD_TIMEOUT_S}s.") from exc
+        if result.returncode != 0:
+            raise RuntimeError("Build failed (rc=2).")
+        if rom is None:
+            return str(built)
+        rom.parent.mkdir(parents=True, exist_ok=True)
+        temp = rom.with_suffix(f".{os.getpid()}.{slot.instance}.tmp")
+        shutil.copyfile(built, temp)
+        os.replace(temp, rom)
+        return str(rom)
+
+    def _slot_socket(self, slot: Slot) -> str:
+        """The slot's own socket (the path mesen2_launch_instance.sh creates).
+
+        Passed explicitly so the repro never falls back to MESEN2_INSTANCE,
+        the registry or the newest /tmp/mesen2-*.sock, which could be another
+        slot's emulator or the user's own Mesen2.
+        """
+        socket = f"/tmp/mesen2-{slot.instance}.sock"
+        if not self.base_cfg.launch and not Path(socket).exists():
+            raise RuntimeError(
+                f"Slot {slot.instance}: socket {socket} not found "
+                "(start that instance or pass --launch)."
+            )
+        return socket
+
+    # -- predicate ------------------------------------------------------------
+
+    def _evaluate(self, disable: list[str]) -> bool:
+        slot = self._slots.get()
+        try:
+            self._prepare(slot)
+            cfg = dataclasses.replace(self.base_cfg, disable=list(disable), instance=slot.instance)
+            if slot.worktree is not None:
+                socket = self._slot_socket(slot)
+                cfg = dataclasses.replace(cfg, socket=socket, rom=self._build(slot, disable))
+            fixed = is_fixed(cfg, runs=self.runs, sleep_s=self.sleep_s, log=self.log)
+        finally:
+            self._slots.put(slot)
+        self._store(disable, fixed)
+        return fixed
+
+    def test_fixed(self, disable: list[str]) -> bool:
+        return self.test_many([disable])[0]
+
+    def test_many(self, subsets: list[list[str]]) -> list[bool]:
+        """Evaluate subsets (cache first, then up to `jobs` at once), in order."""
+        keys = [tuple(sorted(subset)) for subset in subsets]
+        results: dict[tuple[str, ...], bool] = {}
+        pending: list[tuple[str, ...]] = []
+        for key in dict.fromkeys(keys):
+            cached = self._cached(list(key))
+            if cached is None:
+                pending.append(key)
+            else:
+                self.cache_hits += 1
+                results[key] = cached
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(self.jobs, len(pending))) as pool:
+                for key, fixed in zip(pending, pool.map(lambda k: self._evaluate(list(k)), pending)):
+                    results[key] = fixed
+        return [results[key] for key in keys]
+
+    def cleanup(self) -> None:
+        """Remove the slot worktrees (kept by default for the next session)."""
+        while not self._slots.empty():
+            slot = self._slots.get()
+            if slot.worktree is not None:
+                subprocess.run([str(SANDBOX_RUNNER), "--name", slot.instance, "destroy"],
+                               cwd=GIT_ROOT, check=False)
+
+
 def main() -> int:
     ap = argparse.ArgumentParser(description="Bisect dungeon blackout across feature flags (disable-set minimization).")
     ap.add_argument("--version", type=int, default=168)
@@ -210,6 +453,11 @@ def main() -> int:
     ap.add_argument("--max-frames", type=int, default=1200)
     ap.add_argument("--poll-every", type=int, default=10)
     ap.add_argument("--out", default="", help="Write JSON log here (optional).")
+    ap.add_argument("--jobs", type=int, default=1,
+                    help="Evaluate up to N subsets at once, each in its own sandbox worktree + Mesen2 instance "
+                         "(<instance>-1..N; combine with --launch).")
+    ap.add_argument("--no-cache", action="store_true", help="Ignore and do not write cached predicate results.")
+    ap.add_argument("--cleanup", action="store_true", help="Remove the --jobs sandbox worktrees when done.")
     args = ap.parse_args()
 
     os.chdir(REPO_ROOT)
@@ -249,44 +497,82 @@ def main() -> int:
         no_capture=bool(args.no_capture),
     )
 
-    print(f"Candidates: {candidates}")
-    print("Sanity check: baseline should reproduce (defaults, no disables).")
     try:
-        baseline_fixed = is_fixed(base_cfg, runs=max(1, int(args.runs)), sleep_s=float(args.sleep), log=log)
+        source = source_revision()
     except RuntimeError as e:
-        print(str(e), file=sys.stderr)
-        return 125
+        if args.jobs > 1:
+            print(str(e), file=sys.stderr)
+            return 2
+        source = None
+    bisector = FlagBisector(
+        base_cfg,
+        runs=max(1, int(args.runs)),
+        sleep_s=float(args.sleep),
+        log=log,
+        jobs=int(args.jobs),
+        source=source,
+        cache_dir=None if args.no_cache else CACHE_DIR,
+    )
+    try:
+        return _bisect(args, candidates, base_cfg, bisector, log)
+    finally:
+        if args.cleanup:
+            bisector.cleanup()
+
+
+def _bisect(args, candidates: list[str], base_cfg: TestConfig, bisector: FlagBisector, log: list[dict]) -> int:
+    print(f"Candidates: {candidates}")
+    if bisector.jobs > 1:
+        print(f"Evaluating up to {bisector.jobs} subsets at once (source tree {bisector.source_tree[:12]}).")
+        print("Sanity checks (concurrent): baseline should reproduce; disabling all candidates should fix.")
+        try:
+            baseline_fixed, all_disabled_fixed = bisector.test_many([[], list(candidates)])
+        except RuntimeError as e:
+            print(str(e), file=sys.stderr)
+            return 125
+    else:
+        print("Sanity check: baseline should reproduce (defaults, no disables).")
+        try:
+            baseline_fixed = bisector.test_fixed([])
+        except RuntimeError as e:
+            print(str(e), file=sys.stderr)
+            return 125
+        all_disabled_fixed = None
     if baseline_fixed:
         print("Baseline did NOT reproduce (blackout not seen).")
         print("Action: adjust seed state/press window or increase --max-frames; then rerun.")
         _write_log(args.out, log)
         return 3
 
-    print("Sanity check: disabling all candidates should fix.")
-    all_disabled_cfg = TestConfig(**{**base_cfg.__dict__, "disable": list(candidates)})
-    try:
-        all_disabled_fixed = is_fixed(all_disabled_cfg, runs=max(1, int(args.runs)), sleep_s=float(args.sleep), log=log)
-    except RuntimeError as e:
-        print(str(e), file=sys.stderr)
-        return 125
+    if all_disabled_fixed is None:
+        print("Sanity check: disabling all candidates should fix.")
+        try:
+            all_disabled_fixed = bisector.test_fixed(list(candidates))
+        except RuntimeError as e:
+            print(str(e), file=sys.stderr)
+            return 125
     if not all_disabled_fixed:
         print("Disabling all candidates did NOT fix the repro.")
         print("Action: expand --candidates (or the root cause is outside feature-flagged code).")
         _write_log(args.out, log)
         return 4
 
-    def predicate(disable_subset: list[str]) -> bool:
-        cfg = TestConfig(**{**base_cfg.__dict__, "disable": list(disable_subset)})
-        return is_fixed(cfg, runs=max(1, int(args.runs)), sleep_s=float(args.sleep), log=log)
-
     print("Minimizing disable set...")
-    minimal = ddmin(list(candidates), predicate)
+    try:
+        minimal = ddmin(list(candidates), bisector.test_fixed,
+                        bisector.test_many if bisector.jobs > 1 else None)
+    except RuntimeError as e:
+        print(str(e), file=sys.stderr)
+        _write_log(args.out, log)
+        return 125
     minimal = sorted(set(minimal), key=lambda x: candidates.index(x) if x in candidates else 9999)
 
     print("")
     print("Result (minimal disables that make it stop reproducing):")
     for f in minimal:
         print(f"  - {f}")
+    if bisector.cache_hits:
+        print(f"({bisector.cache_hits} predicate results reused from {CACHE_DIR})")
     print("")
     print("Next action:")
     print(f"  python3 Scripts/repro_blackout_transition.py --build --profile {base_cfg.profile} --disable {','.join(minimal)}")
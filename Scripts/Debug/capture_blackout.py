@@ -17,6 +17,10 @@ Usage:
     # After blackout occurs (do NOT reset):
     python3 capture_blackout.py capture
 
+    # Or keep a rolling 10 s history and dump it with a savestate the moment
+    # the screen stays black for 30 frames (Ctrl-C dumps on demand):
+    python3 capture_blackout.py watch --seconds 10 --confirm 30
+
     # To review captured artifacts:
     python3 capture_blackout.py summary
 """
@@ -26,6 +30,7 @@ import json
 import os
 import subprocess
 import sys
+import time
 from datetime import datetime
 from pathlib import Path
 
@@ -33,8 +38,11 @@ from pathlib import Path
 MESEN2_CLIENT = Path(__file__).parent / "mesen2_client.py"
 OUTPUT_DIR = Path("/tmp/oos_blackout")
 LAST_CAPTURE_MARKER = Path(__file__).resolve().parents[1] / "scratchpad" / "last_blackout_capture.json"
+MESEN2_DIR = Path(__file__).resolve().parents[1] / "Mesen2"
 REPRO_SLOT = 20
 CAPTURE_SLOT = 21
+RING_FPS = 60
+RING_WATCHES = ["0x7E0013", "0x7E0010", "0x7E0011"]  # INIDISPQ, GameMode, SubMode
 
 _MESEN2_GLOBAL_ARGS: list[str] = []
 
@@ -154,6 +162,19 @@ def _summarize_blame(blame_res: dict) -> dict:
     }
 
 
+def _write_capture_marker(timestamp: str, output_dir: Path) -> None:
+    # Repo-local marker so other tools/agents can find the latest capture
+    # without copying paths around.
+    try:
+        LAST_CAPTURE_MARKER.parent.mkdir(parents=True, exist_ok=True)
+        LAST_CAPTURE_MARKER.write_text(
+            json.dumps({"timestamp": timestamp, "path": str(output_dir)}, indent=2) + "\n",
+            encoding="utf-8",
+        )
+    except Exception:
+        pass
+
+
 def cmd_arm(args):
     """Arm instrumentation before reproducing the bug."""
     print("=== Arming Blackout Capture Instrumentation ===")
@@ -251,16 +272,7 @@ def cmd_capture(args):
     print(f"Output directory: {output_dir}")
     print()
 
-    # Write a repo-local marker so other tools/agents can find the latest capture
-    # without copying paths around.
-    try:
-        LAST_CAPTURE_MARKER.parent.mkdir(parents=True, exist_ok=True)
-        LAST_CAPTURE_MARKER.write_text(
-            json.dumps({"timestamp": timestamp, "path": str(output_dir)}, indent=2) + "\n",
-            encoding="utf-8",
-        )
-    except Exception:
-        pass
+    _write_capture_marker(timestamp, output_dir)
 
     # Save failure state
     print(f"1. Saving failure state (slot {CAPTURE_SLOT})...")
@@ -408,6 +420,107 @@ def cmd_capture(args):
     return 0
 
 
+def cmd_watch(args):
+    """Keep a rolling per-frame ring and dump it with a savestate on blackout."""
+    if str(MESEN2_DIR) not in sys.path:
+        sys.path.insert(0, str(MESEN2_DIR))
+    from mesen2_client_lib.bridge import MesenBridge
+    from mesen2_client_lib.frame_bisect import BridgeFrames, FrameBisectError
+    from mesen2_client_lib.frame_ring import FrameRing, FrameSampler, RingCapture
+
+    print("=== Blackout Ring Capture ===")
+    print()
+
+    bridge = MesenBridge(socket_path=args.socket)
+    if bridge.socket_path is None or not bridge.send_command("PING").get("success"):
+        print("[ERROR] Cannot connect to Mesen2. Is it running?")
+        print("Set MESEN2_SOCKET_PATH if you have multiple instances.")
+        return 1
+
+    watch_addrs = [int(addr, 0) for addr in (args.watch or RING_WATCHES)]
+    try:
+        sampler = FrameSampler(bridge, watch_addrs)
+        ring = FrameRing(max(1, int(args.seconds * RING_FPS)))
+    except ValueError as exc:
+        print(f"[ERROR] {exc}")
+        return 1
+    capture = RingCapture(ring, confirm=args.confirm)
+
+    watch_ids = []
+    for addr in watch_addrs:
+        res = bridge.mem_watch_add(addr, depth=64)
+        data = res.get("data") if res.get("success") else None
+        if isinstance(data, dict) and data.get("watch_id") is not None:
+            watch_ids.append(data["watch_id"])
+        else:
+            print(f"  [WARN] MEM_WATCH_WRITES failed for 0x{addr:06X}; hits will read 0")
+
+    mode = "frame-stepped" if args.step else "live (frames may be skipped)"
+    print(f"Ring: {ring.capacity} frames ({ring.nbytes} bytes), {mode}")
+    print(f"Trigger: black screen for {capture.confirm} consecutive frame(s); Ctrl-C dumps now")
+    print()
+
+    reason = "max_frames"
+    sampled = 0
+    frames = BridgeFrames(bridge) if args.step else None
+    last_frame = None
+    try:
+        while not args.max_frames or sampled < args.max_frames:
+            if frames is not None:
+                record = sampler.sample()
+            else:
+                frame = sampler.frame_counter()
+                if frame == last_frame:
+                    time.sleep(0.002)
+                    continue
+                last_frame = frame
+                record = sampler.sample(frame)
+            sampled += 1
+            if capture.push(record):
+                reason = "black_screen"
+                break
+            if frames is not None:
+                frames.advance(1)
+    except KeyboardInterrupt:
+        reason = "manual"
+    except FrameBisectError as exc:
+        print(f"[ERROR] {exc}")
+        reason = "error"
+    finally:
+        bridge.pause()
+        for watch_id in watch_ids:
+            bridge.mem_watch_remove(watch_id)
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_dir = OUTPUT_DIR / timestamp
+    output_dir.mkdir(parents=True, exist_ok=True)
+    _write_capture_marker(timestamp, output_dir)
+
+    state_path = output_dir / "blackout.mss"
+    saved = bridge.save_state(path=str(state_path))
+    (output_dir / "cpu.json").write_text(json.dumps(bridge.get_cpu_state(), indent=2))
+    first_bad = capture.first_bad if reason == "black_screen" else None
+    ring.dump(
+        output_dir / "ring.json",
+        reason=reason,
+        confirm=capture.confirm,
+        first_bad_frame=first_bad.frame if first_bad else None,
+        watches=[f"0x{addr:06X}" for addr in watch_addrs],
+        state=str(state_path) if saved else None,
+    )
+
+    print(f"=== Ring Dumped ({reason}) ===")
+    print(f"Artifacts saved to: {output_dir}")
+    print(f"  ring.json: {len(ring)} frames")
+    print(f"  blackout.mss: {'OK' if saved else 'SAVESTATE failed'}")
+    if first_bad:
+        print(f"  First black frame: {first_bad.frame} (INIDISPQ=${first_bad.inidisp:02X})")
+    print()
+    print("Emulator left paused. For the full artifact set, run:")
+    print(f"    python3 {Path(__file__).name} capture")
+    return 0 if reason == "black_screen" else 2
+
+
 def cmd_summary(args):
     """Summarize captured artifacts."""
     print("=== Blackout Capture Summary ===")
@@ -476,6 +589,15 @@ def cmd_summary(args):
                 bits.append(f"RoomID=${room_id:04X}")
             if bits:
                 print(f"  {' | '.join(bits)}")
+
+            ring_path = capture_dir / "ring.json"
+            if ring_path.exists():
+                ring = json.loads(ring_path.read_text())
+                records = ring.get("records") or []
+                line = f"  Ring: {len(records)} frames, reason={ring.get('reason')}"
+                if ring.get("first_bad_frame") is not None:
+                    line += f", first black frame={ring['first_bad_frame']}"
+                print(line)
         except Exception:
             pass
 
@@ -508,6 +630,24 @@ def main():
     capture_parser = subparsers.add_parser("capture", help="Capture evidence after blackout")
     capture_parser.add_argument("--deep", action="store_true", help="Capture extra watches (fade + stack + color math)")
 
+    # watch subcommand
+    watch_parser = subparsers.add_parser("watch", help="Keep a rolling frame ring; dump it with a savestate on blackout")
+    watch_parser.add_argument("--seconds", type=float, default=10.0, help="History to keep (default: 10)")
+    watch_parser.add_argument(
+        "--confirm",
+        type=int,
+        default=30,
+        help="Consecutive black frames before triggering (default: 30; skips transition blanks)",
+    )
+    watch_parser.add_argument(
+        "--watch",
+        action="append",
+        metavar="ADDR",
+        help=f"MEM_WATCH_WRITES address to count hits for (repeatable; default: {', '.join(RING_WATCHES)})",
+    )
+    watch_parser.add_argument("--step", action="store_true", help="Step frame by frame (paused) instead of polling live")
+    watch_parser.add_argument("--max-frames", type=int, default=0, help="Stop after N samples (default: unlimited)")
+
     # summary subcommand
     summary_parser = subparsers.add_parser("summary", help="Summarize captured artifacts")
 
@@ -523,6 +663,8 @@ def main():
         return cmd_arm(args)
     elif args.command == "capture":
         return cmd_capture(args)
+    elif args.command == "watch":
+        return cmd_watch(args)
     elif args.command == "summary":
         return cmd_summary(args)
 
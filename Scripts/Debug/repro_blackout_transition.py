@@ -117,6 +117,11 @@ def main() -> int:
     ap.add_argument("--disable", default="", help="Comma-separated feature flags to disable (passed to build_rom.sh)")
     ap.add_argument("--profile", default="defaults", help="Feature profile: defaults|all-on|all-off (passed to build_rom.sh)")
     ap.add_argument("--persist-flags", action="store_true", help="Persist generated Config/feature_flags.asm")
+    ap.add_argument(
+        "--rom",
+        default="",
+        help="Run a prebuilt ROM instead of Roms/oos<version>x.sfc (launched with, or hot-loaded into, the instance).",
+    )
 
     ap.add_argument("--socket", default="", help="Mesen2 socket path override")
     ap.add_argument("--instance", default="", help="Mesen2 instance name (registry-backed)")
@@ -175,7 +180,10 @@ def main() -> int:
         if rc != 0:
             print("Build failed; aborting.", file=sys.stderr)
             return 2
-    rom_path = (REPO_ROOT / "Roms" / f"oos{int(args.version)}x.sfc").resolve()
+    if args.rom:
+        rom_path = Path(args.rom).expanduser().resolve()
+    else:
+        rom_path = (REPO_ROOT / "Roms" / f"oos{int(args.version)}x.sfc").resolve()
 
     try:
         from scripts.mesen2_client_lib.client import OracleDebugClient
@@ -184,6 +192,7 @@ def main() -> int:
         return 2
 
     client = OracleDebugClient()
+    launched = False
 
     if not client.bridge.ensure_connected():
         if not args.launch:
@@ -191,7 +200,6 @@ def main() -> int:
             return 125
 
         instance = str(args.instance or "oos-repro")
-        rom_path = REPO_ROOT / "Roms" / f"oos{int(args.version)}x.sfc"
         if not rom_path.exists():
             print(f"ROM not found for launch: {rom_path} (run with --build, or pass --version matching existing ROM).", file=sys.stderr)
             return 2
@@ -215,8 +223,9 @@ def main() -> int:
         if not client.bridge.ensure_connected():
             print("Mesen2 still not connected after launch attempt.", file=sys.stderr)
             return 125
+        launched = True
 
-    if args.build and args.rom_load:
+    if (args.build and args.rom_load) or (args.rom and not launched):
         if not rom_path.exists():
             print(f"Built ROM not found: {rom_path}", file=sys.stderr)
             return 2
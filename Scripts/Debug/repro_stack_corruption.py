@@ -11,6 +11,13 @@ Strategy (in priority order):
   3. Corruption PC breakpoint: exec at $83:A66D (fallback, catches post-corruption)
   4. Frame-by-frame SP polling: advance 1 frame, read CPU, check SP (slowest fallback)
 
+--strategy bisect skips the breakpoints and localizes the first frame with a
+bad SP by savestate bisection (mesen2_client_lib/frame_bisect.py): O(log n)
+CPU reads over the --frames window instead of one per frame. The state one
+frame before corruption becomes the last-good state for --step-after-save.
+Checkpoints go to a temp directory removed when the run ends; pass
+--save-last-good PATH to keep the last-good state.
+
 On corruption detection: captures CPU, TRACE (500 instructions), STACK_RETADDR,
 P_LOG, and MEM_BLAME for full attribution.
 
@@ -26,6 +33,7 @@ import argparse
 import json
 import re
 import sys
+import tempfile
 import time
 from pathlib import Path
 
@@ -290,6 +298,7 @@ def run_repro(
                   'tcs' for TCS breakpoint,
                   'polling' for frame-by-frame SP polling,
                   'breakpoint' for crash-site breakpoint only,
+                  'bisect' for savestate bisection to the first bad frame,
                   'auto' to try sp_range -> tcs -> breakpoint -> polling
     """
     report: dict = {
@@ -341,10 +350,10 @@ def run_repro(
     strategies_to_try = []
     if strategy == "auto":
         strategies_to_try = ["sp_range", "tcs", "breakpoint"]
-    else:
+    elif strategy != "bisect":
         strategies_to_try = [strategy]
 
-    active_strategy = None
+    active_strategy = "bisect" if strategy == "bisect" else None
     for strat in strategies_to_try:
         if strat == "sp_range":
             # Conditional breakpoint: SP >= 0x0200
@@ -418,9 +427,14 @@ def run_repro(
         )
 
     # 7. Run and monitor based on strategy
+    bisect_states = None
     if active_strategy == "polling":
         # Frame-by-frame SP polling (slowest but most reliable)
         _run_polling_strategy(bridge, report, max_frames, save_last_good_path)
+    elif active_strategy == "bisect":
+        # Checkpoints live until the optional step-after-save below is done.
+        bisect_states = tempfile.TemporaryDirectory(prefix="oos_sp_bisect_")
+        _run_bisect_strategy(bridge, report, max_frames, Path(bisect_states.name), save_last_good_path)
     elif active_strategy == "tcs":
         # TCS breakpoint — need to check A register on each hit
         _run_tcs_strategy(bridge, report, max_frames)
@@ -432,8 +446,12 @@ def run_repro(
     bridge.send_command("PAUSE")
 
     # 8b. Optional: reload last-good state and step to the corrupting instruction
-    if step_after_save and save_last_good_path and report.get("status") == "sp_corruption_detected":
-        report["step_analysis"] = _step_from_saved_state(bridge, save_last_good_path, step_max)
+    last_good_path = report.get("last_good_state_path") or save_last_good_path
+    if step_after_save and last_good_path and report.get("status") == "sp_corruption_detected":
+        report["step_analysis"] = _step_from_saved_state(bridge, last_good_path, step_max)
+    if bisect_states is not None:
+        bisect_states.cleanup()
+        _forget_removed_states(report, bisect_states.name)
 
     # 9. Capture full attribution data
     _capture_full_attribution(bridge, report, watch_id, watch_id_1f0a)
@@ -636,6 +654,61 @@ def _run_polling_strategy(bridge, report, max_frames, save_last_good_path: str |
     report["polling_mode"] = polling_mode
 
 
+def _run_bisect_strategy(bridge, report, max_frames, state_dir: Path, save_last_good_path: str | None = None):
+    """Savestate bisection to the first frame whose SP is outside $01xx."""
+    import shutil
+
+    from mesen2_client_lib.frame_bisect import (
+        BridgeFrames,
+        FrameBisectError,
+        FrameBisector,
+        sp_corrupt,
+    )
+
+    bisector = FrameBisector(BridgeFrames(bridge), sp_corrupt(bridge), state_dir)
+    try:
+        result = bisector.run(max_frames)
+    except FrameBisectError as exc:
+        report["error"] = str(exc)
+        return
+    bisector.discard_checkpoints(result)
+    report["bisect"] = result.to_json()
+    if not result.found:
+        return
+
+    last_good = str(result.last_good.path) if result.last_good else None
+    if last_good and save_last_good_path:
+        shutil.copyfile(last_good, save_last_good_path)
+        last_good = save_last_good_path
+    cpu = bridge.get_cpu_state()
+    sp = _parse_int(cpu.get("sp", "0"))
+    report.update({
+        "status": "sp_corruption_detected",
+        "detection_method": "frame_bisect",
+        "frames_to_repro": result.first_bad_frame,
+        "cpu": cpu,
+        "corrupt_sp": f"0x{sp:04X}",
+    })
+    if last_good:
+        report["last_good_state_path"] = last_good
+        report["last_good_frame"] = result.first_bad_frame - 1
+    print(
+        f"SP corruption first seen at frame {result.first_bad_frame} "
+        f"({len(result.probes)} probes, {result.loads} state loads)",
+        file=sys.stderr,
+    )
+
+
+def _forget_removed_states(report: dict, state_dir: str) -> None:
+    """Null out report paths into a bisection checkpoint dir that was removed."""
+    if str(report.get("last_good_state_path", "")).startswith(state_dir):
+        report.pop("last_good_state_path")
+    bisect = report.get("bisect") or {}
+    for key in ("last_good_state", "first_bad_state"):
+        if str(bisect.get(key) or "").startswith(state_dir):
+            bisect[key] = None
+
+
 def _step_from_saved_state(bridge: MesenBridge, state_path: str, max_steps: int = 50000) -> dict:
     """Load last-good state and step until SP corruption is observed."""
     result = {
@@ -709,7 +782,7 @@ def main() -> int:
                         help=f"Breakpoint address (default: 0x{CORRUPTION_PC:06X})")
     parser.add_argument("--depth", type=int, default=500,
                         help="Watch depth (max blame entries, default: 500)")
-    parser.add_argument("--strategy", choices=["auto", "sp_range", "tcs", "breakpoint", "polling"],
+    parser.add_argument("--strategy", choices=["auto", "sp_range", "tcs", "breakpoint", "polling", "bisect"],
                         default="auto",
                         help="Detection strategy (default: auto)")
     args = parser.parse_args()
@@ -1,6 +1,11 @@
 #!/usr/bin/env python3
 """
 Generate a symbol-mapped report from Mesen bridge write_trace.jsonl logs.
+
+The trace is ingested into a columnar store (trace_store.py) once and
+refreshed incrementally as the log grows; the report streams over the
+memory-mapped columns, so multi-million-entry traces need neither a full
+JSON parse per run nor memory proportional to the trace.
 """
 
 from __future__ import annotations
@@ -8,90 +13,89 @@ from __future__ import annotations
 import argparse
 import json
 import sys
-from collections import Counter, defaultdict
+from collections import Counter
 from pathlib import Path
 
-from symbols import SymbolResolver, parse_int
+from symbols import SymbolResolver
+from trace_store import MISSING, TraceStore, default_store_dir, ingest_jsonl, summarize_writes
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 
 
-def load_trace(path: Path) -> list[dict]:
+def open_trace(path: Path, store_dir: Path | None = None) -> TraceStore:
+    """Ingest (or incrementally refresh) the columnar store for a JSONL trace."""
     if not path.exists():
         raise SystemExit(f"Trace not found: {path}")
-    entries = []
-    for line in path.read_text().splitlines():
-        if not line.strip():
-            continue
-        try:
-            entries.append(json.loads(line))
-        except json.JSONDecodeError:
-            continue
-    return entries
+    return ingest_jsonl(path, store_dir or default_store_dir(path))
 
 
 def format_addr(addr: int | None) -> str:
-    if addr is None:
+    if addr is None or addr == MISSING:
         return "unknown"
     return f"0x{addr:06X}"
 
 
+def format_value(value: int) -> str:
+    return "None" if value == MISSING else str(value)
+
+
+def _field(value: int) -> int | None:
+    return None if value == MISSING else value
+
+
 def build_report(
-    entries: list[dict],
+    store: TraceStore | None,
     resolver: SymbolResolver,
     limit: int,
     state_log: list[dict] | None = None,
 ) -> str:
-    if not entries and not state_log:
+    total = len(store) if store is not None else 0
+    if not total and not state_log:
         return "No trace entries found."
 
-    by_addr = defaultdict(list)
-    for e in entries:
-        addr = parse_int(e.get("addr"))
-        if addr is None and isinstance(e.get("addr"), str):
-            addr = parse_int(e.get("addr"))
-        if addr is None:
-            continue
-        by_addr[addr].append(e)
-
     lines = []
     lines.append("# Trace Report")
     lines.append("")
-    lines.append(f"Total entries: {len(entries)}")
+    lines.append(f"Total entries: {total}")
     lines.append("")
 
-    if entries:
-        for addr in sorted(by_addr.keys()):
-            items = by_addr[addr]
-            last = items[-1]
-            bank = parse_int(last.get("pb"))
-            pc = parse_int(last.get("pc"))
-            symbol = resolver.resolve(bank, pc) or "unknown"
+    names: dict[tuple[int, int], str] = {}
+
+    def writer(pb: int, pc: int) -> str:
+        # One resolver lookup per distinct writer, not per entry.
+        key = (pb, pc)
+        name = names.get(key)
+        if name is None:
+            name = names[key] = resolver.resolve(_field(pb), _field(pc)) or "unknown"
+        return name
+
+    if total:
+        summary = summarize_writes(store)
+        for addr in sorted(summary):
+            item = summary[addr]
+            last = store.rows(item.last_row, item.last_row + 1)[0]
+            bank, pc = _field(last["pb"]), _field(last["pc"])
             lines.append(f"## Address {format_addr(addr)}")
-            lines.append(f"- Total writes: {len(items)}")
-            lines.append(f"- Last write: frame {last.get('frame')} value {last.get('value')} writer {symbol} (PB={bank}, PC={pc})")
+            lines.append(f"- Total writes: {item.writes}")
+            lines.append(
+                f"- Last write: frame {_field(last['frame'])} value {format_value(last['value'])} "
+                f"writer {writer(last['pb'], last['pc'])} (PB={bank}, PC={pc})"
+            )
 
             counter = Counter()
-            for e in items:
-                bank = parse_int(e.get("pb"))
-                pc = parse_int(e.get("pc"))
-                counter[resolver.resolve(bank, pc) or "unknown"] += 1
-            top = counter.most_common(limit)
+            for (pb, pc_value), count in item.writers.items():
+                counter[writer(pb, pc_value)] += count
             lines.append("- Top writers:")
-            for name, count in top:
+            for name, count in counter.most_common(limit):
                 lines.append(f"  - {name}: {count}")
             lines.append("")
 
-    # Recent events
-    if entries:
+        # Recent events
         lines.append("## Recent Writes")
-        for e in entries[-limit:]:
-            addr = parse_int(e.get("addr"))
-            bank = parse_int(e.get("pb"))
-            pc = parse_int(e.get("pc"))
-            symbol = resolver.resolve(bank, pc) or "unknown"
+        for e in store.rows(max(total - limit, 0), total):
             lines.append(
-                f"- frame {e.get('frame')} addr {format_addr(addr)} value {e.get('value')} writer {symbol}"
+                f"- frame {_field(e['frame'])} addr {format_addr(e['addr'])} "
+                f"value {format_value(e['value'])} writer {writer(e['pb'], e['pc'])}"
             )
 
     if state_log:
@@ -212,6 +216,7 @@ def main() -> int:
     parser.add_argument("--trace", default=str(Path.home() / "Documents/Mesen2/bridge/logs/write_trace.jsonl"))
     parser.add_argument("--sym", default=str(REPO_ROOT / "Roms/oos168x.sym"))
     parser.add_argument("--state-log", help="Optional state log JSONL for transition summary")
+    parser.add_argument("--store", help="Columnar store directory (default: .cache/trace_store/<trace>)")
     parser.add_argument("--out", help="Output path for report markdown")
     parser.add_argument("--limit", type=int, default=10)
     parser.add_argument("--llm-summary", action="store_true", help="Append LM Studio summary")
@@ -231,11 +236,11 @@ def main() -> int:
     state_log = load_state_log(Path(args.state_log)) if args.state_log else None
     if not trace_path.exists() and state_log is not None:
         print(f"[trace_report] Trace file missing: {trace_path} (continuing with state log only)", file=sys.stderr)
-        entries = []
+        store = None
     else:
-        entries = load_trace(trace_path)
+        store = open_trace(trace_path, Path(args.store) if args.store else None)
     resolver = SymbolResolver(Path(args.sym))
-    report = build_report(entries, resolver, args.limit, state_log=state_log)
+    report = build_report(store, resolver, args.limit, state_log=state_log)
     summary = add_llm_summary(report, args)
     if summary:
         report = report + "\n\n## LLM Summary\n\n" + summary.strip() + "\n"
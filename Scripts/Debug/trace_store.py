@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""Columnar, memory-mapped store for Mesen bridge write traces.
+
+write_trace.jsonl grows to millions of lines; parsing it into a list of
+dicts for every report costs gigabytes. The store ingests the JSONL once,
+streaming, into fixed-width column chunks:
+
+    <store>/meta.json
+    <store>/chunk_00000.frame.bin   int64
+    <store>/chunk_00000.addr.bin    int32   (-1 = missing)
+    <store>/chunk_00000.value.bin   int32
+    <store>/chunk_00000.pb.bin      int32
+    <store>/chunk_00000.pc.bin      int32
+
+Readers mmap each chunk and see the columns as typed memoryviews, so memory
+stays bounded by one chunk regardless of trace length. The trace log is
+append-only: an unchanged log (same size and mtime) reuses the store as is,
+and a grown log whose leading bytes and bytes before the ingested offset
+still match only parses the new tail. Anything else is re-ingested from
+scratch. New bytes are parsed in parallel, one chunk per 64 MB range.
+
+The repo does not depend on NumPy; columns are native-endian `array`
+typecodes, which `numpy.memmap(path, dtype=...)` can open directly if it is
+available.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import shutil
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from symbols import parse_int
+
+
+STORE_VERSION = 2
+CHUNK_ROWS = 1 << 20
+RANGE_BYTES = 64 << 20
+HEAD_BYTES = 1 << 16
+MISSING = -1
+COLUMNS = {"frame": "q", "addr": "i", "value": "i", "pb": "i", "pc": "i"}
+CACHE_DIR = Path(__file__).resolve().parents[2] / ".cache" / "trace_store"
+
+
+def _column(value) -> int:
+    if type(value) is int:
+        return value
+    parsed = parse_int(value)
+    return MISSING if parsed is None else parsed
+
+
+def _digest(path: Path, start: int, stop: int) -> str:
+    with path.open("rb") as handle:
+        handle.seek(start)
+        return hashlib.sha1(handle.read(stop - start)).hexdigest()
+
+
+def _head_digest(path: Path, offset: int) -> str:
+    """Digest of the first HEAD_BYTES ingested (fewer for a short log)."""
+    return _digest(path, 0, min(offset, HEAD_BYTES))
+
+
+def _tail_digest(path: Path, offset: int) -> str:
+    """Digest of the HEAD_BYTES ingested just before `offset`."""
+    return _digest(path, max(offset - HEAD_BYTES, 0), offset)
+
+
+def default_store_dir(trace: Path) -> Path:
+    key = hashlib.sha1(str(trace.resolve()).encode("utf-8")).hexdigest()[:16]
+    return CACHE_DIR / f"{trace.stem}-{key}"
+
+
+def _write_chunk(store_dir: Path, index: int, buffers: dict[str, array]) -> int:
+    for name, buffer in buffers.items():
+        with (store_dir / f"chunk_{index:05d}.{name}.bin").open("wb") as handle:
+            buffer.tofile(handle)
+    return len(buffers["addr"])
+
+
+class TraceWriter:
+    """Appends rows to a store, flushing a chunk every CHUNK_ROWS rows."""
+
+    def __init__(self, store_dir: Path, meta: Optional[dict] = None) -> None:
+        self.store_dir = Path(store_dir)
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        self.meta = meta or {"version": STORE_VERSION, "columns": COLUMNS, "chunks": []}
+        self._buffers = {name: array(code) for name, code in COLUMNS.items()}
+
+    def append(self, entry: dict) -> None:
+        for name, buffer in self._buffers.items():
+            buffer.append(_column(entry.get(name)))
+        if len(self._buffers["addr"]) >= CHUNK_ROWS:
+            self.flush()
+
+    def extend(self, entries: Iterable[dict]) -> None:
+        for entry in entries:
+            self.append(entry)
+
+    def flush(self) -> None:
+        if not self._buffers["addr"]:
+            return
+        rows = _write_chunk(self.store_dir, len(self.meta["chunks"]), self._buffers)
+        self._buffers = {name: array(code) for name, code in COLUMNS.items()}
+        self.meta["chunks"].append(rows)
+
+    def close(self) -> None:
+        self.flush()
+        path = self.store_dir / "meta.json"
+        temp = path.with_suffix(f".{os.getpid()}.tmp")
+        temp.write_text(json.dumps(self.meta, indent=1), encoding="utf-8")
+        os.replace(temp, path)
+
+
+def _ingest_range(task: tuple[str, str, int, int, int]) -> int:
+    """Parse trace bytes [start, stop) into chunk `index` (worker process)."""
+    trace, store_dir, index, start, stop = task
+    buffers = {name: array(code) for name, code in COLUMNS.items()}
+    columns = list(buffers.items())
+    with open(trace, "rb") as handle:
+        handle.seek(start)
+        data = handle.read(stop - start)
+    for line in data.splitlines():
+        if not line.strip():
+            continue
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        for name, buffer in columns:
+            buffer.append(_column(entry.get(name)))
+    return _write_chunk(Path(store_dir), index, buffers)
+
+
+def _line_ranges(trace: Path, start: int, size: int) -> list[tuple[int, int]]:
+    """Newline-aligned byte ranges covering the complete lines in [start, size)."""
+    ranges = []
+    with trace.open("rb") as handle:
+        handle.seek(max(start, size - HEAD_BYTES))
+        # Bytes appended after the stat belong to the next pass.
+        tail = handle.read(size - handle.tell())
+        cut = tail.rfind(b"\n")
+        if cut < 0:
+            return []
+        # A partial last line is still being written; pick it up next time.
+        end = size - len(tail) + cut + 1
+        position = start
+        while position < end:
+            handle.seek(min(position + RANGE_BYTES, end))
+            handle.readline()
+            stop = min(handle.tell(), end)
+            ranges.append((position, stop))
+            position = stop
+    return ranges
+
+
+def ingest_jsonl(trace: Path, store_dir: Path, jobs: Optional[int] = None) -> "TraceStore":
+    """Stream `trace` into `store_dir`, reusing rows already ingested.
+
+    The store is returned as is while the log's size and mtime match the
+    ingest. A log that grew is only tail-ingested when both its head and
+    the bytes just before the ingested offset are unchanged; a rewrite that
+    keeps the head (or the size) rebuilds the store. New bytes are split
+    into newline-aligned ranges parsed in parallel, one column chunk per
+    range.
+    """
+    stat = trace.stat()
+    try:
+        meta = json.loads((store_dir / "meta.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        meta = None
+    source = (meta or {}).get("source", {})
+    offset = source.get("offset", 0)
+    current = (
+        meta is not None
+        and meta.get("version") == STORE_VERSION
+        and source.get("head") == _head_digest(trace, offset)
+    )
+    if current and (source.get("size"), source.get("mtime_ns")) == (stat.st_size, stat.st_mtime_ns):
+        return TraceStore(store_dir)
+    reusable = (
+        current
+        and offset <= source.get("size", -1) < stat.st_size
+        and source.get("tail") == _tail_digest(trace, offset)
+    )
+    if not reusable:
+        shutil.rmtree(store_dir, ignore_errors=True)
+        meta = None
+
+    writer = TraceWriter(store_dir, meta)
+    offset = offset if reusable else 0
+    ranges = _line_ranges(trace, offset, stat.st_size)
+    first = len(writer.meta["chunks"])
+    tasks = [
+        (str(trace), str(store_dir), first + i, start, stop)
+        for i, (start, stop) in enumerate(ranges)
+    ]
+    workers = min(jobs or os.cpu_count() or 1, len(tasks))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            writer.meta["chunks"].extend(pool.map(_ingest_range, tasks))
+    else:
+        writer.meta["chunks"].extend(map(_ingest_range, tasks))
+    if ranges:
+        offset = ranges[-1][1]
+    writer.meta["source"] = {
+        "path": str(trace),
+        "head": _head_digest(trace, offset),
+        "tail": _tail_digest(trace, offset),
+        "offset": offset,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+    writer.close()
+    return TraceStore(store_dir)
+
+
+def store_from_entries(entries: Iterable[dict], store_dir: Path) -> "TraceStore":
+    """Store already-parsed entries (e.g. OracleDebugClient results)."""
+    shutil.rmtree(store_dir, ignore_errors=True)
+    writer = TraceWriter(store_dir)
+    writer.extend(entries)
+    writer.close()
+    return TraceStore(store_dir)
+
+
+class TraceStore:
+    """Read-only view over a store's memory-mapped column chunks."""
+
+    def __init__(self, store_dir: Path) -> None:
+        self.store_dir = Path(store_dir)
+        self.meta = json.loads((self.store_dir / "meta.json").read_text(encoding="utf-8"))
+        self.chunk_rows: list[int] = self.meta["chunks"]
+
+    def __len__(self) -> int:
+        return sum(self.chunk_rows)
+
+    def _map(self, index: int, name: str) -> memoryview:
+        path = self.store_dir / f"chunk_{index:05d}.{name}.bin"
+        with path.open("rb") as handle:
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        return memoryview(mapped).cast(COLUMNS[name])
+
+    def chunks(self, names: Iterable[str] = COLUMNS) -> Iterator[dict[str, memoryview]]:
+        """Column views one chunk at a time (each mapped only while in use)."""
+        names = list(names)
+        for index, rows in enumerate(self.chunk_rows):
+            if rows:
+                yield {name: self._map(index, name) for name in names}
+
+    def rows(self, start: int, stop: int) -> list[dict[str, int]]:
+        """Rows [start, stop) as dicts; cheap for small ranges anywhere."""
+        found = []
+        base = 0
+        for index, rows in enumerate(self.chunk_rows):
+            lo, hi = max(start - base, 0), min(stop - base, rows)
+            if lo < hi:
+                views = {name: self._map(index, name) for name in COLUMNS}
+                for row in range(lo, hi):
+                    found.append({name: views[name][row] for name in COLUMNS})
+            base += rows
+        return found
+
+
+@dataclass
+class AddressSummary:
+    writes: int = 0
+    last_row: int = 0
+    writers: Counter = field(default_factory=Counter)
+
+
+def summarize_writes(store: TraceStore) -> dict[int, AddressSummary]:
+    """Per-address write counts, last row and (pb, pc) writer histogram.
+
+    Runs chunk by chunk with C-level Counter/dict construction over the
+    mapped columns; memory grows with distinct addresses and writers only.
+    """
+    summary: dict[int, AddressSummary] = {}
+    base = 0
+    for chunk in store.chunks(("addr", "pb", "pc")):
+        addr = chunk["addr"]
+        rows = len(addr)
+        pairs = Counter(zip(addr, chunk["pb"], chunk["pc"]))
+        last = dict(zip(addr, range(base, base + rows)))
+        for (address, pb, pc), count in pairs.items():
+            if address == MISSING:
+                continue
+            item = summary.get(address)
+            if item is None:
+                item = summary[address] = AddressSummary()
+            item.writes += count
+            item.writers[(pb, pc)] += count
+        for address, row in last.items():
+            if address != MISSING:
+                summary[address].last_row = row
+        base += rows
+    return summary
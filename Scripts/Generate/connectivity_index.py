@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""Whole-ROM connectivity index: rooms, entrances and overworld areas.
+
+One scan of the ROM (via dungeon_rooms.py) yields every traversal edge the
+analysis scripts care about:
+
+  door                room -> grid neighbour, for each non-exit door
+  stair               room -> staircase destination (header bytes 10-13)
+  holewarp            room -> fall-through destination (header byte 9)
+  entrance            entrance -> the room it loads
+  overworld_entrance  overworld area -> entrance (door/cave entrances)
+  hole                overworld area -> entrance (holes Link drops into)
+  exit                room -> overworld area its exit leads back to
+
+Nodes are numbered rooms first, then entrances, then overworld areas, and
+the edges are stored in CSR form (`offsets`, `targets`, `kinds` arrays), so
+path and reachability queries are plain array walks. The index is cached
+as .cache/connectivity/<rom sha1>.json; loading a cached index costs one
+ROM hash plus a small JSON parse.
+
+    index = ConnectivityIndex.load(Path("Roms/oos168x.sfc"))
+    start = index.node("entrance", 0x27)
+    rooms = index.reachable([start], kinds={"entrance", "door", "stair"})
+    print(index.path(start, index.node("room", 0xC8)))
+
+    python3 Scripts/Generate/connectivity_index.py --rom Roms/oos168x.sfc \\
+        --export connectivity.json --path entrance:0x27 room:0xC8
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from array import array
+from collections import deque
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from dungeon_rooms import ENTRANCE_COUNT, DungeonRooms, adjacent_room
+from rom_image import RomImage
+from room_streams import ROOM_COUNT, RoomStreams
+
+
+CACHE_VERSION = 1
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_CACHE_DIR = REPO_ROOT / ".cache" / "connectivity"
+
+OVERWORLD_AREA_COUNT = 0xA0  # light world, dark world, special areas
+
+# PC addresses (from Yaze's overworld_entrance.h / overworld_exit.h)
+OVERWORLD_ENTRANCE_AREA_PC = 0xDB96F  # u16 area per entrance slot
+OVERWORLD_ENTRANCE_ID_PC = 0xDBB73  # u8 entrance id per entrance slot
+OVERWORLD_ENTRANCE_COUNT = 129
+OVERWORLD_HOLE_AREA_PC = 0xDB826
+OVERWORLD_HOLE_ENTRANCE_PC = 0xDB84C
+OVERWORLD_HOLE_COUNT = 0x13
+EXIT_ROOM_PC = 0x15D8A  # u16 room per exit
+EXIT_AREA_PC = 0x15E28  # u8 overworld area per exit
+EXIT_COUNT = 0x4F
+
+EDGE_KINDS = ("door", "stair", "holewarp", "entrance", "overworld_entrance", "hole", "exit")
+KIND_CODES = {name: code for code, name in enumerate(EDGE_KINDS)}
+NODE_KINDS = ("room", "entrance", "area")
+LOCATION_KEYS = (
+    ("room_id", "room"),
+    ("entrance_id", "entrance"),
+    ("overworld_id", "area"),
+    ("special_world_id", "area"),
+)
+
+
+class ConnectivityIndex:
+    """CSR adjacency over room, entrance and overworld-area nodes."""
+
+    def __init__(
+        self,
+        offsets: array,
+        targets: array,
+        kinds: array,
+        counts: tuple[int, int, int] = (ROOM_COUNT, ENTRANCE_COUNT, OVERWORLD_AREA_COUNT),
+        rom_sha1: str = "",
+    ) -> None:
+        self.offsets = offsets
+        self.targets = targets
+        self.kinds = kinds
+        self.counts = tuple(counts)
+        self.rom_sha1 = rom_sha1
+        room_count, entrance_count, _ = self.counts
+        self._bases = (0, room_count, room_count + entrance_count)
+
+    # -- construction -------------------------------------------------------
+
+    @classmethod
+    def from_edges(
+        cls,
+        edges: Iterable[tuple[int, int, str]],
+        counts: tuple[int, int, int] = (ROOM_COUNT, ENTRANCE_COUNT, OVERWORLD_AREA_COUNT),
+        rom_sha1: str = "",
+    ) -> "ConnectivityIndex":
+        """CSR from (source node, target node, kind) edges; order is kept per source."""
+        node_count = sum(counts)
+        by_source: list[list[tuple[int, int]]] = [[] for _ in range(node_count)]
+        seen: set[tuple[int, int, int]] = set()
+        for source, target, kind in edges:
+            code = KIND_CODES[kind]
+            if (source, target, code) not in seen:
+                seen.add((source, target, code))
+                by_source[source].append((target, code))
+        offsets = array("I", [0])
+        targets = array("I")
+        kinds = array("B")
+        for out_edges in by_source:
+            for target, code in out_edges:
+                targets.append(target)
+                kinds.append(code)
+            offsets.append(len(targets))
+        return cls(offsets, targets, kinds, counts, rom_sha1)
+
+    @classmethod
+    def build(cls, rooms: DungeonRooms, rom_sha1: str = "") -> "ConnectivityIndex":
+        """Scan every room, entrance, overworld entrance/hole and exit once."""
+        data = rooms.streams.data
+        index = cls(array("I"), array("I"), array("B"), rom_sha1=rom_sha1)
+        edges: list[tuple[int, int, str]] = []
+
+        def u16(pc: int) -> int:
+            return data[pc] | (data[pc + 1] << 8)
+
+        for room_id, room in rooms.rooms().items():
+            source = index.node("room", room_id)
+            for door in room.doors:
+                target = adjacent_room(room_id, door.direction)
+                if target is not None and not door.is_exit:
+                    edges.append((source, index.node("room", target), "door"))
+            for target in room.stairs:
+                if target and target != room_id and target < ROOM_COUNT:
+                    edges.append((source, index.node("room", target), "stair"))
+            if room.holewarp and room.holewarp != room_id:
+                edges.append((source, index.node("room", room.holewarp), "holewarp"))
+
+        for entrance_id in range(ENTRANCE_COUNT):
+            room_id = rooms.entrance_room(entrance_id)
+            if room_id < ROOM_COUNT:
+                edges.append((index.node("entrance", entrance_id), index.node("room", room_id), "entrance"))
+
+        for kind, area_pc, entrance_pc, count in (
+            ("overworld_entrance", OVERWORLD_ENTRANCE_AREA_PC, OVERWORLD_ENTRANCE_ID_PC, OVERWORLD_ENTRANCE_COUNT),
+            ("hole", OVERWORLD_HOLE_AREA_PC, OVERWORLD_HOLE_ENTRANCE_PC, OVERWORLD_HOLE_COUNT),
+        ):
+            for slot in range(count):
+                area = u16(area_pc + slot * 2)
+                entrance_id = data[entrance_pc + slot]
+                if area < OVERWORLD_AREA_COUNT and entrance_id < ENTRANCE_COUNT:
+                    edges.append((index.node("area", area), index.node("entrance", entrance_id), kind))
+
+        for slot in range(EXIT_COUNT):
+            room_id = u16(EXIT_ROOM_PC + slot * 2)
+            area = data[EXIT_AREA_PC + slot]
+            if room_id < ROOM_COUNT and area < OVERWORLD_AREA_COUNT:
+                edges.append((index.node("room", room_id), index.node("area", area), "exit"))
+
+        return cls.from_edges(edges, index.counts, rom_sha1)
+
+    @classmethod
+    def load(
+        cls, rom_path: Path, cache_dir: Optional[Path] = DEFAULT_CACHE_DIR
+    ) -> "ConnectivityIndex":
+        """Cached index for the ROM at `rom_path` (rebuilt when its SHA-1 changes)."""
+        with RomImage.open(Path(rom_path)) as rom:
+            sha1 = rom.sha1
+            cache_path = Path(cache_dir) / f"{sha1}.json" if cache_dir is not None else None
+            if cache_path is not None:
+                cached = cls.read_cache(cache_path, sha1)
+                if cached is not None:
+                    return cached
+            index = cls.build(DungeonRooms(RoomStreams.for_rom(rom)), sha1)
+        if cache_path is not None:
+            index.write_cache(cache_path)
+        return index
+
+    # -- cache --------------------------------------------------------------
+
+    @classmethod
+    def read_cache(cls, path: Path, rom_sha1: str) -> Optional["ConnectivityIndex"]:
+        try:
+            record = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if record.get("version") != CACHE_VERSION or record.get("rom_sha1") != rom_sha1:
+            return None
+        return cls(
+            array("I", record["offsets"]),
+            array("I", record["targets"]),
+            array("B", record["kinds"]),
+            tuple(record["counts"]),
+            rom_sha1,
+        )
+
+    def write_cache(self, path: Path) -> None:
+        record = {
+            "version": CACHE_VERSION,
+            "rom_sha1": self.rom_sha1,
+            "counts": list(self.counts),
+            "offsets": self.offsets.tolist(),
+            "targets": self.targets.tolist(),
+            "kinds": self.kinds.tolist(),
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp = path.with_suffix(f".{os.getpid()}.tmp")
+        temp.write_text(json.dumps(record, separators=(",", ":")), encoding="utf-8")
+        os.replace(temp, path)
+
+    # -- nodes --------------------------------------------------------------
+
+    @property
+    def node_count(self) -> int:
+        return sum(self.counts)
+
+    def node(self, kind: str, number: int) -> int:
+        position = NODE_KINDS.index(kind)
+        if not 0 <= number < self.counts[position]:
+            raise ValueError(f"{kind} 0x{number:02X} is out of range")
+        return self._bases[position] + number
+
+    def describe(self, node: int) -> tuple[str, int]:
+        """(kind, number) for a node id."""
+        for position in (2, 1, 0):
+            if node >= self._bases[position]:
+                return NODE_KINDS[position], node - self._bases[position]
+        raise ValueError(f"node {node} is out of range")
+
+    def label(self, node: int) -> str:
+        kind, number = self.describe(node)
+        return f"{kind}:0x{number:02X}"
+
+    def parse_label(self, label: str) -> int:
+        """Node id for 'room:0x98', 'entrance:0x27' or 'area:0x10'."""
+        kind, _, number = label.partition(":")
+        if kind not in NODE_KINDS or not number:
+            raise ValueError(f"expected room:/entrance:/area:<id>, got {label!r}")
+        return self.node(kind, int(number, 0))
+
+    def location_nodes(self, location: dict) -> list[int]:
+        """Nodes named by a story/registry location record.
+
+        Reads `room_id`, `entrance_id`, `overworld_id` and `special_world_id`
+        (hex strings such as "0x98"; "0x0C/0x37" lists alternatives) and
+        skips values that do not parse or are out of range.
+        """
+        nodes = []
+        for key, kind in LOCATION_KEYS:
+            for number in str(location.get(key) or "").split("/"):
+                try:
+                    nodes.append(self.node(kind, int(number, 0)))
+                except ValueError:
+                    pass
+        return nodes
+
+    # -- queries ------------------------------------------------------------
+
+    def edges(self, node: int) -> Iterator[tuple[int, str]]:
+        for position in range(self.offsets[node], self.offsets[node + 1]):
+            yield self.targets[position], EDGE_KINDS[self.kinds[position]]
+
+    def _walk(
+        self, starts: Iterable[int], kinds: Optional[Iterable[str]], within: Optional[set[int]]
+    ) -> dict[int, int]:
+        allowed = None if kinds is None else {KIND_CODES[kind] for kind in kinds}
+        parents: dict[int, int] = {}
+        queue: deque[int] = deque()
+        for start in starts:
+            if start not in parents:
+                parents[start] = -1
+                queue.append(start)
+        offsets, targets, codes = self.offsets, self.targets, self.kinds
+        while queue:
+            node = queue.popleft()
+            for position in range(offsets[node], offsets[node + 1]):
+                target = targets[position]
+                if target in parents:
+                    continue
+                if allowed is not None and codes[position] not in allowed:
+                    continue
+                if within is not None and target not in within:
+                    continue
+                parents[target] = node
+                queue.append(target)
+        return parents
+
+    def reachable(
+        self,
+        starts: Iterable[int],
+        kinds: Optional[Iterable[str]] = None,
+        within: Optional[set[int]] = None,
+    ) -> set[int]:
+        """Nodes reachable from `starts` over edges of `kinds`, staying inside `within`."""
+        return set(self._walk(starts, kinds, within))
+
+    def path(
+        self, source: int, target: int, kinds: Optional[Iterable[str]] = None
+    ) -> list[int]:
+        """Shortest node path from source to target, or [] if unreachable."""
+        parents = self._walk([source], kinds, None)
+        if target not in parents:
+            return []
+        path = [target]
+        while parents[path[-1]] != -1:
+            path.append(parents[path[-1]])
+        return path[::-1]
+
+    def overworld_reachable(self) -> set[int]:
+        """Nodes reachable from any overworld area that has an entrance or hole."""
+        area_base = self._bases[2]
+        return self.reachable(range(area_base, self.node_count))
+
+    # -- export -------------------------------------------------------------
+
+    def to_json(self) -> dict:
+        return {
+            "rom_sha1": self.rom_sha1,
+            "counts": dict(zip(NODE_KINDS, self.counts)),
+            "edge_kinds": list(EDGE_KINDS),
+            "edges": [
+                {"from": self.label(node), "to": self.label(target), "kind": kind}
+                for node in range(self.node_count)
+                for target, kind in self.edges(node)
+            ],
+        }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rom", type=Path, required=True, help="Path to ROM file")
+    parser.add_argument("--export", type=Path, help="Write the edge list as JSON")
+    parser.add_argument("--path", nargs=2, metavar=("FROM", "TO"), help="Shortest path, e.g. entrance:0x27 room:0xC8")
+    parser.add_argument("--reachable", metavar="FROM", help="List nodes reachable from a node")
+    parser.add_argument("--cache-dir", type=Path, default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--no-cache", action="store_true", help="Rebuild without reading or writing the cache")
+    args = parser.parse_args(argv)
+
+    try:
+        index = ConnectivityIndex.load(args.rom, None if args.no_cache else args.cache_dir)
+    except (OSError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    print(f"{len(index.targets)} edges over {index.node_count} nodes", file=sys.stderr)
+
+    try:
+        if args.path:
+            source, target = (index.parse_label(label) for label in args.path)
+            path = index.path(source, target)
+            print(" -> ".join(index.label(node) for node in path) if path else "unreachable")
+        if args.reachable:
+            for node in sorted(index.reachable([index.parse_label(args.reachable)])):
+                print(index.label(node))
+    except ValueError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    if args.export:
+        args.export.write_text(json.dumps(index.to_json(), indent=2) + "\n", encoding="utf-8")
+        print(f"Wrote {args.export}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
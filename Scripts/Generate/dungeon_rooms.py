@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""In-process dungeon room decoder for the analysis and navigation scripts.
+
+Answers the questions the analysis tools used to ask z3ed one subprocess at
+a time (`dungeon-room-header`, `dungeon-describe-room`, `dungeon-map`,
+`dungeon-room-graph`) straight from the ROM bytes, on top of the shared
+`RoomStreams` decode:
+
+  header     blockset, palette, spriteset, effect, tags (14-byte header)
+  stairs     staircase destination rooms (header bytes 10-13)
+  holewarp   fall-through destination room (header byte 9)
+  doors      direction, position slot, type and wall tile (door list)
+  objects    floor/layout nibbles and object count (object stream)
+  map grid   64x64 feature grid in the `dungeon-map` alphabet
+
+The map grid only covers what can be read without rendering room objects:
+doors, chest and stair objects and Oracle custom-collision tiles (pits,
+spikes, minecart track, stops and switches). Vanilla wall collision comes
+from drawn tiles and still needs z3ed, which the scripts keep as an
+optional cross-check.
+
+    rooms = DungeonRooms.load(Path("Roms/oos168x.sfc"))
+    for room in rooms.rooms().values():
+        print(room.room_id, room.blockset, [d.direction for d in room.doors])
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+from rom_image import RomImage
+from room_streams import (
+    COLLISION_MAP_HEIGHT,
+    COLLISION_MAP_WIDTH,
+    ROOM_COUNT,
+    RoomHeader,
+    RoomStreamError,
+    RoomStreams,
+)
+
+
+# PC address of the per-entrance room table (from Yaze's dungeon_rom_addresses.h)
+ENTRANCE_ROOM_PC = 0x14813
+ENTRANCE_COUNT = 0x85
+
+_CACHE_LIMIT = 4
+_ROOMS_BY_FILE: "OrderedDict[tuple[str, int, int], DungeonRooms]" = OrderedDict()
+
+DIRECTIONS = ("North", "South", "West", "East")
+OPPOSITE_DIRECTION = {"North": "South", "South": "North", "West": "East", "East": "West"}
+DIRECTION_STEP = {"North": -0x10, "South": 0x10, "West": -0x01, "East": 0x01}
+
+# Tilemap word offsets for each door position slot, per wall
+# (kDoorPositionToTilemapOffs_* in the reverse-engineered engine). Offset/2
+# is the tile index in the 64x64 room map.
+DOOR_TILEMAP_OFFSETS = {
+    "North": (0x021C, 0x023C, 0x025C, 0x039C, 0x03BC, 0x03DC,
+              0x121C, 0x123C, 0x125C, 0x139C, 0x13BC, 0x13DC),
+    "South": (0x0D1C, 0x0D3C, 0x0D5C, 0x0B9C, 0x0BBC, 0x0BDC,
+              0x1D1C, 0x1D3C, 0x1D5C, 0x1B9C, 0x1BBC, 0x1BDC),
+    "West": (0x0784, 0x0F84, 0x1784, 0x078A, 0x0F8A, 0x178A,
+             0x07C4, 0x0FC4, 0x17C4, 0x07CA, 0x0FCA, 0x17CA),
+    "East": (0x07B4, 0x0FB4, 0x17B4, 0x07AE, 0x0FAE, 0x17AE,
+             0x07F4, 0x0FF4, 0x17F4, 0x07EE, 0x0FEE, 0x17EE),
+}
+DOOR_WIDTH = 4  # tiles along the wall
+
+# Door type byte -> name (z3ed/ZScream wording; the mapper matches "Exit")
+DOOR_TYPE_NAMES = {
+    0x00: "Normal Door",
+    0x02: "Normal Door (Lower)",
+    0x04: "Exit (Lower)",
+    0x06: "Unused Cave Exit",
+    0x08: "Waterfall Door",
+    0x0A: "Fancy Dungeon Exit",
+    0x0C: "Fancy Dungeon Exit (Lower)",
+    0x0E: "Cave Exit",
+    0x10: "Lit Cave Exit (Lower)",
+    0x12: "Exit Marker",
+    0x14: "Dungeon Swap Marker",
+    0x16: "Layer Swap Marker",
+    0x18: "Double-Sided Shutter",
+    0x1A: "Eye Watch Door",
+    0x1C: "Small Key Door",
+    0x1E: "Big Key Door",
+    0x20: "Small Key Stairs (Up)",
+    0x22: "Small Key Stairs (Down)",
+    0x24: "Small Key Stairs (Up, Lower)",
+    0x26: "Small Key Stairs (Down, Lower)",
+    0x28: "Dash Wall",
+    0x2A: "Bombable Cave Exit",
+    0x2C: "Unopenable Big Key Door",
+    0x2E: "Bombable Door",
+    0x30: "Exploding Wall",
+    0x32: "Curtain Door",
+    0x34: "Unusable Bottom-Sided Shutter",
+    0x36: "Bottom-Sided Shutter",
+    0x38: "Top-Sided Shutter",
+    0x3A: "Unusable Normal Door",
+    0x3C: "Unusable Normal Door",
+    0x3E: "Unusable Normal Door",
+    0x40: "Normal Door (One-Sided Shutter)",
+    0x42: "Unused Double-Sided Shutter",
+    0x44: "Double Shutter Door",
+    0x46: "Explicit Room Door",
+    0x48: "Bottom-Sided Shutter (Lower)",
+    0x4A: "Top-Sided Shutter (Lower)",
+}
+
+# Map grid alphabet (matches z3ed dungeon-map, see Analysis/dungeon_viz.py)
+MAP_EMPTY = " "
+MAP_DOOR = "D"
+MAP_CHEST = "C"
+MAP_STAIRS = ">"
+
+CHEST_OBJECT_IDS = frozenset({0xF99, 0xFB1})  # chest, big chest
+STAIR_OBJECT_IDS = frozenset(range(0x12D, 0x134)) | frozenset(range(0x138, 0x13C))
+
+COLLISION_MAP_CHARS = {
+    0x01: "#",
+    0x20: "v",  # pit
+    0x62: "x",  # spikes
+    0xB0: "-", 0xB1: "|",
+    0xB2: "+", 0xB3: "+", 0xB4: "+", 0xB5: "+", 0xB6: "+",
+    0xBB: "+", 0xBC: "+", 0xBD: "+", 0xBE: "+",
+    0xB7: "N", 0xB8: "s", 0xB9: "W", 0xBA: "E",  # minecart stops
+    0xD0: "S", 0xD1: "S", 0xD2: "S", 0xD3: "S",  # track switches
+}
+
+
+# ---------------------------------------------------------------------------
+# Records
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class RoomDoor:
+    position: int  # door slot 0-11 along the wall
+    direction: str  # North | South | West | East
+    door_type: int
+    tile_x: int
+    tile_y: int
+
+    @property
+    def type_name(self) -> str:
+        return DOOR_TYPE_NAMES.get(self.door_type, f"Door 0x{self.door_type:02X}")
+
+    @property
+    def is_exit(self) -> bool:
+        return "Exit" in self.type_name
+
+
+@dataclass(frozen=True)
+class DungeonRoom:
+    room_id: int
+    header: RoomHeader
+    floor1: int
+    floor2: int
+    layout: int
+    object_count: int
+    doors: tuple[RoomDoor, ...]
+
+    @property
+    def blockset(self) -> int:
+        return self.header.blockset
+
+    @property
+    def palette(self) -> int:
+        return self.header.palette & 0x3F
+
+    @property
+    def spriteset(self) -> int:
+        return self.header.spriteset
+
+    @property
+    def effect(self) -> int:
+        return self.header.effect
+
+    @property
+    def stairs(self) -> tuple[int, int, int, int]:
+        return self.header.staircase_rooms
+
+    @property
+    def holewarp(self) -> int:
+        return self.header.holewarp
+
+
+def decode_door(word: int) -> RoomDoor:
+    """Decode one 16-bit door word: slot in bits 4-7, wall in bits 0-1, type in the high byte."""
+    position = (word >> 4) & 0x0F
+    direction = DIRECTIONS[word & 0x03]
+    offsets = DOOR_TILEMAP_OFFSETS[direction]
+    tile_x = tile_y = 0
+    if position < len(offsets):
+        tile = offsets[position] >> 1
+        tile_x, tile_y = tile % COLLISION_MAP_WIDTH, tile // COLLISION_MAP_WIDTH
+    return RoomDoor(position, direction, (word >> 8) & 0xFF, tile_x, tile_y)
+
+
+def adjacent_room(room_id: int, direction: str) -> Optional[int]:
+    """Neighbouring room on the 16-wide room grid, or None at the grid edge."""
+    column = room_id & 0x0F
+    if (direction == "West" and column == 0) or (direction == "East" and column == 0x0F):
+        return None
+    target = room_id + DIRECTION_STEP[direction]
+    return target if 0 <= target < ROOM_COUNT else None
+
+
+# ---------------------------------------------------------------------------
+# Whole-ROM view
+# ---------------------------------------------------------------------------
+
+class DungeonRooms:
+    """Memoized room decode of one ROM, shared with the generators' RoomStreams."""
+
+    def __init__(self, streams: RoomStreams) -> None:
+        self.streams = streams
+        self._rooms: dict[int, DungeonRoom] = {}
+
+    @classmethod
+    def load(cls, path: Path) -> "DungeonRooms":
+        """Shared decode of the ROM at `path`, re-read only when the file changes."""
+        path = Path(path).resolve()
+        stat = path.stat()
+        key = (str(path), stat.st_mtime_ns, stat.st_size)
+        rooms = _ROOMS_BY_FILE.get(key)
+        if rooms is None:
+            with RomImage.open(path) as rom:
+                rooms = cls(RoomStreams.for_rom(rom))
+            _ROOMS_BY_FILE[key] = rooms
+            while len(_ROOMS_BY_FILE) > _CACHE_LIMIT:
+                _ROOMS_BY_FILE.popitem(last=False)
+        else:
+            _ROOMS_BY_FILE.move_to_end(key)
+        return rooms
+
+    def room(self, room_id: int) -> DungeonRoom:
+        room = self._rooms.get(room_id)
+        if room is None:
+            if not 0 <= room_id < ROOM_COUNT:
+                raise RoomStreamError(f"room 0x{room_id:03X} is out of range")
+            objects = self.streams.objects(room_id)
+            floor, layout = objects.floor
+            room = DungeonRoom(
+                room_id=room_id,
+                header=self.streams.header(room_id),
+                floor1=floor & 0x0F,
+                floor2=(floor >> 4) & 0x0F,
+                layout=(layout >> 2) & 0x07,
+                object_count=len(objects.objects),
+                doors=tuple(decode_door(word) for word in objects.doors),
+            )
+            self._rooms[room_id] = room
+        return room
+
+    def rooms(self, room_ids: Optional[Iterable[int]] = None) -> dict[int, DungeonRoom]:
+        """Decode `room_ids` (default: every room) in one pass."""
+        ids = range(ROOM_COUNT) if room_ids is None else room_ids
+        return {room_id: self.room(room_id) for room_id in ids}
+
+    def entrance_room(self, entrance_id: int) -> int:
+        """Room an underworld entrance drops Link into."""
+        if not 0 <= entrance_id < ENTRANCE_COUNT:
+            raise RoomStreamError(f"entrance 0x{entrance_id:02X} is out of range")
+        pc = ENTRANCE_ROOM_PC + entrance_id * 2
+        return self.streams.data[pc] | (self.streams.data[pc + 1] << 8)
+
+    def map_grid(self, room_id: int) -> list[str]:
+        """64 rows of 64 map characters for `room_id` (see module docstring)."""
+        grid = [[MAP_EMPTY] * COLLISION_MAP_WIDTH for _ in range(COLLISION_MAP_HEIGHT)]
+        collision = self.streams.collision(room_id)
+        if collision is not None:
+            for offset, tile in collision.tiles.items():
+                char = COLLISION_MAP_CHARS.get(tile)
+                if char is not None:
+                    grid[offset // COLLISION_MAP_WIDTH][offset % COLLISION_MAP_WIDTH] = char
+        for obj in self.streams.objects(room_id).objects:
+            if obj.obj_id in CHEST_OBJECT_IDS:
+                grid[obj.y][obj.x] = MAP_CHEST
+            elif obj.obj_id in STAIR_OBJECT_IDS:
+                grid[obj.y][obj.x] = MAP_STAIRS
+        for door in self.room(room_id).doors:
+            horizontal = door.direction in ("North", "South")
+            for step in range(DOOR_WIDTH):
+                x = door.tile_x + (step if horizontal else 0)
+                y = door.tile_y + (0 if horizontal else step)
+                if x < COLLISION_MAP_WIDTH and y < COLLISION_MAP_HEIGHT:
+                    grid[y][x] = MAP_DOOR
+        return ["".join(row) for row in grid]
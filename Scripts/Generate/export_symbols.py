@@ -13,15 +13,25 @@ Usage:
     ./Scripts/export_symbols.py --sync             # Export and sync to Mesen2
     ./Scripts/export_symbols.py --filter oracle    # Only Oracle_ prefixed labels
     ./Scripts/export_symbols.py --format full      # Full SnesPrgRom: format
+    ./Scripts/export_symbols.py --live             # Push changed labels to a running Mesen2
+
+--live diffs the new export against the previous .mlb (keyed by address) and
+sends only added/renamed/removed labels over the socket bridge (LABELS set,
+or one SYMBOLS_LOAD for large ROM batches), so the debugger keeps running
+instead of reloading every label after a rebuild. It needs --format full:
+the simple/prg formats drop the bank, so labels from different banks share
+an address.
 """
 
 import argparse
+import json
 import os
 import re
 import shutil
 import sys
+import tempfile
 from pathlib import Path
-from typing import Iterator, NamedTuple
+from typing import Iterable, Iterator, NamedTuple
 
 class Symbol(NamedTuple):
     """Parsed symbol entry."""
@@ -245,18 +255,17 @@ def _dedupe_by_address(symbols: list[Symbol]) -> tuple[list[Symbol], dict[int, l
     return result, aliases
 
 
-def export_symbols(
+def iter_mlb_lines(
     input_path: Path,
-    output_path: Path,
     filter_type: str = 'named',
     format_type: str = 'simple',
     include_wram: bool = True,
     dedupe: bool = True,
-) -> int:
-    """Export symbols to MLB format. Returns count of symbols exported."""
+) -> Iterator[str]:
+    """Yield the MLB file for `input_path` line by line (without newlines)."""
 
     exclude = _load_exclude_list()
-    symbols = list(filter_symbols(parse_wla_symbols(input_path), filter_type, exclude))
+    symbols = filter_symbols(parse_wla_symbols(input_path), filter_type, exclude)
     # Only keep ROM-mapped symbols (LoROM uses $8000-$FFFF in banks $00-$7D/$80-$FF).
     # This drops constant defines like 00:00F8 that are not real ROM addresses.
     rom_symbols = [
@@ -270,39 +279,219 @@ def export_symbols(
     if dedupe:
         rom_symbols, alias_map = _dedupe_by_address(rom_symbols)
 
-    with open(output_path, 'w', encoding='utf-8') as f:
-        # Write header comment
-        f.write(f"; Oracle of Secrets symbols\n")
-        f.write(f"; Generated from {input_path.name}\n")
-        f.write(f"; Filter: {filter_type}, Format: {format_type}\n")
-        f.write(f"; Total: {len(rom_symbols)} ROM symbols\n")
-        f.write("\n")
-
-        # Write WRAM symbols first
-        if include_wram:
-            f.write("; === WRAM Symbols ===\n")
-            for addr, name, comment in get_wram_symbols():
-                f.write(f"SnesWorkRam:{addr:06X}:{name}:{comment}\n")
-            f.write("\n")
-
-        # Write ROM symbols
-        f.write("; === ROM Symbols ===\n")
-        current_bank = -1
-        for sym in rom_symbols:
-            # Add bank separator comments
-            if sym.bank != current_bank:
-                f.write(f"\n; Bank ${sym.bank:02X}\n")
-                current_bank = sym.bank
-
-            if sym.full_address in alias_map:
-                alias_list = alias_map[sym.full_address]
-                alias_preview = ", ".join(alias_list[:6])
-                if len(alias_list) > 6:
-                    alias_preview += ", ..."
-                f.write(f"; aliases: {alias_preview}\n")
-            f.write(format_mlb_line(sym, format_type) + "\n")
-
-    return len(rom_symbols)
+    # Header comment
+    yield "; Oracle of Secrets symbols"
+    yield f"; Generated from {input_path.name}"
+    yield f"; Filter: {filter_type}, Format: {format_type}"
+    yield f"; Total: {len(rom_symbols)} ROM symbols"
+    yield ""
+
+    # WRAM symbols first
+    if include_wram:
+        yield "; === WRAM Symbols ==="
+        for addr, name, comment in get_wram_symbols():
+            yield f"SnesWorkRam:{addr:06X}:{name}:{comment}"
+        yield ""
+
+    # ROM symbols
+    yield "; === ROM Symbols ==="
+    current_bank = -1
+    for sym in rom_symbols:
+        # Add bank separator comments
+        if sym.bank != current_bank:
+            yield ""
+            yield f"; Bank ${sym.bank:02X}"
+            current_bank = sym.bank
+
+        if sym.full_address in alias_map:
+            alias_list = alias_map[sym.full_address]
+            alias_preview = ", ".join(alias_list[:6])
+            if len(alias_list) > 6:
+                alias_preview += ", ..."
+            yield f"; aliases: {alias_preview}"
+        yield format_mlb_line(sym, format_type)
+
+
+def _write_mlb(output_path: Path, lines: Iterator[str]) -> list[str]:
+    """Write MLB lines via a temp file + rename; return the label lines."""
+    labels = []
+    tmp_path = output_path.with_name(f".{output_path.name}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        for line in lines:
+            f.write(line + "\n")
+            if line and not line.startswith(';'):
+                labels.append(line)
+    os.replace(tmp_path, output_path)
+    return labels
+
+
+def export_symbols(
+    input_path: Path,
+    output_path: Path,
+    filter_type: str = 'named',
+    format_type: str = 'simple',
+    include_wram: bool = True,
+    dedupe: bool = True,
+) -> int:
+    """Export symbols to MLB format. Returns count of symbols exported."""
+    labels = _write_mlb(
+        output_path,
+        iter_mlb_lines(input_path, filter_type, format_type, include_wram, dedupe),
+    )
+    return sum(1 for line in labels if not line.startswith('SnesWorkRam:'))
+
+
+# ---------------------------------------------------------------------------
+# Incremental sync
+# ---------------------------------------------------------------------------
+
+class MlbLabel(NamedTuple):
+    """One label line of an MLB file."""
+    memtype: str
+    address: int
+    name: str
+    comment: str = ""
+
+
+class LabelDelta(NamedTuple):
+    """Labels to (re)define and labels to drop, relative to a previous export."""
+    upserts: list[MlbLabel]
+    removed: list[MlbLabel]
+
+    def __bool__(self) -> bool:
+        return bool(self.upserts or self.removed)
+
+
+# MLB memory type -> LABELS `memtype` parameter of the Mesen2 socket API.
+LABEL_MEMTYPES = {
+    'SnesWorkRam': 'WRAM',
+    'SnesSaveRam': 'SRAM',
+    'SnesPrgRom': 'PRG',
+}
+
+# Above this many ROM upserts, push them as one SYMBOLS_LOAD file rather
+# than one LABELS round trip each.
+BULK_LABEL_THRESHOLD = 256
+
+
+def parse_mlb_labels(lines: Iterable[str]) -> dict[tuple[str, int], MlbLabel]:
+    """Index MLB label lines by (memtype, address); last definition wins."""
+    labels: dict[tuple[str, int], MlbLabel] = {}
+    for line in lines:
+        line = line.rstrip('\n')
+        if not line or line.startswith(';'):
+            continue
+        parts = line.split(':', 3)
+        if len(parts) < 3:
+            continue
+        try:
+            address = int(parts[1], 16)
+        except ValueError:
+            continue
+        label = MlbLabel(parts[0], address, parts[2], parts[3] if len(parts) > 3 else "")
+        labels[(label.memtype, address)] = label
+    return labels
+
+
+def read_mlb_labels(path: Path) -> dict[tuple[str, int], MlbLabel]:
+    """Labels of an existing MLB file (empty if it does not exist)."""
+    try:
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            return parse_mlb_labels(f)
+    except FileNotFoundError:
+        return {}
+
+
+def diff_mlb_labels(
+    old: dict[tuple[str, int], MlbLabel],
+    new: dict[tuple[str, int], MlbLabel],
+) -> LabelDelta:
+    """Address-keyed difference between two label sets."""
+    upserts = [label for key, label in new.items() if old.get(key) != label]
+    removed = [label for key, label in old.items() if key not in new]
+    return LabelDelta(upserts, removed)
+
+
+def export_symbols_delta(
+    input_path: Path,
+    output_path: Path,
+    filter_type: str = 'named',
+    format_type: str = 'full',
+    include_wram: bool = True,
+    dedupe: bool = True,
+) -> tuple[int, LabelDelta]:
+    """Export like `export_symbols` and return the change since the file on disk.
+
+    Only the full format carries banks; the others would key labels by a
+    bank-less address, so they are rejected with ValueError.
+    """
+    if format_type != 'full':
+        raise ValueError(f"label deltas need the full MLB format, not {format_type!r}")
+    previous = read_mlb_labels(output_path)
+    labels = _write_mlb(
+        output_path,
+        iter_mlb_lines(input_path, filter_type, format_type, include_wram, dedupe),
+    )
+    count = sum(1 for line in labels if not line.startswith('SnesWorkRam:'))
+    return count, diff_mlb_labels(previous, parse_mlb_labels(labels))
+
+
+def push_label_delta(bridge, delta: LabelDelta, bulk_threshold: int = BULK_LABEL_THRESHOLD) -> dict[str, int]:
+    """Apply a LabelDelta to a running Mesen2 without reloading every label.
+
+    `bridge` is a MesenBridge (anything with its `set_label` and
+    `symbols_load`). Removed labels and RAM labels go through `set_label`
+    (an empty label clears the address); large batches of ROM labels are
+    loaded with one `symbols_load` (clear=False). Returns counts per path
+    plus failures.
+    """
+    stats = {'set': 0, 'removed': 0, 'bulk': 0, 'failed': 0}
+
+    def set_label(label: MlbLabel, name: str, comment: str) -> bool:
+        memtype = LABEL_MEMTYPES.get(label.memtype, label.memtype)
+        if not bridge.set_label(label.address, name, comment, memtype=memtype):
+            stats['failed'] += 1
+            return False
+        return True
+
+    for label in delta.removed:
+        if set_label(label, '', ''):
+            stats['removed'] += 1
+
+    rom = [label for label in delta.upserts if label.memtype == 'SnesPrgRom']
+    individual = [label for label in delta.upserts if label.memtype != 'SnesPrgRom']
+    if len(rom) > bulk_threshold:
+        payload = {
+            label.name: {'addr': f"{label.address:06X}", 'size': 1, 'type': 'code'}
+            for label in rom
+        }
+        fd, tmp = tempfile.mkstemp(prefix='oos_symbols_', suffix='.json')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(payload, f)
+            result = bridge.symbols_load(tmp, clear=False)
+        finally:
+            os.unlink(tmp)
+        if result.get('success'):
+            stats['bulk'] += len(rom)
+        else:
+            stats['failed'] += len(rom)
+    else:
+        individual.extend(rom)
+
+    for label in individual:
+        if set_label(label, label.name, label.comment):
+            stats['set'] += 1
+    return stats
+
+
+def connect_mesen_bridge(socket_path: str | None):
+    """MesenBridge from Scripts/Mesen2 (imported lazily; it is optional here)."""
+    mesen2_dir = Path(__file__).resolve().parents[1] / "Mesen2"
+    if str(mesen2_dir) not in sys.path:
+        sys.path.insert(0, str(mesen2_dir))
+    from mesen2_client_lib.bridge import MesenBridge
+    return MesenBridge(socket_path)
 
 def sync_to_mesen2(mlb_path: Path, rom_name: str = "oos168x") -> bool:
     """Copy MLB file to Mesen2 directory."""
@@ -354,6 +543,14 @@ def main():
         '--sync', action='store_true',
         help='Sync to Mesen2 directory after export'
     )
+    parser.add_argument(
+        '--live', action='store_true',
+        help='Push only changed labels to a running Mesen2 via the socket bridge'
+    )
+    parser.add_argument(
+        '--socket',
+        help='Mesen2 socket path for --live (default: auto-detect)'
+    )
     parser.add_argument(
         '--rom-name',
         default='oos168x',
@@ -373,6 +570,8 @@ def main():
     )
 
     args = parser.parse_args()
+    if args.live and args.format != 'full':
+        parser.error('--live requires --format full (simple/prg addresses have no bank)')
 
     # Resolve paths relative to the repo root (script lives in Scripts/Generate/)
     script_dir = Path(__file__).resolve().parents[2]
@@ -389,20 +588,40 @@ def main():
         print(f"Filter: {args.filter}")
         print(f"Format: {args.format}")
 
-    count = export_symbols(
-        input_path,
-        output_path,
+    options = dict(
         filter_type=args.filter,
         format_type=args.format,
         include_wram=not args.no_wram,
         dedupe=not args.no_dedupe,
     )
+    if args.live:
+        count, delta = export_symbols_delta(input_path, output_path, **options)
+    else:
+        count = export_symbols(input_path, output_path, **options)
 
     print(f"Exported {count} symbols to {output_path}")
 
     if args.sync:
         sync_to_mesen2(output_path, args.rom_name)
 
+    if args.live:
+        if not delta:
+            print("Labels unchanged; nothing to push")
+            return 0
+        try:
+            bridge = connect_mesen_bridge(args.socket)
+            stats = push_label_delta(bridge, delta)
+        except (ImportError, OSError, ConnectionError) as e:
+            print(f"Live label push failed: {e}", file=sys.stderr)
+            return 1
+        print(
+            f"Pushed {len(delta.upserts)} changed / {len(delta.removed)} removed labels "
+            f"(set={stats['set']}, bulk={stats['bulk']}, cleared={stats['removed']}, "
+            f"failed={stats['failed']})"
+        )
+        if stats['failed']:
+            return 1
+
     return 0
 
 if __name__ == '__main__':
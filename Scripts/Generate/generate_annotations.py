@@ -11,7 +11,9 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 ASM_DEFINE = re.compile(r"^\s*([A-Za-z_][A-Za-z0-9_]*)\s*=\s*(\$[0-9A-Fa-f]{4,6})")
@@ -58,90 +60,126 @@ def _parse_size(token: str) -> int | None:
         return None
 
 
-def collect_annotations(root: Path) -> list[dict]:
+def scan_file_annotations(path: Path, rel: Path) -> list[dict]:
+    """Tagged comments in one .asm file (`rel` is used for sources)."""
     annotations: list[dict] = []
-    for path in root.rglob("*.asm"):
-        if any(part in SKIP_DIRS for part in path.parts):
+    struct_name: str | None = None
+    struct_base: int | None = None
+    struct_offset = 0
+    for idx, line in enumerate(path.read_text(errors="ignore").splitlines(), 1):
+        struct_field_name = ""
+        struct_field_addr: int | None = None
+
+        start_match = STRUCT_START.match(line)
+        if start_match:
+            struct_name = start_match.group(1)
+            struct_base = _parse_addr(start_match.group(2))
+            struct_offset = 0
             continue
-        rel = path.relative_to(root)
-        struct_name: str | None = None
-        struct_base: int | None = None
-        struct_offset = 0
-        for idx, line in enumerate(path.read_text(errors="ignore").splitlines(), 1):
-            struct_field_name = ""
-            struct_field_addr: int | None = None
-
-            start_match = STRUCT_START.match(line)
-            if start_match:
-                struct_name = start_match.group(1)
-                struct_base = _parse_addr(start_match.group(2))
-                struct_offset = 0
-                continue
-
-            if STRUCT_END.match(line):
-                struct_name = None
-                struct_base = None
-                struct_offset = 0
-                continue
-
-            field_match = STRUCT_FIELD.match(line)
-            if field_match and struct_name and struct_base is not None:
-                field_name = field_match.group(1)
-                size = _parse_size(field_match.group(2))
-                if size is not None:
-                    struct_field_name = f"{struct_name}.{field_name}"
-                    struct_field_addr = struct_base + struct_offset
-                    struct_offset += size
-
-            comment = _extract_comment(line)
-            if not comment:
-                continue
-
-            if TAG_WATCH.search(comment):
-                fmt = ""
-                fmt_match = TAG_FMT.search(comment)
-                if fmt_match:
-                    fmt = fmt_match.group(1).lower()
-
-                addr = None
-                label = ""
-                if struct_field_name:
-                    label = struct_field_name
-                    addr = struct_field_addr
+
+        if STRUCT_END.match(line):
+            struct_name = None
+            struct_base = None
+            struct_offset = 0
+            continue
+
+        field_match = STRUCT_FIELD.match(line)
+        if field_match and struct_name and struct_base is not None:
+            field_name = field_match.group(1)
+            size = _parse_size(field_match.group(2))
+            if size is not None:
+                struct_field_name = f"{struct_name}.{field_name}"
+                struct_field_addr = struct_base + struct_offset
+                struct_offset += size
+
+        comment = _extract_comment(line)
+        if not comment:
+            continue
+
+        if TAG_WATCH.search(comment):
+            fmt = ""
+            fmt_match = TAG_FMT.search(comment)
+            if fmt_match:
+                fmt = fmt_match.group(1).lower()
+
+            addr = None
+            label = ""
+            if struct_field_name:
+                label = struct_field_name
+                addr = struct_field_addr
+            else:
+                define = ASM_DEFINE.match(line)
+                if define:
+                    label = define.group(1)
+                    addr = _parse_addr(define.group(2))
                 else:
-                    define = ASM_DEFINE.match(line)
-                    if define:
-                        label = define.group(1)
-                        addr = _parse_addr(define.group(2))
-                    else:
-                        label_match = ASM_LABEL.match(line)
-                        if label_match:
-                            label = label_match.group(1)
-
-                annotations.append({
-                    "type": "watch",
-                    "label": label,
-                    "address": f"0x{addr:06X}" if addr is not None else None,
-                    "format": fmt,
-                    "source": f"{rel}:{idx}",
-                    "note": comment,
-                })
-
-            if TAG_ASSERT.search(comment):
-                expr = TAG_ASSERT.split(comment, 1)[1].strip()
-                annotations.append({
-                    "type": "assert",
-                    "expr": expr,
-                    "source": f"{rel}:{idx}",
-                })
-
-            if TAG_ABI.search(comment) or TAG_NO_RETURN.search(comment):
-                annotations.append({
-                    "type": "abi",
-                    "note": comment,
-                    "source": f"{rel}:{idx}",
-                })
+                    label_match = ASM_LABEL.match(line)
+                    if label_match:
+                        label = label_match.group(1)
+
+            annotations.append({
+                "type": "watch",
+                "label": label,
+                "address": f"0x{addr:06X}" if addr is not None else None,
+                "format": fmt,
+                "source": f"{rel}:{idx}",
+                "note": comment,
+            })
+
+        if TAG_ASSERT.search(comment):
+            expr = TAG_ASSERT.split(comment, 1)[1].strip()
+            annotations.append({
+                "type": "assert",
+                "expr": expr,
+                "source": f"{rel}:{idx}",
+            })
+
+        if TAG_ABI.search(comment) or TAG_NO_RETURN.search(comment):
+            annotations.append({
+                "type": "abi",
+                "note": comment,
+                "source": f"{rel}:{idx}",
+            })
+
+    return annotations
+
 
+def annotation_sources(root: Path) -> list[tuple[Path, Path]]:
+    """(path, repo-relative path) for every scanned .asm file, in scan order."""
+    return [
+        (path, path.relative_to(root))
+        for path in root.rglob("*.asm")
+        if not any(part in SKIP_DIRS for part in path.parts)
+    ]
+
+
+def _scan_chunk(chunk: list[tuple[Path, Path]]) -> list[list[dict]]:
+    return [scan_file_annotations(path, rel) for path, rel in chunk]
+
+
+def collect_annotations(root: Path, jobs: int | None = 1) -> list[dict]:
+    """Collect tagged comments from every .asm file under root.
+
+    jobs > 1 (or 0/None for every core) scans files in a process pool; the
+    result order is the same as the serial scan.
+    """
+    files = annotation_sources(root)
+    workers = (os.cpu_count() or 1) if not jobs else max(1, jobs)
+    if workers <= 1 or len(files) < 2:
+        per_file = [scan_file_annotations(path, rel) for path, rel in files]
+    else:
+        size = max(1, -(-len(files) // (workers * 4)))
+        chunks = [files[i:i + size] for i in range(0, len(files), size)]
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+            per_file = [
+                result
+                for chunk_results in pool.map(_scan_chunk, chunks)
+                for result in chunk_results
+            ]
+
+    annotations: list[dict] = []
+    for file_annotations in per_file:
+        annotations.extend(file_annotations)
     return annotations
 
 
@@ -149,9 +187,11 @@ def main() -> int:
     parser = argparse.ArgumentParser(description="Generate annotations.json from ASM tags")
     parser.add_argument("--root", type=Path, required=True, help="Root directory to scan")
     parser.add_argument("--out", type=Path, required=True, help="Output annotations.json path")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="Scan worker processes (0 = every core; default: 1)")
     args = parser.parse_args()
 
-    annotations = collect_annotations(args.root)
+    annotations = collect_annotations(args.root, args.jobs)
     payload = {
         "version": 1,
         "annotations": annotations,
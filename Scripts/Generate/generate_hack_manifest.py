@@ -43,17 +43,26 @@ import re
 import sys
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import Iterable, Mapping, Optional, Union
 
 # Import the existing hooks scanner infrastructure
 from generate_hooks_json import (
     DEFINE_ANY_ASSIGN_RE,
     scan_org_directives,
     scan_hooks,
-    _load_global_defines,
-    _iter_active_lines,
     HookEntry,
     OrgDirective,
+    DEFAULT_SCAN_CACHE,
+    HOOK_FILE_SCANNERS,
+    ScanCache,
+    SourceGraph,
+)
+from rom_image import RomImage, RomImageCache
+from room_streams import (
+    RoomStreamError,
+    scan_object_stream,
+    scan_pot_stream,
+    scan_sprite_stream,
 )
 
 # ---------------------------------------------------------------------------
@@ -183,16 +192,29 @@ def _parse_incsrc(line: str) -> Optional[str]:
 
 
 def _iter_active_incsrcs(
-    lines: list[str],
-    global_defines: dict[str, int],
+    records: Iterable[tuple[int, str, Mapping[str, int]]],
 ) -> Iterable[tuple[int, str]]:
     """Yield literal includes whose enclosing Asar condition is active."""
-    for line_index, line, _ in _iter_active_lines(lines, global_defines):
+    for line_index, line, _ in records:
         include_text = _parse_incsrc(line)
         if include_text is not None:
             yield line_index + 1, include_text
 
 
+def _scan_file_incsrc(graph: SourceGraph, asm_path: Path) -> dict:
+    """Active includes and define assignments of one file (JSON-safe)."""
+    records = graph.active_lines(asm_path)
+    assignments = []
+    for line_index, line, _ in records:
+        assignment = DEFINE_ANY_ASSIGN_RE.match(line.split(";", 1)[0])
+        if assignment:
+            assignments.append([line_index + 1, assignment.group(1)])
+    return {
+        "includes": [list(item) for item in _iter_active_incsrcs(records)],
+        "assignments": assignments,
+    }
+
+
 def _is_case_exact_file(candidate: Path, root: Path) -> bool:
     """Return whether a candidate exists with repository-exact path casing."""
     normalized = Path(os.path.normpath(candidate))
@@ -218,6 +240,7 @@ def collect_reachable_asm_sources(
     root: Path,
     entry_point: Path = MANIFEST_ENTRY_POINT,
     defines: Optional[dict[str, int]] = None,
+    graph: Optional[SourceGraph] = None,
 ) -> list[Path]:
     """Collect the transitive literal `incsrc` graph for the build entry.
 
@@ -237,11 +260,9 @@ def collect_reachable_asm_sources(
             f"ASM entry point is outside repo root: {entry}"
         )
 
-    active_defines = (
-        _load_global_defines(resolved_root)
-        if defines is None
-        else dict(defines)
-    )
+    if graph is None:
+        graph = SourceGraph(resolved_root, defines)
+    active_defines = graph.global_defines
     pending = [entry]
     reachable: set[Path] = set()
     while pending:
@@ -251,17 +272,13 @@ def collect_reachable_asm_sources(
         reachable.add(asm_path)
 
         try:
-            lines = asm_path.read_text(
-                encoding="utf-8", errors="ignore"
-            ).splitlines()
+            scan = graph.file_result("incsrc", asm_path, _scan_file_incsrc)
         except OSError as exc:
             raise ManifestGenerationError(
                 f"Unable to read reachable ASM source {asm_path}: {exc}"
             ) from exc
 
-        for line_number, include_text in _iter_active_incsrcs(
-            lines, active_defines
-        ):
+        for line_number, include_text in scan["includes"]:
             include_path = Path(include_text)
             candidates = (
                 asm_path.parent / include_path,
@@ -296,19 +313,16 @@ def collect_reachable_asm_sources(
         if rel in canonical_define_sources:
             continue
         try:
-            lines = asm_path.read_text(
-                encoding="utf-8", errors="ignore"
-            ).splitlines()
+            scan = graph.file_result("incsrc", asm_path, _scan_file_incsrc)
         except OSError as exc:
             raise ManifestGenerationError(
                 f"Unable to validate reachable ASM source {asm_path}: {exc}"
             ) from exc
-        for line_index, line, _ in _iter_active_lines(lines, active_defines):
-            assignment = DEFINE_ANY_ASSIGN_RE.match(line.split(";", 1)[0])
-            if assignment and assignment.group(1) in active_defines:
+        for line_number, name in scan["assignments"]:
+            if name in active_defines:
                 raise ManifestGenerationError(
-                    f"{rel}:{line_index + 1}: reachable source reassigns "
-                    f"preloaded global define !{assignment.group(1)} outside "
+                    f"{rel}:{line_number}: reachable source reassigns "
+                    f"preloaded global define !{name} outside "
                     "the canonical define files; include-order state cannot "
                     "be resolved safely"
                 )
@@ -329,16 +343,89 @@ class BankRegion:
     purpose: str = ""
 
 
+def _scan_file_banks(graph: SourceGraph, asm_path: Path) -> list[list]:
+    """Expanded-bank [bank, region] pairs declared by one file (JSON-safe)."""
+    lines = graph.lines(asm_path)
+    rel = str(asm_path.relative_to(graph.root))
+    regions: list[list] = []
+    for i, line in enumerate(lines):
+        # Check for org $XX8000+ (expanded bank entry points)
+        m = ORG_BANK_RE.match(line)
+        if m:
+            source_addr = int(m.group(1), 16)
+            addr = _physical_org_address(source_addr)
+            bank = (addr >> 16) & 0xFF
+            # Only track expanded banks (>= $1E, avoiding vanilla $00-$1D)
+            if bank >= 0x1E:
+                purpose = ""
+                # Check preceding comment for purpose (truncate to 80 chars)
+                if i > 0:
+                    pm = PURPOSE_COMMENT_RE.search(lines[i - 1])
+                    if pm:
+                        text = pm.group(1).strip()
+                        # Skip separator lines and @hook annotations
+                        if not text.startswith(("===", "---", "@hook", "***")):
+                            purpose = text[:80]
+
+                # Look for assert pc() <= $XXXXXX to find end bound
+                end_addr = None
+                for j in range(i + 1, min(i + 2000, len(lines))):
+                    am = ASSERT_PC_RE.search(lines[j])
+                    if am:
+                        end_addr = _physical_org_address(
+                            int(am.group(1), 16)
+                        )
+                        break
+                    # Stop at next org in a different bank
+                    next_org = ORG_BANK_RE.match(lines[j])
+                    if next_org:
+                        next_addr = _physical_org_address(
+                            int(next_org.group(1), 16)
+                        )
+                        next_bank = (next_addr >> 16) & 0xFF
+                        if next_bank != bank:
+                            break
+
+                entry = {
+                    "start": f"0x{addr:06X}",
+                    "source": f"{rel}:{i + 1}",
+                    "purpose": purpose,
+                }
+                if end_addr:
+                    entry["end"] = f"0x{end_addr:06X}"
+
+                regions.append([bank, entry])
+
+        # Check for freedata bank $XX
+        fm = FREEDATA_BANK_RE.match(line)
+        if fm:
+            source_bank = int(fm.group(1), 16)
+            if source_bank in (0x7E, 0x7F):
+                bank = source_bank
+            else:
+                bank = source_bank & 0x7F
+            if bank >= 0x1E:
+                entry = {
+                    "start": f"0x{bank:02X}8000",
+                    "source": f"{rel}:{i + 1}",
+                    "purpose": "freedata (asar auto-allocated)",
+                }
+                regions.append([bank, entry])
+    return regions
+
+
 def scan_bank_ownership(
     root: Path,
     asm_paths: Optional[Iterable[Path]] = None,
+    graph: Optional[SourceGraph] = None,
 ) -> list[dict]:
     """Detect owned banks from sources reachable by the build entry point."""
     root = root.resolve()
     bank_sources: dict[int, list[dict]] = {}
+    graph = graph or SourceGraph(root)
 
     candidate_paths = (
-        collect_reachable_asm_sources(root)
+        collect_reachable_asm_sources(root, graph=graph)
         if asm_paths is None
         else asm_paths
     )
@@ -346,83 +433,19 @@ def scan_bank_ownership(
     for asm_path in source_paths:
         asm_path = asm_path.resolve()
         try:
-            rel = str(asm_path.relative_to(root))
+            asm_path.relative_to(root)
         except ValueError as exc:
             raise ManifestGenerationError(
                 f"Reachable ASM source is outside repo root: {asm_path}"
             ) from exc
         try:
-            text = asm_path.read_text(encoding="utf-8", errors="ignore")
+            regions = graph.file_result("banks", asm_path, _scan_file_banks)
         except OSError as exc:
             raise ManifestGenerationError(
                 f"Unable to read reachable ASM source {asm_path}: {exc}"
             ) from exc
-
-        lines = text.splitlines()
-
-        for i, line in enumerate(lines):
-            # Check for org $XX8000+ (expanded bank entry points)
-            m = ORG_BANK_RE.match(line)
-            if m:
-                source_addr = int(m.group(1), 16)
-                addr = _physical_org_address(source_addr)
-                bank = (addr >> 16) & 0xFF
-                # Only track expanded banks (>= $1E, avoiding vanilla $00-$1D)
-                if bank >= 0x1E:
-                    purpose = ""
-                    # Check preceding comment for purpose (truncate to 80 chars)
-                    if i > 0:
-                        pm = PURPOSE_COMMENT_RE.search(lines[i - 1])
-                        if pm:
-                            text = pm.group(1).strip()
-                            # Skip separator lines and @hook annotations
-                            if not text.startswith(("===", "---", "@hook", "***")):
-                                purpose = text[:80]
-
-                    # Look for assert pc() <= $XXXXXX to find end bound
-                    end_addr = None
-                    for j in range(i + 1, min(i + 2000, len(lines))):
-                        am = ASSERT_PC_RE.search(lines[j])
-                        if am:
-                            end_addr = _physical_org_address(
-                                int(am.group(1), 16)
-                            )
-                            break
-                        # Stop at next org in a different bank
-                        next_org = ORG_BANK_RE.match(lines[j])
-                        if next_org:
-                            next_addr = _physical_org_address(
-                                int(next_org.group(1), 16)
-                            )
-                            next_bank = (next_addr >> 16) & 0xFF
-                            if next_bank != bank:
-                                break
-
-                    entry = {
-                        "start": f"0x{addr:06X}",
-                        "source": f"{rel}:{i + 1}",
-                        "purpose": purpose,
-                    }
-                    if end_addr:
-                        entry["end"] = f"0x{end_addr:06X}"
-
-                    bank_sources.setdefault(bank, []).append(entry)
-
-            # Check for freedata bank $XX
-            fm = FREEDATA_BANK_RE.match(line)
-            if fm:
-                source_bank = int(fm.group(1), 16)
-                if source_bank in (0x7E, 0x7F):
-                    bank = source_bank
-                else:
-                    bank = source_bank & 0x7F
-                if bank >= 0x1E:
-                    entry = {
-                        "start": f"0x{bank:02X}8000",
-                        "source": f"{rel}:{i + 1}",
-                        "purpose": "freedata (asar auto-allocated)",
-                    }
-                    bank_sources.setdefault(bank, []).append(entry)
+        for bank, entry in regions:
+            bank_sources.setdefault(bank, []).append(dict(entry))
 
     # Known shared banks: yaze writes base data, ASM re-patches parts.
     # These need special handling — yaze can write, but must re-run asar after.
@@ -546,17 +569,91 @@ def scan_message_layout(root: Path) -> dict:
 # Room tag extraction
 # ---------------------------------------------------------------------------
 
+def _scan_file_room_tags(graph: SourceGraph, asm_path: Path) -> list[list]:
+    """[tag_id, entry, gate_flag] for each room tag org in one file (JSON-safe).
+
+    The gate flag is resolved against the caller's defines when merging, so
+    the per-file result does not depend on them.
+    """
+    lines = graph.lines(asm_path)
+    rel = str(asm_path.relative_to(graph.root))
+    found: list[list] = []
+    # Track if/endif nesting for feature-gated tags
+    in_gated_block = False
+    gate_flag = None
+
+    for i, line in enumerate(lines):
+        stripped = line.strip()
+
+        # Track feature flag guards
+        if stripped.startswith("if "):
+            fm = re.search(r"!(ENABLE_\w+)\s*==\s*1", stripped)
+            if fm:
+                in_gated_block = True
+                gate_flag = fm.group(1)
+        elif stripped.startswith("endif"):
+            in_gated_block = False
+            gate_flag = None
+
+        m = ROOM_TAG_RE.match(line)
+        if not m:
+            continue
+
+        offset = int(m.group(1), 16)
+        addr = 0x01CC00 + offset
+        # Tag ID = offset / 4 + 0x33
+        tag_id = offset // 4 + 0x33
+
+        # Extract hook name from @hook annotation
+        name = f"Tag_0x{tag_id:02X}"
+        nm = HOOK_NAME_RE.search(line)
+        if nm:
+            name = nm.group(1)
+
+        # Extract purpose from comment
+        purpose = ""
+        # Check current line and preceding line
+        for check_line in [line, lines[i - 1] if i > 0 else ""]:
+            cm = PURPOSE_COMMENT_RE.search(check_line)
+            if cm:
+                text = cm.group(1).strip()
+                # Skip pure @hook annotations
+                if text.startswith("@hook"):
+                    continue
+                # Strip trailing @hook annotation from inline comments
+                if "; @hook" in check_line:
+                    text = text.split("@hook")[0].strip().rstrip(";").strip()
+                if text:
+                    purpose = text
+                    break
+
+        entry = {
+            "tag_id": f"0x{tag_id:02X}",
+            "address": f"0x{addr:06X}",
+            "name": name,
+            "source": f"{rel}:{i + 1}",
+        }
+        if purpose:
+            entry["purpose"] = purpose
+        found.append([
+            tag_id, entry, gate_flag if in_gated_block and gate_flag else None
+        ])
+    return found
+
+
 def scan_room_tags(
     root: Path,
     defines: dict[str, int],
     asm_paths: Optional[Iterable[Path]] = None,
+    graph: Optional[SourceGraph] = None,
 ) -> list[dict]:
     """Extract room tag mappings from org $01CCxx directives."""
     root = root.resolve()
     tags: dict[int, dict] = {}
+    graph = graph or SourceGraph(root, defines)
 
     candidate_paths = (
-        collect_reachable_asm_sources(root)
+        collect_reachable_asm_sources(root, graph=graph)
         if asm_paths is None
         else asm_paths
     )
@@ -564,76 +661,21 @@ def scan_room_tags(
     for asm_path in source_paths:
         asm_path = asm_path.resolve()
         try:
-            rel = str(asm_path.relative_to(root))
+            asm_path.relative_to(root)
         except ValueError as exc:
             raise ManifestGenerationError(
                 f"Reachable ASM source is outside repo root: {asm_path}"
             ) from exc
         try:
-            lines = asm_path.read_text(encoding="utf-8", errors="ignore").splitlines()
+            found = graph.file_result("room_tags", asm_path, _scan_file_room_tags)
         except OSError as exc:
             raise ManifestGenerationError(
                 f"Unable to read reachable ASM source {asm_path}: {exc}"
             ) from exc
 
-        # Track if/endif nesting for feature-gated tags
-        in_gated_block = False
-        gate_flag = None
-
-        for i, line in enumerate(lines):
-            stripped = line.strip()
-
-            # Track feature flag guards
-            if stripped.startswith("if "):
-                fm = re.search(r"!(ENABLE_\w+)\s*==\s*1", stripped)
-                if fm:
-                    in_gated_block = True
-                    gate_flag = fm.group(1)
-            elif stripped.startswith("endif"):
-                in_gated_block = False
-                gate_flag = None
-
-            m = ROOM_TAG_RE.match(line)
-            if not m:
-                continue
-
-            offset = int(m.group(1), 16)
-            addr = 0x01CC00 + offset
-            # Tag ID = offset / 4 + 0x33
-            tag_id = offset // 4 + 0x33
-
-            # Extract hook name from @hook annotation
-            name = f"Tag_0x{tag_id:02X}"
-            nm = HOOK_NAME_RE.search(line)
-            if nm:
-                name = nm.group(1)
-
-            # Extract purpose from comment
-            purpose = ""
-            # Check current line and preceding line
-            for check_line in [line, lines[i - 1] if i > 0 else ""]:
-                cm = PURPOSE_COMMENT_RE.search(check_line)
-                if cm:
-                    text = cm.group(1).strip()
-                    # Skip pure @hook annotations
-                    if text.startswith("@hook"):
-                        continue
-                    # Strip trailing @hook annotation from inline comments
-                    if "; @hook" in check_line:
-                        text = text.split("@hook")[0].strip().rstrip(";").strip()
-                    if text:
-                        purpose = text
-                        break
-
-            entry = {
-                "tag_id": f"0x{tag_id:02X}",
-                "address": f"0x{addr:06X}",
-                "name": name,
-                "source": f"{rel}:{i + 1}",
-            }
-            if purpose:
-                entry["purpose"] = purpose
-            if in_gated_block and gate_flag:
+        for tag_id, cached_entry, gate_flag in found:
+            entry = dict(cached_entry)
+            if gate_flag:
                 flag_value = defines.get(gate_flag, 0)
                 entry["feature_flag"] = f"!{gate_flag}"
                 entry["enabled"] = flag_value == 1
@@ -645,19 +687,30 @@ def scan_room_tags(
     return [tags[k] for k in sorted(tags)]
 
 
+# Per-file scanners run over every reachable source, keyed by result kind.
+MANIFEST_FILE_SCANNERS = {
+    **HOOK_FILE_SCANNERS,
+    "banks": _scan_file_banks,
+    "room_tags": _scan_file_room_tags,
+}
+
+
 # ---------------------------------------------------------------------------
 # Feature flag extraction
 # ---------------------------------------------------------------------------
 
-def scan_feature_flags(root: Path) -> list[dict]:
+def scan_feature_flags(
+    root: Path, graph: Optional[SourceGraph] = None
+) -> list[dict]:
     """Extract feature flags from macros.asm and feature_flags.asm."""
     flags: dict[str, dict] = {}
+    graph = graph or SourceGraph(root)
 
     for rel in ("Util/macros.asm", "Config/feature_flags.asm"):
         path = root / rel
         if not path.exists():
             continue
-        lines = path.read_text(encoding="utf-8", errors="ignore").splitlines()
+        lines = graph.lines(path)
         for i, line in enumerate(lines):
             m = FEATURE_FLAG_RE.match(line)
             if not m:
@@ -687,13 +740,22 @@ class SramVariable:
     bits: list = field(default_factory=list)
 
 
-def scan_sram_layout(root: Path) -> list[dict]:
+def scan_sram_layout(
+    root: Path, graph: Optional[SourceGraph] = None
+) -> list[dict]:
     """Extract custom SRAM variable definitions from Core/sram.asm."""
     sram_file = root / "Core" / "sram.asm"
     if not sram_file.exists():
         return []
 
-    lines = sram_file.read_text(encoding="utf-8", errors="ignore").splitlines()
+    graph = graph or SourceGraph(root)
+    result = graph.file_result("sram", sram_file, _scan_file_sram)
+    return [dict(entry) for entry in result]
+
+
+def _scan_file_sram(graph: SourceGraph, sram_file: Path) -> list[dict]:
+    """SRAM variables declared in Core/sram.asm (JSON-safe)."""
+    lines = graph.lines(sram_file)
     variables: dict[int, SramVariable] = {}
     current_section = ""
 
@@ -1041,6 +1103,13 @@ def _dungeon_stream_parse_limit(
     return min(containing_end, bank_end)
 
 
+_DUNGEON_STREAM_SCANNERS = {
+    "objects": scan_object_stream,
+    "sprites": scan_sprite_stream,
+    "pot_items": scan_pot_stream,
+}
+
+
 def _find_dungeon_stream_end(
     data: bytes,
     stream_name: str,
@@ -1049,70 +1118,17 @@ def _find_dungeon_stream_end(
     limit_pc: int,
 ) -> int:
     """Return a format-valid stream's exclusive logical end."""
-
-    def require(size: int, description: str) -> None:
-        if size < 0 or cursor + size > limit_pc:
-            raise ManifestGenerationError(
-                f"{stream_name} stream for room 0x{room_id:03X} {description} "
-                f"before parse limit PC 0x{limit_pc:X}"
-            )
-        _require_rom_span(data, cursor, size, description)
-
-    cursor = start_pc
-    if stream_name == "objects":
-        require(2, "is missing its two-byte header")
-        cursor += 2
-        for list_id in range(2):
-            while True:
-                require(2, f"list {list_id} has no 0xFFFF terminator")
-                if data[cursor : cursor + 2] == b"\xFF\xFF":
-                    cursor += 2
-                    break
-                require(3, f"list {list_id} has a truncated record")
-                cursor += 3
-
-        in_doors = False
-        while True:
-            require(
-                2,
-                (
-                    "door list has no 0xFFFF terminator"
-                    if in_doors
-                    else "list 2 has no door marker or terminator"
-                ),
-            )
-            marker = data[cursor : cursor + 2]
-            if marker == b"\xFF\xFF":
-                return cursor + 2
-            if not in_doors and marker == b"\xF0\xFF":
-                cursor += 2
-                in_doors = True
-                continue
-            if in_doors:
-                cursor += 2
-            else:
-                require(3, "list 2 has a truncated record")
-                cursor += 3
-
-    if stream_name == "sprites":
-        require(1, "is missing its sort byte")
-        cursor += 1
-        while True:
-            require(1, "has no 0xFF terminator")
-            if data[cursor] == 0xFF:
-                return cursor + 1
-            require(3, "has a truncated record")
-            cursor += 3
-
-    if stream_name == "pot_items":
-        while True:
-            require(2, "has no 0xFFFF terminator")
-            if data[cursor : cursor + 2] == b"\xFF\xFF":
-                return cursor + 2
-            require(3, "has a truncated record")
-            cursor += 3
-
-    raise ManifestGenerationError(f"unsupported dungeon stream {stream_name}")
+    scan = _DUNGEON_STREAM_SCANNERS.get(stream_name)
+    if scan is None:
+        raise ManifestGenerationError(f"unsupported dungeon stream {stream_name}")
+    try:
+        stream = scan(data, start_pc, limit_pc)
+    except RoomStreamError as exc:
+        raise ManifestGenerationError(
+            f"{stream_name} stream for room 0x{room_id:03X} {exc} "
+            f"before parse limit PC 0x{limit_pc:X}"
+        ) from exc
+    return stream if isinstance(stream, int) else stream.end
 
 
 def _derive_dungeon_stream_regions(data: bytes) -> dict:
@@ -1337,15 +1353,29 @@ def _derive_dungeon_stream_regions(data: bytes) -> dict:
     }
 
 
-def derive_dungeon_stream_regions(dev_rom_path: Path) -> dict:
-    """Derive guarded object, sprite, and pot-item layouts from a dev ROM."""
+def _open_dev_rom(dev_rom: Union[Path, RomImage]) -> RomImage:
+    if isinstance(dev_rom, RomImage):
+        return dev_rom
     try:
-        data = dev_rom_path.read_bytes()
+        return RomImage.open(dev_rom)
     except OSError as exc:
         raise ManifestGenerationError(
-            f"Unable to read dev ROM {dev_rom_path}: {exc}"
+            f"Unable to read dev ROM {dev_rom}: {exc}"
         ) from exc
-    return _derive_dungeon_stream_regions(data)
+
+
+def _open_rom_image(path: Path, roms: Optional[RomImageCache]) -> RomImage:
+    return roms.get(path) if roms is not None else RomImage.open(path)
+
+
+def derive_dungeon_stream_regions(dev_rom: Union[Path, RomImage]) -> dict:
+    """Derive guarded object, sprite, and pot-item layouts from a dev ROM."""
+    image = _open_dev_rom(dev_rom)
+    try:
+        return _derive_dungeon_stream_regions(image.data)
+    finally:
+        if image is not dev_rom:
+            image.close()
 
 
 def _find_custom_collision_stream_end(data: bytes, room_id: int, start_pc: int) -> int:
@@ -1426,15 +1456,17 @@ def _find_custom_collision_stream_end(data: bytes, room_id: int, start_pc: int)
     )
 
 
-def derive_editor_managed_regions(dev_rom_path: Path) -> list[dict]:
+def derive_editor_managed_regions(dev_rom: Union[Path, RomImage]) -> list[dict]:
     """Derive exact dungeon metadata and collision ranges from the dev ROM."""
+    image = _open_dev_rom(dev_rom)
     try:
-        data = dev_rom_path.read_bytes()
-    except OSError as exc:
-        raise ManifestGenerationError(
-            f"Unable to read dev ROM {dev_rom_path}: {exc}"
-        ) from exc
+        return _derive_editor_managed_regions(image.data)
+    finally:
+        if image is not dev_rom:
+            image.close()
+
 
+def _derive_editor_managed_regions(data: bytes) -> list[dict]:
     header_table_snes = _read_u24(
         data, ROOM_HEADER_POINTER_PC, "room-header pointer-table operand"
     )
@@ -1688,10 +1720,20 @@ def generate_manifest(
     root: Path,
     rom_path: Optional[Path] = None,
     dev_rom_path: Optional[Path] = None,
+    cache: Optional[ScanCache] = None,
+    jobs: Optional[int] = 1,
+    graph: Optional[SourceGraph] = None,
+    roms: Optional[RomImageCache] = None,
 ) -> dict:
-    """Generate the complete hack manifest."""
-    import hashlib
-
+    """Generate the complete hack manifest.
+
+    With a ScanCache, per-file scan results are reused for sources whose
+    content and global define state are unchanged; the caller saves it.
+    `jobs` > 1 (or 0 for every core) scans the reachable sources in worker
+    processes; the output is identical to the serial scan. Long-running
+    callers pass a warm `graph` and `roms` cache to skip re-reading sources
+    and ROMs that have not changed.
+    """
     root = root.resolve()
     if rom_path is not None:
         rom_path = _resolve_repo_path(root, rom_path)
@@ -1710,15 +1752,19 @@ def generate_manifest(
             f"Editable dev ROM not found: {dev_rom_path}"
         )
 
-    reachable_sources = collect_reachable_asm_sources(root)
+    # Every scanner below shares one parsed view of the sources: each file is
+    # read and preprocessed once per run rather than once per pass.
+    graph = graph or SourceGraph(root, cache=cache)
+    reachable_sources = collect_reachable_asm_sources(root, graph=graph)
 
     # Load defines for conditional compilation evaluation
-    defines = _load_global_defines(root)
+    defines = graph.global_defines
     asm_sources = reachable_sources
+    graph.prefetch(asm_sources, MANIFEST_FILE_SCANNERS, jobs)
 
     # Scan only the source graph assembled from Oracle_main.asm. Local ignored
     # assets and archived experiments must not claim ROM ownership.
-    hooks = scan_hooks(root, asm_sources)
+    hooks = scan_hooks(root, asm_sources, graph)
 
     # Build manifest sections
     manifest: dict = {
@@ -1754,36 +1800,44 @@ def generate_manifest(
     if rom_path and rom_path.exists():
         rom_meta["path"] = _manifest_path(root, rom_path)
         try:
-            data = rom_path.read_bytes()
-            rom_meta["sha1"] = hashlib.sha1(data).hexdigest()
-            rom_meta["size"] = len(data)
+            rom = _open_rom_image(rom_path, roms)
         except OSError as exc:
             raise ManifestGenerationError(
                 f"Unable to read patched ROM {rom_path}: {exc}"
             ) from exc
+        rom_meta["sha1"] = rom.sha1
+        rom_meta["size"] = rom.size
+        if roms is None:
+            rom.close()
 
     # Also hash the exact editable ROM selected by the build, if it exists.
+    # The same mapping feeds every dev-ROM derivation below.
+    dev_rom: Optional[RomImage] = None
     if dev_rom_path.exists():
         try:
-            dev_data = dev_rom_path.read_bytes()
-            rom_meta["dev_rom_sha1"] = hashlib.sha1(dev_data).hexdigest()
-            rom_meta["dev_rom_size"] = len(dev_data)
+            dev_rom = _open_rom_image(dev_rom_path, roms)
         except OSError as exc:
             raise ManifestGenerationError(
                 f"Unable to read editable dev ROM {dev_rom_path}: {exc}"
             ) from exc
+        rom_meta["dev_rom_sha1"] = dev_rom.sha1
+        rom_meta["dev_rom_size"] = dev_rom.size
     manifest["rom"] = rom_meta
 
-    if dev_rom_path.exists():
-        manifest["dungeon_stream_regions"] = derive_dungeon_stream_regions(
-            dev_rom_path
-        )
-        editor_regions = derive_editor_managed_regions(dev_rom_path)
+    if dev_rom is not None:
+        try:
+            manifest["dungeon_stream_regions"] = derive_dungeon_stream_regions(
+                dev_rom
+            )
+            editor_regions = derive_editor_managed_regions(dev_rom)
+        finally:
+            if roms is None:
+                dev_rom.close()
         _validate_expanded_hooks_disjoint_from_editor_regions(
             hooks, editor_regions
         )
         _validate_unresolved_org_proofs(
-            scan_org_directives(root, asm_sources), editor_regions
+            scan_org_directives(root, asm_sources, graph), editor_regions
         )
         manifest["editor_managed_regions"] = {
             "description": (
@@ -1819,7 +1873,7 @@ def generate_manifest(
     }
 
     # Bank ownership — expanded banks with ownership classification
-    banks = scan_bank_ownership(root, asm_sources)
+    banks = scan_bank_ownership(root, asm_sources, graph)
     manifest["owned_banks"] = {
         "description": "Expanded ROM banks with ownership classification. 'asm_owned' banks are fully owned by ASM. 'shared' banks (e.g., $28 ZSCustomOverworld) contain data that yaze writes AND ASM patches on top — yaze can edit these but must rebuild after. 'asm_expansion' banks only exist in the patched ROM.",
         "ownership_types": {
@@ -1865,7 +1919,7 @@ def generate_manifest(
     # Room tags — the dispatch table at $01CC00-$01CC5A is in vanilla bank $01.
     # Asar patches specific 4-byte slots (JML instructions). Yaze's room editor
     # assigns tag IDs to rooms; this manifest tells yaze what each tag ID means.
-    room_tags = scan_room_tags(root, defines, asm_sources)
+    room_tags = scan_room_tags(root, defines, asm_sources, graph)
     manifest["room_tags"] = {
         "description": "Custom room tag dispatch table entries in bank $01. Asar patches 4-byte JML slots at these addresses. Yaze assigns tag IDs to rooms via room headers — this manifest provides labels and semantics so the editor can show meaningful names instead of raw tag numbers.",
         "dispatch_table_start": "0x01CC00",
@@ -1878,7 +1932,7 @@ def generate_manifest(
     # Feature flags — compile-time toggles that affect which hooks are active.
     # Yaze could display these in the project settings panel and optionally
     # generate Config/feature_flags.asm when toggled.
-    flags = scan_feature_flags(root)
+    flags = scan_feature_flags(root, graph)
     manifest["feature_flags"] = {
         "description": "Compile-time feature toggles in Config/feature_flags.asm. These control which ASM hooks are active. Yaze can display them in the project settings and optionally write updated flag values before triggering a rebuild.",
         "config_file": "Config/feature_flags.asm",
@@ -1887,7 +1941,7 @@ def generate_manifest(
 
     # SRAM layout — custom variable definitions that yaze can use for
     # the RAM panel, save state inspector, and debugging overlays.
-    sram = scan_sram_layout(root)
+    sram = scan_sram_layout(root, graph)
     manifest["sram"] = {
         "description": "Custom SRAM variable definitions from Core/sram.asm. These extend the vanilla ALTTP save file layout. Yaze can display variable names in the RAM panel and save state inspector instead of raw hex addresses.",
         "source_file": "Core/sram.asm",
@@ -1952,6 +2006,23 @@ def main() -> int:
         action="store_true",
         help="Compact JSON output (no indentation)",
     )
+    parser.add_argument(
+        "--cache",
+        type=Path,
+        default=DEFAULT_SCAN_CACHE,
+        help="Per-file scan cache (default: .cache/asm_scan_cache.json)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Rescan every source file and leave the cache untouched",
+    )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=1,
+        help="Scan worker processes (0 = every core; default: 1)",
+    )
     args = parser.parse_args()
 
     root = args.root.resolve()
@@ -1962,11 +2033,20 @@ def main() -> int:
         default_rom_path = root / "Roms" / "oos168x.sfc"
         rom_path = default_rom_path if default_rom_path.is_file() else None
 
+    cache = None
+    if not args.no_cache:
+        cache_path = args.cache if args.cache.is_absolute() else root / args.cache
+        cache = ScanCache(cache_path)
+
     try:
-        manifest = generate_manifest(root, rom_path, args.dev_rom)
+        manifest = generate_manifest(
+            root, rom_path, args.dev_rom, cache, args.jobs
+        )
     except ManifestGenerationError as exc:
         print(f"error: cannot generate hack manifest: {exc}", file=sys.stderr)
         return 1
+    if cache is not None:
+        cache.save()
 
     indent = None if args.compact else 2
     output.write_text(json.dumps(manifest, indent=indent) + "\n")
@@ -9,12 +9,24 @@ from __future__ import annotations
 import argparse
 import ast
 import hashlib
+import itertools
 import json
+import os
 import re
 import sys
-from dataclasses import dataclass
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from functools import partial
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import Callable, Iterable, Iterator, Mapping, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: ScanCache.save still merges, just unlocked
+    fcntl = None
+
+from rom_image import RomImage, RomImageCache
 
 ORG_RE = re.compile(r'^\s*org\s+\$([0-9A-Fa-f]{1,6})(?=\s*(?::|;|$))')
 ORG_DIRECTIVE_RE = re.compile(r"^\s*org\s+([^:;]+)", re.IGNORECASE)
@@ -248,27 +260,46 @@ def _scan_hook_directive(lines: list[str], start_idx: int) -> dict:
 
 
 def _parse_define_assignment(
-    line: str, defines: Optional[dict[str, int]] = None
+    line: str, defines: Optional[Mapping[str, int]] = None
 ) -> tuple[str, int] | None:
     source = line.split(";", 1)[0]
     m = DEFINE_ASSIGN_RE.match(source)
     if not m:
         return None
     name = m.group(1).strip()
-    value = _eval_numeric_expression(m.group(2), defines or {})
+    value = _eval_numeric_expression(
+        m.group(2), defines if defines is not None else {}
+    )
     if value is None:
         return None
     return name, value
 
 
-def _load_global_defines(root: Path) -> dict[str, int]:
+# Files whose defines are preloaded before every source; editing one changes
+# the entry define state of all files.
+GLOBAL_DEFINE_SOURCES = (
+    "Util/macros.asm",
+    "Config/module_flags.asm",
+    "Config/feature_flags.asm",
+)
+
+
+def _load_global_defines(
+    root: Path,
+    read_lines: Optional[Callable[[Path], list[str]]] = None,
+) -> dict[str, int]:
     """Parse the macro + override files that are always included before code."""
     defines: dict[str, int] = {}
-    for rel in ("Util/macros.asm", "Config/module_flags.asm", "Config/feature_flags.asm"):
+    for rel in GLOBAL_DEFINE_SOURCES:
         path = root / rel
         if not path.exists():
             continue
-        for line in path.read_text(encoding="utf-8", errors="ignore").splitlines():
+        lines = (
+            read_lines(path)
+            if read_lines is not None
+            else path.read_text(encoding="utf-8", errors="ignore").splitlines()
+        )
+        for line in lines:
             parsed = _parse_define_assignment(line, defines)
             if parsed is None:
                 continue
@@ -341,7 +372,7 @@ def _eval_ast(node: ast.AST) -> int | bool:
     raise ValueError(f"unsupported expr node: {type(node).__name__}")
 
 
-def _eval_condition(expr: str, defines: dict[str, int]) -> Optional[bool]:
+def _eval_condition(expr: str, defines: Mapping[str, int]) -> Optional[bool]:
     """Evaluate a simple Asar `if` expression using known define values.
 
     If the expression references unknown defines or uses unsupported syntax,
@@ -373,7 +404,7 @@ def _eval_condition(expr: str, defines: dict[str, int]) -> Optional[bool]:
 
 
 def _eval_numeric_expression(
-    expr: str, defines: dict[str, int]
+    expr: str, defines: Mapping[str, int]
 ) -> Optional[int]:
     """Evaluate a simple numeric Asar expression, or return None."""
     raw = expr.split(";", 1)[0].strip()
@@ -404,7 +435,7 @@ def _eval_numeric_expression(
 
 
 def _expression_address_anchor_banks(
-    expr: str, defines: Optional[dict[str, int]] = None
+    expr: str, defines: Optional[Mapping[str, int]] = None
 ) -> tuple[int, ...]:
     """Return physical LoROM banks named by literals or known defines."""
     banks: set[int] = set()
@@ -412,7 +443,7 @@ def _expression_address_anchor_banks(
         value = int(match.group(1), 16)
         if value <= 0xFFFFFF and (value & 0xFFFF) >= 0x8000:
             banks.add((value >> 16) & 0x7F)
-    known_defines = defines or {}
+    known_defines = defines if defines is not None else {}
     for match in DEFINE_REF_RE.finditer(expr):
         value = known_defines.get(match.group(1))
         if (
@@ -449,13 +480,13 @@ def _inline_org_payload(line: str) -> tuple[str, Optional[str]] | None:
     return "patch", None
 
 
-def _first_instruction(lines: list[str], start_idx: int, defines: dict[str, int]) -> tuple[str, Optional[str]]:
+def _first_instruction(lines: list[str], start_idx: int, defines: Mapping[str, int]) -> tuple[str, Optional[str]]:
     """Return (kind, target) based on first meaningful instruction after org."""
     inline = _inline_org_payload(lines[start_idx])
     if inline is not None:
         return inline
 
-    defines = dict(defines)
+    defines = defines if isinstance(defines, DefineEnv) else DefineEnv(defines)
     active = True
     stack: list[dict[str, object]] = []
 
@@ -517,13 +548,13 @@ def _first_instruction(lines: list[str], start_idx: int, defines: dict[str, int]
         parsed_define = _parse_define_assignment(raw_line, defines)
         if parsed_define is not None:
             name, value = parsed_define
-            defines[name] = value
+            defines = defines.set(name, value)
             continue
         assignment = DEFINE_ANY_ASSIGN_RE.match(
             raw_line.split(";", 1)[0]
         )
         if assignment:
-            defines.pop(assignment.group(1), None)
+            defines = defines.discard(assignment.group(1))
             continue
 
         if LABEL_RE.match(line):
@@ -591,11 +622,134 @@ def filter_active_asm_sources(
     return active_sources
 
 
+_REMOVED = object()
+_MISSING = object()
+# Chain length after which a DefineEnv flattens itself, bounding lookup cost.
+_DEFINE_ENV_COMPACT_DEPTH = 32
+
+
+class DefineEnv(Mapping[str, int]):
+    """Immutable, persistent define state.
+
+    `set`/`discard` return a new environment that records only the change
+    and points at its parent, so every source line can carry an O(1)
+    reference to the state in effect there. Lookups walk the (bounded)
+    chain; the full dict is only built when something iterates the state.
+    """
+
+    __slots__ = ("_parent", "_name", "_value", "_flat", "_depth", "generation")
+    _generations = itertools.count()
+
+    def __init__(self, values: Optional[Mapping[str, int]] = None) -> None:
+        self._parent: Optional[DefineEnv] = None
+        self._name: Optional[str] = None
+        self._value: object = None
+        self._flat: Optional[dict[str, int]] = (
+            dict(values) if values is not None else {}
+        )
+        self._depth = 0
+        self.generation = next(DefineEnv._generations)
+
+    @classmethod
+    def _child(cls, parent: "DefineEnv", name: str, value: object) -> "DefineEnv":
+        env = cls.__new__(cls)
+        env._parent = parent
+        env._name = name
+        env._value = value
+        env._flat = None
+        env._depth = parent._depth + 1
+        env.generation = next(DefineEnv._generations)
+        if env._depth >= _DEFINE_ENV_COMPACT_DEPTH:
+            env._materialize()
+        return env
+
+    def set(self, name: str, value: int) -> "DefineEnv":
+        """Return an environment with `name` bound to `value`."""
+        current = self._lookup(name)
+        if current is not _MISSING and current == value:
+            return self
+        return DefineEnv._child(self, name, value)
+
+    def discard(self, name: str) -> "DefineEnv":
+        """Return an environment without `name`."""
+        if self._lookup(name) is _MISSING:
+            return self
+        return DefineEnv._child(self, name, _REMOVED)
+
+    def _lookup(self, name: str) -> object:
+        node = self
+        while node._flat is None:
+            if node._name == name:
+                return _MISSING if node._value is _REMOVED else node._value
+            node = node._parent  # type: ignore[assignment]
+        return node._flat.get(name, _MISSING)
+
+    def _materialize(self) -> dict[str, int]:
+        if self._flat is None:
+            chain: list[DefineEnv] = []
+            node = self
+            while node._flat is None:
+                chain.append(node)
+                node = node._parent  # type: ignore[assignment]
+            flat = dict(node._flat)
+            for change in reversed(chain):
+                if change._value is _REMOVED:
+                    flat.pop(change._name, None)  # type: ignore[arg-type]
+                else:
+                    flat[change._name] = change._value  # type: ignore[index]
+            self._flat = flat
+            self._depth = 0
+            self._parent = None
+        return self._flat
+
+    def __getitem__(self, name: str) -> int:
+        value = self._lookup(name)
+        if value is _MISSING:
+            raise KeyError(name)
+        return value  # type: ignore[return-value]
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and self._lookup(name) is not _MISSING
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._materialize())
+
+    def __len__(self) -> int:
+        return len(self._materialize())
+
+    def __repr__(self) -> str:
+        return f"DefineEnv({self._materialize()!r})"
+
+
+def _merge_branch_states(branch_states: list[DefineEnv]) -> DefineEnv:
+    """Keep only defines every feasible branch agrees on."""
+    first = branch_states[0]
+    if all(state is first for state in branch_states[1:]):
+        return first
+    common_names = set(first)
+    for state in branch_states[1:]:
+        common_names.intersection_update(state)
+    return DefineEnv(
+        {
+            name: first[name]
+            for name in common_names
+            if all(state[name] == first[name] for state in branch_states[1:])
+        }
+    )
+
+
 def _iter_active_lines(
-    lines: list[str], initial_defines: dict[str, int]
-) -> Iterable[tuple[int, str, dict[str, int]]]:
-    """Yield active source lines with the numeric define state at that line."""
-    defines = dict(initial_defines)
+    lines: list[str], initial_defines: Mapping[str, int]
+) -> Iterable[tuple[int, str, DefineEnv]]:
+    """Yield active source lines with the numeric define state at that line.
+
+    Consecutive lines share one immutable DefineEnv until a define changes.
+    """
+    defines = (
+        initial_defines
+        if isinstance(initial_defines, DefineEnv)
+        else DefineEnv(initial_defines)
+    )
     active = True
     stack: list[dict[str, object]] = []
     for idx, line in enumerate(lines):
@@ -604,7 +758,7 @@ def _iter_active_lines(
         if m_if:
             kind = m_if.group(1).lower()
             condition_defines = (
-                dict(stack[-1]["entry_defines"])
+                stack[-1]["entry_defines"]
                 if kind == "elseif" and stack
                 else defines
             )
@@ -617,7 +771,7 @@ def _iter_active_lines(
                 stack.append(
                     {
                         "parent_active": parent_active,
-                        "entry_defines": dict(defines),
+                        "entry_defines": defines,
                         "branch_states": [],
                         "current_branch_active": active,
                         "fallthrough_possible": (
@@ -628,8 +782,8 @@ def _iter_active_lines(
             elif stack:
                 frame = stack[-1]
                 if bool(frame["current_branch_active"]):
-                    frame["branch_states"].append(dict(defines))
-                defines = dict(frame["entry_defines"])
+                    frame["branch_states"].append(defines)
+                defines = frame["entry_defines"]
                 fallthrough = bool(frame["fallthrough_possible"])
                 active = fallthrough and cond is not False
                 frame["current_branch_active"] = active
@@ -641,8 +795,8 @@ def _iter_active_lines(
             if stack:
                 frame = stack[-1]
                 if bool(frame["current_branch_active"]):
-                    frame["branch_states"].append(dict(defines))
-                defines = dict(frame["entry_defines"])
+                    frame["branch_states"].append(defines)
+                defines = frame["entry_defines"]
                 active = bool(frame["fallthrough_possible"])
                 frame["current_branch_active"] = active
                 frame["fallthrough_possible"] = False
@@ -652,23 +806,13 @@ def _iter_active_lines(
                 frame = stack.pop()
                 branch_states = frame["branch_states"]
                 if bool(frame["current_branch_active"]):
-                    branch_states.append(dict(defines))
+                    branch_states.append(defines)
                 if bool(frame["fallthrough_possible"]):
-                    branch_states.append(dict(frame["entry_defines"]))
+                    branch_states.append(frame["entry_defines"])
                 if branch_states:
-                    common_names = set(branch_states[0])
-                    for state in branch_states[1:]:
-                        common_names.intersection_update(state)
-                    defines = {
-                        name: branch_states[0][name]
-                        for name in common_names
-                        if all(
-                            state[name] == branch_states[0][name]
-                            for state in branch_states[1:]
-                        )
-                    }
+                    defines = _merge_branch_states(branch_states)
                 else:
-                    defines = dict(frame["entry_defines"])
+                    defines = frame["entry_defines"]
                 active = bool(frame["parent_active"])
             continue
         if not active:
@@ -677,17 +821,392 @@ def _iter_active_lines(
         parsed = _parse_define_assignment(line, defines)
         if parsed is not None:
             name, value = parsed
-            defines[name] = value
+            defines = defines.set(name, value)
         else:
             assigned = DEFINE_ANY_ASSIGN_RE.match(line.split(";", 1)[0])
             if assigned:
-                defines.pop(assigned.group(1), None)
-        yield idx, line, dict(defines)
+                defines = defines.discard(assigned.group(1))
+        yield idx, line, defines
+
+
+SCAN_CACHE_VERSION = 1
+DEFAULT_SCAN_CACHE = Path(".cache/asm_scan_cache.json")
+
+
+def _scanner_fingerprint() -> str:
+    """Hash of the scanner sources, so cached results die with code changes."""
+    digest = hashlib.sha1()
+    here = Path(__file__).resolve().parent
+    for name in ("generate_hooks_json.py", "generate_hack_manifest.py"):
+        try:
+            digest.update((here / name).read_bytes())
+        except OSError:
+            continue
+    return digest.hexdigest()
+
+
+class ScanCache:
+    """On-disk per-file scan results.
+
+    Entries are keyed by repo-relative path and validated against the file's
+    content sha1 and the incoming define-state hash, so a rebuild only
+    rescans files that changed or whose entry state changed. Values are the
+    JSON-safe per-file results produced by the scanners.
+    """
+
+    def __init__(self, path: Path, fingerprint: Optional[str] = None) -> None:
+        self.path = path
+        self.fingerprint = fingerprint or _scanner_fingerprint()
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        self._files: dict[str, dict] = {}
+        self._touched: set[str] = set()
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            data = {}
+        if (
+            isinstance(data, dict)
+            and data.get("version") == SCAN_CACHE_VERSION
+            and data.get("fingerprint") == self.fingerprint
+        ):
+            self._files = data.get("files", {})
+
+    def get(self, rel: str, sha1: str, define_hash: str, kind: str):
+        entry = self._files.get(rel)
+        if (
+            entry is not None
+            and entry.get("sha1") == sha1
+            and entry.get("defines") == define_hash
+            and kind in entry.get("results", {})
+        ):
+            self.hits += 1
+            return entry["results"][kind]
+        self.misses += 1
+        return None
+
+    def put(self, rel: str, sha1: str, define_hash: str, kind: str, value) -> None:
+        entry = self._files.get(rel)
+        if (
+            entry is None
+            or entry.get("sha1") != sha1
+            or entry.get("defines") != define_hash
+        ):
+            entry = {"sha1": sha1, "defines": define_hash, "results": {}}
+            self._files[rel] = entry
+        entry["results"][kind] = value
+        self._touched.add(rel)
+        self._dirty = True
+
+    def _merge_on_disk(self) -> None:
+        """Fold in entries another process saved since this cache was loaded.
+
+        hooks_json and hack_manifest run concurrently and share the cache
+        file; entries this run did not touch (or touched for other result
+        kinds at the same sha1/defines) are taken from disk.
+        """
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if (
+            not isinstance(data, dict)
+            or data.get("version") != SCAN_CACHE_VERSION
+            or data.get("fingerprint") != self.fingerprint
+        ):
+            return
+        merged = data.get("files", {})
+        for rel in self._touched:
+            ours = self._files[rel]
+            theirs = merged.get(rel)
+            if (
+                theirs is not None
+                and theirs.get("sha1") == ours["sha1"]
+                and theirs.get("defines") == ours["defines"]
+            ):
+                theirs.setdefault("results", {}).update(ours["results"])
+            else:
+                merged[rel] = ours
+        self._files = merged
+
+    def save(self) -> None:
+        """Merge with the on-disk cache and write it (locked, atomic replace)."""
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path.with_name(self.path.name + ".lock"), "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            self._merge_on_disk()
+            payload = {
+                "version": SCAN_CACHE_VERSION,
+                "fingerprint": self.fingerprint,
+                "files": self._files,
+            }
+            fd, tmp = tempfile.mkstemp(
+                prefix=self.path.name + ".", suffix=".tmp", dir=self.path.parent
+            )
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                    json.dump(payload, handle, separators=(",", ":"))
+                os.replace(tmp, self.path)
+            except BaseException:
+                Path(tmp).unlink(missing_ok=True)
+                raise
+        self._touched.clear()
+        self._dirty = False
+
+
+class SourceGraph:
+    """Parsed ASM sources shared by every scanner in one generation run.
+
+    Each file is read once and its conditional directives are evaluated once
+    against the global define state. Scanners walk the cached records instead
+    of re-reading and re-preprocessing the same file per pass. Records carry
+    shared, immutable DefineEnv references rather than per-line copies.
+
+    Per-file scan results go through `file_result`, which memoises them for
+    the run and, when a ScanCache is attached, across runs.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        global_defines: Optional[dict[str, int]] = None,
+        cache: Optional[ScanCache] = None,
+    ) -> None:
+        self.root = root.resolve()
+        self.cache = cache
+        self._lines: dict[Path, list[str]] = {}
+        self._digests: dict[Path, str] = {}
+        self._active: dict[Path, list[tuple[int, str, DefineEnv]]] = {}
+        self._results: dict[tuple[str, Path], object] = {}
+        self.global_defines = (
+            _load_global_defines(self.root, self.lines)
+            if global_defines is None
+            else dict(global_defines)
+        )
+        self._global_env = DefineEnv(self.global_defines)
+        self.define_hash = hashlib.sha1(
+            json.dumps(sorted(self.global_defines.items())).encode("utf-8")
+        ).hexdigest()
+
+    def lines(self, path: Path) -> list[str]:
+        """Raw source lines of `path` (read once; raises OSError)."""
+        key = path.resolve()
+        cached = self._lines.get(key)
+        if cached is None:
+            data = key.read_bytes()
+            self._digests[key] = hashlib.sha1(data).hexdigest()
+            cached = data.decode("utf-8", errors="ignore").splitlines()
+            self._lines[key] = cached
+        return cached
+
+    def digest(self, path: Path) -> str:
+        """Content sha1 of `path`."""
+        key = path.resolve()
+        if key not in self._digests:
+            self.lines(key)
+        return self._digests[key]
+
+    def active_lines(self, path: Path) -> list[tuple[int, str, DefineEnv]]:
+        """Active (index, line, defines) records of `path` under the global state."""
+        key = path.resolve()
+        cached = self._active.get(key)
+        if cached is None:
+            cached = list(_iter_active_lines(self.lines(key), self._global_env))
+            self._active[key] = cached
+        return cached
+
+    def invalidate(self, paths: Iterable[Path]) -> None:
+        """Forget everything read or scanned from `paths` (edited on disk).
+
+        Global define sources are not tracked here; rebuild the graph when
+        one of GLOBAL_DEFINE_SOURCES changes.
+        """
+        keys = {path.resolve() for path in paths}
+        for key in keys:
+            self._lines.pop(key, None)
+            self._digests.pop(key, None)
+            self._active.pop(key, None)
+        for memo_key in [k for k in self._results if k[1] in keys]:
+            del self._results[memo_key]
+
+    def _cache_key(self, key: Path) -> str:
+        try:
+            return key.relative_to(self.root).as_posix()
+        except ValueError:
+            return str(key)
+
+    def _load(self, kind: str, key: Path):
+        """Result from the run memo or the on-disk cache, else None."""
+        memo_key = (kind, key)
+        if memo_key in self._results:
+            return self._results[memo_key]
+        if self.cache is None:
+            return None
+        value = self.cache.get(
+            self._cache_key(key), self.digest(key), self.define_hash, kind
+        )
+        if value is not None:
+            self._results[memo_key] = value
+        return value
+
+    def _store(self, kind: str, key: Path, value) -> None:
+        self._results[(kind, key)] = value
+        if self.cache is not None:
+            self.cache.put(
+                self._cache_key(key), self.digest(key), self.define_hash,
+                kind, value,
+            )
+
+    def file_result(self, kind: str, path: Path, scanner: FileScanner):
+        """Per-file scan result for `kind`, computed at most once per content.
+
+        `scanner(graph, path)` must return JSON-safe data (lists, dicts,
+        scalars) and be a module-level function so `prefetch` can ship it
+        to worker processes.
+        """
+        key = path.resolve()
+        value = self._load(kind, key)
+        if value is None:
+            value = scanner(self, key)
+            self._store(kind, key, value)
+        return value
+
+    def prefetch(
+        self,
+        paths: Iterable[Path],
+        scanners: Mapping[str, FileScanner],
+        jobs: Optional[int] = 1,
+    ) -> None:
+        """Compute uncached per-file results for `paths` in a process pool.
+
+        Files are fanned out in chunks; each worker builds its own graph with
+        the same global defines and runs every requested scanner per file.
+        Results land in the run memo, so scanners still merge them in their
+        own source order and the output matches the serial path exactly.
+        Files a worker cannot scan are left for the serial path, which
+        raises the caller-facing error.
+        """
+        workers = resolve_jobs(jobs)
+        if workers <= 1:
+            return
+        pending: list[tuple[str, tuple[str, ...]]] = []
+        for path in paths:
+            key = path.resolve()
+            try:
+                missing = tuple(
+                    kind for kind in scanners if self._load(kind, key) is None
+                )
+            except OSError:
+                continue
+            if missing:
+                pending.append((str(key), missing))
+        if len(pending) < 2:
+            return
+
+        chunks = _chunked(pending, workers)
+        scan = partial(
+            _scan_file_chunk, str(self.root), self.global_defines, dict(scanners)
+        )
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+            for results in pool.map(scan, chunks):
+                for path_text, values in results:
+                    key = Path(path_text)
+                    for kind, value in values.items():
+                        self._store(kind, key, value)
+
+
+FileScanner = Callable[[SourceGraph, Path], object]
+
+
+def resolve_jobs(jobs: Optional[int]) -> int:
+    """Worker count for a `--jobs` value (0 or None means every core)."""
+    if not jobs:
+        return os.cpu_count() or 1
+    return max(1, jobs)
+
+
+def _chunked(items: list, workers: int) -> list[list]:
+    """Split `items` into ordered chunks, a few per worker for balance."""
+    size = max(1, -(-len(items) // (workers * 4)))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _scan_file_chunk(
+    root: str,
+    global_defines: dict[str, int],
+    scanners: dict[str, FileScanner],
+    chunk: list[tuple[str, tuple[str, ...]]],
+) -> list[tuple[str, dict]]:
+    """Worker entry point for SourceGraph.prefetch."""
+    graph = SourceGraph(Path(root), global_defines)
+    results: list[tuple[str, dict]] = []
+    for path_text, kinds in chunk:
+        path = Path(path_text)
+        try:
+            values = {kind: scanners[kind](graph, path) for kind in kinds}
+        except Exception:
+            continue
+        results.append((path_text, values))
+    return results
+
+
+def _scan_file_orgs(graph: SourceGraph, asm_path: Path) -> dict:
+    """Macro graph and every active org directive of one file (JSON-safe)."""
+    rel = str(asm_path.relative_to(graph.root))
+    records = graph.active_lines(asm_path)
+    defined: list[str] = []
+    roots: list[str] = []
+    edges: dict[str, list[str]] = {}
+    orgs: list[dict] = []
+    macro_name: Optional[str] = None
+    for idx, line, defines in records:
+        source_text = line.split(";", 1)[0]
+        macro_start = MACRO_START_RE.match(source_text)
+        if macro_start:
+            macro_name = macro_start.group(1).lower()
+            defined.append(macro_name)
+            continue
+        if MACRO_END_RE.match(source_text):
+            macro_name = None
+            continue
+        invocation = MACRO_INVOKE_RE.match(source_text)
+        if invocation:
+            invoked = invocation.group(1).lower()
+            if macro_name is None:
+                roots.append(invoked)
+            else:
+                edges.setdefault(macro_name, []).append(invoked)
+            continue
+        match = ORG_DIRECTIVE_RE.match(source_text)
+        if not match:
+            continue
+        expression = match.group(1).strip()
+        proof_match = ORG_BANK_PROOF_RE.search(line)
+        orgs.append(
+            {
+                "expression": expression,
+                "address": _eval_numeric_expression(expression, defines),
+                "source": f"{rel}:{idx + 1}",
+                "proof_bank": (
+                    int(proof_match.group(1), 16) if proof_match else None
+                ),
+                "macro_name": macro_name,
+                "anchor_banks": list(
+                    _expression_address_anchor_banks(expression, defines)
+                ),
+            }
+        )
+    return {"macros": defined, "roots": roots, "edges": edges, "orgs": orgs}
 
 
 def scan_org_directives(
     root: Path,
     asm_paths: Optional[Iterable[Path]] = None,
+    graph: Optional[SourceGraph] = None,
 ) -> list[OrgDirective]:
     """Scan active literal/computed org directives with explicit proofs.
 
@@ -698,54 +1217,36 @@ def scan_org_directives(
     """
     root = root.resolve()
     explicit_sources = asm_paths is not None
-    global_defines = _load_global_defines(root)
+    graph = graph or SourceGraph(root)
+    global_defines = graph.global_defines
     source_paths = list(root.rglob("*.asm") if asm_paths is None else asm_paths)
     active_sources = (
         list(source_paths)
         if explicit_sources
         else filter_active_asm_sources(root, source_paths, global_defines)
     )
-    records_by_path: dict[
-        Path, list[tuple[int, str, dict[str, int]]]
-    ] = {}
+    results_by_path: dict[Path, dict] = {}
     for source_path in active_sources:
         asm_path = source_path.resolve()
         if not explicit_sources and _should_skip(asm_path):
             continue
         try:
-            lines = asm_path.read_text(
-                encoding="utf-8", errors="ignore"
-            ).splitlines()
+            results_by_path[asm_path] = graph.file_result(
+                "orgs", asm_path, _scan_file_orgs
+            )
         except OSError:
             if explicit_sources:
                 raise
             continue
-        records_by_path[asm_path] = list(
-            _iter_active_lines(lines, global_defines)
-        )
 
     root_invocations: set[str] = set()
     macro_edges: dict[str, set[str]] = {}
-    for records in records_by_path.values():
-        macro_name: Optional[str] = None
-        for _, line, _ in records:
-            source = line.split(";", 1)[0]
-            macro_start = MACRO_START_RE.match(source)
-            if macro_start:
-                macro_name = macro_start.group(1).lower()
-                macro_edges.setdefault(macro_name, set())
-                continue
-            if MACRO_END_RE.match(source):
-                macro_name = None
-                continue
-            invocation = MACRO_INVOKE_RE.match(source)
-            if not invocation:
-                continue
-            invoked = invocation.group(1).lower()
-            if macro_name is None:
-                root_invocations.add(invoked)
-            else:
-                macro_edges.setdefault(macro_name, set()).add(invoked)
+    for result in results_by_path.values():
+        for macro_name in result["macros"]:
+            macro_edges.setdefault(macro_name, set())
+        root_invocations.update(result["roots"])
+        for macro_name, invoked in result["edges"].items():
+            macro_edges.setdefault(macro_name, set()).update(invoked)
 
     active_macros = set(root_invocations)
     pending = list(root_invocations)
@@ -757,60 +1258,156 @@ def scan_org_directives(
                 pending.append(invoked)
 
     directives: list[OrgDirective] = []
-    for asm_path, records in records_by_path.items():
-        macro_name = None
-        for idx, line, defines in records:
-            source_text = line.split(";", 1)[0]
-            macro_start = MACRO_START_RE.match(source_text)
-            if macro_start:
-                macro_name = macro_start.group(1).lower()
-                continue
-            if MACRO_END_RE.match(source_text):
-                macro_name = None
-                continue
-            match = ORG_DIRECTIVE_RE.match(source_text)
-            if not match or (
-                macro_name is not None and macro_name not in active_macros
-            ):
+    for result in results_by_path.values():
+        for org in result["orgs"]:
+            macro_name = org["macro_name"]
+            if macro_name is not None and macro_name not in active_macros:
                 continue
-            expression = match.group(1).strip()
-            proof_match = ORG_BANK_PROOF_RE.search(line)
-            proof_bank = (
-                int(proof_match.group(1), 16) if proof_match else None
-            )
             directives.append(
                 OrgDirective(
-                    expression=expression,
-                    address=_eval_numeric_expression(expression, defines),
-                    source=f"{asm_path.relative_to(root)}:{idx + 1}",
-                    proof_bank=proof_bank,
+                    expression=org["expression"],
+                    address=org["address"],
+                    source=org["source"],
+                    proof_bank=org["proof_bank"],
                     macro_name=macro_name,
-                    anchor_banks=_expression_address_anchor_banks(
-                        expression, defines
-                    ),
+                    anchor_banks=tuple(org["anchor_banks"]),
                 )
             )
     return directives
 
 
+def _scan_file_hooks(graph: SourceGraph, asm_path: Path) -> list[dict]:
+    """Hook candidates of one file with their enclosing macro (JSON-safe)."""
+    root = graph.root
+    lines = graph.lines(asm_path)
+    rel = asm_path.relative_to(root)
+    candidates: list[dict] = []
+    macro_name: Optional[str] = None
+    for idx, line, defines in graph.active_lines(asm_path):
+        source_text = line.split(";", 1)[0]
+        macro_start = MACRO_START_RE.match(source_text)
+        if macro_start:
+            macro_name = macro_start.group(1).lower()
+            continue
+        if MACRO_END_RE.match(source_text):
+            macro_name = None
+            continue
+        m = ORG_DIRECTIVE_RE.match(source_text)
+        if not m:
+            continue
+        addr = _eval_numeric_expression(m.group(1), defines)
+        if addr is None:
+            continue
+        kind, target = _first_instruction(lines, idx, defines)
+        abi_class_note, no_return, ann_m, ann_x = _scan_annotations(lines, idx)
+        hook_directive = _scan_hook_directive(lines, idx)
+        source = f"{rel}:{idx + 1}"
+        directive_name = hook_directive.get("name")
+        directive_kind = hook_directive.get("kind")
+        directive_target = hook_directive.get("target")
+        name = (directive_name or target or f"hook_{addr:06X}")
+        if directive_kind:
+            kind = str(directive_kind).lower()
+        if directive_target:
+            target = str(directive_target)
+        module = _module_from_path(asm_path, root)
+        skip_abi = (
+            kind == 'data'
+            or kind in ('jmp', 'jml')
+            or _is_data_label(name)
+            or _is_data_label(target)
+            or (kind == 'patch' and name.startswith('hook_'))
+            or name.startswith('.')
+            or name.startswith('$')
+        )
+        directive_skip = hook_directive.get("skip_abi")
+        if directive_skip is not None:
+            parsed = _parse_bool(str(directive_skip))
+            if parsed is not None:
+                skip_abi = parsed
+        if addr in EXPECTED_NAMES and (name.startswith('hook_') or name.startswith('.') or name.startswith('$')):
+            name = EXPECTED_NAMES[addr]
+        directive_abi = hook_directive.get("abi") or hook_directive.get("abi_class")
+        if directive_abi:
+            abi_class = str(directive_abi)
+        else:
+            abi_class = abi_class_note or _abi_class(name or target)
+        if no_return:
+            skip_abi = True
+        if addr in FORCE_ABI_ADDRESSES:
+            skip_abi = False
+        directive_expected_m = _parse_int(str(hook_directive.get("expected_m"))) if hook_directive.get("expected_m") is not None else None
+        directive_expected_x = _parse_int(str(hook_directive.get("expected_x"))) if hook_directive.get("expected_x") is not None else None
+        if directive_expected_m is not None:
+            ann_m = directive_expected_m
+        if directive_expected_x is not None:
+            ann_x = directive_expected_x
+        # Explicit exit expectations from @hook directive
+        ann_exit_m = _parse_int(str(hook_directive.get("expected_exit_m"))) if hook_directive.get("expected_exit_m") is not None else None
+        ann_exit_x = _parse_int(str(hook_directive.get("expected_exit_x"))) if hook_directive.get("expected_exit_x") is not None else None
+        directive_module = hook_directive.get("module")
+        if directive_module:
+            module = str(directive_module)
+        note = ''
+        directive_note = hook_directive.get("note")
+        if directive_note:
+            note = str(directive_note)
+        entry = HookEntry(
+            address=addr,
+            name=name,
+            kind=kind,
+            target=target,
+            source=source,
+            note=note,
+            module=module,
+            skip_abi=skip_abi,
+            abi_class=abi_class,
+            expected_m=ann_m,
+            expected_x=ann_x,
+            expected_exit_m=ann_exit_m,
+            expected_exit_x=ann_exit_x,
+            protected_size=PROTECTED_SIZE_ESTIMATE.get(kind, 4),
+        )
+        candidates.append({"macro_name": macro_name, "entry": asdict(entry)})
+    return candidates
+
+
+# Per-file scanners behind scan_hooks, keyed by result kind.
+HOOK_FILE_SCANNERS: dict[str, FileScanner] = {
+    "orgs": _scan_file_orgs,
+    "hooks": _scan_file_hooks,
+}
+
+
 def scan_hooks(
     root: Path,
     asm_paths: Optional[Iterable[Path]] = None,
+    graph: Optional[SourceGraph] = None,
+    jobs: Optional[int] = 1,
 ) -> list[HookEntry]:
     root = root.resolve()
     hooks_by_addr: dict[int, HookEntry] = {}
     explicit_sources = asm_paths is not None
 
-    global_defines = _load_global_defines(root)
+    graph = graph or SourceGraph(root)
+    global_defines = graph.global_defines
     source_paths = root.rglob('*.asm') if asm_paths is None else asm_paths
     active_sources = (
         list(source_paths)
         if explicit_sources
         else filter_active_asm_sources(root, source_paths, global_defines)
     )
+    graph.prefetch(
+        (
+            path for path in active_sources
+            if explicit_sources or not _should_skip(path.resolve())
+        ),
+        HOOK_FILE_SCANNERS,
+        jobs,
+    )
     active_macros = {
         directive.macro_name
-        for directive in scan_org_directives(root, active_sources)
+        for directive in scan_org_directives(root, active_sources, graph)
         if directive.macro_name is not None
     }
     for source_path in active_sources:
@@ -826,101 +1423,19 @@ def scan_hooks(
                 )
             continue
         try:
-            lines = asm_path.read_text(encoding='utf-8', errors='ignore').splitlines()
+            candidates = graph.file_result("hooks", asm_path, _scan_file_hooks)
         except OSError:
             if explicit_sources:
                 raise
             continue
 
-        macro_name: Optional[str] = None
-        for idx, line, defines in _iter_active_lines(lines, global_defines):
-            source_text = line.split(";", 1)[0]
-            macro_start = MACRO_START_RE.match(source_text)
-            if macro_start:
-                macro_name = macro_start.group(1).lower()
-                continue
-            if MACRO_END_RE.match(source_text):
-                macro_name = None
-                continue
-            m = ORG_DIRECTIVE_RE.match(source_text)
-            if not m or (
-                macro_name is not None and macro_name not in active_macros
-            ):
+        for candidate in candidates:
+            macro_name = candidate["macro_name"]
+            if macro_name is not None and macro_name not in active_macros:
                 continue
-            addr = _eval_numeric_expression(m.group(1), defines)
-            if addr is None:
-                continue
-            kind, target = _first_instruction(lines, idx, defines)
-            abi_class_note, no_return, ann_m, ann_x = _scan_annotations(lines, idx)
-            hook_directive = _scan_hook_directive(lines, idx)
-            source = f"{asm_path.relative_to(root)}:{idx + 1}"
-            directive_name = hook_directive.get("name")
-            directive_kind = hook_directive.get("kind")
-            directive_target = hook_directive.get("target")
-            name = (directive_name or target or f"hook_{addr:06X}")
-            if directive_kind:
-                kind = str(directive_kind).lower()
-            if directive_target:
-                target = str(directive_target)
-            module = _module_from_path(asm_path, root)
-            skip_abi = (
-                kind == 'data'
-                or kind in ('jmp', 'jml')
-                or _is_data_label(name)
-                or _is_data_label(target)
-                or (kind == 'patch' and name.startswith('hook_'))
-                or name.startswith('.')
-                or name.startswith('$')
-            )
-            directive_skip = hook_directive.get("skip_abi")
-            if directive_skip is not None:
-                parsed = _parse_bool(str(directive_skip))
-                if parsed is not None:
-                    skip_abi = parsed
-            if addr in EXPECTED_NAMES and (name.startswith('hook_') or name.startswith('.') or name.startswith('$')):
-                name = EXPECTED_NAMES[addr]
-            directive_abi = hook_directive.get("abi") or hook_directive.get("abi_class")
-            if directive_abi:
-                abi_class = str(directive_abi)
-            else:
-                abi_class = abi_class_note or _abi_class(name or target)
-            if no_return:
-                skip_abi = True
-            if addr in FORCE_ABI_ADDRESSES:
-                skip_abi = False
-            directive_expected_m = _parse_int(str(hook_directive.get("expected_m"))) if hook_directive.get("expected_m") is not None else None
-            directive_expected_x = _parse_int(str(hook_directive.get("expected_x"))) if hook_directive.get("expected_x") is not None else None
-            if directive_expected_m is not None:
-                ann_m = directive_expected_m
-            if directive_expected_x is not None:
-                ann_x = directive_expected_x
-            # Explicit exit expectations from @hook directive
-            ann_exit_m = _parse_int(str(hook_directive.get("expected_exit_m"))) if hook_directive.get("expected_exit_m") is not None else None
-            ann_exit_x = _parse_int(str(hook_directive.get("expected_exit_x"))) if hook_directive.get("expected_exit_x") is not None else None
-            directive_module = hook_directive.get("module")
-            if directive_module:
-                module = str(directive_module)
-            note = ''
-            directive_note = hook_directive.get("note")
-            if directive_note:
-                note = str(directive_note)
-            entry = HookEntry(
-                address=addr,
-                name=name,
-                kind=kind,
-                target=target,
-                source=source,
-                note=note,
-                module=module,
-                skip_abi=skip_abi,
-                abi_class=abi_class,
-                expected_m=ann_m,
-                expected_x=ann_x,
-                expected_exit_m=ann_exit_m,
-                expected_exit_x=ann_exit_x,
-                protected_size=PROTECTED_SIZE_ESTIMATE.get(kind, 4),
-            )
-
+            # Fresh objects: merging below mutates protected_size.
+            entry = HookEntry(**candidate["entry"])
+            addr = entry.address
             existing = hooks_by_addr.get(addr)
             if existing:
                 maximum_size = max(
@@ -935,28 +1450,22 @@ def scan_hooks(
     return sorted(hooks_by_addr.values(), key=lambda e: e.address)
 
 
-def main() -> int:
-    parser = argparse.ArgumentParser(description='Generate hooks.json from ASM org directives')
-    parser.add_argument('--root', type=Path, default=Path(__file__).resolve().parents[2],
-                        help='Oracle repo root (default: repo root)')
-    parser.add_argument('-o', '--output', type=Path, default=Path('Roms/hooks.json'),
-                        help='Output hooks.json path (default: Roms/hooks.json)')
-    parser.add_argument('--rom', type=Path, default=Path('Roms/oos168x.sfc'),
-                        help='ROM path for metadata (optional)')
-    args = parser.parse_args()
-
-    root = args.root.resolve()
-    output = (root / args.output).resolve() if not args.output.is_absolute() else args.output
-
-    hooks = scan_hooks(root)
-
+def hooks_document(
+    root: Path,
+    hooks: list[HookEntry],
+    rom_path: Optional[Path] = None,
+    roms: Optional[RomImageCache] = None,
+) -> dict:
+    """Build the hooks.json payload for scanned hooks."""
     rom_meta = {}
-    rom_path = (root / args.rom).resolve() if not args.rom.is_absolute() else args.rom
-    if rom_path.exists():
+    if rom_path is not None and rom_path.exists():
         rom_meta['path'] = str(rom_path.relative_to(root))
         try:
-            sha1 = hashlib.sha1(rom_path.read_bytes()).hexdigest()
-            rom_meta['sha1'] = sha1
+            if roms is not None:
+                rom_meta['sha1'] = roms.get(rom_path).sha1
+            else:
+                with RomImage.open(rom_path) as rom:
+                    rom_meta['sha1'] = rom.sha1
         except Exception:
             pass
 
@@ -1011,6 +1520,39 @@ def main() -> int:
             hook['note'] = entry.note
         data['hooks'].append(hook)
 
+    return data
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Generate hooks.json from ASM org directives')
+    parser.add_argument('--root', type=Path, default=Path(__file__).resolve().parents[2],
+                        help='Oracle repo root (default: repo root)')
+    parser.add_argument('-o', '--output', type=Path, default=Path('Roms/hooks.json'),
+                        help='Output hooks.json path (default: Roms/hooks.json)')
+    parser.add_argument('--rom', type=Path, default=Path('Roms/oos168x.sfc'),
+                        help='ROM path for metadata (optional)')
+    parser.add_argument('--cache', type=Path, default=DEFAULT_SCAN_CACHE,
+                        help='Per-file scan cache (default: .cache/asm_scan_cache.json)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Rescan every source file and leave the cache untouched')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='Scan worker processes (0 = every core; default: 1)')
+    args = parser.parse_args()
+
+    root = args.root.resolve()
+    output = (root / args.output).resolve() if not args.output.is_absolute() else args.output
+
+    cache = None
+    if not args.no_cache:
+        cache_path = args.cache if args.cache.is_absolute() else root / args.cache
+        cache = ScanCache(cache_path)
+    hooks = scan_hooks(root, graph=SourceGraph(root, cache=cache), jobs=args.jobs)
+    if cache is not None:
+        cache.save()
+
+    rom_path = (root / args.rom).resolve() if not args.rom.is_absolute() else args.rom
+    data = hooks_document(root, hooks, rom_path)
+
     output.write_text(json.dumps(data, indent=2) + "\n")
     print(f"Wrote {len(hooks)} hooks to {output}")
     return 0
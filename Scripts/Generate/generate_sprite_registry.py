@@ -104,7 +104,8 @@ def load_registry(csv_path: Path) -> list[dict]:
         return [row for row in reader]
 
 
-def emit_ids(registry: list[dict], out_path: Path) -> None:
+def render_ids(registry: list[dict]) -> str:
+    """Text of the sprite ID include for a loaded registry."""
     lines = [
         "; Auto-generated from Sprites/registry.csv",
         "; Do not edit by hand.",
@@ -127,8 +128,13 @@ def emit_ids(registry: list[dict], out_path: Path) -> None:
         if note:
             line += f" ; {note}"
         lines.append(line)
+    return "\n".join(lines) + "\n"
+
+
+def emit_ids(registry: list[dict], out_path: Path) -> None:
+    text = render_ids(registry)
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text("\n".join(lines) + "\n")
+    out_path.write_text(text)
 
 
 def main() -> int:
@@ -15,21 +15,17 @@ import argparse
 from pathlib import Path
 from typing import Dict, List, Sequence
 
+from rom_image import RomImage
+from room_streams import (
+    COLLISION_DATA_END_PC,
+    COLLISION_DATA_START_PC,
+    ROOM_COUNT,
+    RoomStreamError,
+    RoomStreams,
+)
 
-ROOM_COUNT = 296  # 0x00..0x127
-ROOM_POINTER_SNES = 0x258090
-WATER_FILL_TABLE_SNES = 0x25E000
-CUSTOM_COLLISION_DATA_PC_START = 0x128450
-CUSTOM_COLLISION_DATA_PC_END = 0x12E000  # reserved WaterFill table starts here
-
-
-def snes_to_pc(addr: int) -> int:
-    # LoROM mapping
-    return ((addr & 0x7F0000) >> 1) | (addr & 0x7FFF)
 
-
-def read16(data: bytes, offset: int) -> int:
-    return data[offset] | (data[offset + 1] << 8)
+WATER_FILL_TABLE_SNES = 0x25E000
 
 
 def fmt_hex(v: int, width: int = 2) -> str:
@@ -51,96 +47,28 @@ def parse_room_masks(raw: str) -> Dict[int, int]:
     return out
 
 
-def parse_room_custom_collision(data: bytes, room_id: int) -> Dict[int, int]:
+def parse_room_custom_collision(streams: RoomStreams, room_id: int) -> Dict[int, int]:
     """Decode per-room custom collision tiles by emulating custom_collision.asm format."""
-    pointer_table_pc = snes_to_pc(ROOM_POINTER_SNES)
-    entry_pc = pointer_table_pc + (room_id * 3)
-    if entry_pc + 2 >= len(data):
-        return {}
-
-    lo = data[entry_pc]
-    hi = data[entry_pc + 1]
-    bank = data[entry_pc + 2]
-    if lo == 0 and hi == 0:
-        return {}
-
-    stream_snes = (bank << 16) | (hi << 8) | lo
-    stream_pc = snes_to_pc(stream_snes)
-    if stream_pc < 0 or stream_pc >= len(data):
-        raise ValueError(f"Room {room_id:02X}: stream pointer out of range ({stream_snes:06X})")
-
+    stream_pc = streams.collision_pc(room_id)
     # Guard against stale/invalid pointers outside the custom-collision data bank.
     # These should be treated as "no custom collision data" for generation.
-    if stream_pc < CUSTOM_COLLISION_DATA_PC_START or stream_pc >= CUSTOM_COLLISION_DATA_PC_END:
+    if stream_pc is None or not COLLISION_DATA_START_PC <= stream_pc < COLLISION_DATA_END_PC:
         return {}
-
-    tiles: Dict[int, int] = {}
-    pos = stream_pc
-    guard = 0
-
-    while True:
-        guard += 1
-        if guard > 0x20000:
-            raise ValueError(f"Room {room_id:02X}: collision parse guard exceeded")
-        if pos + 1 >= len(data):
-            raise ValueError(f"Room {room_id:02X}: unexpected EOF reading stream word")
-
-        word = read16(data, pos)
-        pos += 2
-
-        # Rectangle block
-        if word < 0xF0F0:
-            if pos + 1 >= len(data):
-                raise ValueError(f"Room {room_id:02X}: unexpected EOF reading rectangle size")
-            cols = data[pos]
-            rows = data[pos + 1]
-            pos += 2
-
-            byte_count = cols * rows
-            if pos + byte_count > len(data):
-                raise ValueError(f"Room {room_id:02X}: unexpected EOF reading rectangle payload")
-
-            for row in range(rows):
-                base = word + (row * 64)
-                row_pos = pos + (row * cols)
-                for col in range(cols):
-                    tiles[base + col] = data[row_pos + col]
-
-            pos += byte_count
-            continue
-
-        # Single-tile block (or terminator)
-        while True:
-            if word == 0xF0F0:
-                if pos + 1 >= len(data):
-                    raise ValueError(f"Room {room_id:02X}: unexpected EOF after F0F0 sentinel")
-                word = read16(data, pos)
-                pos += 2
-                continue
-
-            if word == 0xFFFF:
-                return tiles
-
-            if pos >= len(data):
-                raise ValueError(f"Room {room_id:02X}: unexpected EOF reading single tile")
-            tiles[word] = data[pos]
-            pos += 1
-
-            if pos + 1 >= len(data):
-                raise ValueError(f"Room {room_id:02X}: unexpected EOF reading next single offset")
-            word = read16(data, pos)
-            pos += 2
+    try:
+        return streams.collision(room_id, strict=False).tiles
+    except RoomStreamError as exc:
+        raise ValueError(f"Room {room_id:02X}: {exc}") from exc
 
 
 def collect_marker_offsets(
-    data: bytes,
+    streams: RoomStreams,
     room_max: int,
     marker_tile: int,
 ) -> Dict[int, List[int]]:
     out: Dict[int, List[int]] = {}
     upper = min(room_max, ROOM_COUNT - 1)
     for room_id in range(upper + 1):
-        tiles = parse_room_custom_collision(data, room_id)
+        tiles = parse_room_custom_collision(streams, room_id)
         if not tiles:
             continue
         offsets = sorted(off for off, value in tiles.items() if value == marker_tile)
@@ -327,12 +255,12 @@ def main() -> int:
         if not validate_mask(mask):
             raise SystemExit(f"Invalid mask for room {room_id:#x}: {mask:#x} (must be single bit 0x01..0x80)")
 
-    rom_data = rom_path.read_bytes()
-    marker_offsets = collect_marker_offsets(
-        rom_data,
-        room_max=args.room_max,
-        marker_tile=args.marker_tile,
-    )
+    with RomImage.open(rom_path) as rom:
+        marker_offsets = collect_marker_offsets(
+            RoomStreams.for_rom(rom),
+            room_max=args.room_max,
+            marker_tile=args.marker_tile,
+        )
     rooms = sorted(marker_offsets)
     room_masks = assign_room_masks(rooms, explicit_masks)
     data_offsets = build_layout(marker_offsets, room_masks)
@@ -12,51 +12,17 @@ without hand-editing ASM byte tables.
 from __future__ import annotations
 
 import argparse
-from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, Iterable, List, Sequence, Tuple
 
+from rom_image import RomImage
+from room_streams import ROOM_COUNT, RoomObject, RoomSprite, RoomStreamError, RoomStreams
 
-ROOM_COUNT = 296  # 0x00..0x127
-
-# PC addresses (from Yaze's dungeon_rom_addresses.h)
-ROOM_OBJECT_POINTER_PC = 0x874C
-ROOMS_SPRITE_POINTER_PC = 0x4C298
 
 # Sprite IDs used by Zora Baby switch interactions.
 SWITCH_SPRITE_IDS = {0x21, 0x04}
 
 
-@dataclass(frozen=True)
-class RoomObject:
-    obj_id: int
-    x: int
-    y: int
-    size: int
-    layer: int
-    b1: int
-    b2: int
-    b3: int
-
-
-@dataclass(frozen=True)
-class RoomSprite:
-    spr_id: int
-    x: int
-    y: int
-    subtype: int
-    layer: int
-
-
-def read24(data: bytes, offset: int) -> int:
-    return data[offset] | (data[offset + 1] << 8) | (data[offset + 2] << 16)
-
-
-def snes_to_pc(addr: int) -> int:
-    # LoROM mapping
-    return ((addr & 0x7F0000) >> 1) | (addr & 0x7FFF)
-
-
 def parse_hex_list(raw: str) -> List[int]:
     out: List[int] = []
     for part in raw.split(","):
@@ -67,112 +33,6 @@ def parse_hex_list(raw: str) -> List[int]:
     return out
 
 
-def decode_room_object(b1: int, b2: int, b3: int, layer: int) -> RoomObject:
-    # Matches Yaze room_object.cc DecodeObjectFromBytes.
-    if b1 >= 0xFC:
-        obj_id = (b3 & 0x3F) | 0x100
-        x = ((b2 & 0xF0) >> 4) | ((b1 & 0x03) << 4)
-        y = ((b2 & 0x0F) << 2) | ((b3 & 0xC0) >> 6)
-        size = 0
-    elif b3 >= 0xF8:
-        obj_id = (b3 << 4) | 0x80 | (((b2 & 0x03) << 2) + (b1 & 0x03))
-        x = (b1 & 0xFC) >> 2
-        y = (b2 & 0xFC) >> 2
-        size = ((b1 & 0x03) << 2) | (b2 & 0x03)
-    else:
-        obj_id = b3
-        x = (b1 & 0xFC) >> 2
-        y = (b2 & 0xFC) >> 2
-        size = ((b1 & 0x03) << 2) | (b2 & 0x03)
-
-    return RoomObject(
-        obj_id=obj_id,
-        x=x,
-        y=y,
-        size=size,
-        layer=layer,
-        b1=b1,
-        b2=b2,
-        b3=b3,
-    )
-
-
-def parse_room_objects(data: bytes, room_id: int) -> List[RoomObject]:
-    object_table_pc = snes_to_pc(read24(data, ROOM_OBJECT_POINTER_PC))
-    room_ptr_pc = object_table_pc + (room_id * 3)
-    room_stream_pc = snes_to_pc(read24(data, room_ptr_pc))
-
-    pos = room_stream_pc + 2  # skip floor/layout bytes
-    layer = 0
-    in_door_list = False
-    out: List[RoomObject] = []
-
-    guard = 0
-    while pos + 1 < len(data) and guard < 0x8000:
-        guard += 1
-        b1 = data[pos]
-        b2 = data[pos + 1]
-
-        if b1 == 0xFF and b2 == 0xFF:
-            pos += 2
-            layer += 1
-            in_door_list = False
-            if layer == 3:
-                break
-            continue
-
-        if b1 == 0xF0 and b2 == 0xFF:
-            pos += 2
-            in_door_list = True
-            continue
-
-        if in_door_list:
-            # Doors are 2-byte entries until 0xFFFF.
-            pos += 2
-            continue
-
-        if pos + 2 >= len(data):
-            break
-        b3 = data[pos + 2]
-        pos += 3
-        out.append(decode_room_object(b1, b2, b3, layer))
-
-    return out
-
-
-def parse_room_sprites(data: bytes, room_id: int) -> List[RoomSprite]:
-    # Matches Yaze Room::LoadSprites.
-    sprite_ptr_table_snes = (0x09 << 16) | (data[ROOMS_SPRITE_POINTER_PC + 1] << 8) | data[ROOMS_SPRITE_POINTER_PC]
-    sprite_ptr_table_pc = snes_to_pc(sprite_ptr_table_snes)
-    ptr_off = sprite_ptr_table_pc + (room_id * 2)
-    sprite_stream_snes = (0x09 << 16) | (data[ptr_off + 1] << 8) | data[ptr_off]
-    sprite_stream_pc = snes_to_pc(sprite_stream_snes)
-
-    pos = sprite_stream_pc + 1  # first byte is SortSprites mode
-    out: List[RoomSprite] = []
-    guard = 0
-    while pos + 2 < len(data) and guard < 512:
-        guard += 1
-        b1 = data[pos]
-        if b1 == 0xFF:
-            break
-        b2 = data[pos + 1]
-        b3 = data[pos + 2]
-
-        out.append(
-            RoomSprite(
-                spr_id=b3,
-                x=b2 & 0x1F,
-                y=b1 & 0x1F,
-                subtype=((b2 & 0xE0) >> 5) + ((b1 & 0x60) >> 2),
-                layer=(b1 & 0x80) >> 7,
-            )
-        )
-        pos += 3
-
-    return out
-
-
 def choose_switch_targets(
     objects: Sequence[RoomObject],
     sprites: Sequence[RoomSprite],
@@ -211,7 +71,7 @@ def fmt_hex(v: int, width: int = 2) -> str:
 
 
 def generate_tables(
-    data: bytes,
+    streams: RoomStreams,
     room_max: int,
     overlay_object_ids: Sequence[int],
     target_marker_ids: Sequence[int],
@@ -220,8 +80,11 @@ def generate_tables(
     targets: Dict[int, List[Tuple[int, int, int, int, int]]] = {}
 
     for room_id in range(min(ROOM_COUNT, room_max + 1)):
-        objects = parse_room_objects(data, room_id)
-        sprites = parse_room_sprites(data, room_id)
+        try:
+            objects = streams.objects(room_id, strict=False).objects
+            sprites = streams.sprites(room_id, strict=False).sprites
+        except RoomStreamError as exc:
+            raise RoomStreamError(f"Room {room_id:02X}: {exc}") from exc
 
         room_overlay = [o for o in objects if o.obj_id in overlay_object_ids]
         if room_overlay:
@@ -336,13 +199,16 @@ def main() -> int:
     overlay_ids = parse_hex_list(args.overlay_object_ids)
     marker_ids = parse_hex_list(args.target_marker_ids)
 
-    rom_data = rom_path.read_bytes()
-    overlays, targets = generate_tables(
-        rom_data,
-        room_max=args.room_max,
-        overlay_object_ids=overlay_ids,
-        target_marker_ids=marker_ids,
-    )
+    try:
+        with RomImage.open(rom_path) as rom:
+            overlays, targets = generate_tables(
+                RoomStreams.for_rom(rom),
+                room_max=args.room_max,
+                overlay_object_ids=overlay_ids,
+                target_marker_ids=marker_ids,
+            )
+    except RoomStreamError as exc:
+        raise SystemExit(f"Invalid room data in {rom_path}: {exc}")
 
     write_asm(
         out_path=args.out_asm,
@@ -68,12 +68,11 @@ def _check_sequence(
     if not require_contiguous:
         return
 
-    sorted_ids = sorted(set(ids))
+    sorted_ids = sorted(seen)
     if len(sorted_ids) <= 1:
         return
-    expected = list(range(sorted_ids[0], sorted_ids[-1] + 1))
-    if sorted_ids != expected:
-        gaps = [value for value in expected if value not in set(sorted_ids)]
+    if sorted_ids[-1] - sorted_ids[0] + 1 != len(sorted_ids):
+        gaps = sorted(set(range(sorted_ids[0], sorted_ids[-1] + 1)).difference(seen))
         preview = ", ".join(str(v) for v in gaps[:8])
         suffix = "" if len(gaps) <= 8 else f" ... (+{len(gaps) - 8} more)"
         report.warnings.append(f"{bank}: non-contiguous IDs; gaps at {preview}{suffix}")
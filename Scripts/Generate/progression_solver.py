@@ -0,0 +1,500 @@
+#!/usr/bin/env python3
+"""Progression solver: story flags, item gates and dungeons as bitset states.
+
+Compiles the story event graph (Docs/Dev/Planning/story_events.json), the
+location registry's dungeon gates (Data/location_registry.json) and,
+optionally, the ROM connectivity index into actions over a bitset of
+atoms:
+
+  event:EV-003        story event done
+  flag:GameState=2    story flag (value flags replace each other)
+  dungeon:D4_...      dungeon cleared
+  item:zoramask       item held (names normalized to mesen2 ITEMS keys)
+
+Each action has `requires`/`forbids` masks and `grants`/`clears` masks. An
+action whose ROM locations are all unreachable from the overworld is
+dropped before solving.
+
+Actions that only add atoms and cannot disable anything are applied eagerly
+to a fixpoint, because their order never matters. The search branches only
+on actions that clear atoms, or whose grants another action forbids. The BFS runs
+over those fixpoint states, and every visited bitset is memoized. With
+today's data the whole game is a handful of states, so one check takes
+milliseconds.
+
+Most dungeon rewards in the registry are still TBD, so gate items such as
+item:zoramask usually have no source in the data. Those are reported as
+"unknown source", apart from truly blocked actions; pass them with --have
+(or --assume-unknown) to solve past them. When the goal cannot be reached,
+softlocks are judged against the goal atoms that can still be obtained.
+
+    model = ProgressionModel.compile(events, registry, index)
+    result = ProgressionSolver(model).solve(model.mask(["item:zoramask"]))
+    print(result.reached_goal, result.plan(), result.softlocks)
+
+    python3 Scripts/Generate/progression_solver.py --rom Roms/oos168x.sfc \\
+        --profile zora_temple_debug --goal dungeon:D4_zora_temple
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Optional
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+REGISTRY_PATH = REPO_ROOT / "Data" / "location_registry.json"
+STORY_EVENTS_PATH = REPO_ROOT / "Docs" / "Dev" / "Planning" / "story_events.json"
+SAVE_DATA_PROFILE_DIR = REPO_ROOT / "Docs" / "Debugging" / "Testing" / "save_data_profiles"
+
+DEFAULT_MAX_STATES = 1 << 16
+UNKNOWN_VALUES = {"", "TBD", "None", "-"}
+
+
+def item_atom(name: str) -> str:
+    """'Zora Mask' -> 'item:zoramask' (the mesen2 ITEMS key spelling)."""
+    return "item:" + re.sub(r"[^a-z0-9]", "", name.lower())
+
+
+def flag_atom(flag: dict) -> str:
+    value = flag.get("value")
+    if value is None or flag.get("operation") == "increment":
+        return f"flag:{flag['name']}"
+    return f"flag:{flag['name']}={value}"
+
+
+@dataclass(frozen=True)
+class Action:
+    name: str
+    requires: int = 0
+    grants: int = 0
+    clears: int = 0
+    forbids: int = 0
+    locations: tuple[int, ...] = ()  # connectivity nodes; any one must be reachable
+
+    def enabled(self, state: int) -> bool:
+        return state & self.requires == self.requires and not state & self.forbids
+
+    def apply(self, state: int) -> int:
+        return (state & ~self.clears) | self.grants
+
+
+class ProgressionModel:
+    """Atom numbering plus the compiled action list."""
+
+    def __init__(self) -> None:
+        self.atoms: list[str] = []
+        self.bits: dict[str, int] = {}
+        self.actions: list[Action] = []
+
+    def bit(self, atom: str) -> int:
+        if atom not in self.bits:
+            self.bits[atom] = len(self.atoms)
+            self.atoms.append(atom)
+        return 1 << self.bits[atom]
+
+    def mask(self, atoms: Iterable[str]) -> int:
+        mask = 0
+        for atom in atoms:
+            mask |= self.bit(atom)
+        return mask
+
+    def atoms_of(self, mask: int) -> list[str]:
+        return [atom for position, atom in enumerate(self.atoms) if mask >> position & 1]
+
+    def add_action(
+        self,
+        name: str,
+        requires: Iterable[str] = (),
+        grants: Iterable[str] = (),
+        clears: Iterable[str] = (),
+        forbids: Iterable[str] = (),
+        locations: Iterable[int] = (),
+    ) -> Action:
+        action = Action(
+            name,
+            self.mask(requires),
+            self.mask(grants),
+            self.mask(clears),
+            self.mask(forbids),
+            tuple(locations),
+        )
+        self.actions.append(action)
+        return action
+
+    @property
+    def goal(self) -> int:
+        """Every story event done and every dungeon cleared."""
+        return self.mask(
+            atom for atom in self.atoms if atom.startswith(("event:", "dungeon:"))
+        )
+
+    @classmethod
+    def compile(cls, events: list[dict], registry: dict, index=None) -> "ProgressionModel":
+        """Actions for each story event and each dungeon in the registry."""
+        model = cls()
+
+        flag_values: dict[str, set[str]] = {}
+        for event in events:
+            for flag in event.get("flags", []):
+                if "value" in flag and flag.get("operation") != "increment":
+                    flag_values.setdefault(flag["name"], set()).add(flag_atom(flag))
+
+        for event in events:
+            grants = [f"event:{event['id']}"]
+            clears: set[str] = set()
+            for flag in event.get("flags", []):
+                atom = flag_atom(flag)
+                grants.append(atom)
+                clears |= flag_values.get(flag["name"], set()) - {atom}
+            locations = []
+            if index is not None:
+                for location in event.get("locations", []):
+                    locations.extend(index.location_nodes(location))
+            model.add_action(
+                f"event:{event['id']}",
+                requires=[f"event:{dep}" for dep in event.get("dependencies", [])],
+                grants=grants,
+                clears=sorted(clears),
+                forbids=[f"event:{event['id']}"],  # story events fire once
+                locations=locations,
+            )
+
+        progression = registry.get("progression", {})
+        dungeons = registry.get("dungeons", {})
+        item_gates = progression.get("item_gates", {})
+        for key in progression.get("order", list(dungeons)):
+            dungeon = dungeons.get(key, {})
+            required = set(item_gates.get(key, []))
+            required |= set(dungeon.get("difficulty", {}).get("required_items", []))
+            rewards = [
+                item.strip() for item in str(dungeon.get("dungeon_item") or "").split(",")
+                if item.strip() not in UNKNOWN_VALUES
+            ]
+            locations = []
+            if index is not None:
+                locations = index.location_nodes({
+                    "room_id": dungeon.get("entrance_room"),
+                    "entrance_id": dungeon.get("entrance_id"),
+                })
+            model.add_action(
+                f"dungeon:{key}",
+                requires=sorted(item_atom(item) for item in required),
+                grants=[f"dungeon:{key}"] + [item_atom(item) for item in rewards],
+                locations=locations,
+            )
+        return model
+
+
+def profile_atoms(profile: dict, registry: dict) -> list[str]:
+    """Atoms held by a mesen2 save-data profile (items/flags; crystals d1-d7)."""
+    atoms = [item_atom(key) for key, value in (profile.get("items") or {}).items() if value]
+    dungeon_keys = {
+        f"d{dungeon.get('dungeon_id')}": key
+        for key, dungeon in registry.get("dungeons", {}).items()
+    }
+    for key, value in (profile.get("flags") or {}).items():
+        if key in dungeon_keys:
+            if value:
+                atoms.append(f"dungeon:{dungeon_keys[key]}")
+        elif key == "gamestate":
+            atoms.append(f"flag:GameState={int(str(value), 0)}")
+        elif value:
+            atoms.append(f"flag:{key}")
+    atoms.extend(f"event:{event_id}" for event_id in profile.get("events", []))
+    return atoms
+
+
+@dataclass
+class SolveResult:
+    model: ProgressionModel
+    start: int
+    goal: int
+    # fixpoint state -> (parent state, actions taken from the parent)
+    parents: dict[int, tuple[Optional[int], tuple[str, ...]]]
+    goal_states: list[int]
+    softlocks: list[int]  # visited states that can no longer reach the goal
+    blocked: dict[str, list[str]]  # action -> atoms it never had
+    truncated: bool = False
+    unreachable_actions: list[str] = field(default_factory=list)
+    unknown_sources: dict[str, list[str]] = field(default_factory=dict)  # atom -> actions gated on it
+    assumed: list[str] = field(default_factory=list)  # unknown-source atoms started with
+
+    @property
+    def reached_goal(self) -> bool:
+        return bool(self.goal_states)
+
+    def plan(self, state: Optional[int] = None) -> list[str]:
+        """Action sequence to `state` (default: the first goal state found)."""
+        if state is None:
+            if not self.goal_states:
+                return []
+            state = self.goal_states[0]
+        steps: list[tuple[str, ...]] = []
+        while state is not None:
+            parent, actions = self.parents[state]
+            steps.append(actions)
+            state = parent
+        return [action for actions in reversed(steps) for action in actions]
+
+    def to_json(self) -> dict:
+        return {
+            "reached_goal": self.reached_goal,
+            "states_explored": len(self.parents),
+            "truncated": self.truncated,
+            "plan": self.plan(),
+            "missing_goal_atoms": self.model.atoms_of(self.goal & ~self.obtained),
+            "blocked_actions": self.blocked,
+            "unknown_sources": self.unknown_sources,
+            "assumed": self.assumed,
+            "unreachable_actions": self.unreachable_actions,
+            "softlocks": [
+                {"after": self.plan(state), "holds": self.model.atoms_of(state)}
+                for state in self.softlocks
+            ],
+        }
+
+    @property
+    def obtained(self) -> int:
+        """Every atom held in some visited state."""
+        union = 0
+        for state in self.parents:
+            union |= state
+        return union
+
+
+class ProgressionSolver:
+    """BFS over fixpoint states of a ProgressionModel, memoized by bitset."""
+
+    def __init__(self, model: ProgressionModel, index=None) -> None:
+        self.model = model
+        self.unreachable_actions: list[str] = []
+        actions = model.actions
+        if index is not None:
+            from_overworld = index.overworld_reachable()
+            actions = []
+            for action in model.actions:
+                if action.locations and not any(node in from_overworld for node in action.locations):
+                    self.unreachable_actions.append(action.name)
+                else:
+                    actions.append(action)
+        self.eager: list[Action] = []
+        self.branching: list[Action] = []
+        for action in actions:
+            forbidden_by_others = 0
+            for other in actions:
+                if other is not action:
+                    forbidden_by_others |= other.forbids
+            if action.clears or action.grants & forbidden_by_others:
+                self.branching.append(action)
+            else:
+                self.eager.append(action)
+        self._fixpoints: dict[int, tuple[int, tuple[str, ...]]] = {}
+
+    def unknown_sources(self, start: int = 0) -> int:
+        """Required atoms that no action grants (other than by requiring them) and `start` lacks."""
+        required = granted = 0
+        for action in self.model.actions:
+            required |= action.requires
+            granted |= action.grants & ~action.requires
+        return required & ~granted & ~start
+
+    def fixpoint(self, state: int) -> tuple[int, tuple[str, ...]]:
+        """Apply eager actions until nothing changes; returns (state, actions fired)."""
+        cached = self._fixpoints.get(state)
+        if cached is not None:
+            return cached
+        current, fired = state, []
+        changed = True
+        while changed:
+            changed = False
+            for action in self.eager:
+                if action.enabled(current) and action.apply(current) != current:
+                    current = action.apply(current)
+                    fired.append(action.name)
+                    changed = True
+        result = self._fixpoints[state] = (current, tuple(fired))
+        return result
+
+    def solve(
+        self,
+        start: int = 0,
+        goal: Optional[int] = None,
+        max_states: int = DEFAULT_MAX_STATES,
+        assume_unknown: bool = False,
+    ) -> SolveResult:
+        """BFS from `start`; `assume_unknown` starts holding every unknown-source atom."""
+        goal = self.model.goal if goal is None else goal
+        unknown = self.unknown_sources(start)
+        assumed = self.model.atoms_of(unknown) if assume_unknown else []
+        if assume_unknown:
+            start |= unknown
+        first, fired = self.fixpoint(start)
+        parents: dict[int, tuple[Optional[int], tuple[str, ...]]] = {first: (None, fired)}
+        successors: dict[int, list[int]] = {}
+        queue = deque([first])
+        truncated = False
+        while queue:
+            state = queue.popleft()
+            successors[state] = []
+            for action in self.branching:
+                if not action.enabled(state):
+                    continue
+                applied = action.apply(state)
+                if applied == state:
+                    continue
+                following, fired = self.fixpoint(applied)
+                successors[state].append(following)
+                if following in parents:
+                    continue
+                if len(parents) >= max_states:
+                    truncated = True
+                    continue
+                parents[following] = (state, (action.name,) + fired)
+                queue.append(following)
+
+        union = 0
+        for state in parents:
+            union |= state
+        goal_states = [state for state in parents if state & goal == goal]
+        # Softlocks are judged against the goal atoms obtainable at all, so an
+        # unreachable goal (e.g. a missing item source) does not hide them.
+        reachable_goal = goal if goal_states else goal & union
+        winning = [state for state in parents if state & reachable_goal == reachable_goal]
+        # States that can still reach a target state (reverse BFS over explored edges)
+        predecessors: dict[int, list[int]] = {}
+        for state, targets in successors.items():
+            for target in targets:
+                predecessors.setdefault(target, []).append(state)
+        alive = set(winning)
+        pending = deque(winning)
+        while pending:
+            for previous in predecessors.get(pending.popleft(), []):
+                if previous not in alive:
+                    alive.add(previous)
+                    pending.append(previous)
+        # Only meaningful when the start can still reach the (obtainable) goal
+        softlocks = [state for state in parents if state not in alive] if first in alive else []
+
+        blocked = {
+            action.name: self.model.atoms_of(action.requires & ~union)
+            for action in self.eager + self.branching
+            if action.requires & ~union
+        }
+        unknown_sources = {
+            atom: [
+                action.name for action in self.model.actions
+                if action.requires & self.model.bit(atom)
+            ]
+            for atom in self.model.atoms_of(unknown & ~start)
+        }
+        return SolveResult(
+            self.model, start, goal, parents, goal_states, softlocks, blocked,
+            truncated, list(self.unreachable_actions), unknown_sources, assumed,
+        )
+
+
+def load_profile(name_or_path: str) -> dict:
+    """Save-data profile by path or by name under save_data_profiles/."""
+    path = Path(name_or_path)
+    if not path.suffix and "/" not in name_or_path:
+        path = SAVE_DATA_PROFILE_DIR / f"{name_or_path}.json"
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def format_report(result: SolveResult) -> str:
+    model = result.model
+    lines = [
+        f"Progression solver: {len(model.atoms)} atoms, {len(model.actions)} actions, "
+        f"{len(result.parents)} states explored" + (" (truncated)" if result.truncated else ""),
+        "",
+    ]
+    if result.reached_goal:
+        plan = result.plan()
+        lines.append(f"Goal reachable in {len(plan)} steps:")
+        lines.extend(f"  {step:3d}. {action}" for step, action in enumerate(plan, 1))
+    else:
+        missing = model.atoms_of(result.goal & ~result.obtained)
+        lines.append("Goal NOT reachable; never obtained: " + ", ".join(missing))
+    if result.unreachable_actions:
+        lines.append("")
+        lines.append("No location reachable from the overworld:")
+        lines.extend(f"  {name}" for name in result.unreachable_actions)
+    if result.assumed:
+        lines.append("")
+        lines.append("Assumed held (no known source): " + ", ".join(result.assumed))
+    if result.unknown_sources:
+        lines.append("")
+        lines.append("Unknown source (no action grants these; pass --have or --assume-unknown):")
+        lines.extend(
+            f"  {atom}: gates {', '.join(actions)}" for atom, actions in result.unknown_sources.items()
+        )
+    blocked = {
+        name: atoms for name, atoms in result.blocked.items()
+        if any(atom not in result.unknown_sources for atom in atoms)
+    }
+    if blocked:
+        lines.append("")
+        lines.append("Blocked actions (missing atoms):")
+        lines.extend(f"  {name}: {', '.join(atoms)}" for name, atoms in blocked.items())
+    if result.softlocks:
+        lines.append("")
+        lines.append(f"Softlock-prone states: {len(result.softlocks)}")
+        for state in result.softlocks[:10]:
+            lines.append(f"  after {' -> '.join(result.plan(state)) or '(start)'}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--registry", type=Path, default=REGISTRY_PATH)
+    parser.add_argument("--events", type=Path, default=STORY_EVENTS_PATH, help="story_events.json")
+    parser.add_argument("--rom", type=Path, help="Drop actions whose locations are unreachable in this ROM")
+    parser.add_argument("--profile", help="Start from a save-data profile (name or path)")
+    parser.add_argument("--have", action="append", default=[], metavar="ATOM", help="Extra starting atom, e.g. item:hammer")
+    parser.add_argument("--goal", action="append", default=[], metavar="ATOM", help="Goal atom (default: every event and dungeon)")
+    parser.add_argument(
+        "--assume-unknown", action="store_true",
+        help="Start holding every gate item with no known source (most dungeon rewards are TBD)",
+    )
+    parser.add_argument("--max-states", type=int, default=DEFAULT_MAX_STATES)
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        registry = json.loads(args.registry.read_text(encoding="utf-8"))
+        events = json.loads(args.events.read_text(encoding="utf-8"))["events"]
+        profile = load_profile(args.profile) if args.profile else {}
+        index = None
+        if args.rom:
+            from connectivity_index import ConnectivityIndex
+
+            index = ConnectivityIndex.load(args.rom)
+    except (OSError, ValueError, KeyError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+    model = ProgressionModel.compile(events, registry, index)
+    known = set(model.atoms)
+    for atom in args.goal:
+        if atom not in known:
+            print(f"error: unknown goal atom {atom!r}", file=sys.stderr)
+            return 1
+    start = model.mask(profile_atoms(profile, registry) + args.have)
+    goal = model.mask(args.goal) if args.goal else None
+    result = ProgressionSolver(model, index).solve(start, goal, args.max_states, args.assume_unknown)
+
+    if args.json:
+        print(json.dumps(result.to_json(), indent=2))
+    else:
+        print(format_report(result))
+    return 0 if result.reached_goal else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""Read-only, memory-mapped ROM image shared by the generators.
+
+The manifest generator, water-table generators and custom-collision
+validator all inspect the same multi-megabyte ROMs. `RomImage` maps a file
+once and exposes it as a `memoryview`, so stream parsers slice it without
+copying and every consumer in a process can share the same mapping and the
+same cached digests.
+
+    with RomImage.open(Path("Roms/oos168.sfc")) as rom:
+        table = rom.u24(0x874C)
+        stream = rom.view(rom.lorom_to_pc(table), length=0x100)
+        print(rom.sha1)
+"""
+from __future__ import annotations
+
+import hashlib
+import mmap
+from functools import cached_property
+from pathlib import Path
+from typing import Optional, Union
+
+
+class RomImageError(ValueError):
+    """Raised for reads outside the mapped image."""
+
+
+def lorom_to_pc(address: int) -> int:
+    """Map a LoROM SNES address (any bank mirror) to an unheadered PC offset."""
+    return ((address & 0x7F0000) >> 1) | (address & 0x7FFF)
+
+
+def pc_to_lorom(offset: int) -> int:
+    """Map an unheadered PC offset to its canonical LoROM SNES address."""
+    return ((offset << 1) & 0x7F0000) | (offset & 0x7FFF) | 0x8000
+
+
+class RomImage:
+    """A ROM file mapped read-only with typed, bounds-checked readers."""
+
+    def __init__(self, path: Path, buffer: Union[mmap.mmap, bytes]) -> None:
+        self.path = path
+        self._buffer = buffer
+        self.data = memoryview(buffer)
+
+    @classmethod
+    def open(cls, path: Path) -> "RomImage":
+        """Map `path` read-only (raises OSError like Path.read_bytes)."""
+        with open(path, "rb") as handle:
+            try:
+                buffer: Union[mmap.mmap, bytes] = mmap.mmap(
+                    handle.fileno(), 0, access=mmap.ACCESS_READ
+                )
+            except ValueError:
+                # Empty files cannot be mapped.
+                buffer = handle.read()
+        return cls(Path(path), buffer)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, path: Optional[Path] = None) -> "RomImage":
+        """Wrap in-memory ROM data (tests, patched buffers)."""
+        return cls(path or Path("<memory>"), bytes(data))
+
+    def share(self) -> memoryview:
+        """A zero-copy view that stays valid after close() (keeps the map alive)."""
+        return memoryview(self._buffer)
+
+    def close(self) -> None:
+        """Release the mapping once no slices of it are still alive."""
+        self.data.release()
+        if isinstance(self._buffer, mmap.mmap):
+            try:
+                self._buffer.close()
+            except BufferError:
+                # A caller still holds a view; the map goes with it.
+                pass
+
+    def __enter__(self) -> "RomImage":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    @property
+    def size(self) -> int:
+        return len(self.data)
+
+    @cached_property
+    def sha1(self) -> str:
+        return hashlib.sha1(self.data).hexdigest()
+
+    @cached_property
+    def sha256(self) -> str:
+        return hashlib.sha256(self.data).hexdigest()
+
+    # ------------------------------------------------------------------
+    # Reads (PC offsets)
+    # ------------------------------------------------------------------
+
+    def require(self, offset: int, size: int) -> None:
+        if offset < 0 or size < 0 or offset + size > len(self.data):
+            raise RomImageError(
+                f"ROM read [0x{offset:X}, 0x{offset + size:X}) exceeds "
+                f"{self.path} size 0x{len(self.data):X}"
+            )
+
+    def view(
+        self, start: int, end: Optional[int] = None, *, length: Optional[int] = None
+    ) -> memoryview:
+        """Zero-copy slice [start, end) or [start, start + length)."""
+        if end is None:
+            end = len(self.data) if length is None else start + length
+        self.require(start, end - start)
+        return self.data[start:end]
+
+    def u8(self, offset: int) -> int:
+        self.require(offset, 1)
+        return self.data[offset]
+
+    def u16(self, offset: int) -> int:
+        self.require(offset, 2)
+        data = self.data
+        return data[offset] | (data[offset + 1] << 8)
+
+    def u24(self, offset: int) -> int:
+        self.require(offset, 3)
+        data = self.data
+        return data[offset] | (data[offset + 1] << 8) | (data[offset + 2] << 16)
+
+    # ------------------------------------------------------------------
+    # Reads (LoROM SNES addresses)
+    # ------------------------------------------------------------------
+
+    lorom_to_pc = staticmethod(lorom_to_pc)
+    pc_to_lorom = staticmethod(pc_to_lorom)
+
+    def snes_u8(self, address: int) -> int:
+        return self.u8(lorom_to_pc(address))
+
+    def snes_u16(self, address: int) -> int:
+        return self.u16(lorom_to_pc(address))
+
+    def snes_u24(self, address: int) -> int:
+        return self.u24(lorom_to_pc(address))
+
+
+class RomImageCache:
+    """Keeps RomImages mapped across runs, remapping files that change.
+
+    Long-running tools (the generated-artifact watcher) hold one of these so
+    repeated regenerations reuse the mapping and its cached digests until the
+    file's inode, size or mtime changes.
+    """
+
+    def __init__(self) -> None:
+        self._images: dict[Path, tuple[tuple[int, int, int], RomImage]] = {}
+
+    def get(self, path: Path) -> RomImage:
+        """Current image for `path` (raises OSError if unreadable)."""
+        key = Path(path).resolve()
+        stat = key.stat()
+        signature = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        entry = self._images.get(key)
+        if entry is not None:
+            if entry[0] == signature:
+                return entry[1]
+            entry[1].close()
+        image = RomImage.open(key)
+        self._images[key] = (signature, image)
+        return image
+
+    def discard(self, path: Path) -> None:
+        entry = self._images.pop(Path(path).resolve(), None)
+        if entry is not None:
+            entry[1].close()
+
+    def close(self) -> None:
+        for _, image in self._images.values():
+            image.close()
+        self._images.clear()
@@ -0,0 +1,507 @@
+#!/usr/bin/env python3
+"""Shared decoders for dungeon room headers and room data streams.
+
+The water-gate and water-fill generators, the custom-collision validator and
+the hack manifest all walk the same per-room streams:
+
+  headers    14-byte room headers (pointer table at the $B5DD operand)
+  objects    floor/layout header, three 3-byte object lists, door list
+  sprites    sort-mode byte, 3-byte records until $FF (bank $09)
+  pot items  3-byte records until $FFFF (bank $01)
+  collision  Oracle custom-collision rectangles/single tiles until $FFFF
+
+The `scan_*` functions decode one stream from a ROM buffer (any bytes-like
+object, normally a RomImage memoryview) and raise RoomStreamError with a
+short description; callers wrap that in their own error type and wording.
+The manifest and the collision validator use the strict format checks. The
+water-table generators pass `strict=False` to keep the readings of their
+original parsers:
+
+  objects    0xF0FF starts a door list in any object list, 0xFFFF after
+             doors moves on to the next list, and a truncated stream stops
+             where it is (no bank limit)
+  sprites    at most 512 records; a truncated stream stops where it is
+  collision  no 0x12E000 boundary; zero-size and out-of-map rectangles are
+             read as given; in rectangle mode any word from 0xF0F1 to
+             0xFFFE switches to single tiles
+
+`RoomStreams` decodes every room of one ROM image: pointer tables are read
+as whole slices, each stream is decoded once and memoized, and
+`RoomStreams.for_rom()` shares instances across callers by ROM SHA-1, so a
+process that validates and generates from the same ROM decodes it once.
+The shared instance reads a zero-copy view of the RomImage's mapping
+(`RomImage.share()`), which stays valid after the image is closed. Decodes
+are not persisted across processes: decoding all 296 rooms costs about as
+much as loading the results back from disk.
+
+    with RomImage.open(Path("Roms/oos168.sfc")) as rom:
+        streams = RoomStreams.for_rom(rom)
+        for room_id in range(ROOM_COUNT):
+            streams.objects(room_id).objects
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Optional
+
+from rom_image import RomImage, lorom_to_pc
+
+
+ROOM_COUNT = 296  # 0x00..0x127
+
+# PC addresses (from Yaze's dungeon_rom_addresses.h)
+ROOM_OBJECT_POINTER_PC = 0x874C
+ROOM_SPRITE_POINTER_PC = 0x4C298
+ROOM_HEADER_POINTER_PC = 0xB5DD
+ROOM_HEADER_BANK_PC = 0xB5E7
+ROOM_HEADER_SIZE = 14
+SPRITE_POINTER_BANK = 0x09
+
+# Oracle custom collision (Dungeons/Collision/custom_collision.asm)
+COLLISION_POINTER_TABLE_PC = 0x128090
+COLLISION_DATA_START_PC = 0x128450
+COLLISION_DATA_END_PC = 0x12E000  # reserved WaterFill table starts here
+COLLISION_MAP_WIDTH = 64
+COLLISION_MAP_HEIGHT = 64
+COLLISION_MAP_TILES = COLLISION_MAP_WIDTH * COLLISION_MAP_HEIGHT
+COLLISION_SINGLE_TILE_MARKER = 0xF0F0
+COLLISION_END_MARKER = 0xFFFF
+
+LOROM_BANK_SIZE = 0x8000
+LENIENT_SPRITE_LIMIT = 512  # record guard of the water-gate generator's parser
+
+# Shared RoomStreams per ROM SHA-1 (most recently used last).
+_CACHE_LIMIT = 4
+_STREAMS_BY_SHA1: "OrderedDict[str, RoomStreams]" = OrderedDict()
+
+
+class RoomStreamError(ValueError):
+    """A room stream is truncated or malformed; str() is a short description."""
+
+
+# ---------------------------------------------------------------------------
+# Records
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class RoomObject:
+    obj_id: int
+    x: int
+    y: int
+    size: int
+    layer: int
+    b1: int
+    b2: int
+    b3: int
+
+
+@dataclass(frozen=True)
+class RoomSprite:
+    spr_id: int
+    x: int
+    y: int
+    subtype: int
+    layer: int
+
+
+@dataclass(frozen=True)
+class RoomHeader:
+    pc: int
+    raw: bytes
+
+    @property
+    def palette(self) -> int:
+        return self.raw[1]
+
+    @property
+    def blockset(self) -> int:
+        return self.raw[2]
+
+    @property
+    def spriteset(self) -> int:
+        return self.raw[3]
+
+    @property
+    def effect(self) -> int:
+        return self.raw[4]
+
+    @property
+    def tags(self) -> tuple[int, int]:
+        return self.raw[5], self.raw[6]
+
+    @property
+    def holewarp(self) -> int:
+        return self.raw[9]
+
+    @property
+    def staircase_rooms(self) -> tuple[int, int, int, int]:
+        return self.raw[10], self.raw[11], self.raw[12], self.raw[13]
+
+
+@dataclass(frozen=True)
+class ObjectStream:
+    start: int
+    end: int  # exclusive, after the final 0xFFFF
+    floor: bytes  # two-byte floor/layout header
+    objects: tuple[RoomObject, ...]
+    doors: tuple[int, ...]  # raw 16-bit door words
+
+
+@dataclass(frozen=True)
+class SpriteStream:
+    start: int
+    end: int  # exclusive, after the 0xFF terminator
+    sort_mode: int
+    sprites: tuple[RoomSprite, ...]
+
+
+@dataclass(frozen=True)
+class CollisionStream:
+    start: int
+    end: int  # exclusive, after the 0xFFFF terminator
+    tiles: dict[int, int]  # map offset -> tile, including explicit zeros
+
+
+def decode_room_object(b1: int, b2: int, b3: int, layer: int) -> RoomObject:
+    # Matches Yaze room_object.cc DecodeObjectFromBytes.
+    if b1 >= 0xFC:
+        obj_id = (b3 & 0x3F) | 0x100
+        x = ((b2 & 0xF0) >> 4) | ((b1 & 0x03) << 4)
+        y = ((b2 & 0x0F) << 2) | ((b3 & 0xC0) >> 6)
+        size = 0
+    elif b3 >= 0xF8:
+        obj_id = (b3 << 4) | 0x80 | (((b2 & 0x03) << 2) + (b1 & 0x03))
+        x = (b1 & 0xFC) >> 2
+        y = (b2 & 0xFC) >> 2
+        size = ((b1 & 0x03) << 2) | (b2 & 0x03)
+    else:
+        obj_id = b3
+        x = (b1 & 0xFC) >> 2
+        y = (b2 & 0xFC) >> 2
+        size = ((b1 & 0x03) << 2) | (b2 & 0x03)
+    return RoomObject(obj_id, x, y, size, layer, b1, b2, b3)
+
+
+def decode_room_sprite(b1: int, b2: int, b3: int) -> RoomSprite:
+    # Matches Yaze Room::LoadSprites.
+    return RoomSprite(
+        spr_id=b3,
+        x=b2 & 0x1F,
+        y=b1 & 0x1F,
+        subtype=((b2 & 0xE0) >> 5) + ((b1 & 0x60) >> 2),
+        layer=(b1 & 0x80) >> 7,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Table reads
+# ---------------------------------------------------------------------------
+
+def read_u16_table(data, pc: int, count: int) -> list[int]:
+    """`count` little-endian words starting at `pc`."""
+    raw = bytes(data[pc:pc + count * 2])
+    if len(raw) != count * 2:
+        raise RoomStreamError(f"table at PC 0x{pc:X} is truncated")
+    return [lo | (hi << 8) for lo, hi in zip(raw[0::2], raw[1::2])]
+
+
+def read_u24_table(data, pc: int, count: int) -> list[int]:
+    """`count` little-endian 24-bit pointers starting at `pc`."""
+    raw = bytes(data[pc:pc + count * 3])
+    if len(raw) != count * 3:
+        raise RoomStreamError(f"table at PC 0x{pc:X} is truncated")
+    return [
+        lo | (mid << 8) | (hi << 16)
+        for lo, mid, hi in zip(raw[0::3], raw[1::3], raw[2::3])
+    ]
+
+
+def bank_limit(data, pc: int) -> int:
+    """End of the LoROM bank holding `pc` (streams never cross one)."""
+    return min(len(data), (pc // LOROM_BANK_SIZE + 1) * LOROM_BANK_SIZE)
+
+
+# ---------------------------------------------------------------------------
+# Stream scanners
+# ---------------------------------------------------------------------------
+
+def scan_object_stream(
+    data, start: int, limit: Optional[int] = None, strict: bool = True
+) -> ObjectStream:
+    """Decode an object stream: header, lists 0-1, list 2 + optional doors."""
+    limit = len(data) if limit is None else min(limit, len(data))
+    if strict and (start < 0 or start + 2 > limit):
+        raise RoomStreamError("is missing its two-byte header")
+    floor = bytes(data[start:start + 2])
+    cursor = start + 2
+    objects: list[RoomObject] = []
+    doors: list[int] = []
+    layer = 0
+    in_doors = False
+    while True:
+        if cursor + 2 > limit:
+            if not strict:
+                return ObjectStream(start, cursor, floor, tuple(objects), tuple(doors))
+            if in_doors:
+                raise RoomStreamError("door list has no 0xFFFF terminator")
+            if layer == 2:
+                raise RoomStreamError("list 2 has no door marker or terminator")
+            raise RoomStreamError(f"list {layer} has no 0xFFFF terminator")
+        b1 = data[cursor]
+        b2 = data[cursor + 1]
+        if b1 == 0xFF and b2 == 0xFF:
+            cursor += 2
+            if strict and (in_doors or layer == 2):
+                return ObjectStream(start, cursor, floor, tuple(objects), tuple(doors))
+            layer += 1
+            in_doors = False
+            if layer == 3:
+                return ObjectStream(start, cursor, floor, tuple(objects), tuple(doors))
+            continue
+        if not strict and b1 == 0xF0 and b2 == 0xFF:
+            cursor += 2
+            in_doors = True
+            continue
+        if in_doors:
+            doors.append(b1 | (b2 << 8))
+            cursor += 2
+            continue
+        if layer == 2 and b1 == 0xF0 and b2 == 0xFF:
+            cursor += 2
+            in_doors = True
+            continue
+        if cursor + 3 > limit:
+            if not strict:
+                return ObjectStream(start, cursor, floor, tuple(objects), tuple(doors))
+            raise RoomStreamError(f"list {layer} has a truncated record")
+        objects.append(decode_room_object(b1, b2, data[cursor + 2], layer))
+        cursor += 3
+
+
+def scan_sprite_stream(
+    data, start: int, limit: Optional[int] = None, strict: bool = True
+) -> SpriteStream:
+    """Decode a sprite stream: sort byte, 3-byte records, 0xFF terminator."""
+    limit = len(data) if limit is None else min(limit, len(data))
+    if start < 0 or start + 1 > limit:
+        if not strict:
+            return SpriteStream(start, start, 0, ())
+        raise RoomStreamError("is missing its sort byte")
+    sort_mode = data[start]
+    cursor = start + 1
+    sprites: list[RoomSprite] = []
+    while True:
+        if not strict and (cursor + 3 > limit or len(sprites) >= LENIENT_SPRITE_LIMIT):
+            return SpriteStream(start, cursor, sort_mode, tuple(sprites))
+        if cursor + 1 > limit:
+            raise RoomStreamError("has no 0xFF terminator")
+        b1 = data[cursor]
+        if b1 == 0xFF:
+            return SpriteStream(start, cursor + 1, sort_mode, tuple(sprites))
+        if cursor + 3 > limit:
+            raise RoomStreamError("has a truncated record")
+        sprites.append(decode_room_sprite(b1, data[cursor + 1], data[cursor + 2]))
+        cursor += 3
+
+
+def scan_pot_stream(data, start: int, limit: Optional[int] = None) -> int:
+    """Return the exclusive end of a pot-item stream (3-byte records, 0xFFFF)."""
+    limit = len(data) if limit is None else min(limit, len(data))
+    cursor = start
+    while True:
+        if cursor < 0 or cursor + 2 > limit:
+            raise RoomStreamError("has no 0xFFFF terminator")
+        if data[cursor] == 0xFF and data[cursor + 1] == 0xFF:
+            return cursor + 2
+        if cursor + 3 > limit:
+            raise RoomStreamError("has a truncated record")
+        cursor += 3
+
+
+def scan_collision_stream(
+    data, start: int, limit: int = COLLISION_DATA_END_PC, strict: bool = True
+) -> CollisionStream:
+    """Decode a custom-collision stream (custom_collision.asm format).
+
+    Rectangles (offset, width, height, rows of tiles) come first; 0xF0F0
+    switches to single tiles (offset, tile); 0xFFFF ends the stream.
+    """
+    limit = min(limit, len(data)) if strict else len(data)
+    tiles: dict[int, int] = {}
+    cursor = start
+    single_tiles = False
+    while cursor + 1 < limit:
+        offset = data[cursor] | (data[cursor + 1] << 8)
+        cursor += 2
+        if offset == COLLISION_END_MARKER:
+            return CollisionStream(start, cursor, tiles)
+        if offset == COLLISION_SINGLE_TILE_MARKER:
+            single_tiles = True
+            continue
+        if not strict and offset > COLLISION_SINGLE_TILE_MARKER:
+            single_tiles = True
+
+        if single_tiles:
+            if cursor >= limit:
+                break
+            if strict and offset >= COLLISION_MAP_TILES:
+                raise RoomStreamError(f"has out-of-range single-tile offset {offset}")
+            tiles[offset] = data[cursor]
+            cursor += 1
+            continue
+
+        if cursor + 1 >= limit:
+            break
+        width = data[cursor]
+        height = data[cursor + 1]
+        cursor += 2
+        if strict and (width == 0 or height == 0):
+            raise RoomStreamError(
+                f"has zero-dimension collision rectangle {width}x{height}"
+            )
+        if cursor + width * height > limit:
+            raise RoomStreamError("rectangle crosses the collision data boundary")
+        start_row, start_column = divmod(offset, COLLISION_MAP_WIDTH)
+        if strict and (
+            offset >= COLLISION_MAP_TILES
+            or start_column + width > COLLISION_MAP_WIDTH
+            or start_row + height > COLLISION_MAP_HEIGHT
+        ):
+            raise RoomStreamError(
+                f"has an out-of-range collision rectangle at offset {offset} "
+                f"with size {width}x{height}"
+            )
+        for row in range(height):
+            row_offset = offset + row * COLLISION_MAP_WIDTH
+            tiles.update(zip(range(row_offset, row_offset + width), data[cursor:cursor + width]))
+            cursor += width
+
+    if not strict:
+        raise RoomStreamError("collision data is unterminated")
+    raise RoomStreamError(
+        "collision data is unterminated before the reserved water-fill region"
+    )
+
+
+# ---------------------------------------------------------------------------
+# Whole-ROM view
+# ---------------------------------------------------------------------------
+
+class RoomStreams:
+    """Memoized per-room decode of one ROM buffer."""
+
+    def __init__(self, data) -> None:
+        self.data = data
+        # Keyed by (room_id, strict)
+        self._objects: dict[tuple[int, bool], ObjectStream] = {}
+        self._sprites: dict[tuple[int, bool], SpriteStream] = {}
+        self._collision: dict[tuple[int, bool], Optional[CollisionStream]] = {}
+
+    @classmethod
+    def for_rom(cls, rom: RomImage) -> "RoomStreams":
+        """Shared instance for this ROM content (keyed by SHA-1).
+
+        The instance reads `rom.share()` in place rather than a copy. A hit
+        is re-pointed at the caller's view, which is known to hold exactly
+        this content even if an older mapping's file was rewritten since.
+        """
+        key = rom.sha1
+        streams = _STREAMS_BY_SHA1.get(key)
+        if streams is None:
+            streams = cls(rom.share())
+            _STREAMS_BY_SHA1[key] = streams
+            while len(_STREAMS_BY_SHA1) > _CACHE_LIMIT:
+                _STREAMS_BY_SHA1.popitem(last=False)
+        else:
+            streams.data = rom.share()
+            _STREAMS_BY_SHA1.move_to_end(key)
+        return streams
+
+    # -- pointer tables -----------------------------------------------------
+
+    @cached_property
+    def object_pointers(self) -> list[int]:
+        table = self.data[ROOM_OBJECT_POINTER_PC:ROOM_OBJECT_POINTER_PC + 3]
+        table_pc = lorom_to_pc(int.from_bytes(table, "little"))
+        return read_u24_table(self.data, table_pc, ROOM_COUNT)
+
+    @cached_property
+    def sprite_pointers(self) -> list[int]:
+        table_low = self.data[ROOM_SPRITE_POINTER_PC] | (self.data[ROOM_SPRITE_POINTER_PC + 1] << 8)
+        table_pc = lorom_to_pc((SPRITE_POINTER_BANK << 16) | table_low)
+        return [
+            (SPRITE_POINTER_BANK << 16) | low
+            for low in read_u16_table(self.data, table_pc, ROOM_COUNT)
+        ]
+
+    @cached_property
+    def header_pointers(self) -> list[int]:
+        table = self.data[ROOM_HEADER_POINTER_PC:ROOM_HEADER_POINTER_PC + 3]
+        table_pc = lorom_to_pc(int.from_bytes(table, "little"))
+        bank = self.data[ROOM_HEADER_BANK_PC] << 16
+        return [bank | low for low in read_u16_table(self.data, table_pc, ROOM_COUNT)]
+
+    @cached_property
+    def collision_pointers(self) -> list[int]:
+        return read_u24_table(self.data, COLLISION_POINTER_TABLE_PC, ROOM_COUNT)
+
+    # -- per-room streams ---------------------------------------------------
+
+    def header(self, room_id: int) -> RoomHeader:
+        pc = lorom_to_pc(self.header_pointers[room_id])
+        raw = bytes(self.data[pc:pc + ROOM_HEADER_SIZE])
+        if len(raw) != ROOM_HEADER_SIZE:
+            raise RoomStreamError(f"room 0x{room_id:03X} header is truncated")
+        return RoomHeader(pc, raw)
+
+    def objects(self, room_id: int, strict: bool = True) -> ObjectStream:
+        stream = self._objects.get((room_id, strict))
+        if stream is None:
+            pc = lorom_to_pc(self.object_pointers[room_id])
+            limit = bank_limit(self.data, pc) if strict else None
+            stream = scan_object_stream(self.data, pc, limit, strict)
+            self._objects[room_id, strict] = stream
+        return stream
+
+    def sprites(self, room_id: int, strict: bool = True) -> SpriteStream:
+        stream = self._sprites.get((room_id, strict))
+        if stream is None:
+            pc = lorom_to_pc(self.sprite_pointers[room_id])
+            limit = bank_limit(self.data, pc) if strict else None
+            stream = scan_sprite_stream(self.data, pc, limit, strict)
+            self._sprites[room_id, strict] = stream
+        return stream
+
+    def collision_pc(self, room_id: int) -> Optional[int]:
+        """PC of the room's collision stream, or None for a null pointer."""
+        pointer = self.collision_pointers[room_id]
+        return None if pointer == 0 else lorom_to_pc(pointer)
+
+    def collision(self, room_id: int, strict: bool = True) -> Optional[CollisionStream]:
+        """Decoded custom collision, or None when the room has no stream.
+
+        Raises RoomStreamError if the pointer lies outside the collision
+        data region or the stream is malformed.
+        """
+        if (room_id, strict) in self._collision:
+            return self._collision[room_id, strict]
+        pc = self.collision_pc(room_id)
+        stream = None
+        if pc is not None:
+            if not COLLISION_DATA_START_PC <= pc < COLLISION_DATA_END_PC:
+                raise RoomStreamError(
+                    f"collision pointer 0x{self.collision_pointers[room_id]:06X} "
+                    f"maps outside collision data (PC 0x{pc:06X})"
+                )
+            stream = scan_collision_stream(self.data, pc, strict=strict)
+        self._collision[room_id, strict] = stream
+        return stream
+
+    def decode_all(self, room_count: int = ROOM_COUNT) -> "RoomStreams":
+        """Decode objects and sprites for every room up front."""
+        for room_id in range(min(room_count, ROOM_COUNT)):
+            self.objects(room_id)
+            self.sprites(room_id)
+        return self
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+
+GENERATE_DIR = Path(__file__).resolve().parents[1]
+REPO_ROOT = GENERATE_DIR.parents[1]
+sys.path.insert(0, str(REPO_ROOT / "Scripts" / "Build"))
+
+from build_steps import (  # noqa: E402
+    FileIndex,
+    FingerprintStore,
+    Step,
+    append_plan,
+    read_plan,
+    run_steps,
+)
+
+
+class BuildStepsFixture(unittest.TestCase):
+    def setUp(self) -> None:
+        self._temp = tempfile.TemporaryDirectory()
+        self.root = Path(self._temp.name)
+        self.store_path = self.root / ".cache" / "build_steps.json"
+        self.calls: list[str] = []
+
+    def tearDown(self) -> None:
+        self._temp.cleanup()
+
+    def write(self, relative: str, text: str) -> Path:
+        path = self.root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+        return path
+
+    def step(self, name: str, **kwargs) -> Step:
+        return Step(name=name, argv=[name], cwd=str(self.root), **kwargs)
+
+    def execute(self, step: Step) -> tuple[int, str]:
+        self.calls.append(step.name)
+        for output in step.outputs:
+            self.write(output, f"{step.name}\n")
+        return (1 if step.name.startswith("bad") else 0), f"{step.name} ran\n"
+
+    def run_plan(self, steps: list[Step], **kwargs):
+        store = FingerprintStore(self.store_path)
+        index = FileIndex(self.root, store.files)
+        results = run_steps(steps, index, store, execute=self.execute, **kwargs)
+        store.files = index.digests
+        store.save()
+        return {result.name: result.status for result in results}
+
+
+class FingerprintTest(BuildStepsFixture):
+    def test_unchanged_steps_are_skipped(self) -> None:
+        self.write("Core/a.asm", "db $00\n")
+        steps = [self.step("tables", inputs=["**/*.asm"], outputs=["out/tables.asm"])]
+
+        self.assertEqual(self.run_plan(steps), {"tables": "ran"})
+        self.assertEqual(self.run_plan(steps), {"tables": "skipped"})
+
+        self.write("Core/b.asm", "db $01\n")
+        self.assertEqual(self.run_plan(steps), {"tables": "ran"})
+
+        self.write("out/tables.asm", "edited by hand\n")
+        self.assertEqual(self.run_plan(steps), {"tables": "ran"})
+
+        (self.root / "out/tables.asm").unlink()
+        self.assertEqual(self.run_plan(steps), {"tables": "ran"})
+        self.assertEqual(self.run_plan(steps, force=True), {"tables": "ran"})
+        self.assertEqual(self.calls, ["tables"] * 5)
+
+    def test_failed_step_reruns_and_blocks_dependents(self) -> None:
+        steps = [
+            self.step("bad_contract"),
+            self.step("generator", after=["bad_contract"]),
+            self.step("other"),
+        ]
+        self.assertEqual(
+            self.run_plan(steps),
+            {"bad_contract": "failed", "generator": "blocked", "other": "ran"},
+        )
+        self.assertEqual(self.run_plan(steps)["bad_contract"], "failed")
+        self.assertNotIn("generator", self.calls)
+
+    def test_independent_steps_run_in_parallel(self) -> None:
+        barrier = threading.Barrier(2, timeout=5)
+
+        def execute(step: Step) -> tuple[int, str]:
+            if step.name != "last":
+                barrier.wait()
+            self.calls.append(step.name)
+            return 0, ""
+
+        steps = [self.step("a"), self.step("b"), self.step("last", after=["a", "b"])]
+        store = FingerprintStore(self.store_path)
+        run_steps(steps, FileIndex(self.root), store, jobs=2, execute=execute)
+        self.assertEqual(self.calls[-1], "last")
+
+
+class PlanTest(BuildStepsFixture):
+    def test_plan_records_round_trip(self) -> None:
+        plan = self.root / "plan"
+        append_plan(plan, ["first", "--cwd", "/repo", "--in", "a b.txt", "--", "echo", ""])
+        append_plan(plan, ["second", "--after", "first", "--allow-fail", "--", "true"])
+        first, second = read_plan(plan)
+        self.assertEqual((first.cwd, first.inputs, first.argv), ("/repo", ["a b.txt"], ["echo", ""]))
+        self.assertEqual((second.after, second.allow_fail), (["first"], True))
+
+    def test_plan_rejects_unknown_dependency(self) -> None:
+        plan = self.root / "plan"
+        append_plan(plan, ["second", "--after", "first", "--", "true"])
+        with self.assertRaisesRegex(ValueError, "undeclared steps: first"):
+            read_plan(plan)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+GENERATE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(GENERATE_DIR))
+
+from connectivity_index import (  # noqa: E402
+    EXIT_AREA_PC,
+    EXIT_ROOM_PC,
+    OVERWORLD_ENTRANCE_AREA_PC,
+    OVERWORLD_ENTRANCE_ID_PC,
+    ConnectivityIndex,
+)
+from dungeon_rooms import ENTRANCE_ROOM_PC  # noqa: E402
+from rom_image import pc_to_lorom  # noqa: E402
+from room_streams import (  # noqa: E402
+    ROOM_COUNT,
+    ROOM_HEADER_BANK_PC,
+    ROOM_HEADER_POINTER_PC,
+    ROOM_OBJECT_POINTER_PC,
+)
+
+
+OBJECT_TABLE_PC = 0xF8000
+HEADER_TABLE_PC = 0x27000
+EMPTY_OBJECTS = b"\x00\x00" + b"\xFF\xFF" * 3
+# Room 0x98: south door (slot 0) and a cave exit on the west wall.
+DOOR_OBJECTS = b"\x00\x00" + b"\xFF\xFF" * 2 + b"\xF0\xFF" + b"\x01\x00" + b"\x12\x0E" + b"\xFF\xFF"
+# Room 0xA8: staircase to 0xB9 and a holewarp to 0xC8.
+STAIR_HEADER = bytes(9) + b"\xC8" + b"\xB9\x00\x00\x00"
+
+
+def build_rom() -> bytes:
+    rom = bytearray(0x200000)
+    rom[ROOM_OBJECT_POINTER_PC:ROOM_OBJECT_POINTER_PC + 3] = (
+        pc_to_lorom(OBJECT_TABLE_PC).to_bytes(3, "little")
+    )
+    rom[ROOM_HEADER_POINTER_PC:ROOM_HEADER_POINTER_PC + 3] = (
+        pc_to_lorom(HEADER_TABLE_PC).to_bytes(3, "little")
+    )
+    rom[ROOM_HEADER_BANK_PC] = pc_to_lorom(HEADER_TABLE_PC) >> 16
+    data_pc = OBJECT_TABLE_PC + ROOM_COUNT * 3
+    empty_pc, door_pc = data_pc, data_pc + 0x10
+    rom[empty_pc:empty_pc + len(EMPTY_OBJECTS)] = EMPTY_OBJECTS
+    rom[door_pc:door_pc + len(DOOR_OBJECTS)] = DOOR_OBJECTS
+    header_pc = HEADER_TABLE_PC + ROOM_COUNT * 2
+    stair_header_pc = header_pc + 0x10
+    rom[stair_header_pc:stair_header_pc + len(STAIR_HEADER)] = STAIR_HEADER
+    for room_id in range(ROOM_COUNT):
+        objects = door_pc if room_id == 0x98 else empty_pc
+        header = stair_header_pc if room_id == 0xA8 else header_pc
+        entry = OBJECT_TABLE_PC + room_id * 3
+        rom[entry:entry + 3] = pc_to_lorom(objects).to_bytes(3, "little")
+        entry = HEADER_TABLE_PC + room_id * 2
+        rom[entry:entry + 2] = (pc_to_lorom(header) & 0xFFFF).to_bytes(2, "little")
+    # Entrance 0x27 -> room 0x98, reached from overworld area 0x0F.
+    rom[ENTRANCE_ROOM_PC + 0x27 * 2] = 0x98
+    rom[OVERWORLD_ENTRANCE_AREA_PC:OVERWORLD_ENTRANCE_AREA_PC + 2] = b"\x0F\x00"
+    rom[OVERWORLD_ENTRANCE_ID_PC] = 0x27
+    # Exit 0: room 0xC8 back out to area 0x0F.
+    rom[EXIT_ROOM_PC:EXIT_ROOM_PC + 2] = b"\xC8\x00"
+    rom[EXIT_AREA_PC] = 0x0F
+    return bytes(rom)
+
+
+class QueryTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.index = ConnectivityIndex.from_edges(
+            [(0, 1, "door"), (1, 2, "stair"), (0, 1, "door"), (2, 0, "holewarp"), (3, 2, "door")],
+            counts=(4, 1, 1),
+        )
+
+    def test_csr_keeps_source_order_and_drops_duplicates(self) -> None:
+        self.assertEqual(self.index.offsets.tolist(), [0, 1, 2, 3, 4, 4, 4])
+        self.assertEqual(list(self.index.edges(0)), [(1, "door")])
+        self.assertEqual(self.index.label(4), "entrance:0x00")
+        self.assertEqual(self.index.parse_label("area:0x00"), 5)
+
+    def test_reachable_and_path(self) -> None:
+        self.assertEqual(self.index.reachable([0]), {0, 1, 2})
+        self.assertEqual(self.index.reachable([0], kinds={"door"}), {0, 1})
+        self.assertEqual(self.index.reachable([3], within={3, 2}), {3, 2})
+        self.assertEqual(self.index.path(3, 1), [3, 2, 0, 1])
+        self.assertEqual(self.index.path(0, 3), [])
+
+
+class BuildTest(unittest.TestCase):
+    def test_build_from_rom_and_cache_round_trip(self) -> None:
+        with tempfile.TemporaryDirectory() as temp:
+            rom_path = Path(temp) / "oos.sfc"
+            rom_path.write_bytes(build_rom())
+            cache_dir = Path(temp) / "cache"
+            index = ConnectivityIndex.load(rom_path, cache_dir)
+            self.assertEqual(len(list(cache_dir.glob("*.json"))), 1)
+
+            start = index.parse_label("area:0x0F")
+            goal = index.parse_label("room:0xC8")
+            self.assertEqual(
+                [index.label(node) for node in index.path(start, goal)],
+                ["area:0x0F", "entrance:0x27", "room:0x98", "room:0xA8", "room:0xC8"],
+            )
+            self.assertEqual(
+                [(index.label(t), kind) for t, kind in index.edges(index.node("room", 0xA8))],
+                [("room:0xB9", "stair"), ("room:0xC8", "holewarp")],
+            )
+            self.assertIn((start, "exit"), list(index.edges(goal)))
+            # The cave exit on 0x98's west wall does not lead to room 0x97.
+            self.assertEqual(
+                list(index.edges(index.node("room", 0x98))),
+                [(index.node("room", 0xA8), "door")],
+            )
+
+            cached = ConnectivityIndex.load(rom_path, cache_dir)
+            self.assertEqual((cached.targets, cached.kinds), (index.targets, index.kinds))
+            rom_path.write_bytes(build_rom()[:-1] + b"\x01")
+            ConnectivityIndex.load(rom_path, cache_dir)
+            self.assertEqual(len(list(cache_dir.glob("*.json"))), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+GENERATE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(GENERATE_DIR))
+
+from dungeon_rooms import (  # noqa: E402
+    ENTRANCE_ROOM_PC,
+    DungeonRooms,
+    adjacent_room,
+    decode_door,
+)
+from rom_image import pc_to_lorom  # noqa: E402
+from room_streams import (  # noqa: E402
+    COLLISION_DATA_START_PC,
+    COLLISION_POINTER_TABLE_PC,
+    ROOM_COUNT,
+    ROOM_HEADER_BANK_PC,
+    ROOM_HEADER_POINTER_PC,
+    ROOM_OBJECT_POINTER_PC,
+    RoomStreamError,
+    RoomStreams,
+)
+
+
+OBJECT_TABLE_PC = 0xF8000
+HEADER_TABLE_PC = 0x27000  # bank $04
+HEADER = bytes([0x20, 0x4F, 0x07, 0x21, 0x02, 0x03, 0x04, 0, 0, 0x2A, 0x3B, 0x00, 0x5C, 0x00])
+OBJECTS = (
+    b"\x21\x0C"  # floor1 1, floor2 2, layout 3
+    + b"\x10\x20\x30" + b"\xFF\xFF"
+    + b"\x15\x2A\xF9" + b"\xFF\xFF"  # chest (0xF99) at (5, 10)
+    + b"\xF0\xFF"
+    + b"\x01\x1C"  # slot 0, south wall, small key door
+    + b"\x12\x0E"  # slot 1, west wall, cave exit
+    + b"\xFF\xFF"
+)
+COLLISION = b"\xF0\xF0" + b"\x00\x01\x20" + b"\xFF\xFF"  # pit at offset 256
+
+
+def build_rom() -> bytes:
+    rom = bytearray(0x200000)
+    rom[ROOM_OBJECT_POINTER_PC:ROOM_OBJECT_POINTER_PC + 3] = (
+        pc_to_lorom(OBJECT_TABLE_PC).to_bytes(3, "little")
+    )
+    rom[ROOM_HEADER_POINTER_PC:ROOM_HEADER_POINTER_PC + 3] = (
+        pc_to_lorom(HEADER_TABLE_PC).to_bytes(3, "little")
+    )
+    rom[ROOM_HEADER_BANK_PC] = pc_to_lorom(HEADER_TABLE_PC) >> 16
+    objects_pc = OBJECT_TABLE_PC + ROOM_COUNT * 3
+    header_pc = HEADER_TABLE_PC + ROOM_COUNT * 2
+    rom[objects_pc:objects_pc + len(OBJECTS)] = OBJECTS
+    rom[header_pc:header_pc + len(HEADER)] = HEADER
+    for room_id in range(ROOM_COUNT):
+        entry = OBJECT_TABLE_PC + room_id * 3
+        rom[entry:entry + 3] = pc_to_lorom(objects_pc).to_bytes(3, "little")
+        entry = HEADER_TABLE_PC + room_id * 2
+        rom[entry:entry + 2] = (pc_to_lorom(header_pc) & 0xFFFF).to_bytes(2, "little")
+    rom[COLLISION_DATA_START_PC:COLLISION_DATA_START_PC + len(COLLISION)] = COLLISION
+    entry = COLLISION_POINTER_TABLE_PC + 0x98 * 3
+    rom[entry:entry + 3] = pc_to_lorom(COLLISION_DATA_START_PC).to_bytes(3, "little")
+    rom[ENTRANCE_ROOM_PC + 0x27 * 2:ENTRANCE_ROOM_PC + 0x27 * 2 + 2] = b"\x98\x00"
+    return bytes(rom)
+
+
+class DoorTest(unittest.TestCase):
+    def test_decode_door(self) -> None:
+        door = decode_door(0x1C01)
+        self.assertEqual(
+            (door.position, door.direction, door.tile_x, door.tile_y),
+            (0, "South", 14, 26),
+        )
+        self.assertEqual(door.type_name, "Small Key Door")
+        self.assertFalse(door.is_exit)
+        self.assertTrue(decode_door(0x0E12).is_exit)
+        self.assertEqual(decode_door(0x7F00).type_name, "Door 0x7F")
+
+    def test_adjacent_room_stops_at_grid_edges(self) -> None:
+        self.assertEqual(adjacent_room(0x98, "North"), 0x88)
+        self.assertEqual(adjacent_room(0x98, "East"), 0x99)
+        self.assertIsNone(adjacent_room(0x10, "West"))
+        self.assertIsNone(adjacent_room(0x1F, "East"))
+        self.assertIsNone(adjacent_room(0x05, "North"))
+
+
+class DungeonRoomsTest(unittest.TestCase):
+    def test_rooms_decode_header_objects_and_doors(self) -> None:
+        rooms = DungeonRooms(RoomStreams(build_rom())).rooms()
+        self.assertEqual(len(rooms), ROOM_COUNT)
+        room = rooms[0x98]
+        self.assertEqual(
+            (room.blockset, room.palette, room.spriteset, room.effect),
+            (0x07, 0x0F, 0x21, 0x02),
+        )
+        self.assertEqual((room.floor1, room.floor2, room.layout), (1, 2, 3))
+        self.assertEqual(room.object_count, 2)
+        self.assertEqual((room.holewarp, room.stairs), (0x2A, (0x3B, 0x00, 0x5C, 0x00)))
+        self.assertEqual([d.direction for d in room.doors], ["South", "West"])
+
+    def test_map_grid_marks_doors_objects_and_collision(self) -> None:
+        rooms = DungeonRooms(RoomStreams(build_rom()))
+        grid = rooms.map_grid(0x98)
+        self.assertEqual((len(grid), len(grid[0])), (64, 64))
+        self.assertEqual(grid[26][14:18], "DDDD")
+        self.assertEqual(grid[10][5], "C")
+        self.assertEqual(grid[4][0], "v")
+        self.assertNotIn("v", "".join(rooms.map_grid(0x97)))
+
+    def test_entrance_room_and_range_checks(self) -> None:
+        rooms = DungeonRooms(RoomStreams(build_rom()))
+        self.assertEqual(rooms.entrance_room(0x27), 0x98)
+        with self.assertRaisesRegex(RoomStreamError, "entrance 0x90 is out of range"):
+            rooms.entrance_room(0x90)
+        with self.assertRaisesRegex(RoomStreamError, "room 0x128 is out of range"):
+            rooms.room(ROOM_COUNT)
+
+    def test_load_shares_decode_until_file_changes(self) -> None:
+        with tempfile.TemporaryDirectory() as temp:
+            path = Path(temp) / "oos.sfc"
+            path.write_bytes(build_rom())
+            first = DungeonRooms.load(path)
+            self.assertIs(DungeonRooms.load(path), first)
+            path.write_bytes(build_rom() + bytes(0x8000))
+            self.assertIsNot(DungeonRooms.load(path), first)
+
+
+if __name__ == "__main__":
+    unittest.main()
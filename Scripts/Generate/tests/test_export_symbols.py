@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+GENERATE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(GENERATE_DIR))
+sys.path.insert(0, str(GENERATE_DIR.parent / "Mesen2"))
+
+from export_symbols import (  # noqa: E402
+    MlbLabel,
+    diff_mlb_labels,
+    export_symbols,
+    export_symbols_delta,
+    parse_mlb_labels,
+    push_label_delta,
+)
+from mesen2_client_lib.bridge import MesenBridge  # noqa: E402
+
+
+class RecordingBridge:
+    """MesenBridge's label helpers over a recorded send_command."""
+
+    set_label = MesenBridge.set_label
+    symbols_load = MesenBridge.symbols_load
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, dict]] = []
+        self.loaded: dict | None = None
+
+    def send_command(self, command: str, params: dict) -> dict:
+        self.calls.append((command, params))
+        if command == "SYMBOLS_LOAD":
+            self.loaded = json.loads(Path(params["file"]).read_text())
+        return {"success": True}
+
+
+class ExportSymbolsDeltaTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._temp = tempfile.TemporaryDirectory()
+        self.root = Path(self._temp.name)
+        self.sym = self.root / "oos168x.sym"
+        self.mlb = self.root / "oos168x.mlb"
+
+    def tearDown(self) -> None:
+        self._temp.cleanup()
+
+    def _write_sym(self, *lines: str) -> None:
+        self.sym.write_text("[labels]\n" + "\n".join(lines) + "\n")
+
+    def test_delta_tracks_added_renamed_and_removed_labels(self) -> None:
+        self._write_sym("2C:8000 :Oracle_Keep", "2C:8010 :Oracle_Old", "2C:8020 :Oracle_Gone")
+        count, first = export_symbols_delta(self.sym, self.mlb, format_type="full", include_wram=False)
+        self.assertEqual(count, 3)
+        self.assertEqual(len(first.upserts), 3)
+
+        self._write_sym("2C:8000 :Oracle_Keep", "2C:8010 :Oracle_New", "2C:8030 :Oracle_Added")
+        _, delta = export_symbols_delta(self.sym, self.mlb, format_type="full", include_wram=False)
+        self.assertEqual(
+            sorted(label.name for label in delta.upserts), ["Oracle_Added", "Oracle_New"]
+        )
+        self.assertEqual([label.name for label in delta.removed], ["Oracle_Gone"])
+
+        _, unchanged = export_symbols_delta(self.sym, self.mlb, format_type="full", include_wram=False)
+        self.assertFalse(unchanged)
+
+    def test_delta_export_matches_full_export(self) -> None:
+        self._write_sym("2C:8000 :Oracle_A", "2C:8000 :Oracle_A_size", "7E:0010 :Ram", "00:00F8 :Const")
+        full = self.root / "full.mlb"
+        self.assertEqual(
+            export_symbols(self.sym, full, format_type="full"),
+            export_symbols_delta(self.sym, self.mlb, format_type="full")[0],
+        )
+        self.assertEqual(full.read_text(), self.mlb.read_text())
+
+    def test_delta_rejects_bankless_formats(self) -> None:
+        self._write_sym("2C:8000 :Oracle_A", "2D:8000 :Oracle_B")
+        for format_type in ("simple", "prg"):
+            with self.assertRaisesRegex(ValueError, "full MLB format"):
+                export_symbols_delta(self.sym, self.mlb, format_type=format_type)
+        self.assertFalse(self.mlb.exists())
+
+    def test_parse_keeps_comments_with_colons(self) -> None:
+        labels = parse_mlb_labels([
+            "; header",
+            "SnesWorkRam:7E0010:GameMode:mode: see ram.asm",
+            "SnesPrgRom:2C8000:Oracle_A",
+        ])
+        self.assertEqual(
+            labels[("SnesWorkRam", 0x7E0010)],
+            MlbLabel("SnesWorkRam", 0x7E0010, "GameMode", "mode: see ram.asm"),
+        )
+        self.assertEqual(labels[("SnesPrgRom", 0x2C8000)].comment, "")
+
+
+class PushLabelDeltaTest(unittest.TestCase):
+    def test_small_delta_uses_label_commands(self) -> None:
+        old = {("SnesPrgRom", 0x2C8000): MlbLabel("SnesPrgRom", 0x2C8000, "Old")}
+        new = {("SnesWorkRam", 0x7E0010): MlbLabel("SnesWorkRam", 0x7E0010, "GameMode", "mode")}
+        bridge = RecordingBridge()
+        stats = push_label_delta(bridge, diff_mlb_labels(old, new))
+
+        self.assertEqual(stats, {"set": 1, "removed": 1, "bulk": 0, "failed": 0})
+        self.assertEqual([command for command, _ in bridge.calls], ["LABELS", "LABELS"])
+        cleared, added = (params for _, params in bridge.calls)
+        self.assertEqual((cleared["label"], cleared["memtype"]), ("", "PRG"))
+        self.assertEqual((added["addr"], added["label"], added["memtype"]), ("0x7E0010", "GameMode", "WRAM"))
+
+    def test_large_rom_delta_is_bulk_loaded(self) -> None:
+        new = {
+            ("SnesPrgRom", 0x2C8000 + i): MlbLabel("SnesPrgRom", 0x2C8000 + i, f"L{i}")
+            for i in range(5)
+        }
+        bridge = RecordingBridge()
+        stats = push_label_delta(bridge, diff_mlb_labels({}, new), bulk_threshold=2)
+
+        self.assertEqual(stats["bulk"], 5)
+        self.assertEqual([command for command, _ in bridge.calls], ["SYMBOLS_LOAD"])
+        self.assertEqual(bridge.calls[0][1]["clear"], "false")
+        self.assertEqual(bridge.loaded["L3"], {"addr": "2C8003", "size": 1, "type": "code"})
+
+
+if __name__ == "__main__":
+    unittest.main()
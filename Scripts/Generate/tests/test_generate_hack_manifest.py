@@ -37,7 +37,16 @@ from generate_hack_manifest import (  # noqa: E402
     derive_editor_managed_regions,
     generate_manifest,
 )
-from generate_hooks_json import HookEntry, scan_hooks  # noqa: E402
+from generate_annotations import collect_annotations  # noqa: E402
+from generate_hooks_json import (  # noqa: E402
+    DefineEnv,
+    HOOK_FILE_SCANNERS,
+    HookEntry,
+    ScanCache,
+    SourceGraph,
+    _iter_active_lines,
+    scan_hooks,
+)
 
 
 class ManifestFixture:
@@ -974,6 +983,256 @@ class ReachableSourceTest(unittest.TestCase):
         self.assertEqual(len(manifest["room_tags"]["tags"]), 1)
 
 
+class SourceGraphTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.fixture = ManifestFixture()
+
+    def tearDown(self) -> None:
+        self.fixture.close()
+
+    def test_each_source_is_read_once_across_scanners(self) -> None:
+        self.fixture.write_text(
+            "Oracle_main.asm", 'incsrc "Core/active.asm"\n'
+        )
+        self.fixture.write_text(
+            "Core/active.asm",
+            "org $008100\n"
+            "JSL ActiveHook\n"
+            "org $01CC18 : JML ActiveTag ; @hook name=ActiveTag\n"
+            "org $2F8000\n"
+            "db $00\n",
+        )
+        expected = generate_manifest(self.fixture.root)
+
+        reads: list[Path] = []
+        original_text = Path.read_text
+        original_bytes = Path.read_bytes
+
+        def counting(original):
+            def read(path: Path, *args, **kwargs):
+                if path.suffix == ".asm":
+                    reads.append(path.resolve())
+                return original(path, *args, **kwargs)
+            return read
+
+        Path.read_text = counting(original_text)  # type: ignore[method-assign]
+        Path.read_bytes = counting(original_bytes)  # type: ignore[method-assign]
+        try:
+            manifest = generate_manifest(self.fixture.root)
+        finally:
+            Path.read_text = original_text  # type: ignore[method-assign]
+            Path.read_bytes = original_bytes  # type: ignore[method-assign]
+
+        self.assertEqual(manifest, expected)
+        self.assertEqual(len(reads), len(set(reads)))
+
+    def test_active_lines_share_unchanged_define_states(self) -> None:
+        path = self.fixture.write_text(
+            "Core/defines.asm",
+            "!A = 1\n"
+            "nop\n"
+            "nop\n"
+            "!A = 2\n"
+            "nop\n",
+        )
+        graph = SourceGraph(self.fixture.root, {})
+        records = graph.active_lines(path)
+
+        self.assertIs(records[1][2], records[2][2])
+        self.assertEqual(records[2][2], {"A": 1})
+        self.assertEqual(records[4][2], {"A": 2})
+        self.assertIs(graph.active_lines(path), records)
+
+
+class ScanCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.fixture = ManifestFixture()
+        self.fixture.write_text(
+            "Oracle_main.asm",
+            'incsrc "Core/a.asm"\nincsrc "Core/b.asm"\n',
+        )
+        self.fixture.write_text(
+            "Core/a.asm",
+            "org $008100\n"
+            "JSL HookA\n"
+            "org $01CC18 : JML ActiveTag ; @hook name=ActiveTag\n",
+        )
+        self.fixture.write_text(
+            "Core/b.asm",
+            "org $2F8000\n"
+            "db $00\n",
+        )
+        self.cache_path = self.fixture.root / ".cache" / "scan.json"
+
+    def tearDown(self) -> None:
+        self.fixture.close()
+
+    def _generate(self) -> tuple[dict, ScanCache]:
+        cache = ScanCache(self.cache_path)
+        manifest = generate_manifest(self.fixture.root, cache=cache)
+        cache.save()
+        return manifest, cache
+
+    def test_unchanged_sources_are_not_rescanned(self) -> None:
+        expected = generate_manifest(self.fixture.root)
+        first, cold = self._generate()
+        second, warm = self._generate()
+
+        self.assertEqual(first, expected)
+        self.assertEqual(second, expected)
+        self.assertEqual(cold.hits, 0)
+        self.assertEqual(warm.misses, 0)
+        self.assertEqual(warm.hits, cold.misses)
+
+    def test_edited_source_is_rescanned_alone(self) -> None:
+        self._generate()
+        self.fixture.write_text(
+            "Core/b.asm",
+            "org $008200\n"
+            "JSL HookB\n",
+        )
+        manifest, cache = self._generate()
+
+        self.assertEqual(manifest, generate_manifest(self.fixture.root))
+        self.assertEqual(manifest["summary"]["total_hooks"], 3)
+        self.assertGreater(cache.hits, 0)
+        self.assertGreater(cache.misses, 0)
+
+        # Only Core/b.asm entries were refreshed.
+        stale = ScanCache(self.cache_path)
+        a_sha1 = hashlib.sha1(
+            (self.fixture.root / "Core/a.asm").read_bytes()
+        ).hexdigest()
+        self.assertEqual(stale._files["Core/a.asm"]["sha1"], a_sha1)
+
+    def test_define_change_invalidates_entries(self) -> None:
+        self._generate()
+        self.fixture.write_text(
+            "Config/feature_flags.asm", "!ENABLE_TEST = 1\n"
+        )
+        manifest, cache = self._generate()
+
+        self.assertEqual(manifest, generate_manifest(self.fixture.root))
+        self.assertEqual(cache.hits, 0)
+
+    def test_concurrent_saves_merge_entries(self) -> None:
+        hooks = ScanCache(self.cache_path)
+        manifest = ScanCache(self.cache_path)
+        hooks.put("Core/a.asm", "sha", "defs", "hooks", [1])
+        manifest.put("Core/a.asm", "sha", "defs", "manifest", [2])
+        manifest.put("Core/b.asm", "sha", "defs", "manifest", [3])
+        hooks.save()
+        manifest.save()
+
+        merged = ScanCache(self.cache_path)
+        self.assertEqual(merged.get("Core/a.asm", "sha", "defs", "hooks"), [1])
+        self.assertEqual(merged.get("Core/a.asm", "sha", "defs", "manifest"), [2])
+        self.assertEqual(merged.get("Core/b.asm", "sha", "defs", "manifest"), [3])
+        self.assertEqual(
+            sorted(p.name for p in self.cache_path.parent.iterdir()),
+            ["scan.json", "scan.json.lock"],
+        )
+
+    def test_fingerprint_mismatch_discards_cache(self) -> None:
+        self._generate()
+        cache = ScanCache(self.cache_path, fingerprint="other")
+        generate_manifest(self.fixture.root, cache=cache)
+        self.assertEqual(cache.hits, 0)
+
+
+class ParallelScanTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.fixture = ManifestFixture()
+        includes = []
+        for index in range(12):
+            rel = f"Core/part{index:02d}.asm"
+            includes.append(f'incsrc "{rel}"\n')
+            self.fixture.write_text(
+                rel,
+                f"org ${0x008100 + index * 0x10:06X}\n"
+                f"JSL Hook{index:02d} ; @watch fmt=hex\n"
+                f"org ${0x2F8000 + index * 0x100:06X}\n"
+                "db $00\n",
+            )
+        self.fixture.write_text("Oracle_main.asm", "".join(includes))
+
+    def tearDown(self) -> None:
+        self.fixture.close()
+
+    def test_manifest_matches_serial_scan(self) -> None:
+        serial = json.dumps(generate_manifest(self.fixture.root), indent=2)
+        parallel = json.dumps(
+            generate_manifest(self.fixture.root, jobs=3), indent=2
+        )
+        self.assertEqual(parallel, serial)
+
+    def test_hooks_match_serial_scan(self) -> None:
+        self.assertEqual(
+            scan_hooks(self.fixture.root, jobs=3),
+            scan_hooks(self.fixture.root),
+        )
+
+    def test_annotations_match_serial_scan(self) -> None:
+        serial = collect_annotations(self.fixture.root)
+        self.assertEqual(len(serial), 12)
+        self.assertEqual(collect_annotations(self.fixture.root, jobs=3), serial)
+
+    def test_prefetch_fills_results_and_cache(self) -> None:
+        cache = ScanCache(self.fixture.root / ".cache" / "scan.json")
+        graph = SourceGraph(self.fixture.root, cache=cache)
+        sources = collect_reachable_asm_sources(self.fixture.root, graph=graph)
+        graph.prefetch(sources, HOOK_FILE_SCANNERS, jobs=2)
+        cache.save()
+
+        warm = ScanCache(cache.path)
+        scan_hooks(
+            self.fixture.root, sources, SourceGraph(self.fixture.root, cache=warm)
+        )
+        self.assertEqual(warm.misses, 0)
+
+    def test_repository_scan_uses_every_core(self) -> None:
+        serial = json.dumps(generate_manifest(REPO_ROOT), indent=2)
+        parallel = json.dumps(generate_manifest(REPO_ROOT, jobs=0), indent=2)
+        self.assertEqual(parallel, serial)
+
+
+class DefineEnvTest(unittest.TestCase):
+    def test_set_and_discard_are_persistent(self) -> None:
+        base = DefineEnv({"A": 1})
+        changed = base.set("B", 2)
+        removed = changed.discard("A")
+
+        self.assertEqual(dict(base), {"A": 1})
+        self.assertEqual(dict(changed), {"A": 1, "B": 2})
+        self.assertEqual(dict(removed), {"B": 2})
+        self.assertNotIn("A", removed)
+        self.assertIs(base.set("A", 1), base)
+        self.assertIs(base.discard("missing"), base)
+
+    def test_long_chains_stay_correct(self) -> None:
+        env = DefineEnv()
+        for value in range(200):
+            env = env.set(f"N{value % 7}", value)
+        self.assertEqual(env["N0"], 196)
+        self.assertEqual(len(env), 7)
+
+    def test_lines_reference_state_until_a_define_changes(self) -> None:
+        lines = [
+            "!A = 1",
+            "nop",
+            "if !A == 1",
+            "nop",
+            "endif",
+            "!B = !A+1",
+            "nop",
+        ]
+        records = list(_iter_active_lines(lines, {}))
+
+        self.assertIs(records[0][2], records[1][2])
+        self.assertIs(records[1][2], records[2][2])
+        self.assertEqual(records[-1][2], {"A": 1, "B": 2})
+
+
 class RepositorySourceRegressionTest(unittest.TestCase):
     def test_real_fastrom_orgs_use_physical_manifest_ranges(self) -> None:
         manifest = generate_manifest(REPO_ROOT)
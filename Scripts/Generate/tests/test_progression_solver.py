@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+
+
+GENERATE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(GENERATE_DIR))
+
+from connectivity_index import ConnectivityIndex  # noqa: E402
+from progression_solver import (  # noqa: E402
+    ProgressionModel,
+    ProgressionSolver,
+    profile_atoms,
+)
+
+
+EVENTS = [
+    {"id": "EV-001", "flags": [{"name": "IntroState", "operation": "increment"}], "dependencies": []},
+    {"id": "EV-002", "flags": [{"name": "GameState", "value": "2"}], "dependencies": ["EV-001"],
+     "locations": [{"name": "Hall", "room_id": "0x03"}]},
+    {"id": "EV-003", "flags": [{"name": "GameState", "value": "3"}], "dependencies": ["EV-002"]},
+]
+REGISTRY = {
+    "dungeons": {
+        "D1_grotto": {"dungeon_id": 1, "entrance_room": "0x01", "dungeon_item": "Hammer, TBD"},
+        "D2_palace": {"dungeon_id": 2, "entrance_room": "0x02", "difficulty": {"required_items": ["Hammer"]}},
+        "D3_temple": {"dungeon_id": 3, "entrance_room": "0x03"},
+    },
+    "progression": {
+        "order": ["D1_grotto", "D2_palace", "D3_temple"],
+        "item_gates": {"D3_temple": ["Zora Mask"]},
+    },
+}
+
+
+class CompileTest(unittest.TestCase):
+    def test_gates_rewards_and_value_flags(self) -> None:
+        model = ProgressionModel.compile(EVENTS, REGISTRY)
+        result = ProgressionSolver(model).solve()
+        self.assertFalse(result.reached_goal)
+        self.assertEqual(result.blocked, {"dungeon:D3_temple": ["item:zoramask"]})
+        self.assertEqual(model.atoms_of(result.goal & ~result.obtained), ["dungeon:D3_temple"])
+
+        result = ProgressionSolver(model).solve(model.mask(["item:zoramask"]))
+        self.assertTrue(result.reached_goal)
+        plan = result.plan()
+        self.assertLess(plan.index("dungeon:D1_grotto"), plan.index("dungeon:D2_palace"))
+        final = result.goal_states[0]
+        self.assertIn("flag:GameState=3", model.atoms_of(final))
+        self.assertNotIn("flag:GameState=2", model.atoms_of(final))
+        self.assertEqual(result.softlocks, [])
+
+    def test_gate_items_without_source_are_reported(self) -> None:
+        model = ProgressionModel.compile(EVENTS, REGISTRY)
+        result = ProgressionSolver(model).solve()
+        self.assertEqual(result.unknown_sources, {"item:zoramask": ["dungeon:D3_temple"]})
+
+        result = ProgressionSolver(model).solve(assume_unknown=True)
+        self.assertTrue(result.reached_goal)
+        self.assertEqual((result.assumed, result.unknown_sources), (["item:zoramask"], {}))
+
+        # A dungeon that rewards the item it requires is no source for it.
+        model = ProgressionModel()
+        model.add_action("mines", requires=["hammer"], grants=["mines", "hammer"])
+        self.assertEqual(ProgressionSolver(model).solve().unknown_sources, {"hammer": ["mines"]})
+
+    def test_unreachable_locations_drop_actions(self) -> None:
+        # Only area 0x01 -> entrance 0x01 -> room 0x01 is connected.
+        index = ConnectivityIndex.from_edges(
+            [(7, 5, "overworld_entrance"), (5, 1, "entrance")], counts=(4, 2, 2)
+        )
+        model = ProgressionModel.compile(EVENTS, REGISTRY, index)
+        result = ProgressionSolver(model, index).solve(model.mask(["item:zoramask"]))
+        self.assertEqual(
+            result.unreachable_actions,
+            ["event:EV-002", "dungeon:D2_palace", "dungeon:D3_temple"],
+        )
+        self.assertEqual(result.blocked, {"event:EV-003": ["event:EV-002"]})
+
+
+class SolverTest(unittest.TestCase):
+    def test_softlock_states_are_found(self) -> None:
+        model = ProgressionModel()
+        model.add_action("buy_key", requires=["rupees"], grants=["key"], clears=["rupees"])
+        model.add_action("buy_bomb", requires=["rupees"], grants=["bomb"], clears=["rupees"])
+        model.add_action("open_door", requires=["key"], grants=["door"])
+        result = ProgressionSolver(model).solve(model.mask(["rupees"]), model.mask(["door"]))
+        self.assertTrue(result.reached_goal)
+        self.assertEqual(result.plan(), ["buy_key", "open_door"])
+        self.assertEqual(
+            [model.atoms_of(state) for state in result.softlocks], [["bomb"]]
+        )
+
+    def test_softlocks_found_when_goal_unreachable(self) -> None:
+        model = ProgressionModel()
+        model.add_action("buy_key", requires=["rupees"], grants=["key"], clears=["rupees"])
+        model.add_action("buy_bomb", requires=["rupees"], grants=["bomb"], clears=["rupees"])
+        model.add_action("open_door", requires=["key"], grants=["door"])
+        model.add_action("crown", requires=["sceptre"], grants=["crown"])
+        result = ProgressionSolver(model).solve(model.mask(["rupees"]), model.mask(["door", "crown"]))
+        self.assertFalse(result.reached_goal)
+        self.assertEqual(
+            [model.atoms_of(state) for state in result.softlocks], [["bomb"]]
+        )
+
+    def test_profile_atoms(self) -> None:
+        profile = {
+            "items": {"zoramask": 1, "hammer": 0},
+            "flags": {"d1": True, "d3": False, "gamestate": "0x02", "hall": True},
+        }
+        self.assertEqual(
+            profile_atoms(profile, REGISTRY),
+            ["item:zoramask", "dungeon:D1_grotto", "flag:GameState=2", "flag:hall"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
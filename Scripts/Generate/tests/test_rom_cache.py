@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+GENERATE_DIR = Path(__file__).resolve().parents[1]
+REPO_ROOT = GENERATE_DIR.parents[1]
+sys.path.insert(0, str(REPO_ROOT / "Scripts" / "Build"))
+
+from rom_cache import RomCache, UncacheableBuild, reachable_sources  # noqa: E402
+
+
+class RomCacheFixture(unittest.TestCase):
+    def setUp(self) -> None:
+        self._temp = tempfile.TemporaryDirectory()
+        self.root = Path(self._temp.name) / "repo"
+        self.cache = RomCache(Path(self._temp.name) / "cache", budget_mb=1)
+        self.write("Oracle_main.asm", 'incsrc "Config/feature_flags.asm"\nincsrc Menu/menu.asm\n')
+        self.write("Config/feature_flags.asm", "!ENABLE_WATER_GATE_HOOKS = 1\n")
+        self.write("Menu/menu.asm", (
+            "; incsrc missing.asm\n"
+            'menu_frame: incbin "tilemaps/frame.tilemap"\n'
+            "incsrc Menu/shared.asm ; root-relative\n"
+        ))
+        self.write("Menu/tilemaps/frame.tilemap", "\x00\x01")
+        self.write("Menu/shared.asm", "incbin Data/font.bin:0-20\n")
+        self.write("Data/font.bin", "font")
+        self.base_rom = self.write("base.sfc", "base")
+
+    def tearDown(self) -> None:
+        self._temp.cleanup()
+
+    def write(self, relative: str, text: str) -> Path:
+        path = self.root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+        return path
+
+    def key(self, **kwargs) -> str:
+        return self.cache.key(self.root, self.base_rom, "asar", **kwargs)
+
+
+class KeyTest(RomCacheFixture):
+    def test_reachable_sources_follow_both_resolution_rules(self) -> None:
+        self.assertEqual(
+            [path.relative_to(self.root.resolve()).as_posix() for path in reachable_sources(self.root)],
+            [
+                "Config/feature_flags.asm",
+                "Data/font.bin",
+                "Menu/menu.asm",
+                "Menu/shared.asm",
+                "Menu/tilemaps/frame.tilemap",
+                "Oracle_main.asm",
+            ],
+        )
+        self.write("Menu/shared.asm", "incsrc Menu/missing.asm\n")
+        with self.assertRaises(UncacheableBuild):
+            reachable_sources(self.root)
+
+    def test_key_tracks_sources_flags_base_rom_and_symbols(self) -> None:
+        key = self.key()
+        self.assertEqual(self.key(), key)
+        self.assertNotEqual(self.key(symbols=False), key)
+
+        self.write("Unreachable.asm", "db $00\n")
+        self.assertEqual(self.key(), key)
+
+        self.write("Config/feature_flags.asm", "!ENABLE_WATER_GATE_HOOKS = 0\n")
+        flags_off = self.key()
+        self.assertNotEqual(flags_off, key)
+        self.write("Data/font.bin", "FONT")
+        self.assertNotEqual(self.key(), flags_off)
+        self.write("base.sfc", "edited base")
+        self.assertEqual(len({key, flags_off, self.key()}), 3)
+
+    def test_key_tracks_generator_scripts(self) -> None:
+        self.write("Scripts/Generate/generate_hooks_json.py", "VERSION = 1\n")
+        key = self.key()
+        self.write("Scripts/Generate/notes.txt", "not a generator")
+        self.assertEqual(self.key(), key)
+        self.write("Scripts/Generate/generate_hooks_json.py", "VERSION = 2\n")
+        self.assertNotEqual(self.key(), key)
+
+
+class StoreTest(RomCacheFixture):
+    def test_fetch_store_round_trip(self) -> None:
+        key = self.key()
+        rom = self.write("Roms/oos168x.sfc", "patched")
+        sym = self.write("Roms/oos168x.sym", "symbols")
+        self.assertIsNone(self.cache.fetch(key, {"rom": rom}))
+
+        self.cache.store(key, {"rom": rom, "symbols": sym})
+        rom.write_text("stale", encoding="utf-8")
+        hooks = self.root / "Roms/hooks.json"
+        restored = self.cache.fetch(key, {"rom": rom, "symbols": sym}, {"hooks": hooks})
+        self.assertEqual(restored, ["rom", "symbols"])
+        self.assertEqual(rom.read_text(encoding="utf-8"), "patched")
+        self.assertFalse(hooks.exists())
+
+        self.write("Roms/hooks.json", "{}")
+        self.cache.store(key, {"hooks": hooks})
+        self.assertEqual(self.cache.meta(key)["artifacts"], ["hooks", "rom", "symbols"])
+        self.assertIsNone(self.cache.fetch(key, {"rom": rom, "sourcemap": sym}))
+
+    def test_prune_evicts_least_recently_used(self) -> None:
+        payload = self.write("Roms/big.sfc", "x" * 300 * 1024)
+        for index, key in enumerate(["a", "b", "c"]):
+            self.cache.store(key, {"rom": payload})
+            os.utime(self.cache.entry(key), (1000 + index, 1000 + index))
+        self.cache.fetch("a", {"rom": self.root / "Roms/out.sfc"})
+
+        self.cache.store("d", {"rom": payload})
+        remaining = sorted(path.name for _, _, path in self.cache.entries())
+        self.assertEqual(remaining, ["a", "c", "d"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import hashlib
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+GENERATE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(GENERATE_DIR))
+
+from rom_image import (  # noqa: E402
+    RomImage,
+    RomImageError,
+    lorom_to_pc,
+    pc_to_lorom,
+)
+
+
+class RomImageTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._temp = tempfile.TemporaryDirectory()
+        self.path = Path(self._temp.name) / "test.sfc"
+        data = bytearray(0x10000)
+        data[0x8000:0x8003] = b"\x34\x12\xA0"
+        self.data = bytes(data)
+        self.path.write_bytes(self.data)
+
+    def tearDown(self) -> None:
+        self._temp.cleanup()
+
+    def test_typed_reads_and_hashes(self) -> None:
+        with RomImage.open(self.path) as rom:
+            self.assertEqual(rom.size, len(self.data))
+            self.assertEqual(rom.u8(0x8002), 0xA0)
+            self.assertEqual(rom.u16(0x8000), 0x1234)
+            self.assertEqual(rom.u24(0x8000), 0xA01234)
+            self.assertEqual(rom.snes_u16(0x018000), 0x1234)
+            self.assertEqual(rom.sha1, hashlib.sha1(self.data).hexdigest())
+            self.assertEqual(
+                rom.sha256, hashlib.sha256(self.data).hexdigest()
+            )
+
+    def test_reads_are_bounds_checked(self) -> None:
+        with RomImage.open(self.path) as rom:
+            with self.assertRaises(RomImageError):
+                rom.u16(len(self.data) - 1)
+            with self.assertRaises(RomImageError):
+                rom.view(-1, length=2)
+
+    def test_views_are_zero_copy(self) -> None:
+        with RomImage.open(self.path) as rom:
+            view = rom.view(0x8000, length=3)
+            self.assertIsInstance(view, memoryview)
+            self.assertEqual(view, b"\x34\x12\xA0")
+            self.assertIs(view.obj, rom.data.obj)
+            del view
+
+    def test_empty_and_in_memory_images(self) -> None:
+        empty = self.path.with_name("empty.sfc")
+        empty.write_bytes(b"")
+        with RomImage.open(empty) as rom:
+            self.assertEqual(rom.size, 0)
+        rom = RomImage.from_bytes(self.data)
+        self.assertEqual(rom.u24(0x8000), 0xA01234)
+
+    def test_lorom_helpers_round_trip(self) -> None:
+        self.assertEqual(lorom_to_pc(0x258090), 0x128090)
+        self.assertEqual(lorom_to_pc(0xA58090), 0x128090)
+        self.assertEqual(pc_to_lorom(0x128090), 0x258090)
+
+
+if __name__ == "__main__":
+    unittest.main()
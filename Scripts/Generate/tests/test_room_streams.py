@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+GENERATE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(GENERATE_DIR))
+
+from rom_image import RomImage, pc_to_lorom  # noqa: E402
+from room_streams import (  # noqa: E402
+    COLLISION_DATA_END_PC,
+    COLLISION_DATA_START_PC,
+    COLLISION_POINTER_TABLE_PC,
+    ROOM_COUNT,
+    ROOM_OBJECT_POINTER_PC,
+    ROOM_SPRITE_POINTER_PC,
+    RoomStreamError,
+    RoomStreams,
+    scan_collision_stream,
+    scan_object_stream,
+    scan_pot_stream,
+    scan_sprite_stream,
+)
+
+
+OBJECT_TABLE_PC = 0xF8000
+SPRITE_TABLE_PC = 0x4D000
+
+OBJECTS = (
+    b"\x12\x34"
+    + b"\x10\x20\x30" + b"\xFF\xFF"  # list 0: one type-1 object
+    + b"\xFC\x45\x81" + b"\xFF\xFF"  # list 1: one type-2 object
+    + b"\xF0\xFF" + b"\x40\x06" + b"\xFF\xFF"  # list 2: one door
+)
+SPRITES = b"\x01" + b"\x85\x43\x21" + b"\xFF"
+COLLISION = (
+    b"\x41\x00\x02\x01\xF5\x00"  # 2x1 rectangle at offset 65, keeps the zero
+    + b"\xF0\xF0" + b"\x00\x01\x03"  # single tile 3 at offset 256
+    + b"\xFF\xFF"
+)
+
+
+def build_rom() -> bytes:
+    rom = bytearray(0x200000)
+    rom[ROOM_OBJECT_POINTER_PC:ROOM_OBJECT_POINTER_PC + 3] = (
+        pc_to_lorom(OBJECT_TABLE_PC).to_bytes(3, "little")
+    )
+    rom[ROOM_SPRITE_POINTER_PC:ROOM_SPRITE_POINTER_PC + 2] = (
+        (pc_to_lorom(SPRITE_TABLE_PC) & 0xFFFF).to_bytes(2, "little")
+    )
+    objects_pc = OBJECT_TABLE_PC + ROOM_COUNT * 3
+    sprites_pc = SPRITE_TABLE_PC + ROOM_COUNT * 2
+    rom[objects_pc:objects_pc + len(OBJECTS)] = OBJECTS
+    rom[sprites_pc:sprites_pc + len(SPRITES)] = SPRITES
+    rom[COLLISION_DATA_START_PC:COLLISION_DATA_START_PC + len(COLLISION)] = COLLISION
+    for room_id in range(ROOM_COUNT):
+        entry = OBJECT_TABLE_PC + room_id * 3
+        rom[entry:entry + 3] = pc_to_lorom(objects_pc).to_bytes(3, "little")
+        entry = SPRITE_TABLE_PC + room_id * 2
+        rom[entry:entry + 2] = (pc_to_lorom(sprites_pc) & 0xFFFF).to_bytes(2, "little")
+    # Only room 1 owns custom collision.
+    entry = COLLISION_POINTER_TABLE_PC + 3
+    rom[entry:entry + 3] = pc_to_lorom(COLLISION_DATA_START_PC).to_bytes(3, "little")
+    return bytes(rom)
+
+
+class ScanTest(unittest.TestCase):
+    def test_object_stream(self) -> None:
+        stream = scan_object_stream(OBJECTS, 0)
+        self.assertEqual(stream.end, len(OBJECTS))
+        self.assertEqual(stream.floor, b"\x12\x34")
+        self.assertEqual(
+            [(o.obj_id, o.x, o.y, o.layer) for o in stream.objects],
+            [(0x30, 4, 8, 0), (0x101, 4, 22, 1)],
+        )
+        self.assertEqual(stream.doors, (0x0640,))
+
+    def test_object_stream_errors(self) -> None:
+        for data, message in (
+            (b"\x00", "missing its two-byte header"),
+            (b"\x00\x00\x10\x20\x30", "list 0 has no 0xFFFF terminator"),
+            (b"\x00\x00\xFF\xFF\x10\x20", "list 1 has a truncated record"),
+            (b"\x00\x00\xFF\xFF\xFF\xFF", "list 2 has no door marker or terminator"),
+            (b"\x00\x00\xFF\xFF\xFF\xFF\xF0\xFF", "door list has no 0xFFFF terminator"),
+        ):
+            with self.assertRaisesRegex(RoomStreamError, message):
+                scan_object_stream(data, 0)
+
+    def test_sprite_and_pot_streams(self) -> None:
+        stream = scan_sprite_stream(SPRITES, 0)
+        self.assertEqual(stream.end, len(SPRITES))
+        self.assertEqual(stream.sort_mode, 1)
+        sprite = stream.sprites[0]
+        self.assertEqual(
+            (sprite.spr_id, sprite.x, sprite.y, sprite.subtype, sprite.layer),
+            (0x21, 3, 5, 2, 1),
+        )
+        self.assertEqual(scan_pot_stream(b"\x01\x02\x03\xFF\xFF", 0), 5)
+        with self.assertRaisesRegex(RoomStreamError, "has no 0xFF terminator"):
+            scan_sprite_stream(SPRITES, 0, len(SPRITES) - 1)
+        with self.assertRaisesRegex(RoomStreamError, "has no 0xFFFF terminator"):
+            scan_pot_stream(b"\x01\x02\x03\xFF", 0)
+
+    def test_collision_stream_keeps_explicit_zero_tiles(self) -> None:
+        stream = scan_collision_stream(COLLISION, 0, len(COLLISION))
+        self.assertEqual(stream.tiles, {65: 0xF5, 66: 0x00, 256: 0x03})
+        self.assertEqual(stream.end, len(COLLISION))
+
+    def test_collision_stream_errors(self) -> None:
+        for data, message in (
+            (b"\x00\x00\x00\x01\xFF\xFF", "zero-dimension collision rectangle 0x1"),
+            (b"\x3F\x00\x02\x01\x00\x00\xFF\xFF", "rectangle at offset 63 with size 2x1"),
+            (b"\xF0\xF0\x00\x10\x01\xFF\xFF", "out-of-range single-tile offset 4096"),
+            (b"\x00\x00\x01\x01\x00", "unterminated"),
+        ):
+            with self.assertRaisesRegex(RoomStreamError, message):
+                scan_collision_stream(data, 0, len(data))
+
+    def test_lenient_collision_keeps_water_fill_readings(self) -> None:
+        data = (
+            b"\x00\x00\x00\x01"  # zero-size rectangle: no tiles
+            + b"\xF5\xF0\x07"  # 0xF0F5 in rectangle mode: single tile
+            + b"\x00\x10\x09"  # offset 4096 is not range-checked
+            + b"\xFF\xFF"
+        )
+        stream = scan_collision_stream(data, 0, len(data), strict=False)
+        self.assertEqual(stream.tiles, {0xF0F5: 0x07, 0x1000: 0x09})
+
+        # Streams may run past the reserved water-fill boundary.
+        rom = bytearray(COLLISION_DATA_END_PC + 8)
+        start = COLLISION_DATA_END_PC - 4
+        rom[start:start + 8] = b"\x41\x00\x02\x01\xF5\x00\xFF\xFF"
+        with self.assertRaisesRegex(RoomStreamError, "crosses the collision data boundary"):
+            scan_collision_stream(rom, start)
+        self.assertEqual(scan_collision_stream(rom, start, strict=False).tiles, {65: 0xF5, 66: 0})
+        with self.assertRaisesRegex(RoomStreamError, "unterminated"):
+            scan_collision_stream(b"\x00\x00\x01\x01\x00", 0, strict=False)
+
+    def test_lenient_object_and_sprite_streams(self) -> None:
+        # Door marker in list 0; 0xFFFF after the doors moves on to list 1.
+        data = b"\x00\x00" + b"\xF0\xFF\x40\x06\xFF\xFF" + b"\x10\x20\x30\xFF\xFF"
+        stream = scan_object_stream(data + b"\x10\x20", 0, strict=False)
+        self.assertEqual([(o.obj_id, o.layer) for o in stream.objects], [(0x30, 1)])
+        self.assertEqual(stream.doors, (0x0640,))
+        with self.assertRaises(RoomStreamError):
+            scan_object_stream(data + b"\x10\x20", 0)
+
+        stream = scan_sprite_stream(SPRITES[:-1] + b"\x01", 0, strict=False)
+        self.assertEqual((len(stream.sprites), stream.end), (1, 4))
+
+
+class RoomStreamsTest(unittest.TestCase):
+    def test_decodes_every_room_from_pointer_tables(self) -> None:
+        streams = RoomStreams(build_rom()).decode_all()
+        for room_id in (0, ROOM_COUNT - 1):
+            self.assertEqual(len(streams.objects(room_id).objects), 2)
+            self.assertEqual(streams.sprites(room_id).sprites[0].spr_id, 0x21)
+        self.assertIs(streams.objects(5), streams.objects(5))
+        self.assertIsNone(streams.collision(0))
+        self.assertEqual(streams.collision(1).tiles[256], 0x03)
+
+    def test_collision_pointer_outside_region_is_rejected(self) -> None:
+        rom = bytearray(build_rom())
+        entry = COLLISION_POINTER_TABLE_PC + 2 * 3
+        rom[entry:entry + 3] = pc_to_lorom(0x100000).to_bytes(3, "little")
+        with self.assertRaisesRegex(RoomStreamError, "maps outside collision data"):
+            RoomStreams(bytes(rom)).collision(2)
+
+    def test_for_rom_shares_decode_by_content(self) -> None:
+        data = build_rom()
+        first = RoomStreams.for_rom(RomImage.from_bytes(data))
+        second = RoomStreams.for_rom(RomImage.from_bytes(bytes(data)))
+        self.assertIs(first, second)
+        changed = RoomStreams.for_rom(RomImage.from_bytes(data[:-1] + b"\x01"))
+        self.assertIsNot(first, changed)
+
+    def test_for_rom_reads_the_mapping_after_close(self) -> None:
+        with tempfile.TemporaryDirectory() as temp:
+            path = Path(temp) / "oos.sfc"
+            path.write_bytes(build_rom()[:-1] + b"\x02")
+            with RomImage.open(path) as rom:
+                streams = RoomStreams.for_rom(rom)
+            self.assertIsInstance(streams.data, memoryview)
+            self.assertEqual(len(streams.objects(7).objects), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
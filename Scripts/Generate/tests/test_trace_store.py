@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(SCRIPTS_DIR))
+sys.path.insert(0, str(SCRIPTS_DIR / "Debug"))
+
+import trace_store  # noqa: E402
+from symbols import SymbolResolver  # noqa: E402
+from trace_report import build_report  # noqa: E402
+from trace_store import MISSING, ingest_jsonl  # noqa: E402
+
+
+def entry(frame: int, addr: int = 0x7E0010, value: int = 0x07, pb: int = 0x02, pc: int = 0x8000) -> dict:
+    return {"frame": frame, "addr": addr, "value": value, "pb": pb, "pc": pc}
+
+
+def lines(entries: list[dict]) -> bytes:
+    return b"".join(json.dumps(e).encode("utf-8") + b"\n" for e in entries)
+
+
+class TraceStoreTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._temp = tempfile.TemporaryDirectory()
+        self.root = Path(self._temp.name)
+        self.trace = self.root / "write_trace.jsonl"
+        self.store_dir = self.root / "store"
+        self._range_bytes = trace_store.RANGE_BYTES
+        trace_store.RANGE_BYTES = 256
+
+    def tearDown(self) -> None:
+        trace_store.RANGE_BYTES = self._range_bytes
+        self._temp.cleanup()
+
+    def ingest(self) -> trace_store.TraceStore:
+        return ingest_jsonl(self.trace, self.store_dir, jobs=1)
+
+    def append(self, data: bytes) -> None:
+        with self.trace.open("ab") as handle:
+            handle.write(data)
+
+    def test_grown_log_only_ingests_the_tail(self) -> None:
+        self.trace.write_bytes(lines([entry(f) for f in range(20)]))
+        store = self.ingest()
+        self.assertEqual(len(store), 20)
+        chunks = list(store.chunk_rows)
+        self.assertGreater(len(chunks), 1)
+
+        self.append(lines([entry(f) for f in range(20, 25)]))
+        grown = self.ingest()
+        self.assertEqual(grown.chunk_rows[: len(chunks)], chunks)
+        self.assertEqual(sum(grown.chunk_rows[len(chunks):]), 5)
+        self.assertEqual([row["frame"] for row in grown.rows(18, 25)], list(range(18, 25)))
+
+        self.assertEqual(self.ingest().chunk_rows, grown.chunk_rows)
+
+    def test_partial_last_line_waits_for_newline(self) -> None:
+        complete = lines([entry(0), entry(1)])
+        partial = json.dumps(entry(2)).encode("utf-8")
+        self.trace.write_bytes(complete + partial[:10])
+        store = self.ingest()
+        self.assertEqual(len(store), 2)
+        self.assertEqual(store.meta["source"]["offset"], len(complete))
+
+        self.append(partial[10:] + b"\n")
+        store = self.ingest()
+        self.assertEqual([row["frame"] for row in store.rows(0, len(store))], [0, 1, 2])
+
+    def test_bytes_appended_after_stat_wait_for_next_pass(self) -> None:
+        self.trace.write_bytes(lines([entry(f) for f in range(50)]))
+        partial = json.dumps(entry(50)).encode("utf-8")
+        line_ranges = trace_store._line_ranges
+
+        def writer_appends(trace, start, size):
+            # The live writer appends a partial row between the stat and the read.
+            self.append(partial[:10])
+            return line_ranges(trace, start, size)
+
+        with mock.patch.object(trace_store, "_line_ranges", writer_appends):
+            store = self.ingest()
+        self.assertEqual(len(store), 50)
+        self.assertEqual(store.meta["source"]["offset"], store.meta["source"]["size"])
+
+        self.append(partial[10:] + b"\n")
+        store = self.ingest()
+        self.assertEqual([row["frame"] for row in store.rows(48, len(store))], [48, 49, 50])
+
+    def test_missing_fields_use_sentinel(self) -> None:
+        self.trace.write_bytes(
+            b'{"frame": 5, "addr": "0x7E0010", "value": "$3E"}\n'
+            b"not json\n"
+            b'{"frame": 6, "value": null, "pb": 2, "pc": 32768}\n'
+        )
+        rows = self.ingest().rows(0, 2)
+        self.assertEqual(rows[0], {"frame": 5, "addr": 0x7E0010, "value": 0x3E, "pb": MISSING, "pc": MISSING})
+        self.assertEqual(rows[1], {"frame": 6, "addr": MISSING, "value": MISSING, "pb": 2, "pc": 0x8000})
+
+    def test_rewrite_behind_the_head_rebuilds(self) -> None:
+        padding = [entry(f) for f in range(1200)]
+        self.trace.write_bytes(lines(padding + [entry(9000, value=1)]))
+        self.assertGreater(self.trace.stat().st_size, trace_store.HEAD_BYTES)
+        self.ingest()
+
+        # Same head, same length, different rows past the first 64 KB.
+        stat = self.trace.stat()
+        self.trace.write_bytes(lines(padding + [entry(9000, value=2)]))
+        os.utime(self.trace, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        self.assertEqual(self.ingest().rows(1200, 1201)[0]["value"], 2)
+
+        # Same head, grown, but the already-ingested bytes changed.
+        self.trace.write_bytes(lines(padding + [entry(9000, value=3), entry(9001)]))
+        store = self.ingest()
+        self.assertEqual(len(store), 1202)
+        self.assertEqual(store.rows(1200, 1201)[0]["value"], 3)
+
+    def test_report_streams_over_store(self) -> None:
+        sym = self.root / "oos.sym"
+        sym.write_text("[labels]\n02:8000 Module07_Underworld\n")
+        self.trace.write_bytes(
+            lines([entry(1, value=7), entry(2, value=9, pc=0x8004), entry(3, addr=0x7E0011, value=62)])
+        )
+        report = build_report(self.ingest(), SymbolResolver(sym), limit=2)
+        self.assertIn("Total entries: 3", report)
+        self.assertIn("## Address 0x7E0010", report)
+        self.assertIn("- Total writes: 2", report)
+        self.assertIn(
+            "- Last write: frame 2 value 9 writer Module07_Underworld+0x4 (PB=2, PC=32772)", report
+        )
+        self.assertIn("  - Module07_Underworld: 1", report)
+        self.assertIn("- frame 3 addr 0x7E0011 value 62 writer Module07_Underworld", report)
+        self.assertNotIn("- frame 1 addr", report)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import json
+import sys
+import unittest
+from pathlib import Path
+
+
+GENERATE_DIR = Path(__file__).resolve().parents[1]
+REPO_ROOT = GENERATE_DIR.parents[1]
+sys.path.insert(0, str(GENERATE_DIR))
+
+from validate_dialogue_bundles import (  # noqa: E402
+    EXPANDED_CAPACITY,
+    DialogueIndex,
+    EncodingIssue,
+    encode_text,
+)
+from validate_expanded_message_source import (  # noqa: E402
+    BUNDLE_PATH,
+    MessageSourceContractError,
+    _encode_message_text,
+)
+
+
+def bundle(*messages: dict, counts: dict | None = None) -> bytes:
+    data = {"format": "yaze-message-bundle", "version": 1, "messages": list(messages)}
+    if counts is not None:
+        data["counts"] = counts
+    return json.dumps(data).encode("utf-8")
+
+
+class EncodeTextTest(unittest.TestCase):
+    def test_matches_contract_encoder_for_repository_bundle(self) -> None:
+        data = json.loads((REPO_ROOT / BUNDLE_PATH).read_text(encoding="ascii"))
+        for entry in data["messages"]:
+            self.assertEqual(
+                encode_text(entry["text"]),
+                _encode_message_text(entry["text"], entry["id"]),
+            )
+
+    def test_rejects_what_the_contract_encoder_rejects(self) -> None:
+        for text, position in (
+            ("Hi~", 2),
+            ("[D:61]", 0),
+            ("ab[K", 2),
+            ("a[NOPE]", 1),
+            ("line\nbreak", 4),
+        ):
+            with self.assertRaises(MessageSourceContractError):
+                _encode_message_text(text, 0)
+            with self.assertRaises(EncodingIssue) as caught:
+                encode_text(text)
+            self.assertEqual(caught.exception.position, position, text)
+
+    def test_argument_tokens(self) -> None:
+        self.assertEqual(encode_text("[W:2][SFX:1F]A"), b"\x6B\x02\x79\x1F\x00\x7F")
+
+
+class DialogueIndexTest(unittest.TestCase):
+    CANONICAL = BUNDLE_PATH.as_posix()
+
+    def index(self, **bundles: bytes) -> DialogueIndex:
+        index = DialogueIndex(Path("."))
+        for name, payload in bundles.items():
+            index.add_bundle(name, payload)
+        index.index_lengths()
+        return index
+
+    def codes(self, report) -> list[tuple[str, str, int | None]]:
+        return [(i.bundle, i.code, i.message) for i in report.issues]
+
+    def test_single_pass_report(self) -> None:
+        index = self.index(**{
+            self.CANONICAL: bundle(
+                {"id": 0, "bank": "expanded", "text": "Hello"},
+                {"id": 1, "bank": "expanded", "text": "World"},
+            ),
+            "npc_a.json": bundle(
+                {"id": 1, "bank": "expanded", "raw": "Changed"},
+                {"id": 3, "bank": "expanded", "raw": "Bad~"},
+                {"id": 0x18D + 5, "bank": "expanded", "raw": "Abs"},
+                counts={"vanilla": 0, "expanded": 1},
+            ),
+            "npc_b.json": bundle({"id": 1, "bank": "expanded", "raw": "Other"}),
+        })
+        report = index.validate()
+
+        self.assertEqual(
+            sorted(self.codes(report)),
+            sorted([
+                ("npc_a.json", "counts-mismatch", None),
+                ("npc_a.json", "non-contiguous", None),
+                ("npc_a.json", "encoding", 1),
+                ("npc_a.json", "absolute-id", 2),
+                ("npc_a.json", "conflicting-id", 0),
+                ("npc_a.json", "pending-sync", 0),
+                ("npc_b.json", "conflicting-id", 0),
+                ("npc_b.json", "pending-sync", 0),
+            ]),
+        )
+        budget = report.budgets["expanded"]
+        self.assertEqual(budget["used"], len(encode_text("Hello")) + len(encode_text("World")) + 1)
+        self.assertEqual(budget["capacity"], EXPANDED_CAPACITY)
+        json.dumps(report.to_dict())
+
+    def test_check_edit_uses_precomputed_lengths(self) -> None:
+        index = self.index(**{
+            self.CANONICAL: bundle(
+                {"id": 0, "bank": "expanded", "text": "Hello"},
+                {"id": 1, "bank": "expanded", "text": "World"},
+            ),
+        })
+        check = index.check_edit("expanded", 1, "Hi")
+        self.assertTrue(check.fits)
+        self.assertEqual(check.used, 6 + 3 + 1)
+
+        too_long = index.check_edit("expanded", 1, "A" * EXPANDED_CAPACITY)
+        self.assertFalse(too_long.fits)
+
+        bad = index.check_edit("expanded", 1, "[NOPE]")
+        self.assertFalse(bad.fits)
+        self.assertEqual(bad.position, 0)
+
+    def test_repository_bundles_have_no_errors(self) -> None:
+        report = DialogueIndex.load(REPO_ROOT).validate()
+        self.assertEqual(report.errors, [])
+        self.assertLessEqual(report.budgets["expanded"]["projected"], EXPANDED_CAPACITY)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+
+GENERATE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(GENERATE_DIR))
+sys.path.insert(0, str(GENERATE_DIR.parent / "Mesen2"))
+
+from generate_annotations import collect_annotations  # noqa: E402
+from generate_hack_manifest import generate_manifest  # noqa: E402
+from generate_hooks_json import hooks_document, scan_hooks  # noqa: E402
+from mesen2_client_lib.bridge import MesenBridge  # noqa: E402
+from watch_generated import (  # noqa: E402
+    GeneratedArtifacts,
+    InotifyWatcher,
+    PollingWatcher,
+    write_atomic,
+)
+
+
+class WatchFixture(unittest.TestCase):
+    def setUp(self) -> None:
+        self._temp = tempfile.TemporaryDirectory()
+        self.root = Path(self._temp.name).resolve()
+        self.write("Oracle_main.asm", 'incsrc "Core/a.asm"\nincsrc "Core/b.asm"\n')
+        self.write(
+            "Core/a.asm",
+            "org $008100\n"
+            "JSL HookA ; @watch fmt=hex\n",
+        )
+        self.write("Core/b.asm", "org $2F8000\ndb $00\n")
+        self.write(
+            "Sprites/registry.csv",
+            "name,id,paths,group,notes,allow_dupe\nSprite_Tester,$01,Sprites/tester.asm,Sprite_Tester,,\n",
+        )
+        self.logs: list[str] = []
+
+    def tearDown(self) -> None:
+        self._temp.cleanup()
+
+    def write(self, relative: str, text: str) -> Path:
+        path = self.root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+        return path
+
+    def artifacts(self, targets=("hooks", "manifest", "annotations", "sprites")):
+        return GeneratedArtifacts(self.root, targets=targets, log=self.logs.append)
+
+
+class WriteAtomicTest(WatchFixture):
+    def test_unchanged_content_is_not_rewritten(self) -> None:
+        path = self.root / "out" / "x.json"
+        self.assertTrue(write_atomic(path, "a\n"))
+        before = path.stat().st_mtime_ns
+        time.sleep(0.01)
+        self.assertFalse(write_atomic(path, "a\n"))
+        self.assertEqual(path.stat().st_mtime_ns, before)
+        self.assertTrue(write_atomic(path, "b\n"))
+        self.assertEqual(path.read_text(), "b\n")
+        self.assertEqual(sorted(p.name for p in path.parent.iterdir()), ["x.json"])
+
+
+class GeneratedArtifactsTest(WatchFixture):
+    def test_initial_build_matches_generators(self) -> None:
+        artifacts = self.artifacts()
+        written = artifacts.refresh()
+        artifacts.close()
+
+        self.assertEqual(written, {
+            "hooks": True, "manifest": True, "annotations": True, "sprites": True,
+        })
+        hooks = json.loads((self.root / "Roms/hooks.json").read_text())
+        self.assertEqual(hooks, hooks_document(self.root, scan_hooks(self.root)))
+        manifest = json.loads((self.root / "Roms/hack_manifest.json").read_text())
+        self.assertEqual(manifest, generate_manifest(self.root))
+        annotations = json.loads((self.root / ".cache/annotations.json").read_text())
+        self.assertEqual(annotations["annotations"], collect_annotations(self.root))
+        self.assertIn(
+            "Sprite_Tester = $01",
+            (self.root / "Sprites/sprite_registry_ids.asm").read_text(),
+        )
+
+    def test_edit_rebuilds_only_affected_targets(self) -> None:
+        artifacts = self.artifacts()
+        artifacts.refresh()
+
+        csv = self.root / "Sprites/registry.csv"
+        self.assertEqual(artifacts.refresh({csv}), {"sprites": False})
+
+        edited = self.write("Core/b.asm", "org $008200\nJSL HookB\n")
+        written = artifacts.refresh({edited})
+        artifacts.close()
+
+        self.assertEqual(set(written), {"hooks", "manifest", "annotations"})
+        self.assertTrue(written["hooks"])
+        self.assertFalse(written["annotations"])
+        manifest = json.loads((self.root / "Roms/hack_manifest.json").read_text())
+        self.assertEqual(manifest, generate_manifest(self.root))
+
+    def test_global_define_change_rebuilds_graph(self) -> None:
+        artifacts = self.artifacts(targets=("manifest",))
+        artifacts.refresh()
+        graph = artifacts.graph
+        flags = self.write("Config/feature_flags.asm", "!ENABLE_TEST = 1\n")
+        artifacts.refresh({flags})
+        artifacts.close()
+        self.assertIsNot(artifacts.graph, graph)
+
+
+class LiveLabelsTest(WatchFixture):
+    class Bridge:
+        set_label = MesenBridge.set_label
+        symbols_load = MesenBridge.symbols_load
+
+        def __init__(self) -> None:
+            self.labels: list[dict] = []
+
+        def send_command(self, command: str, params: dict) -> dict:
+            if command == "LABELS":
+                self.labels.append(params)
+            return {"success": True}
+
+    def test_symbol_rebuild_pushes_only_changed_labels(self) -> None:
+        sym = self.write("Roms/oos168x.sym", "[labels]\n2C:8000 :Oracle_A\n2C:8010 :Oracle_B\n")
+        bridge = self.Bridge()
+        artifacts = GeneratedArtifacts(
+            self.root, targets=("symbols",), log=self.logs.append, live_labels=bridge
+        )
+        artifacts.refresh()
+        bridge.labels.clear()
+
+        self.write("Roms/oos168x.sym", "[labels]\n2C:8000 :Oracle_A\n2C:8010 :Oracle_C\n")
+        self.assertEqual(artifacts.refresh({sym}), {"symbols": True})
+        artifacts.close()
+
+        self.assertEqual(
+            [(p["addr"], p["label"]) for p in bridge.labels], [("0x2C8010", "Oracle_C")]
+        )
+        self.assertIn("Oracle_C", (self.root / "Roms/oos168x.mlb").read_text())
+
+
+class WatcherTest(WatchFixture):
+    def _touch(self, relative: str) -> Path:
+        path = self.root / relative
+        path.write_text(path.read_text() + "; edit\n")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        return path
+
+    def test_polling_reports_changed_files(self) -> None:
+        watcher = PollingWatcher(self.root, interval=0.01)
+        self.assertEqual(watcher.poll(), set())
+        edited = self._touch("Core/a.asm")
+        (self.root / "notes.txt").write_text("ignored")
+        self.assertEqual(watcher.wait(1.0), {edited})
+        (self.root / "Core/b.asm").unlink()
+        self.assertEqual(watcher.wait(1.0), {self.root / "Core/b.asm"})
+
+    @unittest.skipUnless(InotifyWatcher.available(), "inotify unavailable")
+    def test_inotify_reports_changed_files(self) -> None:
+        watcher = InotifyWatcher(self.root)
+        try:
+            self.assertEqual(watcher.wait(0.01), set())
+            edited = self._touch("Core/a.asm")
+            self.assertEqual(watcher.wait(1.0), {edited})
+            created = self.write("Sprites/New/new.asm", "db $00\n")
+            changed = watcher.wait(1.0)
+            changed |= watcher.wait(0.05)
+            self.assertIn(created, changed)
+        finally:
+            watcher.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+GENERATE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(GENERATE_DIR))
+
+from z3ed_driver import Z3edDriver, Z3edQuery, Z3edResult  # noqa: E402
+
+
+FAKE_Z3ED = """#!{python}
+import json, sys
+with open({log!r}, "a") as log:
+    log.write(" ".join(sys.argv[1:]) + "\\n")
+if "--fail" in sys.argv:
+    sys.stderr.write("bad room\\n")
+    sys.exit(2)
+print("loading rom...")
+print(json.dumps({{"argv": sys.argv[1:]}}))
+"""
+
+
+class Z3edDriverTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._temp = tempfile.TemporaryDirectory()
+        self.root = Path(self._temp.name)
+        self.rom = self.root / "oos.sfc"
+        self.rom.write_bytes(bytes(0x8000))
+        self.log = self.root / "calls.log"
+        self.z3ed = self.root / "z3ed"
+        self.z3ed.write_text(FAKE_Z3ED.format(python=sys.executable, log=str(self.log)))
+        self.z3ed.chmod(0o755)
+
+    def tearDown(self) -> None:
+        self._temp.cleanup()
+
+    def driver(self) -> Z3edDriver:
+        return Z3edDriver(self.rom, str(self.z3ed), cache_dir=self.root / "cache", jobs=4)
+
+    def calls(self) -> list[str]:
+        return self.log.read_text().splitlines() if self.log.exists() else []
+
+    def test_batch_dedupes_and_caches_on_disk(self) -> None:
+        queries = [Z3edQuery("dungeon-map", room=r) for r in (0x98, 0x99, 0x98)]
+        first = self.driver().run_many(queries)
+        self.assertEqual(len(self.calls()), 2)
+        self.assertEqual(
+            first[0].json()["argv"],
+            ["dungeon-map", "--rom", str(self.rom), "--room=0x98"],
+        )
+        self.assertIs(first[0], first[2])
+
+        again = self.driver()
+        second = again.run_many(queries)
+        self.assertEqual((again.launches, len(self.calls())), (0, 2))
+        self.assertTrue(all(result.cached for result in second))
+        self.assertEqual(second[1].stdout, first[1].stdout)
+
+    def test_rom_change_invalidates_cache(self) -> None:
+        query = Z3edQuery("dungeon-room-header", room=0x10)
+        self.driver().run(query)
+        self.rom.write_bytes(bytes(0x8000) + b"\x01")
+        self.assertFalse(self.driver().run(query).cached)
+        self.assertEqual(len(self.calls()), 2)
+
+    def test_shared_driver_drops_results_after_rom_rebuild(self) -> None:
+        driver = Z3edDriver.shared(self.rom, str(self.z3ed), cache_dir=None)
+        query = Z3edQuery("dungeon-room-header", room=0x10)
+        first = driver.run(query)
+        self.assertIs(driver.run(query), first)
+
+        self.rom.write_bytes(bytes(0x8000) + b"\x01")
+        rebuilt = Z3edDriver.shared(self.rom, str(self.z3ed), cache_dir=None)
+        self.assertIs(rebuilt, driver)
+        self.assertIsNot(rebuilt.run(query), first)
+        self.assertEqual(len(self.calls()), 2)
+
+    def test_failures_are_not_cached(self) -> None:
+        query = Z3edQuery("dungeon-describe-room", room=0x01, args=("--fail",))
+        result = self.driver().run(query)
+        self.assertEqual((result.ok, result.stderr), (False, "bad room\n"))
+        self.driver().run(query)
+        self.assertEqual(len(self.calls()), 2)
+
+    def test_missing_binary_reports_error(self) -> None:
+        driver = Z3edDriver(self.rom, str(self.root / "missing"), cache_dir=None)
+        result = driver.run(Z3edQuery("dungeon-map", room=0))
+        self.assertEqual(result.returncode, -1)
+        self.assertEqual(Z3edResult(result.query, 0, "no json", "").json(), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -12,6 +12,9 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+from rom_image import RomImage
+from room_streams import RoomStreamError, read_u24_table, scan_collision_stream
+
 
 SOURCE_PATH = Path("Data/dungeons/custom_collision.json")
 
@@ -24,8 +27,6 @@ COLLISION_DATA_START = 0x128450
 COLLISION_DATA_END_EXCLUSIVE = 0x12E000
 WATER_FILL_TABLE_END_EXCLUSIVE = 0x130000
 
-SINGLE_TILE_MARKER = 0xF0F0
-END_MARKER = 0xFFFF
 ROOM_ID_RE = re.compile(r"^0x[0-9A-F]+$")
 
 
@@ -199,10 +200,6 @@ def _strict_lorom_to_pc(address: int, room_id: int) -> int:
     return pc_address
 
 
-def _read_u16(data: bytes, offset: int) -> int:
-    return data[offset] | (data[offset + 1] << 8)
-
-
 def _decode_room(data: bytes, room_id: int, snes_pointer: int) -> dict[int, int]:
     cursor = _strict_lorom_to_pc(snes_pointer, room_id)
     if not COLLISION_DATA_START <= cursor < COLLISION_DATA_END_EXCLUSIVE:
@@ -211,82 +208,29 @@ def _decode_room(data: bytes, room_id: int, snes_pointer: int) -> dict[int, int]
             f"0x{snes_pointer:06X} maps outside collision data "
             f"(PC 0x{cursor:06X})"
         )
-
-    tiles: dict[int, int] = {}
-    single_tiles_mode = False
-    found_end_marker = False
-    while cursor + 1 < COLLISION_DATA_END_EXCLUSIVE:
-        offset = _read_u16(data, cursor)
-        cursor += 2
-
-        if offset == END_MARKER:
-            found_end_marker = True
-            break
-        if offset == SINGLE_TILE_MARKER:
-            single_tiles_mode = True
-            continue
-
-        if single_tiles_mode:
-            if cursor >= COLLISION_DATA_END_EXCLUSIVE:
-                break
-            if offset >= COLLISION_MAP_TILES:
-                raise CustomCollisionSourceContractError(
-                    f"ROM room 0x{room_id:02X} has out-of-range single-tile "
-                    f"offset {offset}"
-                )
-            tiles[offset] = data[cursor]
-            cursor += 1
-            continue
-
-        if cursor + 1 >= COLLISION_DATA_END_EXCLUSIVE:
-            break
-        width = data[cursor]
-        height = data[cursor + 1]
-        cursor += 2
-        if width == 0 or height == 0:
-            raise CustomCollisionSourceContractError(
-                f"ROM room 0x{room_id:02X} has zero-dimension collision "
-                f"rectangle {width}x{height}"
-            )
-
-        byte_count = width * height
-        if cursor + byte_count > COLLISION_DATA_END_EXCLUSIVE:
-            raise CustomCollisionSourceContractError(
-                f"ROM room 0x{room_id:02X} rectangle crosses the collision "
-                "data boundary"
-            )
-        start_row, start_column = divmod(offset, COLLISION_MAP_WIDTH)
-        if (
-            offset >= COLLISION_MAP_TILES
-            or start_column + width > COLLISION_MAP_WIDTH
-            or start_row + height > COLLISION_MAP_HEIGHT
-        ):
-            raise CustomCollisionSourceContractError(
-                f"ROM room 0x{room_id:02X} has an out-of-range collision "
-                f"rectangle at offset {offset} with size {width}x{height}"
-            )
-        for row in range(height):
-            row_offset = offset + (row * COLLISION_MAP_WIDTH)
-            for column in range(width):
-                tiles[row_offset + column] = data[cursor]
-                cursor += 1
-
-    if not found_end_marker:
+    try:
+        stream = scan_collision_stream(data, cursor, COLLISION_DATA_END_EXCLUSIVE)
+    except RoomStreamError as exc:
         raise CustomCollisionSourceContractError(
-            f"ROM room 0x{room_id:02X} collision data is unterminated before "
-            "the reserved water-fill region"
-        )
-    return {offset: value for offset, value in tiles.items() if value != 0}
+            f"ROM room 0x{room_id:02X} {exc}"
+        ) from exc
+    return {offset: value for offset, value in stream.tiles.items() if value != 0}
 
 
 def _decode_rom(rom_path: Path) -> tuple[CollisionRooms, str]:
     try:
-        data = rom_path.read_bytes()
+        rom = RomImage.open(rom_path)
     except OSError as exc:
         raise CustomCollisionSourceContractError(
             f"cannot read ROM {rom_path}: {exc}"
         ) from exc
+    with rom:
+        return _decode_rom_image(rom)
+
 
+def _decode_rom_image(rom: RomImage) -> tuple[CollisionRooms, str]:
+    rom_path = rom.path
+    data = rom.data
     pointer_table_end = POINTER_TABLE_START + (NUMBER_OF_ROOMS * 3)
     if len(data) < WATER_FILL_TABLE_END_EXCLUSIVE or len(data) < pointer_table_end:
         raise CustomCollisionSourceContractError(
@@ -295,11 +239,8 @@ def _decode_rom(rom_path: Path) -> tuple[CollisionRooms, str]:
         )
 
     rooms: CollisionRooms = {}
-    for room_id in range(NUMBER_OF_ROOMS):
-        pointer_offset = POINTER_TABLE_START + (room_id * 3)
-        snes_pointer = int.from_bytes(
-            data[pointer_offset : pointer_offset + 3], "little"
-        )
+    pointers = read_u24_table(data, POINTER_TABLE_START, NUMBER_OF_ROOMS)
+    for room_id, snes_pointer in enumerate(pointers):
         if snes_pointer == 0:
             continue
         tiles = _decode_room(data, room_id, snes_pointer)
@@ -309,7 +250,7 @@ def _decode_rom(rom_path: Path) -> tuple[CollisionRooms, str]:
         if tiles:
             rooms[room_id] = tiles
 
-    return rooms, hashlib.sha256(data).hexdigest()
+    return rooms, rom.sha256
 
 
 def _format_room_ids(room_ids: set[int]) -> str:
@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""Batch-validate every dialogue bundle under Data/dialogue in one pass.
+
+`normalize_dialogue_bundles.py` checks ID/bank conventions file by file and
+`validate_expanded_message_source.py` checks the canonical expanded bundle
+against its generated ASM. This tool loads all bundles once, indexes them by
+(bank, id), encodes each message with the contract check's table-driven
+encoder, and reports in one pass:
+
+- bundle shape (format, version, messages, counts)
+- per-message ID/bank rules and text encoding errors (with positions)
+- duplicate (bank, id) definitions across bundles, and NPC bundle messages
+  whose text has drifted from the canonical expanded source
+- the expanded-bank size budget, both as committed and as projected with
+  every NPC bundle's overrides applied
+
+`DialogueIndex.check_edit()` re-checks one message against the budget in
+O(len(text)) using the precomputed encoded lengths, so the dialogue editor
+can call it on every keystroke.
+
+Usage:
+    python3 Scripts/Generate/validate_dialogue_bundles.py
+    python3 Scripts/Generate/validate_dialogue_bundles.py --json report.json --strict
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+from validate_expanded_message_source import (
+    BUNDLE_PATH,
+    FIRST_MESSAGE_ID,
+    MESSAGE_DATA_END,
+    MESSAGE_DATA_START,
+    MessageEncodingError,
+    encode_message_text,
+)
+
+DEFAULT_GLOB = "Data/dialogue/*.json"
+VALID_BANKS = ("vanilla", "expanded")
+VANILLA_MAX = 396
+EXPANDED_CAPACITY = MESSAGE_DATA_END - MESSAGE_DATA_START + 1
+
+
+# The bundle validator and the contract check share one encoder.
+EncodingIssue = MessageEncodingError
+encode_text = encode_message_text
+
+
+@dataclass
+class Issue:
+    severity: str  # "error" | "warning"
+    code: str
+    bundle: str
+    detail: str
+    message: Optional[int] = None  # index into the bundle's messages array
+
+
+@dataclass
+class BundleMessage:
+    bundle: str
+    index: int
+    bank: str
+    id: int
+    text: str
+    encoded_length: Optional[int]  # None when the text does not encode
+
+    @property
+    def absolute_id(self) -> int:
+        return self.id + FIRST_MESSAGE_ID if self.bank == "expanded" else self.id
+
+
+@dataclass
+class EditCheck:
+    encoded_length: Optional[int]
+    error: Optional[str]
+    position: Optional[int]
+    used: int
+    capacity: Optional[int]
+
+    @property
+    def fits(self) -> bool:
+        return self.error is None and (self.capacity is None or self.used <= self.capacity)
+
+
+@dataclass
+class DialogueReport:
+    bundles: dict[str, dict[str, int]]
+    issues: list[Issue] = field(default_factory=list)
+    budgets: dict[str, dict[str, int]] = field(default_factory=dict)
+
+    @property
+    def errors(self) -> list[Issue]:
+        return [issue for issue in self.issues if issue.severity == "error"]
+
+    @property
+    def warnings(self) -> list[Issue]:
+        return [issue for issue in self.issues if issue.severity == "warning"]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "version": 1,
+            "summary": {
+                "bundles": len(self.bundles),
+                "messages": sum(b["messages"] for b in self.bundles.values()),
+                "errors": len(self.errors),
+                "warnings": len(self.warnings),
+            },
+            "bundles": self.bundles,
+            "budgets": self.budgets,
+            "issues": [asdict(issue) for issue in self.issues],
+        }
+
+
+class DialogueIndex:
+    """All dialogue bundles, loaded and encoded once."""
+
+    def __init__(self, root: Path, canonical: str = BUNDLE_PATH.as_posix()) -> None:
+        self.root = root
+        self.canonical = canonical
+        self.messages: list[BundleMessage] = []
+        self.by_id: dict[tuple[str, int], list[BundleMessage]] = {}
+        self._load_issues: list[Issue] = []
+        self.bundle_stats: dict[str, dict[str, int]] = {}
+        # Committed and projected (NPC overrides applied) expanded lengths.
+        self._canonical_lengths: dict[int, int] = {}
+        self._projected_lengths: dict[int, int] = {}
+        self._projected_total = 1
+
+    @classmethod
+    def load(cls, root: Path, pattern: str = DEFAULT_GLOB) -> "DialogueIndex":
+        index = cls(root)
+        for path in sorted(root.glob(pattern)):
+            index.add_bundle(path.relative_to(root).as_posix(), path.read_bytes())
+        index.index_lengths()
+        return index
+
+    # -- loading ------------------------------------------------------------
+
+    def _issue(self, severity: str, code: str, bundle: str, detail: str,
+               message: Optional[int] = None) -> None:
+        self._load_issues.append(Issue(severity, code, bundle, detail, message))
+
+    def add_bundle(self, name: str, payload: bytes) -> None:
+        """Parse, check and encode one bundle's messages."""
+        stats = {"messages": 0, "encoded_bytes": 0}
+        self.bundle_stats[name] = stats
+        try:
+            data = json.loads(payload)
+        except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+            self._issue("error", "invalid-json", name, str(exc))
+            return
+        if not isinstance(data, dict):
+            self._issue("error", "invalid-bundle", name, "top-level JSON must be an object")
+            return
+        if data.get("format") != "yaze-message-bundle":
+            self._issue("error", "invalid-bundle", name, "format must be 'yaze-message-bundle'")
+        if data.get("version") != 1:
+            self._issue("error", "invalid-bundle", name, "version must be 1")
+        entries = data.get("messages")
+        if not isinstance(entries, list):
+            self._issue("error", "invalid-bundle", name, "missing or invalid 'messages' array")
+            return
+
+        counts = {bank: 0 for bank in VALID_BANKS}
+        seen: set[tuple[str, int]] = set()
+        for position, entry in enumerate(entries):
+            message = self._parse_message(name, position, entry)
+            if message is None:
+                continue
+            key = (message.bank, message.id)
+            if key in seen:
+                self._issue("error", "duplicate-id", name,
+                            f"{message.bank} id {message.id} defined twice", position)
+            seen.add(key)
+            counts[message.bank] += 1
+            stats["messages"] += 1
+            stats["encoded_bytes"] += message.encoded_length or 0
+            self.messages.append(message)
+            self.by_id.setdefault(key, []).append(message)
+
+        declared = data.get("counts")
+        if isinstance(declared, dict) and {b: declared.get(b) for b in VALID_BANKS} != counts:
+            self._issue("warning", "counts-mismatch", name,
+                        f"counts {declared} do not match messages {counts}")
+
+        expanded = sorted(message_id for bank, message_id in seen if bank == "expanded")
+        if expanded and expanded[-1] - expanded[0] + 1 != len(expanded):
+            gaps = sorted(set(range(expanded[0], expanded[-1] + 1)).difference(expanded))
+            preview = ", ".join(str(v) for v in gaps[:8])
+            suffix = "" if len(gaps) <= 8 else f" ... (+{len(gaps) - 8} more)"
+            self._issue("warning", "non-contiguous", name,
+                        f"expanded: non-contiguous IDs; gaps at {preview}{suffix}")
+
+    def _parse_message(self, name: str, position: int, entry: Any) -> Optional[BundleMessage]:
+        if not isinstance(entry, dict):
+            self._issue("error", "invalid-message", name, "message is not an object", position)
+            return None
+        message_id = entry.get("id")
+        if not isinstance(message_id, int) or isinstance(message_id, bool):
+            self._issue("error", "invalid-message", name, "id missing/invalid", position)
+            return None
+        bank = entry.get("bank", "vanilla")
+        if not isinstance(bank, str) or bank.strip().lower() not in VALID_BANKS:
+            self._issue("error", "invalid-bank", name, f"bank invalid: {bank!r}", position)
+            return None
+        bank = bank.strip().lower()
+        text = entry.get("text", entry.get("raw"))
+        if not isinstance(text, str):
+            self._issue("error", "invalid-message", name, "text/raw must be a string", position)
+            return None
+
+        if bank == "expanded" and message_id >= FIRST_MESSAGE_ID:
+            self._issue("error", "absolute-id", name,
+                        f"expanded id {message_id} looks absolute; use "
+                        f"{message_id - FIRST_MESSAGE_ID} (base 0x{FIRST_MESSAGE_ID:X})", position)
+        elif message_id < 0 or (bank == "vanilla" and message_id > VANILLA_MAX):
+            self._issue("warning", "id-range", name,
+                        f"{bank} id {message_id} outside expected range", position)
+
+        try:
+            length: Optional[int] = len(encode_text(text))
+        except EncodingIssue as exc:
+            self._issue("error", "encoding", name, f"{exc} at position {exc.position}", position)
+            length = None
+        return BundleMessage(name, position, bank, message_id, text, length)
+
+    def index_lengths(self) -> None:
+        """Rebuild the expanded-bank length tables after add_bundle() calls."""
+        for (bank, message_id), defined in self.by_id.items():
+            if bank != "expanded":
+                continue
+            canonical = [m for m in defined if m.bundle == self.canonical]
+            overrides = [m for m in defined if m.bundle != self.canonical]
+            if canonical and canonical[0].encoded_length is not None:
+                self._canonical_lengths[message_id] = canonical[0].encoded_length
+            chosen = overrides[-1] if overrides else (canonical[0] if canonical else None)
+            if chosen is not None and chosen.encoded_length is not None:
+                self._projected_lengths[message_id] = chosen.encoded_length
+        self._projected_total = sum(self._projected_lengths.values()) + 1  # bank $FF
+
+    # -- validation ---------------------------------------------------------
+
+    def validate(self) -> DialogueReport:
+        report = DialogueReport(bundles=dict(self.bundle_stats))
+        report.issues.extend(self._load_issues)
+
+        for (bank, message_id), defined in self.by_id.items():
+            overrides = [m for m in defined if m.bundle != self.canonical]
+            if len(overrides) > 1:
+                owners = ", ".join(sorted({m.bundle for m in overrides}))
+                for message in overrides:
+                    report.issues.append(Issue(
+                        "error", "conflicting-id", message.bundle,
+                        f"{bank} id {message_id} also defined in {owners}", message.index,
+                    ))
+            canonical = next((m for m in defined if m.bundle == self.canonical), None)
+            if canonical is None:
+                continue
+            for message in overrides:
+                if message.text != canonical.text:
+                    report.issues.append(Issue(
+                        "warning", "pending-sync", message.bundle,
+                        f"{bank} id {message_id} differs from {self.canonical}; "
+                        "publish with z3ed message-source-sync", message.index,
+                    ))
+
+        committed = sum(self._canonical_lengths.values()) + 1  # bank $FF
+        projected = self._projected_total
+        report.budgets["expanded"] = {
+            "capacity": EXPANDED_CAPACITY,
+            "used": committed,
+            "projected": projected,
+            "free": EXPANDED_CAPACITY - projected,
+        }
+        for label, used in (("committed", committed), ("projected", projected)):
+            if used > EXPANDED_CAPACITY:
+                report.issues.append(Issue(
+                    "error", "budget", self.canonical,
+                    f"{label} expanded message data is {used} bytes > "
+                    f"{EXPANDED_CAPACITY} byte allocation",
+                ))
+        report.issues.sort(key=lambda i: (i.bundle, i.message if i.message is not None else -1))
+        return report
+
+    def check_edit(self, bank: str, message_id: int, text: str) -> EditCheck:
+        """Encode one edited message and re-check the budget.
+
+        Only `text` is encoded; the rest of the bank comes from the
+        precomputed lengths, so this is cheap enough to run per keystroke.
+        """
+        try:
+            length: Optional[int] = len(encode_text(text))
+            error, position = None, None
+        except EncodingIssue as exc:
+            length, error, position = None, str(exc), exc.position
+        if bank != "expanded":
+            return EditCheck(length, error, position, length or 0, None)
+        used = (
+            self._projected_total
+            - self._projected_lengths.get(message_id, 0)
+            + (length or 0)
+        )
+        return EditCheck(length, error, position, used, EXPANDED_CAPACITY)
+
+
+def _print_report(report: DialogueReport) -> None:
+    by_bundle: dict[str, list[Issue]] = {}
+    for issue in report.issues:
+        by_bundle.setdefault(issue.bundle, []).append(issue)
+    for name, stats in report.bundles.items():
+        issues = by_bundle.get(name, [])
+        status = "OK"
+        if any(issue.severity == "error" for issue in issues):
+            status = "ERROR"
+        elif issues:
+            status = "WARN"
+        print(f"[{status}] {name} ({stats['messages']} messages, {stats['encoded_bytes']} bytes)")
+        for issue in issues:
+            where = f"messages[{issue.message}] " if issue.message is not None else ""
+            tag = "error: " if issue.severity == "error" else "warn:  "
+            print(f"  {tag} {where}{issue.detail}")
+    budget = report.budgets.get("expanded")
+    if budget:
+        print(
+            f"\nexpanded budget: used={budget['used']} projected={budget['projected']} "
+            f"capacity={budget['capacity']} free={budget['free']}"
+        )
+    print(
+        f"summary: bundles={len(report.bundles)} "
+        f"warnings={len(report.warnings)} errors={len(report.errors)}"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--root",
+        type=Path,
+        default=Path(__file__).resolve().parents[2],
+        help="Oracle repo root (default: repo root)",
+    )
+    parser.add_argument(
+        "--glob",
+        default=DEFAULT_GLOB,
+        help="Bundle glob relative to --root (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--json",
+        type=Path,
+        help="Write the machine-readable report here ('-' for stdout)",
+    )
+    parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="Return non-zero when warnings are present",
+    )
+    args = parser.parse_args()
+
+    index = DialogueIndex.load(args.root, args.glob)
+    if not index.bundle_stats:
+        print(f"[error] no files matched glob: {args.glob}", file=sys.stderr)
+        return 2
+    report = index.validate()
+
+    if args.json is not None:
+        text = json.dumps(report.to_dict(), indent=2) + "\n"
+        if str(args.json) == "-":
+            sys.stdout.write(text)
+        else:
+            args.json.write_text(text, encoding="utf-8")
+    if args.json is None or str(args.json) != "-":
+        _print_report(report)
+
+    if report.errors:
+        return 1
+    if args.strict and report.warnings:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
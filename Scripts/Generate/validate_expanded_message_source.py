@@ -37,7 +37,8 @@ ORG_RE = re.compile(r"^\s*org\b", re.IGNORECASE)
 DB_RE = re.compile(r"^\s*db\s+(.+?)\s*$", re.IGNORECASE)
 BYTE_RE = re.compile(r"^\$([0-9A-Fa-f]{2})$")
 DICTIONARY_TOKEN_RE = re.compile(r"^D:([0-9A-F]{2})$")
-ARGUMENT_TOKEN_RE = re.compile(r"^([A-Z0-9]+):([0-9A-F]{1,2})$")
+DICTIONARY_MAX = 0x60
+MESSAGE_TERMINATOR = 0x7F
 
 CHARACTER_BYTES = {
     **{chr(ord("A") + index): index for index in range(26)},
@@ -215,73 +216,86 @@ def _load_bundle(bundle_path: Path) -> tuple[dict[str, Any], bytes, str]:
     return bundle, bundle_bytes, hashlib.sha256(bundle_bytes).hexdigest()
 
 
-def _encode_message_text(text: str, message_id: int) -> bytes:
-    """Encode canonical source text with the Yaze message byte contract."""
-    encoded = bytearray()
-    position = 0
-    while position < len(text):
-        character = text[position]
-        if character in "\r\n":
-            raise MessageSourceContractError(
-                f"canonical bundle message {message_id} contains a literal "
-                "newline; use a message command token"
-            )
+def _build_text_codes() -> dict[str, bytes]:
+    """Every bracket token the encoder accepts, mapped to its bytes."""
+    codes = {token: bytes((value,)) for token, value in TOKEN_BYTES.items()}
+    for index in range(DICTIONARY_MAX + 1):
+        codes[f"D:{index:02X}"] = bytes((0x88 + index,))
+    for name, command in ARGUMENT_TOKEN_BYTES.items():
+        for argument in range(0x100):
+            encoded = bytes((command, argument))
+            codes[f"{name}:{argument:02X}"] = encoded
+            if argument < 0x10:
+                codes[f"{name}:{argument:X}"] = encoded
+    return codes
+
+
+# Token text -> encoded bytes; characters use a str.translate table.
+TEXT_CODES = _build_text_codes()
+_CHARACTER_SET = frozenset(CHARACTER_BYTES)
+_CHARACTER_TRANSLATION = str.maketrans(
+    {character: chr(value) for character, value in CHARACTER_BYTES.items()}
+)
+_SEGMENT_RE = re.compile(r"\[([^\]]*)\]|([^\[]+)|(\[)")
 
-        if character != "[":
-            value = CHARACTER_BYTES.get(character)
-            if value is None:
-                raise MessageSourceContractError(
-                    f"canonical bundle message {message_id} has unsupported "
-                    f"character {character!r} at position {position}"
-                )
-            encoded.append(value)
-            position += 1
-            continue
 
-        close = text.find("]", position)
-        if close < 0:
-            raise MessageSourceContractError(
-                f"canonical bundle message {message_id} has an unclosed token "
-                f"at position {position}"
-            )
-        token = text[position + 1:close]
+class MessageEncodingError(MessageSourceContractError):
+    """Text that the message encoder cannot represent."""
 
-        dictionary_match = DICTIONARY_TOKEN_RE.fullmatch(token)
-        if dictionary_match:
-            dictionary_index = int(dictionary_match.group(1), 16)
-            if dictionary_index > 0x60:
-                raise MessageSourceContractError(
-                    f"canonical bundle message {message_id} dictionary index "
-                    f"0x{dictionary_index:02X} is outside 0x00..0x60"
-                )
-            encoded.append(0x88 + dictionary_index)
-            position = close + 1
-            continue
+    def __init__(self, detail: str, position: int) -> None:
+        super().__init__(detail)
+        self.position = position
 
-        value = TOKEN_BYTES.get(token)
-        if value is not None:
-            encoded.append(value)
-            position = close + 1
-            continue
 
-        argument_match = ARGUMENT_TOKEN_RE.fullmatch(token)
-        if (
-            argument_match
-            and argument_match.group(1) in ARGUMENT_TOKEN_BYTES
-        ):
-            name = argument_match.group(1)
-            argument = int(argument_match.group(2), 16)
-            encoded.extend((ARGUMENT_TOKEN_BYTES[name], argument))
-            position = close + 1
-            continue
+def encode_message_text(text: str) -> bytes:
+    """Encode message text (with trailing $7F) with the Yaze byte contract."""
+    encoded = bytearray()
+    for match in _SEGMENT_RE.finditer(text):
+        token, run, unclosed = match.groups()
+        if run is not None:
+            if not _CHARACTER_SET.issuperset(run):
+                offset, character = next(
+                    (i, c) for i, c in enumerate(run) if c not in _CHARACTER_SET
+                )
+                if character in "\r\n":
+                    raise MessageEncodingError(
+                        "literal newline; use a message command token",
+                        match.start() + offset,
+                    )
+                raise MessageEncodingError(
+                    f"unsupported character {character!r}",
+                    match.start() + offset,
+                )
+            encoded += run.translate(_CHARACTER_TRANSLATION).encode("latin-1")
+        elif unclosed is not None:
+            raise MessageEncodingError("unclosed token", match.start())
+        else:
+            value = TEXT_CODES.get(token)
+            if value is None:
+                dictionary_match = DICTIONARY_TOKEN_RE.fullmatch(token)
+                if dictionary_match:
+                    raise MessageEncodingError(
+                        f"dictionary index 0x{dictionary_match.group(1)} is "
+                        f"outside 0x00..0x{DICTIONARY_MAX:02X}",
+                        match.start(),
+                    )
+                raise MessageEncodingError(
+                    f"unknown token [{token}]", match.start()
+                )
+            encoded += value
+    encoded.append(MESSAGE_TERMINATOR)
+    return bytes(encoded)
 
-        raise MessageSourceContractError(
-            f"canonical bundle message {message_id} has unknown token "
-            f"[{token}] at position {position}"
-        )
 
-    encoded.append(0x7F)
-    return bytes(encoded)
+def _encode_message_text(text: str, message_id: int) -> bytes:
+    """Encode canonical source text with the Yaze message byte contract."""
+    try:
+        return encode_message_text(text)
+    except MessageEncodingError as exc:
+        raise MessageSourceContractError(
+            f"canonical bundle message {message_id}: {exc} "
+            f"at position {exc.position}"
+        ) from exc
 
 
 def _encode_bundle_messages(bundle: dict[str, Any]) -> list[tuple[int, bytes]]:
@@ -424,7 +438,7 @@ def _parse_asm_include(
     for index, (message_id, start) in enumerate(labels):
         end = labels[index + 1][1] if index + 1 < len(labels) else len(encoded) - 1
         message = bytes(encoded[start:end])
-        if not message or message[-1] != 0x7F:
+        if not message or message[-1] != MESSAGE_TERMINATOR:
             raise MessageSourceContractError(
                 f"Message_{message_id:03X} must end with byte $7F"
             )
@@ -0,0 +1,518 @@
+#!/usr/bin/env python3
+"""Keep generated artifacts fresh while editing.
+
+Watches the repo (inotify on Linux, mtime polling elsewhere) and, on each
+save, regenerates only the outputs the change affects:
+
+  hooks        Roms/hooks.json                 <- *.asm, patched ROM
+  manifest     Roms/hack_manifest.json         <- *.asm, dev/patched ROM
+  symbols      Roms/oos<ver>x.mlb              <- Roms/oos<ver>x.sym, Core/ram.asm, Core/sram.asm
+  annotations  .cache/annotations.json         <- *.asm
+  sprites      Sprites/sprite_registry_ids.asm <- Sprites/registry.csv
+
+The parsed source graph (generate_hooks_json.SourceGraph) and ROM mappings
+(rom_image.RomImageCache) stay warm between changes: an edit drops only the
+edited files from the graph, so a save costs one file's rescan plus the
+merge. Outputs are written atomically (temp file + rename) and only when
+their content changes, so yaze and editors never see a partial file.
+
+Usage:
+    python3 Scripts/Generate/watch_generated.py
+    python3 Scripts/Generate/watch_generated.py --only hooks,manifest --sync
+    python3 Scripts/Generate/watch_generated.py --only symbols --live-labels
+    python3 Scripts/Generate/watch_generated.py --once     # build all, exit
+"""
+from __future__ import annotations
+
+import argparse
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import struct
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+from export_symbols import (
+    connect_mesen_bridge,
+    diff_mlb_labels,
+    iter_mlb_lines,
+    parse_mlb_labels,
+    push_label_delta,
+    read_mlb_labels,
+    sync_to_mesen2,
+)
+from generate_annotations import annotation_sources, scan_file_annotations
+from generate_hack_manifest import ManifestGenerationError, generate_manifest
+from generate_hooks_json import (
+    GLOBAL_DEFINE_SOURCES,
+    SourceGraph,
+    hooks_document,
+    scan_hooks,
+)
+from generate_sprite_registry import load_registry, render_ids
+from rom_image import RomImageCache
+
+WATCH_SUFFIXES = frozenset({".asm", ".sym", ".sfc", ".csv"})
+IGNORED_DIRS = frozenset({
+    ".git", ".cache", ".context", "__pycache__", "build", "SaveStates",
+    "node_modules",
+})
+TARGETS = ("hooks", "manifest", "symbols", "annotations", "sprites")
+
+# Quiet period after the first event before regenerating, so editors that
+# write via several syscalls (or save many files at once) trigger one pass.
+DEFAULT_DEBOUNCE = 0.05
+
+
+def write_atomic(path: Path, text: str) -> bool:
+    """Replace `path` with `text` via rename; False if already identical."""
+    try:
+        if path.read_text(encoding="utf-8") == text:
+            return False
+    except (OSError, UnicodeDecodeError):
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return True
+
+
+def _watched(path: Path) -> bool:
+    return path.suffix in WATCH_SUFFIXES and not path.name.startswith(".")
+
+
+def _walk_files(root: Path) -> Iterable[Path]:
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in IGNORED_DIRS]
+        for name in filenames:
+            path = Path(dirpath) / name
+            if _watched(path):
+                yield path
+
+
+# ---------------------------------------------------------------------------
+# Change sources
+# ---------------------------------------------------------------------------
+
+class PollingWatcher:
+    """Detect changes by comparing (mtime, size) snapshots."""
+
+    def __init__(self, root: Path, interval: float = 0.25) -> None:
+        self.root = root
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self) -> dict[Path, tuple[int, int]]:
+        snapshot = {}
+        for path in _walk_files(self.root):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def poll(self) -> set[Path]:
+        current = self._scan()
+        previous = self._snapshot
+        self._snapshot = current
+        changed = {p for p, sig in current.items() if previous.get(p) != sig}
+        changed.update(p for p in previous if p not in current)
+        return changed
+
+    def wait(self, timeout: Optional[float] = None) -> set[Path]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = self.poll()
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            time.sleep(self.interval)
+
+    def close(self) -> None:
+        pass
+
+
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_Q_OVERFLOW = 0x00004000
+_IN_ISDIR = 0x40000000
+_IN_MASK = (
+    _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class InotifyWatcher:
+    """Recursive inotify watch (Linux); see `available()`."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self._libc = self._load_libc()
+        if self._libc is None:
+            raise OSError("inotify is not available on this platform")
+        fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._fd = fd
+        self._dirs: dict[int, Path] = {}
+        self._add_tree(root)
+
+    @staticmethod
+    def _load_libc():
+        if not sys.platform.startswith("linux"):
+            return None
+        name = ctypes.util.find_library("c")
+        try:
+            libc = ctypes.CDLL(name or "libc.so.6", use_errno=True)
+            libc.inotify_init1
+            libc.inotify_add_watch
+        except (OSError, AttributeError):
+            return None
+        return libc
+
+    @classmethod
+    def available(cls) -> bool:
+        return cls._load_libc() is not None
+
+    def _add_dir(self, path: Path) -> None:
+        wd = self._libc.inotify_add_watch(
+            self._fd, os.fsencode(str(path)), _IN_MASK
+        )
+        if wd >= 0:
+            self._dirs[wd] = path
+
+    def _add_tree(self, top: Path) -> list[Path]:
+        """Watch `top` and its subdirectories; return watched files inside."""
+        files = []
+        for dirpath, dirnames, filenames in os.walk(top):
+            dirnames[:] = [d for d in dirnames if d not in IGNORED_DIRS]
+            self._add_dir(Path(dirpath))
+            files.extend(
+                Path(dirpath) / name for name in filenames
+                if _watched(Path(dirpath) / name)
+            )
+        return files
+
+    def _drain(self) -> set[Path]:
+        changed: set[Path] = set()
+        while True:
+            try:
+                buffer = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(buffer):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(buffer, offset)
+                offset += _EVENT_HEADER.size
+                name = buffer[offset:offset + length].rstrip(b"\0")
+                offset += length
+                if mask & _IN_Q_OVERFLOW:
+                    changed.update(_walk_files(self.root))
+                    continue
+                parent = self._dirs.get(wd)
+                if parent is None or not name:
+                    continue
+                path = parent / os.fsdecode(name)
+                if mask & _IN_ISDIR:
+                    if mask & (_IN_CREATE | _IN_MOVED_TO) and path.name not in IGNORED_DIRS:
+                        changed.update(self._add_tree(path))
+                    continue
+                if _watched(path):
+                    changed.add(path)
+
+    def wait(self, timeout: Optional[float] = None) -> set[Path]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            ready, _, _ = select.select([self._fd], [], [], remaining)
+            if ready:
+                changed = self._drain()
+                if changed:
+                    return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def make_watcher(root: Path, poll: bool = False, interval: float = 0.25):
+    if not poll and InotifyWatcher.available():
+        try:
+            return InotifyWatcher(root)
+        except OSError:
+            pass
+    return PollingWatcher(root, interval)
+
+
+# ---------------------------------------------------------------------------
+# Artifacts
+# ---------------------------------------------------------------------------
+
+class GeneratedArtifacts:
+    """Warm generator state and the per-target rebuild rules."""
+
+    def __init__(
+        self,
+        root: Path,
+        version: str = "168",
+        targets: Iterable[str] = TARGETS,
+        sync_mesen: bool = False,
+        log: Callable[[str], None] = print,
+        live_labels=None,
+    ) -> None:
+        self.root = root.resolve()
+        self.targets = [t for t in TARGETS if t in set(targets)]
+        self.sync_mesen = sync_mesen
+        # Bridge (MesenBridge-like) that receives label deltas after each
+        # symbol export, instead of the emulator reloading the whole MLB.
+        self.live_labels = live_labels
+        self.log = log
+        roms = self.root / "Roms"
+        self.patched_rom = roms / f"oos{version}x.sfc"
+        self.dev_rom = roms / f"oos{version}.sfc"
+        self.symbols_in = roms / f"oos{version}x.sym"
+        self.rom_name = f"oos{version}x"
+        self.outputs = {
+            "hooks": roms / "hooks.json",
+            "manifest": roms / "hack_manifest.json",
+            "symbols": roms / f"oos{version}x.mlb",
+            "annotations": self.root / ".cache" / "annotations.json",
+            "sprites": self.root / "Sprites" / "sprite_registry_ids.asm",
+        }
+        self.roms = RomImageCache()
+        self.graph: Optional[SourceGraph] = None
+        self._annotations: dict[Path, list[dict]] = {}
+        self._global_sources = {
+            (self.root / rel).resolve() for rel in GLOBAL_DEFINE_SOURCES
+        }
+
+    # -- change routing -----------------------------------------------------
+
+    def affected(self, changed: set[Path]) -> list[str]:
+        """Targets whose inputs include any of `changed`."""
+        changed = {p.resolve() for p in changed} - {
+            p.resolve() for p in self.outputs.values()
+        }
+        asm = any(p.suffix == ".asm" for p in changed)
+        roms = {self.patched_rom.resolve(), self.dev_rom.resolve()}
+        ram_sources = {
+            (self.root / "Core" / name).resolve() for name in ("ram.asm", "sram.asm")
+        }
+        rules = {
+            "hooks": asm or self.patched_rom.resolve() in changed,
+            "manifest": asm or bool(roms & changed),
+            "symbols": self.symbols_in.resolve() in changed or bool(ram_sources & changed),
+            "annotations": asm,
+            "sprites": (self.root / "Sprites" / "registry.csv").resolve() in changed,
+        }
+        return [t for t in self.targets if rules[t]]
+
+    def _invalidate(self, changed: set[Path]) -> None:
+        asm = {p.resolve() for p in changed if p.suffix == ".asm"}
+        if self.graph is not None and asm & self._global_sources:
+            self.graph = None
+        elif self.graph is not None:
+            self.graph.invalidate(asm)
+        for path in asm:
+            self._annotations.pop(path, None)
+
+    def _source_graph(self) -> SourceGraph:
+        if self.graph is None:
+            self.graph = SourceGraph(self.root)
+        return self.graph
+
+    # -- builders (return output text, or None to leave the output alone) ---
+
+    def build_hooks(self) -> Optional[str]:
+        hooks = scan_hooks(self.root, graph=self._source_graph())
+        data = hooks_document(self.root, hooks, self.patched_rom, self.roms)
+        return json.dumps(data, indent=2) + "\n"
+
+    def build_manifest(self) -> Optional[str]:
+        manifest = generate_manifest(
+            self.root,
+            self.patched_rom if self.patched_rom.is_file() else None,
+            self.dev_rom if self.dev_rom.is_file() else None,
+            graph=self._source_graph(),
+            roms=self.roms,
+        )
+        return json.dumps(manifest, indent=2) + "\n"
+
+    def build_symbols(self) -> Optional[str]:
+        if not self.symbols_in.is_file():
+            return None
+        lines = iter_mlb_lines(self.symbols_in, format_type="full")
+        return "\n".join(lines) + "\n"
+
+    def _push_labels(self, output: Path, text: str) -> None:
+        delta = diff_mlb_labels(
+            read_mlb_labels(output), parse_mlb_labels(text.splitlines())
+        )
+        if not delta:
+            return
+        try:
+            stats = push_label_delta(self.live_labels, delta)
+        except OSError as exc:
+            self.log(f"[watch] symbols: live label push failed: {exc}")
+            return
+        self.log(
+            f"[watch] symbols: pushed {len(delta.upserts)} changed / "
+            f"{len(delta.removed)} removed labels ({stats['failed']} failed)"
+        )
+
+    def build_annotations(self) -> Optional[str]:
+        annotations: list[dict] = []
+        for path, rel in annotation_sources(self.root):
+            key = path.resolve()
+            cached = self._annotations.get(key)
+            if cached is None:
+                try:
+                    cached = scan_file_annotations(path, rel)
+                except OSError:
+                    continue
+                self._annotations[key] = cached
+            annotations.extend(cached)
+        payload = {"version": 1, "annotations": annotations}
+        return json.dumps(payload, indent=2) + "\n"
+
+    def build_sprites(self) -> Optional[str]:
+        csv_path = self.root / "Sprites" / "registry.csv"
+        if not csv_path.is_file():
+            return None
+        return render_ids(load_registry(csv_path))
+
+    # -- driver -------------------------------------------------------------
+
+    def refresh(self, changed: Optional[set[Path]] = None) -> dict[str, bool]:
+        """Rebuild targets affected by `changed` (all targets when None).
+
+        Returns {target: written}; a target that fails keeps its previous
+        output and is reported through `log`.
+        """
+        if changed is None:
+            self.graph = None
+            self._annotations.clear()
+            targets = list(self.targets)
+        else:
+            self._invalidate(changed)
+            targets = self.affected(changed)
+
+        results: dict[str, bool] = {}
+        for target in targets:
+            started = time.perf_counter()
+            try:
+                text = getattr(self, f"build_{target}")()
+            except (ManifestGenerationError, OSError, ValueError) as exc:
+                self.log(f"[watch] {target}: {exc}")
+                continue
+            if text is None:
+                continue
+            output = self.outputs[target]
+            if target == "symbols" and self.live_labels is not None:
+                self._push_labels(output, text)
+            written = write_atomic(output, text)
+            results[target] = written
+            if written:
+                elapsed = (time.perf_counter() - started) * 1000
+                self.log(f"[watch] {target}: wrote {output.relative_to(self.root)} ({elapsed:.0f} ms)")
+                if target == "symbols" and self.sync_mesen:
+                    sync_to_mesen2(output, self.rom_name)
+        return results
+
+    def close(self) -> None:
+        self.roms.close()
+
+
+def run(
+    artifacts: GeneratedArtifacts,
+    watcher,
+    debounce: float = DEFAULT_DEBOUNCE,
+) -> None:
+    """Build everything once, then rebuild on each batch of changes."""
+    artifacts.refresh()
+    while True:
+        changed = watcher.wait()
+        # Coalesce the rest of a multi-file save.
+        while True:
+            more = watcher.wait(debounce)
+            if not more:
+                break
+            changed |= more
+        artifacts.refresh(changed)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Regenerate hooks/manifest/symbols/annotations/sprite IDs on save"
+    )
+    parser.add_argument(
+        "--root", type=Path, default=Path(__file__).resolve().parents[2],
+        help="Oracle repo root (default: repo root)",
+    )
+    parser.add_argument("--version", default="168", help="ROM version (default: 168)")
+    parser.add_argument(
+        "--only", default=",".join(TARGETS),
+        help=f"Comma-separated targets (default: {','.join(TARGETS)})",
+    )
+    parser.add_argument("--sync", action="store_true", help="Sync the MLB into Mesen2 after export")
+    parser.add_argument(
+        "--live-labels", action="store_true",
+        help="Push changed labels to a running Mesen2 after each symbol export",
+    )
+    parser.add_argument("--socket", help="Mesen2 socket path for --live-labels")
+    parser.add_argument("--poll", action="store_true", help="Use mtime polling instead of inotify")
+    parser.add_argument("--interval", type=float, default=0.25, help="Polling interval in seconds")
+    parser.add_argument("--once", action="store_true", help="Build all targets once and exit")
+    args = parser.parse_args()
+
+    targets = [t.strip() for t in args.only.split(",") if t.strip()]
+    unknown = sorted(set(targets) - set(TARGETS))
+    if unknown:
+        parser.error(f"unknown target(s): {', '.join(unknown)}")
+
+    bridge = connect_mesen_bridge(args.socket) if args.live_labels else None
+    artifacts = GeneratedArtifacts(
+        args.root, args.version, targets, sync_mesen=args.sync, live_labels=bridge
+    )
+    if args.once:
+        artifacts.refresh()
+        artifacts.close()
+        return 0
+
+    watcher = make_watcher(artifacts.root, poll=args.poll, interval=args.interval)
+    kind = "inotify" if isinstance(watcher, InotifyWatcher) else "polling"
+    print(f"[watch] watching {artifacts.root} ({kind}); Ctrl-C to stop")
+    try:
+        run(artifacts, watcher)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+        artifacts.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""Shared z3ed driver with an on-disk result cache and batched queries.
+
+Room decoding runs in-process (dungeon_rooms.py); z3ed is still needed for
+editor-exact answers such as dungeon-map renders and the room-graph
+cross-checks. Every such call used to be its own `subprocess.run`. The
+driver gives the analysis scripts and the Mesen2 navigator one place to
+ask:
+
+    driver = Z3edDriver.shared(Path("Roms/oos168x.sfc"), z3ed)
+    results = driver.run_many(
+        Z3edQuery("dungeon-describe-room", room=room_id) for room_id in rooms
+    )
+    desc = results[0].json()
+
+Results are cached under .cache/z3ed/<rom sha1>/ keyed by the ROM SHA-1,
+the z3ed binary (path, size, mtime), the command and its arguments, so a
+repeat analysis of an unchanged ROM starts no processes at all. Only
+successful (exit 0) results are stored. `run_many` de-duplicates a batch,
+serves hits from memory and disk, and runs the misses concurrently.
+
+z3ed has no batch or stdin protocol the repo relies on, so a cold miss is
+still one process per query; the batch bounds how many run at once.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+from rom_image import RomImage
+
+
+CACHE_VERSION = 1
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_CACHE_DIR = REPO_ROOT / ".cache" / "z3ed"
+DEFAULT_TIMEOUT = 60.0
+
+_DRIVERS: dict[tuple[str, str, str], "Z3edDriver"] = {}
+
+
+@dataclass(frozen=True)
+class Z3edQuery:
+    """One z3ed invocation: `z3ed <command> --rom <rom> [--room=0xNN] <args>`."""
+
+    command: str
+    room: Optional[int] = None
+    args: tuple[str, ...] = ()
+
+    def argv(self, z3ed: str, rom: Path) -> list[str]:
+        argv = [z3ed, self.command, "--rom", str(rom)]
+        if self.room is not None:
+            argv.append(f"--room=0x{self.room:02X}")
+        return argv + list(self.args)
+
+
+@dataclass(frozen=True)
+class Z3edResult:
+    query: Z3edQuery
+    returncode: int
+    stdout: str
+    stderr: str
+    cached: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0
+
+    def json(self) -> dict:
+        """Parsed stdout; tolerates log lines around the JSON object."""
+        try:
+            return json.loads(self.stdout)
+        except json.JSONDecodeError:
+            match = re.search(r"\{[\s\S]*\}", self.stdout)
+            if match:
+                try:
+                    return json.loads(match.group())
+                except json.JSONDecodeError:
+                    pass
+        return {}
+
+
+class Z3edDriver:
+    """Cached, batched z3ed runner for one (ROM, z3ed binary) pair."""
+
+    def __init__(
+        self,
+        rom_path: Path,
+        z3ed_path: str,
+        cache_dir: Optional[Path] = DEFAULT_CACHE_DIR,
+        jobs: Optional[int] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> None:
+        self.rom_path = Path(rom_path)
+        self.z3ed_path = str(z3ed_path)
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.jobs = jobs or min(8, os.cpu_count() or 1)
+        self.timeout = timeout
+        self._memory: dict[Z3edQuery, Z3edResult] = {}
+        self._rom_stamp: Optional[tuple[int, int]] = None
+        self._rom_sha1: Optional[str] = None
+        self._z3ed_identity: Optional[list] = None
+        self.launches = 0
+
+    @classmethod
+    def shared(cls, rom_path: Path, z3ed_path: str, **kwargs) -> "Z3edDriver":
+        """One driver per (ROM, z3ed, cache dir) in this process."""
+        cache_dir = kwargs.get("cache_dir", DEFAULT_CACHE_DIR)
+        key = (str(Path(rom_path).resolve()), str(z3ed_path), str(cache_dir))
+        driver = _DRIVERS.get(key)
+        if driver is None:
+            driver = _DRIVERS[key] = cls(rom_path, z3ed_path, **kwargs)
+        return driver
+
+    @property
+    def rom_sha1(self) -> str:
+        self._revalidate()
+        if self._rom_sha1 is None:
+            with RomImage.open(self.rom_path) as rom:
+                self._rom_sha1 = rom.sha1
+        return self._rom_sha1
+
+    @property
+    def z3ed_identity(self) -> list:
+        try:
+            stat = Path(self.z3ed_path).stat()
+        except OSError:
+            return [self.z3ed_path]
+        return [self.z3ed_path, stat.st_size, stat.st_mtime_ns]
+
+    def _revalidate(self) -> None:
+        """Drop in-memory results when the ROM or z3ed changed on disk.
+
+        Shared drivers live for the whole process, so a long-lived caller
+        would otherwise keep serving results for a ROM that has since been
+        rebuilt. The ROM is only re-hashed when its (mtime, size) moved.
+        """
+        identity = self.z3ed_identity
+        if identity != self._z3ed_identity:
+            self._z3ed_identity = identity
+            self._memory.clear()
+        try:
+            stat = self.rom_path.stat()
+        except OSError:
+            return
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self._rom_stamp:
+            return
+        with RomImage.open(self.rom_path) as rom:
+            sha1 = rom.sha1
+        if sha1 != self._rom_sha1:
+            self._memory.clear()
+        self._rom_stamp, self._rom_sha1 = stamp, sha1
+
+    # -- cache --------------------------------------------------------------
+
+    def _cache_path(self, query: Z3edQuery) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        key = json.dumps(
+            [CACHE_VERSION, self._z3ed_identity, query.command, query.room, list(query.args)]
+        )
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.cache_dir / (self._rom_sha1 or self.rom_sha1) / f"{digest}.json"
+
+    def _load(self, query: Z3edQuery) -> Optional[Z3edResult]:
+        path = self._cache_path(query)
+        if path is None:
+            return None
+        try:
+            record = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return Z3edResult(query, 0, record["stdout"], record["stderr"], cached=True)
+
+    def _store(self, result: Z3edResult) -> None:
+        path = self._cache_path(result.query)
+        if path is None or not result.ok:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp = path.with_suffix(f".{os.getpid()}.tmp")
+        temp.write_text(
+            json.dumps({"stdout": result.stdout, "stderr": result.stderr}),
+            encoding="utf-8",
+        )
+        os.replace(temp, path)
+
+    # -- execution ----------------------------------------------------------
+
+    def _execute(self, query: Z3edQuery) -> Z3edResult:
+        self.launches += 1
+        try:
+            completed = subprocess.run(
+                query.argv(self.z3ed_path, self.rom_path),
+                capture_output=True,
+                text=True,
+                timeout=self.timeout,
+            )
+        except subprocess.TimeoutExpired:
+            return Z3edResult(query, -1, "", f"timed out after {self.timeout:g}s")
+        except OSError as exc:
+            return Z3edResult(query, -1, "", str(exc))
+        result = Z3edResult(query, completed.returncode, completed.stdout, completed.stderr)
+        self._store(result)
+        return result
+
+    def run(self, query: Z3edQuery) -> Z3edResult:
+        return self.run_many([query])[0]
+
+    def run_many(self, queries: Iterable[Z3edQuery]) -> list[Z3edResult]:
+        """Results in query order; cache misses run concurrently."""
+        queries = list(queries)
+        self._revalidate()
+        missing = []
+        for query in dict.fromkeys(queries):
+            if query in self._memory:
+                continue
+            result = self._load(query)
+            if result is None:
+                missing.append(query)
+            else:
+                self._memory[query] = result
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(self.jobs, len(missing))) as pool:
+                for result in pool.map(self._execute, missing):
+                    self._memory[result.query] = result
+        return [self._memory[query] for query in queries]
@@ -1,10 +1,12 @@
 """Dungeon room navigator for Oracle of Secrets / ALTTP.
 
-Navigates Link between dungeon rooms using z3ed graph data and Mesen2
-pos-teleport primitives.
+Navigates Link between dungeon rooms using a room graph decoded from the
+ROM (Scripts/Generate/dungeon_rooms.py) and Mesen2 pos-teleport primitives.
+z3ed's dungeon-room-graph is still available via build_graph_z3ed() as a
+cross-check.
 
 Algorithm per hop:
-  1. Load door tile data from z3ed (dungeon-describe-room)
+  1. Load door tile data from the room's door list
   2. Compute door's world pixel coordinate from room grid formula
   3. Align Link's X (N/S door) or Y (E/W door) to the door
   4. Press direction button until ROOM_ID changes, or timeout
@@ -26,7 +28,7 @@ from __future__ import annotations
 import json
 import os
 import shutil
-import subprocess
+import sys
 import time
 from collections import deque
 from dataclasses import dataclass, field
@@ -35,6 +37,14 @@ from typing import Optional
 
 from .constants import OracleRAM
 
+_GENERATE_DIR = Path(__file__).resolve().parents[2] / "Generate"
+
+
+def _use_generate_modules() -> None:
+    """Make Scripts/Generate (dungeon_rooms, z3ed_driver) importable."""
+    if str(_GENERATE_DIR) not in sys.path:
+        sys.path.insert(0, str(_GENERATE_DIR))
+
 # ---------------------------------------------------------------------------
 # World coordinate constants (calibrated, see module docstring)
 # ---------------------------------------------------------------------------
@@ -66,6 +76,14 @@ def door_world_pos(room_id: int, tile_x: int, tile_y: int) -> tuple[int, int]:
 # Door edge data
 # ---------------------------------------------------------------------------
 
+# Map from room-decoder wall name to z3ed direction string
+_WALL_TO_DIR: dict[str, str] = {
+    "North": "door_north",
+    "South": "door_south",
+    "West":  "door_west",
+    "East":  "door_east",
+}
+
 # Map from z3ed direction string to gamepad button
 _DIR_TO_BUTTON: dict[str, str] = {
     "door_north": "up",
@@ -160,8 +178,8 @@ class DungeonNavigator:
         nav.build_graph()
         ok = nav.go_to_room(0xDA)
 
-    The navigator builds a graph once via z3ed and caches it.  Each call to
-    go_to_room() does a fresh BFS and executes the path step-by-step.
+    The navigator decodes the graph from the ROM once and caches it.  Each
+    call to go_to_room() does a fresh BFS and executes the path step-by-step.
     """
 
     def __init__(
@@ -176,7 +194,7 @@ class DungeonNavigator:
         self.client = client
         self.rom_path = rom_path
         self.entrance_id = entrance_id
-        self.z3ed_path = z3ed_path or self._find_z3ed()
+        self._z3ed_path = z3ed_path
         self.step_frames = step_frames       # frames to press button per step
         self.timeout_frames = timeout_frames  # frames before giving up on transition
         self._graph: Optional[DungeonGraph] = None
@@ -185,7 +203,70 @@ class DungeonNavigator:
     # Graph building
     # ------------------------------------------------------------------
 
+    @property
+    def z3ed_path(self) -> str:
+        if self._z3ed_path is None:
+            self._z3ed_path = self._find_z3ed()
+        return self._z3ed_path
+
     def build_graph(self, same_blockset: bool = True) -> DungeonGraph:
+        """Build navigation graph from the ROM's room headers and door lists.
+
+        Rooms are collected breadth-first from the entrance room through
+        door neighbours (non-exit doors), staircases and holewarps; with
+        same_blockset only rooms sharing the entrance room's blockset are
+        followed.
+        """
+        _use_generate_modules()
+        from dungeon_rooms import DungeonRooms, adjacent_room
+
+        rooms = DungeonRooms.load(Path(self.rom_path))
+        start = rooms.entrance_room(self.entrance_id)
+        blockset = rooms.room(start).blockset
+
+        def follow(room_id: Optional[int]) -> bool:
+            if room_id is None:
+                return False
+            return not same_blockset or rooms.room(room_id).blockset == blockset
+
+        graph = DungeonGraph()
+        queue: deque[int] = deque([start])
+        seen: set[int] = {start}
+        while queue:
+            room_id = queue.popleft()
+            graph.rooms.append(room_id)
+            room = rooms.room(room_id)
+            targets = []
+            for door in room.doors:
+                if door.is_exit:
+                    continue
+                target = adjacent_room(room_id, door.direction)
+                if not follow(target):
+                    continue
+                graph.add_door(DoorEdge(
+                    from_room=room_id,
+                    to_room=target,
+                    direction=_WALL_TO_DIR[door.direction],
+                    door_type=door.type_name,
+                    tile_x=door.tile_x,
+                    tile_y=door.tile_y,
+                ))
+                targets.append(target)
+            for index, target in enumerate(room.stairs, start=1):
+                if target and target != room_id and follow(target):
+                    graph.add_stair(StairEdge(room_id, target, f"stair{index}"))
+                    targets.append(target)
+            if room.holewarp and room.holewarp != room_id and follow(room.holewarp):
+                graph.add_stair(StairEdge(room_id, room.holewarp, "holewarp"))
+                targets.append(room.holewarp)
+            for target in targets:
+                if target not in seen:
+                    seen.add(target)
+                    queue.append(target)
+
+        return self._finish_graph(graph)
+
+    def build_graph_z3ed(self, same_blockset: bool = True) -> DungeonGraph:
         """Build navigation graph from z3ed dungeon-room-graph output."""
         args = [
             "dungeon-room-graph",
@@ -220,6 +301,9 @@ class DungeonNavigator:
                 kind=edge["type"],
             ))
 
+        return self._finish_graph(graph)
+
+    def _finish_graph(self, graph: DungeonGraph) -> DungeonGraph:
         self._graph = graph
         n_rooms = len(graph.rooms)
         n_door_edges = sum(len(v) for v in graph.door_edges.values())
@@ -416,10 +500,11 @@ class DungeonNavigator:
 
     def _run_z3ed(self, *args) -> dict:
         # z3ed requires: z3ed <command> --rom <path> --format json [command-flags]
-        subcmd = list(args[:1])
-        flags = list(args[1:])
-        cmd = [self.z3ed_path] + subcmd + ["--rom", self.rom_path, "--format", "json"] + flags
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
-        if result.returncode != 0:
+        _use_generate_modules()
+        from z3ed_driver import Z3edDriver, Z3edQuery
+
+        query = Z3edQuery(args[0], args=("--format", "json") + tuple(args[1:]))
+        result = Z3edDriver.shared(Path(self.rom_path), self.z3ed_path).run(query)
+        if not result.ok:
             raise RuntimeError(f"z3ed command failed: {result.stderr.strip()}")
         return json.loads(result.stdout)
@@ -0,0 +1,285 @@
+"""First-bad-frame localization with savestate checkpoints.
+
+A forward run saves a state at exponentially spaced frame offsets (1, 2, 4,
+8, ...) and evaluates a predicate at each. Once a checkpoint is bad, a binary
+search between the last good and first bad checkpoint replays only the span
+it needs, starting from the nearest good state; every good probe becomes a
+new checkpoint. A corruption N frames in is found with O(log N) predicate
+reads and state loads instead of a frame-by-frame scan.
+
+The predicate must be monotonic over the window (once bad, it stays bad)
+and replays must be deterministic, i.e. no live input after the start state.
+Conditions that also occur transiently, such as a forced-blank frame during
+a normal transition, can be made sticky with `confirm=k`: a frame is only bad
+if the predicate holds for k consecutive frames starting there.
+
+    bisector = FrameBisector(BridgeFrames(bridge), sp_corrupt(bridge), state_dir)
+    result = bisector.run(max_frames=10000)
+    result.first_bad_frame, result.last_good.path
+"""
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable, Optional, Protocol
+
+from .bridge import MesenBridge
+from .constants import OracleRAM
+from .expr import EvalContext, ExprError, ExprEvaluator
+
+
+Predicate = Callable[[], bool]
+
+INIDISPQ = 0x7E0013  # Queued INIDISP value written to $2100 during NMI
+SP_PAGE = range(0x0100, 0x0200)
+BLACKOUT_MODES = frozenset({0x06, 0x07})  # transition / underworld
+
+
+class FrameBisectError(RuntimeError):
+    """Raised when the emulator cannot provide frame-exact replays."""
+
+
+class FrameSource(Protocol):
+    def advance(self, count: int) -> None: ...
+    def save(self, path: Path) -> None: ...
+    def load(self, path: Path) -> None: ...
+
+
+def _state_data(bridge: MesenBridge) -> dict:
+    data = bridge.get_state().get("data", {})
+    if isinstance(data, str):
+        try:
+            data = json.loads(data)
+        except ValueError:
+            data = {}
+    return data if isinstance(data, dict) else {}
+
+
+class BridgeFrames:
+    """Frame-exact stepping and state files over a paused MesenBridge."""
+
+    def __init__(self, bridge: MesenBridge) -> None:
+        self.bridge = bridge
+        self.bridge.pause()
+
+    def frame_counter(self) -> Optional[int]:
+        frame = _state_data(self.bridge).get("frame")
+        return frame if isinstance(frame, int) else None
+
+    def advance(self, count: int) -> None:
+        if count <= 0:
+            return
+        before = self.frame_counter()
+        self.bridge.send_command("FRAME", count=str(count))
+        if before is None:
+            return
+        current = self.frame_counter()
+        if current is None:
+            return
+        # Some builds honour only one frame per FRAME command; finish singly.
+        while current < before + count:
+            self.bridge.send_command("FRAME", count="1")
+            previous, current = current, self.frame_counter()
+            if current is None or current <= previous:
+                raise FrameBisectError(
+                    "FRAME did not advance the frame counter; bisection needs "
+                    "frame-exact stepping"
+                )
+
+    def save(self, path: Path) -> None:
+        if not self.bridge.save_state(path=str(path)):
+            raise FrameBisectError(f"SAVESTATE failed: {path}")
+
+    def load(self, path: Path) -> None:
+        if not self.bridge.load_state(path=str(path)):
+            raise FrameBisectError(f"LOADSTATE failed: {path}")
+
+
+# ---------------------------------------------------------------------------
+# Predicates (True = bad)
+# ---------------------------------------------------------------------------
+
+def sp_corrupt(bridge: MesenBridge) -> Predicate:
+    """SP has left the $01xx stack page."""
+    def check() -> bool:
+        sp = bridge.get_cpu_state().get("sp", 0x01FF)
+        if isinstance(sp, str):
+            sp = int(sp.replace("0x", "").replace("$", ""), 16)
+        return sp not in SP_PAGE
+    return check
+
+
+def mode_in(bridge: MesenBridge, modes: Iterable[int]) -> Predicate:
+    """Game mode ($7E0010) is one of `modes`."""
+    wanted = frozenset(modes)
+    return lambda: bridge.read_memory(OracleRAM.MODE) in wanted
+
+
+def is_blackout(mode: int, inidisp: int) -> bool:
+    """The project's transition-blackout signature.
+
+    Same narrow check as GameStateSnapshot.is_black_screen in
+    Scripts/Campaign/emulator_abstraction.py: INIDISP(Q) exactly 0x80 in
+    game mode 0x06/0x07. Fades, dark rooms and other forced-blank values
+    do not count.
+    """
+    return (inidisp & 0xFF) == 0x80 and mode in BLACKOUT_MODES
+
+
+def black_screen(bridge: MesenBridge) -> Predicate:
+    """INIDISPQ and game mode match the blackout signature (is_blackout)."""
+    def check() -> bool:
+        return is_blackout(bridge.read_memory(OracleRAM.MODE), bridge.read_memory(INIDISPQ))
+    return check
+
+
+def expr_true(
+    bridge: MesenBridge,
+    expr: str,
+    resolve: Optional[Callable[[str], int]] = None,
+) -> Predicate:
+    """An expr.py expression evaluates non-zero (e.g. "mem($7E0010) >= $1A")."""
+    def unknown(name: str) -> int:
+        raise ExprError(f"Unknown symbol: {name}")
+
+    evaluator = ExprEvaluator(EvalContext(
+        resolve_value=resolve or unknown,
+        read_mem8=bridge.read_memory,
+        read_mem16=bridge.read_memory16,
+    ))
+    evaluator.evaluate(expr)  # surface syntax errors before the run starts
+    return lambda: evaluator.evaluate(expr) != 0
+
+
+# ---------------------------------------------------------------------------
+# Bisection
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class Checkpoint:
+    frame: int
+    path: Path
+
+
+@dataclass
+class BisectResult:
+    first_bad_frame: Optional[int]
+    last_good: Optional[Checkpoint]
+    first_bad: Optional[Checkpoint]
+    max_frames: int
+    loads: int = 0
+    frames_run: int = 0
+    probes: list[tuple[int, bool]] = field(default_factory=list)
+
+    @property
+    def found(self) -> bool:
+        return self.first_bad_frame is not None
+
+    def to_json(self) -> dict:
+        return {
+            "found": self.found,
+            "first_bad_frame": self.first_bad_frame,
+            "last_good_frame": self.last_good.frame if self.last_good else None,
+            "last_good_state": str(self.last_good.path) if self.last_good else None,
+            "first_bad_state": str(self.first_bad.path) if self.first_bad else None,
+            "max_frames": self.max_frames,
+            "loads": self.loads,
+            "frames_run": self.frames_run,
+            "probes": [{"frame": frame, "bad": bad} for frame, bad in self.probes],
+        }
+
+
+class FrameBisector:
+    """Find the first frame at which `predicate` turns bad."""
+
+    def __init__(
+        self,
+        frames: FrameSource,
+        predicate: Predicate,
+        state_dir: Path,
+        confirm: int = 1,
+    ) -> None:
+        self.frames = frames
+        self.predicate = predicate
+        self.state_dir = Path(state_dir)
+        self.confirm = max(1, confirm)
+        self.position = 0
+        self._result: Optional[BisectResult] = None
+
+    def _checkpoint(self) -> Checkpoint:
+        path = self.state_dir / f"frame_{self.position:06d}.mss"
+        self.frames.save(path)
+        return Checkpoint(self.position, path)
+
+    def _advance(self, count: int) -> None:
+        self.frames.advance(count)
+        self.position += count
+        self._result.frames_run += count
+
+    def _seek(self, good: Checkpoint, target: int) -> None:
+        """Move to `target` on `good`'s timeline, loading it only if needed."""
+        if not good.frame <= self.position <= target:
+            self.frames.load(good.path)
+            self.position = good.frame
+            self._result.loads += 1
+        self._advance(target - self.position)
+
+    def _probe(self) -> tuple[Checkpoint, bool]:
+        checkpoint = self._checkpoint()
+        bad = self.predicate()
+        for _ in range(self.confirm - 1):
+            if not bad:
+                break
+            self._advance(1)
+            bad = self.predicate()
+        self._result.probes.append((checkpoint.frame, bad))
+        return checkpoint, bad
+
+    def run(self, max_frames: int, first_interval: int = 1, growth: int = 2) -> BisectResult:
+        """Bisect from the current emulator state over `max_frames` frames.
+
+        On success the emulator is left paused on the first bad frame and
+        `last_good.path` is the state one frame before it.
+        """
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        self.position = 0
+        result = self._result = BisectResult(None, None, None, max_frames)
+
+        checkpoint, bad = self._probe()
+        if bad:
+            result.first_bad_frame, result.first_bad = 0, checkpoint
+            return result
+        good = checkpoint
+        offset = max(1, first_interval)
+        while True:
+            target = min(offset, max_frames)
+            self._seek(good, target)
+            checkpoint, bad = self._probe()
+            if bad:
+                break
+            good = checkpoint
+            if target >= max_frames:
+                result.last_good = good
+                return result
+            offset = max(target + 1, target * growth)
+
+        while checkpoint.frame - good.frame > 1:
+            self._seek(good, (good.frame + checkpoint.frame) // 2)
+            probe, bad = self._probe()
+            if bad:
+                checkpoint = probe
+            else:
+                good = probe
+        self._seek(good, checkpoint.frame)
+        result.first_bad_frame = checkpoint.frame
+        result.last_good, result.first_bad = good, checkpoint
+        return result
+
+    def discard_checkpoints(self, result: BisectResult) -> None:
+        """Delete intermediate states, keeping the last-good/first-bad pair."""
+        keep = {c.path for c in (result.last_good, result.first_bad) if c is not None}
+        for path in self.state_dir.glob("frame_*.mss"):
+            if path not in keep:
+                path.unlink(missing_ok=True)
+
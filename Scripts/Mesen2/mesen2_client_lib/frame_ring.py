@@ -0,0 +1,210 @@
+"""Fixed-memory ring of per-frame records for pre-trigger capture.
+
+A blackout is usually noticed seconds after the frames that caused it. The
+ring keeps the last N frames as packed records (mode/submode, INIDISPQ, Link
+position, SP, PC sample and MEM_WATCH_WRITES hits) in one preallocated
+bytearray, so history costs RECORD.size bytes per frame regardless of how
+long the watcher runs. When the trigger fires, the ring is dumped oldest
+first next to a savestate.
+
+    sampler = FrameSampler(bridge, watch_addrs=[0x7E0013])
+    capture = RingCapture(FrameRing(60 * 10), confirm=30)
+    while not capture.push(sampler.sample()):
+        frames.advance(1)
+    capture.ring.dump(path)
+"""
+from __future__ import annotations
+
+import json
+import struct
+from pathlib import Path
+from typing import Callable, Iterable, NamedTuple, Optional
+
+from .bridge import MesenBridge
+from .constants import OracleRAM
+from .frame_bisect import _state_data, is_blackout
+
+
+# frame, mode, submode, INIDISPQ, Link X, Link Y, SP, PC (24-bit), hits, watch mask
+RECORD = struct.Struct("<IBBBHHHIHH")
+STATE_BASE = OracleRAM.MODE  # $7E0010
+STATE_LEN = 0x14  # $7E0010-$7E0023 covers mode, submode, INIDISPQ, Link Y/X
+MAX_WATCHES = 16  # one bit each in the record's watch mask
+
+
+class FrameRecord(NamedTuple):
+    frame: int
+    mode: int
+    submode: int
+    inidisp: int
+    link_x: int
+    link_y: int
+    sp: int
+    pc: int
+    hits: int = 0
+    watch_mask: int = 0
+
+    @property
+    def black(self) -> bool:
+        """Mode and INIDISPQ match the blackout signature (frame_bisect.is_blackout)."""
+        return is_blackout(self.mode, self.inidisp)
+
+    def to_json(self) -> dict:
+        return {
+            "frame": self.frame,
+            "mode": f"0x{self.mode:02X}",
+            "submode": f"0x{self.submode:02X}",
+            "inidispq": f"0x{self.inidisp:02X}",
+            "link_x": self.link_x,
+            "link_y": self.link_y,
+            "sp": f"0x{self.sp:04X}",
+            "pc": f"0x{self.pc:06X}",
+            "hits": self.hits,
+            "watch_mask": self.watch_mask,
+        }
+
+
+class FrameRing:
+    """Circular buffer of packed FrameRecords with a fixed byte budget."""
+
+    def __init__(self, capacity: int) -> None:
+        if capacity <= 0:
+            raise ValueError("ring capacity must be positive")
+        self.capacity = capacity
+        self._buffer = bytearray(capacity * RECORD.size)
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._buffer)
+
+    def append(self, record: FrameRecord) -> None:
+        RECORD.pack_into(self._buffer, self._next * RECORD.size, *record)
+        self._next = (self._next + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def records(self) -> list[FrameRecord]:
+        """Oldest first."""
+        start = (self._next - self._count) % self.capacity
+        return [
+            FrameRecord(*RECORD.unpack_from(self._buffer, ((start + i) % self.capacity) * RECORD.size))
+            for i in range(self._count)
+        ]
+
+    def dump(self, path: Path, **extra) -> None:
+        payload = {"capacity": self.capacity, **extra}
+        payload["records"] = [record.to_json() for record in self.records()]
+        Path(path).write_text(json.dumps(payload, indent=1) + "\n", encoding="utf-8")
+
+
+def _register(regs: dict, *names: str) -> int:
+    for name in names:
+        value = regs.get(name)
+        if isinstance(value, int):
+            return value
+        if isinstance(value, str):
+            try:
+                return int(value.replace("0x", "").replace("$", ""), 16)
+            except ValueError:
+                continue
+    return 0
+
+
+def _blame_writes(response: dict) -> list:
+    data = response.get("data") if response.get("success") else None
+    if isinstance(data, str):
+        try:
+            data = json.loads(data)
+        except ValueError:
+            data = None
+    writes = data.get("writes") if isinstance(data, dict) else None
+    return writes if isinstance(writes, list) else []
+
+
+class FrameSampler:
+    """Reads one FrameRecord per call: STATE, one READBLOCK, CPU, MEM_BLAME per watch."""
+
+    def __init__(self, bridge: MesenBridge, watch_addrs: Iterable[int] = ()) -> None:
+        self.bridge = bridge
+        self.watch_addrs = list(watch_addrs)
+        if len(self.watch_addrs) > MAX_WATCHES:
+            raise ValueError(f"at most {MAX_WATCHES} watch addresses fit in a record")
+        self._last_cycle: dict[int, Optional[int]] = {}
+
+    def frame_counter(self) -> int:
+        frame = _state_data(self.bridge).get("frame")
+        return frame if isinstance(frame, int) else 0
+
+    def _watch_hits(self) -> tuple[int, int]:
+        """Writes to each watched address since the previous sample."""
+        hits = mask = 0
+        for bit, addr in enumerate(self.watch_addrs):
+            writes = _blame_writes(self.bridge.mem_blame(addr=addr))
+            cycles = [w.get("cycle") for w in writes if isinstance(w, dict)]
+            cycles = [c for c in cycles if isinstance(c, int)]
+            newest = max(cycles, default=None)
+            if addr in self._last_cycle:
+                seen = self._last_cycle[addr]
+                count = sum(1 for c in cycles if seen is None or c > seen)
+                if count:
+                    hits += count
+                    mask |= 1 << bit
+            self._last_cycle[addr] = newest if newest is not None else self._last_cycle.get(addr)
+        return min(hits, 0xFFFF), mask
+
+    def sample(self, frame: Optional[int] = None) -> FrameRecord:
+        if frame is None:
+            frame = self.frame_counter()
+        block = self.bridge.read_block(STATE_BASE, STATE_LEN).ljust(STATE_LEN, b"\x00")
+        regs = self.bridge.get_cpu_state()
+        pc = _register(regs, "PC", "pc")
+        if pc <= 0xFFFF:  # bank-relative PC; full 24-bit PCs pass through
+            pc |= (_register(regs, "K", "pb", "k") & 0xFF) << 16
+        hits, mask = self._watch_hits()
+        return FrameRecord(
+            frame=frame & 0xFFFFFFFF,
+            mode=block[0x00],
+            submode=block[0x01],
+            inidisp=block[0x03],
+            link_x=int.from_bytes(block[0x12:0x14], "little"),
+            link_y=int.from_bytes(block[0x10:0x12], "little"),
+            sp=_register(regs, "SP", "sp") & 0xFFFF,
+            pc=pc & 0xFFFFFF,
+            hits=hits,
+            watch_mask=mask,
+        )
+
+
+class RingCapture:
+    """Feeds records into a ring and reports when the trigger is confirmed.
+
+    `trigger` defaults to the black-screen check. A record only counts once
+    the trigger has held for `confirm` consecutive records, so the normal
+    forced-blank frames of a room transition do not fire it.
+    """
+
+    def __init__(
+        self,
+        ring: FrameRing,
+        trigger: Callable[[FrameRecord], bool] = lambda record: record.black,
+        confirm: int = 1,
+    ) -> None:
+        self.ring = ring
+        self.trigger = trigger
+        self.confirm = max(1, confirm)
+        self.streak = 0
+        self.first_bad: Optional[FrameRecord] = None
+
+    def push(self, record: FrameRecord) -> bool:
+        self.ring.append(record)
+        if not self.trigger(record):
+            self.streak, self.first_bad = 0, None
+            return False
+        if self.streak == 0:
+            self.first_bad = record
+        self.streak += 1
+        return self.streak >= self.confirm
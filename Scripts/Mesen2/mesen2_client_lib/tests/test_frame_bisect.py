@@ -0,0 +1,121 @@
+"""
+Tests for savestate-driven first-bad-frame bisection.
+"""
+
+import math
+
+import pytest
+
+from mesen2_client_lib.frame_bisect import BridgeFrames, FrameBisector, black_screen, expr_true
+
+
+class FakeFrames:
+    """Deterministic emulator whose only state is the frame number."""
+
+    def __init__(self):
+        self.frame = 0
+        self.loads = 0
+
+    def advance(self, count):
+        self.frame += count
+
+    def save(self, path):
+        path.write_text(str(self.frame))
+
+    def load(self, path):
+        self.loads += 1
+        self.frame = int(path.read_text())
+
+
+@pytest.mark.parametrize("bad_from", [1, 2, 3, 700, 4096, 7321, 9999])
+def test_finds_first_bad_frame_with_logarithmic_replays(tmp_path, bad_from):
+    frames = FakeFrames()
+    reads = []
+
+    def predicate():
+        reads.append(frames.frame)
+        return frames.frame >= bad_from
+
+    bisector = FrameBisector(frames, predicate, tmp_path)
+    result = bisector.run(max_frames=10000)
+
+    assert result.first_bad_frame == bad_from
+    assert result.last_good.frame == bad_from - 1
+    assert int(result.last_good.path.read_text()) == bad_from - 1
+    assert frames.frame == bad_from
+    bound = 2 * math.ceil(math.log2(10000)) + 2
+    assert len(reads) <= bound
+    assert frames.loads <= bound
+    assert result.frames_run <= 3 * bad_from + 2
+
+    bisector.discard_checkpoints(result)
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(
+        {result.last_good.path.name, result.first_bad.path.name}
+    )
+
+
+def test_not_found_and_bad_at_start(tmp_path):
+    frames = FakeFrames()
+    result = FrameBisector(frames, lambda: False, tmp_path).run(max_frames=100)
+    assert not result.found
+    assert result.last_good.frame == 100
+
+    result = FrameBisector(FakeFrames(), lambda: True, tmp_path).run(max_frames=100)
+    assert result.first_bad_frame == 0
+    assert result.last_good is None
+
+
+def test_confirm_skips_transient_blips(tmp_path):
+    frames = FakeFrames()
+    # Frames 40-41 blank briefly during a transition; the real hang starts at 300.
+    bisector = FrameBisector(frames, lambda: frames.frame in (40, 41) or frames.frame >= 300,
+                             tmp_path, confirm=4)
+    result = bisector.run(max_frames=1000, first_interval=8)
+    assert result.first_bad_frame == 300
+
+
+class FakeBridge:
+    def __init__(self, frame_step=1):
+        self.counter = 100
+        self.frame_step = frame_step
+        self.memory = {0x7E0010: 0x07, 0x7E0013: 0x0F}
+        self.commands = []
+
+    def pause(self):
+        return True
+
+    def get_state(self):
+        return {"success": True, "data": {"frame": self.counter}}
+
+    def send_command(self, command, **params):
+        self.commands.append((command, params))
+        if command == "FRAME":
+            self.counter += min(int(params["count"]), self.frame_step)
+        return {"success": True}
+
+    def read_memory(self, addr):
+        return self.memory.get(addr, 0)
+
+    def read_memory16(self, addr):
+        return self.read_memory(addr) | (self.read_memory(addr + 1) << 8)
+
+
+def test_bridge_frames_finishes_partial_frame_commands():
+    bridge = FakeBridge(frame_step=1)
+    BridgeFrames(bridge).advance(3)
+    assert bridge.counter == 103
+    assert [params["count"] for _, params in bridge.commands] == ["3", "1", "1"]
+
+
+def test_memory_predicates():
+    bridge = FakeBridge()
+    check = expr_true(bridge, "mem($7E0010) == 7 && mem($7E0013) < $80")
+    blank = black_screen(bridge)
+    assert check() and not blank()
+    bridge.memory[0x7E0013] = 0x80
+    assert not check() and blank()
+    # Only the narrow signature counts: not zero brightness, not other modes.
+    bridge.memory[0x7E0013] = 0x00
+    assert not blank()
+    bridge.memory[0x7E0010], bridge.memory[0x7E0013] = 0x09, 0x80
+    assert not blank()
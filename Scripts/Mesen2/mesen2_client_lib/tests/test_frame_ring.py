@@ -0,0 +1,89 @@
+"""
+Tests for the fixed-memory pre-trigger frame ring.
+"""
+
+import json
+
+import pytest
+
+from mesen2_client_lib.frame_ring import RECORD, FrameRecord, FrameRing, FrameSampler, RingCapture
+
+
+def record(frame, inidisp=0x0F, **fields):
+    values = dict(mode=0x07, submode=0x00, link_x=0x0100, link_y=0x0200, sp=0x01F0, pc=0x028000)
+    values.update(fields)
+    return FrameRecord(frame=frame, inidisp=inidisp, **values)
+
+
+def test_ring_keeps_newest_records_at_fixed_size(tmp_path):
+    ring = FrameRing(8)
+    assert ring.nbytes == 8 * RECORD.size
+    for frame in range(3):
+        ring.append(record(frame))
+    assert [r.frame for r in ring.records()] == [0, 1, 2]
+
+    for frame in range(3, 1000):
+        ring.append(record(frame, pc=0x008000 + frame))
+    assert ring.nbytes == 8 * RECORD.size
+    assert [r.frame for r in ring.records()] == list(range(992, 1000))
+    assert ring.records()[-1] == record(999, pc=0x008000 + 999)
+
+    ring.dump(tmp_path / "ring.json", trigger_frame=999)
+    payload = json.loads((tmp_path / "ring.json").read_text())
+    assert payload["trigger_frame"] == 999
+    assert payload["records"][-1]["pc"] == "0x0083E7"
+
+
+def test_capture_confirms_before_triggering():
+    capture = RingCapture(FrameRing(64), confirm=4)
+    # A two-frame transition blank, then the real blackout from frame 20.
+    blank = {10, 11} | set(range(20, 40))
+    fired = [f for f in range(40) if capture.push(record(f, inidisp=0x80 if f in blank else 0x0F))]
+    assert fired[0] == 23
+    assert capture.first_bad.frame == 20
+    assert record(0, inidisp=0x80).black and not record(0, inidisp=0x0F).black
+    # Zero brightness and forced blank outside modes 0x06/0x07 are not blackouts.
+    assert not record(0, inidisp=0x00).black
+    assert not record(0, inidisp=0x80, mode=0x09).black
+
+
+class FakeBridge:
+    def __init__(self):
+        self.frame = 500
+        self.ram = bytearray(0x14)
+        self.ram[0x00], self.ram[0x01], self.ram[0x03] = 0x07, 0x02, 0x0F
+        self.ram[0x10:0x14] = (0x0345).to_bytes(2, "little") + (0x0678).to_bytes(2, "little")
+        self.writes = {0x7E0013: [], 0x7E0010: []}
+
+    def get_state(self):
+        return {"success": True, "data": json.dumps({"frame": self.frame})}
+
+    def read_block(self, address, length):
+        assert address == 0x7E0010
+        return bytes(self.ram[:length])
+
+    def get_cpu_state(self):
+        return {"sp": "0x01F3", "pc": "0x8781", "k": "0x00"}
+
+    def mem_blame(self, addr=None):
+        writes = [{"cycle": c, "pc": "0x008000"} for c in reversed(self.writes[addr])]
+        return {"success": True, "data": {"writes": writes}}
+
+
+def test_sampler_reads_state_and_counts_new_watch_hits():
+    bridge = FakeBridge()
+    bridge.writes[0x7E0013] = [10, 20]
+    sampler = FrameSampler(bridge, watch_addrs=[0x7E0013, 0x7E0010])
+
+    first = sampler.sample()
+    assert first == FrameRecord(500, 0x07, 0x02, 0x0F, 0x0678, 0x0345, 0x01F3, 0x008781, 0, 0)
+
+    bridge.frame += 1
+    bridge.writes[0x7E0013] += [30, 31]
+    bridge.writes[0x7E0010] += [32]
+    second = sampler.sample()
+    assert (second.frame, second.hits, second.watch_mask) == (501, 3, 0b11)
+    assert sampler.sample().hits == 0
+
+    with pytest.raises(ValueError):
+        FrameSampler(bridge, watch_addrs=range(17))
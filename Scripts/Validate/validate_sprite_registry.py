@@ -17,6 +17,7 @@ from pathlib import Path
 
 DEFAULT_REGISTRY = Path("Sprites/registry.csv")
 DEFAULT_IDS = Path("Sprites/sprite_registry_ids.asm")
+GENERATOR = Path(__file__).resolve().parents[1] / "Generate" / "generate_sprite_registry.py"
 
 
 def _parse_id(value: str) -> int | None:
@@ -89,7 +90,7 @@ def _check_ids(registry: list[dict], strict: bool) -> int:
 
 
 def _check_ids_file(registry_csv: Path, ids_path: Path) -> bool:
-    script = Path("Scripts/generate_sprite_registry.py")
+    script = GENERATOR
     if not script.exists():
         print(f"[error] {script} not found")
         return False